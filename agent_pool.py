@@ -0,0 +1,608 @@
+"""
+Agent Process Pool
+==================
+
+Warm fork servers for the orchestrator's agent subprocesses.
+
+Starting an agent as ``python autonomous_agent_demo.py ...`` pays for the
+interpreter start and for importing the agent stack (Claude SDK, SQLAlchemy,
+the API and MCP modules) on every coding and testing assignment. A pool
+server is started once per agent type with those modules already imported.
+Each assignment is sent to it over a Unix socket, together with the write
+end of the agent's output pipe, and the server forks a child that runs the
+agent script as ``__main__``.
+
+Isolation is the same as with Popen: every assignment runs in a fresh
+process with the orchestrator's environment and working directory, stdin on
+/dev/null and stdout/stderr on its own pipe, and its process tree is stopped
+as before when it finishes. The server imports modules and caches the
+agents' prompt templates but never runs an agent, opens a database or starts
+a thread, so nothing leaks between assignments through it. Servers are replaced after ``max_tasks`` forks or
+when their memory grows by ``max_rss_growth_mb``.
+
+A server's command line carries ``--agent-pool`` and the agent type it
+serves, and its forked agents inherit that command line; the server itself
+is not counted as an agent (see AgentProcessManager.get_agent_counts).
+
+Where fork is unavailable (Windows) or the pool is disabled with
+AUTOFORGE_AGENT_POOL=0, the orchestrator starts agents with Popen as before.
+"""
+
+import argparse
+import gc
+import importlib
+import itertools
+import json
+import os
+import runpy
+import select
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import traceback
+from pathlib import Path
+
+import psutil
+
+from server.utils.process_utils import POOL_MARKER
+
+FORK_AVAILABLE = (
+    sys.platform != "win32"
+    and hasattr(os, "fork")
+    and hasattr(socket, "send_fds")
+    and hasattr(socket, "SOCK_SEQPACKET")
+)
+
+# Modules imported by a server before it forks agents
+DEFAULT_PRELOAD = ("autonomous_agent_demo",)
+# Forks before a server is replaced
+DEFAULT_MAX_TASKS = 50
+# Server memory growth (MB) before it is replaced
+DEFAULT_MAX_RSS_GROWTH_MB = 256
+# Seconds to wait for a server to finish its imports
+DEFAULT_START_TIMEOUT = 60.0
+# Seconds to wait for a server to confirm a fork
+SPAWN_TIMEOUT = 10.0
+
+# Largest control message; assignments carry the agent's environment
+_MAX_MESSAGE = 1 << 18
+# How often a server checks that the orchestrator is still alive
+_PARENT_CHECK_SECONDS = 1.0
+# Error for assignments that reach a server after it retired
+_RETIRING = "pool server is retiring"
+
+
+class AgentPoolError(RuntimeError):
+    """Raised when an assignment cannot be handed to a pool server."""
+
+
+class _ServerRetiring(AgentPoolError):
+    """The server retired while the assignment was on its way."""
+
+
+def pool_enabled() -> bool:
+    """Return True if agents should be started through the pool."""
+    setting = os.environ.get("AUTOFORGE_AGENT_POOL", "1").lower()
+    return FORK_AVAILABLE and setting not in ("0", "false", "no")
+
+
+# =============================================================================
+# Orchestrator side
+# =============================================================================
+
+class PooledProcess:
+    """Popen-like handle for an agent forked by a pool server.
+
+    Supports what the orchestrator and kill_process_tree use: ``pid``,
+    ``args``, ``stdout`` (text, UTF-8 with replacement), ``returncode``,
+    ``poll``, ``wait``, ``send_signal``, ``terminate`` and ``kill``. The
+    exit status is reported by the server that reaped the agent.
+    """
+
+    def __init__(self, args: list[str], pid: int):
+        self.args = args
+        self.pid = pid
+        self.stdout = None
+        self.returncode: int | None = None
+        self._exited = threading.Event()
+
+    def __repr__(self) -> str:
+        return f"<PooledProcess pid={self.pid} returncode={self.returncode}>"
+
+    def _set_returncode(self, returncode: int) -> None:
+        if self.returncode is None:
+            self.returncode = returncode
+        self._exited.set()
+
+    def poll(self) -> int | None:
+        return self.returncode
+
+    def wait(self, timeout: float | None = None) -> int:
+        if not self._exited.wait(timeout):
+            raise subprocess.TimeoutExpired(self.args, timeout)
+        return self.returncode
+
+    def send_signal(self, sig: int) -> None:
+        # Once reaped the PID may belong to another process
+        if self.returncode is not None:
+            return
+        try:
+            os.kill(self.pid, sig)
+        except ProcessLookupError:
+            pass
+
+    def terminate(self) -> None:
+        self.send_signal(signal.SIGTERM)
+
+    def kill(self) -> None:
+        self.send_signal(signal.SIGKILL)
+
+
+class _PoolServer:
+    """A running pool server and the orchestrator's end of its socket."""
+
+    def __init__(self, pool: "AgentPool", agent_type: str):
+        self.pool = pool
+        self.agent_type = agent_type
+        self.ready = threading.Event()
+        self.retiring = False
+        self.lost = False
+        self._ids = itertools.count(1)
+        self._send_lock = threading.Lock()
+        self._pending: dict[int, dict] = {}
+        self._children: dict[int, PooledProcess] = {}
+
+        self._sock, server_sock = socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+        cmd = [
+            sys.executable, "-u", str(Path(__file__).resolve()),
+            POOL_MARKER,
+            "--agent-type", agent_type,
+            "--fd", str(server_sock.fileno()),
+            "--max-tasks", str(pool.max_tasks),
+            "--max-rss-growth-mb", str(pool.max_rss_growth_mb),
+            "--preload", ",".join(pool.preload),
+        ]
+        if pool.project_dir is not None:
+            cmd.extend(["--project-dir", str(pool.project_dir)])
+        if pool.yolo_mode:
+            cmd.append("--yolo")
+        try:
+            self.process = subprocess.Popen(
+                cmd,
+                pass_fds=[server_sock.fileno()],
+                stdin=subprocess.DEVNULL,
+                cwd=str(Path(__file__).parent.resolve()),
+                env={**os.environ, "PYTHONUNBUFFERED": "1", "PYTHONIOENCODING": "utf-8"},
+            )
+        except OSError:
+            self._sock.close()
+            raise
+        finally:
+            server_sock.close()
+
+        threading.Thread(target=self._read_events, daemon=True).start()
+
+    @property
+    def usable(self) -> bool:
+        return not (self.retiring or self.lost)
+
+    def _read_events(self) -> None:
+        while True:
+            try:
+                data = self._sock.recv(_MAX_MESSAGE)
+            except OSError:
+                data = b""
+            if not data:
+                break
+            event = json.loads(data)
+            kind = event["event"]
+            if kind == "ready":
+                self.ready.set()
+            elif kind == "started":
+                pending = self._pending.get(event["id"], {})
+                proc = PooledProcess(pending.get("args", []), event["pid"])
+                self._children[proc.pid] = proc
+                # Mark a retiring server before the caller can pick it again
+                if event["retiring"]:
+                    self.retiring = True
+                    self.pool._server_retiring(self)
+                self._resolve(event["id"], process=proc)
+            elif kind == "error":
+                self._resolve(event["id"], error=event["error"])
+            elif kind == "exited":
+                proc = self._children.pop(event["pid"], None)
+                if proc is not None:
+                    proc._set_returncode(event["returncode"])
+        self._on_lost()
+
+    def _resolve(self, request_id: int, **result) -> None:
+        pending = self._pending.get(request_id)
+        if pending is not None:
+            pending.update(result)
+            pending["done"].set()
+
+    def _on_lost(self) -> None:
+        """The server exited: fail pending requests and watch orphaned agents."""
+        self.lost = True
+        self.ready.set()
+        # A retired server exits once drained, leaving late assignments unread
+        error = _RETIRING if self.retiring else "pool server exited"
+        for request_id in list(self._pending):
+            self._resolve(request_id, error=error)
+        for proc in list(self._children.values()):
+            threading.Thread(target=_watch_orphan, args=(proc,), daemon=True).start()
+        self._children.clear()
+        self._sock.close()
+        try:
+            self.process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            pass
+
+    def spawn(self, args: list[str], script: str, cwd: str, env: dict[str, str]) -> PooledProcess:
+        """Have the server fork an agent running ``script`` with ``args``."""
+        request_id = next(self._ids)
+        payload = json.dumps({
+            "op": "spawn", "id": request_id, "script": script,
+            "args": args, "cwd": cwd, "env": env,
+        }).encode()
+        if len(payload) > _MAX_MESSAGE:
+            raise AgentPoolError("assignment too large for the pool")
+
+        read_fd, write_fd = os.pipe()
+        pending = {"args": [sys.executable, "-u", script, *args], "done": threading.Event()}
+        self._pending[request_id] = pending
+        try:
+            with self._send_lock:
+                socket.send_fds(self._sock, [payload], [write_fd])
+        except OSError as e:
+            os.close(read_fd)
+            if self.retiring:
+                raise _ServerRetiring(_RETIRING) from e
+            raise AgentPoolError(f"pool server unreachable: {e}") from e
+        finally:
+            os.close(write_fd)
+
+        try:
+            if not pending["done"].wait(SPAWN_TIMEOUT):
+                # Do not reuse a server that stopped answering
+                self.lost = True
+                self.shutdown()
+                raise AgentPoolError("pool server did not confirm the fork")
+        except BaseException:
+            os.close(read_fd)
+            raise
+        finally:
+            self._pending.pop(request_id, None)
+
+        if "error" in pending:
+            os.close(read_fd)
+            if pending["error"] == _RETIRING:
+                self.retiring = True
+                raise _ServerRetiring(_RETIRING)
+            raise AgentPoolError(pending["error"])
+        proc = pending["process"]
+        proc.stdout = open(read_fd, encoding="utf-8", errors="replace")
+        return proc
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Ask the server to exit, killing it if it does not."""
+        try:
+            with self._send_lock:
+                self._sock.send(json.dumps({"op": "shutdown"}).encode())
+        except OSError:
+            pass
+        try:
+            self.process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+
+
+def _watch_orphan(proc: PooledProcess) -> None:
+    """Wait for an agent whose server died; its exit status is unknown."""
+    try:
+        psutil.Process(proc.pid).wait()
+    except psutil.Error:
+        pass
+    proc._set_returncode(1)
+
+
+class AgentPool:
+    """Pool servers for agent subprocesses, one per agent type.
+
+    ``spawn`` takes the same command line the orchestrator would give Popen
+    and returns a PooledProcess. Servers are started on first use (or ahead
+    of time with ``start``) and replaced when they retire or die.
+    """
+
+    def __init__(
+        self,
+        script: Path,
+        preload: tuple[str, ...] = DEFAULT_PRELOAD,
+        max_tasks: int = DEFAULT_MAX_TASKS,
+        max_rss_growth_mb: int = DEFAULT_MAX_RSS_GROWTH_MB,
+        start_timeout: float = DEFAULT_START_TIMEOUT,
+        project_dir: Path | None = None,
+        yolo_mode: bool = False,
+    ):
+        """Initialize the pool.
+
+        Args:
+            script: Agent script the servers run for each assignment
+            preload: Modules each server imports before forking agents
+            max_tasks: Forks after which a server is replaced
+            max_rss_growth_mb: Server memory growth after which it is replaced
+            start_timeout: Seconds to wait for a new server to be ready
+            project_dir: Project whose prompt templates each server caches
+                before forking agents (see prompts.warm_prompt_cache)
+            yolo_mode: Also cache the YOLO variant of the coding prompt
+        """
+        if not FORK_AVAILABLE:
+            raise AgentPoolError("fork servers are not supported on this platform")
+        self.script = str(Path(script).resolve())
+        self.preload = tuple(preload)
+        self.max_tasks = max(max_tasks, 1)
+        self.max_rss_growth_mb = max_rss_growth_mb
+        self.start_timeout = start_timeout
+        self.project_dir = project_dir
+        self.yolo_mode = yolo_mode
+        self.servers_started = 0
+        self._lock = threading.Lock()
+        self._servers: dict[str, _PoolServer] = {}
+        self._closed = False
+
+    def start(self, agent_types: tuple[str, ...] = ("coding", "testing")) -> None:
+        """Start servers ahead of the first assignments, without waiting."""
+        with self._lock:
+            for agent_type in agent_types:
+                self._server_locked(agent_type)
+
+    def _server_locked(self, agent_type: str) -> _PoolServer:
+        if self._closed:
+            raise AgentPoolError("pool is closed")
+        server = self._servers.get(agent_type)
+        if server is None or not server.usable:
+            server = _PoolServer(self, agent_type)
+            self._servers[agent_type] = server
+            self.servers_started += 1
+        return server
+
+    def _server_retiring(self, server: _PoolServer) -> None:
+        """Start the replacement while the retiring server drains."""
+        with self._lock:
+            if not self._closed and self._servers.get(server.agent_type) is server:
+                self._server_locked(server.agent_type)
+
+    def spawn(self, cmd: list[str], cwd: str, env: dict[str, str]) -> PooledProcess:
+        """Start an agent through the pool.
+
+        Args:
+            cmd: Agent command line, ``[sys.executable, "-u", script, *args]``
+            cwd: Working directory for the agent
+            env: Complete environment for the agent
+
+        Returns:
+            Handle for the forked agent
+
+        Raises:
+            AgentPoolError: If the command is not for this pool's script or
+                no server could take the assignment
+        """
+        if len(cmd) < 3 or cmd[:2] != [sys.executable, "-u"] or str(Path(cmd[2]).resolve()) != self.script:
+            raise AgentPoolError("command is not an agent command for this pool")
+        args = list(cmd[3:])
+        agent_type = args[args.index("--agent-type") + 1] if "--agent-type" in args[:-1] else "agent"
+
+        # Concurrent assignments can retire the server this one was sent to.
+        # Each retirement means that server forked its max_tasks agents, so
+        # moving on to its replacement always makes progress.
+        while True:
+            with self._lock:
+                server = self._server_locked(agent_type)
+            if not server.ready.wait(self.start_timeout) or server.lost:
+                raise AgentPoolError(f"pool server for {agent_type} agents is not available")
+            try:
+                return server.spawn(args, self.script, cwd, env)
+            except _ServerRetiring:
+                continue
+
+    def close(self) -> None:
+        """Shut down all servers. Agents already started keep running."""
+        with self._lock:
+            self._closed = True
+            servers = list(self._servers.values())
+            self._servers.clear()
+        for server in servers:
+            server.shutdown()
+
+
+# =============================================================================
+# Server side
+# =============================================================================
+
+def _max_rss_mb() -> float:
+    """Peak resident memory of this process in MB."""
+    # Not available on Windows, where no pool server runs
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _exit_code(code) -> int:
+    """Map a SystemExit code to a process exit status, as the interpreter does."""
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code & 0xFF
+    print(code, file=sys.stderr)
+    return 1
+
+
+def _run_agent(request: dict, out_fd: int, close_fds: list[int]) -> None:
+    """Run one assignment in a freshly forked child. Never returns."""
+    code = 1
+    try:
+        signal.set_wakeup_fd(-1)
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        for fd in close_fds:
+            os.close(fd)
+
+        null_fd = os.open(os.devnull, os.O_RDONLY)
+        os.dup2(null_fd, 0)
+        os.close(null_fd)
+        os.dup2(out_fd, 1)
+        os.dup2(out_fd, 2)
+        os.close(out_fd)
+
+        os.chdir(request["cwd"])
+        os.environ.clear()
+        os.environ.update(request["env"])
+        sys.argv = [request["script"], *request["args"]]
+
+        runpy.run_path(request["script"], run_name="__main__")
+        code = 0
+    except SystemExit as e:
+        code = _exit_code(e.code)
+    except BaseException:
+        traceback.print_exc()
+        code = 1
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        finally:
+            os._exit(code)
+
+
+def serve(
+    sock: socket.socket,
+    preload: tuple[str, ...],
+    max_tasks: int,
+    max_rss_growth_mb: float,
+    project_dir: Path | None = None,
+    yolo_mode: bool = False,
+) -> None:
+    """Pool server loop: fork an agent per assignment and report exits.
+
+    Prompt templates are cached before the first fork, so agents do not read
+    or strip them again. Exits when the orchestrator shuts it down or goes
+    away, or once it has retired and its last agent has exited.
+    """
+    parent_pid = os.getppid()
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    for module in preload:
+        try:
+            importlib.import_module(module)
+        except Exception as e:
+            print(f"[agent-pool] Failed to preload {module}: {e}", file=sys.stderr, flush=True)
+    try:
+        import prompts
+        prompts.warm_prompt_cache(project_dir, yolo_mode)
+    except Exception as e:
+        print(f"[agent-pool] Failed to cache prompt templates: {e}", file=sys.stderr, flush=True)
+    # Keep the preloaded objects out of the collector so forks share their pages
+    gc.collect()
+    gc.freeze()
+    base_rss = _max_rss_mb()
+
+    # SIGCHLD wakes the select loop through the wakeup pipe
+    wake_r, wake_w = os.pipe()
+    os.set_blocking(wake_r, False)
+    os.set_blocking(wake_w, False)
+    signal.set_wakeup_fd(wake_w)
+    signal.signal(signal.SIGCHLD, lambda signum, frame: None)
+
+    def send(**event) -> None:
+        try:
+            sock.send(json.dumps(event).encode())
+        except OSError:
+            pass
+
+    children: set[int] = set()
+    tasks = 0
+    retiring = False
+    send(event="ready", preloaded=list(preload))
+
+    while not (retiring and not children):
+        readable, _, _ = select.select([sock, wake_r], [], [], _PARENT_CHECK_SECONDS)
+        if os.getppid() != parent_pid:
+            break
+
+        if wake_r in readable:
+            try:
+                while os.read(wake_r, 512):
+                    pass
+            except BlockingIOError:
+                pass
+        while children:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                break
+            children.discard(pid)
+            send(event="exited", pid=pid, returncode=os.waitstatus_to_exitcode(status))
+
+        if sock not in readable:
+            continue
+        try:
+            data, fds, _, _ = socket.recv_fds(sock, _MAX_MESSAGE, 1)
+        except InterruptedError:
+            continue
+        except OSError:
+            break
+        if not data:
+            break
+        request = json.loads(data)
+        if request["op"] == "shutdown":
+            break
+        if not fds:
+            send(event="error", id=request["id"], error="no output pipe received")
+            continue
+        if retiring:
+            os.close(fds[0])
+            send(event="error", id=request["id"], error=_RETIRING)
+            continue
+
+        sys.stdout.flush()
+        sys.stderr.flush()
+        pid = os.fork()
+        if pid == 0:
+            _run_agent(request, fds[0], [sock.fileno(), wake_r, wake_w])
+        os.close(fds[0])
+        children.add(pid)
+        tasks += 1
+        retiring = tasks >= max_tasks or _max_rss_mb() - base_rss > max_rss_growth_mb
+        send(event="started", id=request["id"], pid=pid, retiring=retiring)
+
+
+def _serve_main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Agent pool server (started by AgentPool)")
+    parser.add_argument(POOL_MARKER, dest="agent_pool", action="store_true")
+    parser.add_argument("--agent-type", default="agent")
+    parser.add_argument("--fd", type=int, required=True)
+    parser.add_argument("--max-tasks", type=int, default=DEFAULT_MAX_TASKS)
+    parser.add_argument("--max-rss-growth-mb", type=float, default=DEFAULT_MAX_RSS_GROWTH_MB)
+    parser.add_argument("--preload", default=",".join(DEFAULT_PRELOAD))
+    parser.add_argument("--project-dir", type=Path, default=None)
+    parser.add_argument("--yolo", action="store_true")
+    args = parser.parse_args(argv)
+
+    sock = socket.socket(fileno=args.fd)
+    preload = tuple(module for module in args.preload.split(",") if module)
+    try:
+        serve(sock, preload, args.max_tasks, args.max_rss_growth_mb, args.project_dir, args.yolo)
+    finally:
+        sock.close()
+
+
+if __name__ == "__main__":
+    _serve_main()
@@ -20,6 +20,7 @@ from sqlalchemy import (
     CheckConstraint,
     Column,
     DateTime,
+    Float,
     ForeignKey,
     Index,
     Integer,
@@ -60,6 +61,8 @@ class Feature(Base):
     # Dependencies: list of feature IDs that must be completed before this feature
     # NULL/empty = no dependencies (backwards compatible)
     dependencies = Column(JSON, nullable=True, default=None)
+    # Project revision at which this row last changed (maintained by trigger)
+    revision = Column(Integer, nullable=False, default=0, server_default="0", index=True)
 
     def to_dict(self) -> dict:
         """Convert feature to dictionary for JSON serialization."""
@@ -86,6 +89,101 @@ class Feature(Base):
         return []
 
 
+class FeatureSyncState(Base):
+    """Single-row table holding the project's monotonic write revision.
+
+    Every insert, update or delete on the features table bumps ``revision``
+    (via triggers, see _migrate_add_revision_tracking). ``epoch`` is random
+    per database so revisions from a restored or recreated database are
+    never mistaken for those of the original.
+    """
+
+    __tablename__ = "feature_sync_state"
+
+    id = Column(Integer, primary_key=True)
+    epoch = Column(String(32), nullable=False)
+    revision = Column(Integer, nullable=False, default=0)
+
+
+class FeatureTombstone(Base):
+    """Record of a deleted feature, for delta sync clients."""
+
+    __tablename__ = "feature_tombstones"
+
+    feature_id = Column(Integer, primary_key=True)
+    revision = Column(Integer, nullable=False, index=True)
+
+
+class FeatureTransition(Base):
+    """Append-only log of feature status transitions.
+
+    Rows are written by SQLite triggers on the features table (see
+    _migrate_add_transition_log), so every writer - ORM sessions, raw UPDATEs
+    from the MCP server, other processes - is captured without cooperation.
+    """
+
+    __tablename__ = "feature_transitions"
+
+    __table_args__ = (
+        Index('ix_feature_transition_feature_event', 'feature_id', 'event'),
+    )
+
+    id = Column(Integer, primary_key=True)
+    feature_id = Column(Integer, nullable=False)
+    # created, started, released, passed, regressed, deleted
+    event = Column(String(20), nullable=False)
+    passes = Column(Boolean, nullable=False, default=False)
+    in_progress = Column(Boolean, nullable=False, default=False)
+    occurred_at = Column(DateTime, nullable=False, default=_utc_now, index=True)
+    # Seconds from the latest "started" to "passed" (passed events only)
+    cycle_seconds = Column(Float, nullable=True)
+
+    def to_dict(self) -> dict:
+        """Convert transition to dictionary for JSON serialization."""
+        return {
+            "id": self.id,
+            "feature_id": self.feature_id,
+            "event": self.event,
+            "passes": self.passes,
+            "in_progress": self.in_progress,
+            "occurred_at": self.occurred_at.isoformat() if self.occurred_at else None,
+            "cycle_seconds": self.cycle_seconds,
+        }
+
+
+class _FeatureRollupColumns:
+    """Counter columns shared by the hourly and daily rollup tables."""
+
+    created = Column(Integer, nullable=False, default=0)
+    started = Column(Integer, nullable=False, default=0)
+    released = Column(Integer, nullable=False, default=0)
+    passed = Column(Integer, nullable=False, default=0)
+    regressed = Column(Integer, nullable=False, default=0)
+    deleted = Column(Integer, nullable=False, default=0)
+    cycle_seconds_total = Column(Float, nullable=False, default=0.0)
+    cycle_count = Column(Integer, nullable=False, default=0)
+
+
+class FeatureRollupHourly(_FeatureRollupColumns, Base):
+    """Transition counts per UTC hour, maintained incrementally by trigger."""
+
+    __tablename__ = "feature_rollup_hourly"
+
+    bucket = Column(String(13), primary_key=True)  # "YYYY-MM-DDTHH"
+
+
+class FeatureRollupDaily(_FeatureRollupColumns, Base):
+    """Transition counts per UTC day, maintained incrementally by trigger."""
+
+    __tablename__ = "feature_rollup_daily"
+
+    bucket = Column(String(10), primary_key=True)  # "YYYY-MM-DD"
+
+
+# Events counted by the rollup tables, in column order
+TRANSITION_EVENTS = ("created", "started", "released", "passed", "regressed", "deleted")
+
+
 class Schedule(Base):
     """Time-based schedule for automated agent start/stop."""
 
@@ -251,6 +349,179 @@ def _migrate_add_testing_columns(engine) -> None:
     pass
 
 
+def _rollup_upsert_sql(table: str, bucket_format: str) -> str:
+    """Build the trigger statement that folds one transition into a rollup table."""
+    counters = ", ".join(f"NEW.event = '{e}'" for e in TRANSITION_EVENTS)
+    updates = ", ".join(f"{e} = {e} + excluded.{e}" for e in TRANSITION_EVENTS)
+    return f"""
+        INSERT INTO {table} (bucket, {", ".join(TRANSITION_EVENTS)}, cycle_seconds_total, cycle_count)
+        VALUES (
+            strftime('{bucket_format}', NEW.occurred_at), {counters},
+            COALESCE(NEW.cycle_seconds, 0), NEW.cycle_seconds IS NOT NULL
+        )
+        ON CONFLICT(bucket) DO UPDATE SET {updates},
+            cycle_seconds_total = cycle_seconds_total + excluded.cycle_seconds_total,
+            cycle_count = cycle_count + excluded.cycle_count;
+    """
+
+
+def _migrate_add_transition_log(engine) -> None:
+    """Install triggers that record feature transitions and maintain rollups.
+
+    The feature_transitions, feature_rollup_hourly and feature_rollup_daily
+    tables are created by create_all(). Triggers on the features table append
+    a transition whenever a row is inserted, deleted, or changes passes /
+    in_progress; a trigger on feature_transitions folds each new row into the
+    hourly and daily rollups, so analytics queries are O(buckets).
+
+    Databases created before the log existed get a one-time baseline: every
+    existing feature is recorded as created (and passing ones as passed) at
+    migration time, so cumulative totals match the current feature table.
+    """
+    with engine.connect() as conn:
+        conn.execute(text(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_feature_transition_rollup
+            AFTER INSERT ON feature_transitions
+            BEGIN
+                {_rollup_upsert_sql("feature_rollup_hourly", "%Y-%m-%dT%H")}
+                {_rollup_upsert_sql("feature_rollup_daily", "%Y-%m-%d")}
+            END
+        """))
+
+        has_log = conn.execute(text("SELECT 1 FROM feature_transitions LIMIT 1")).first()
+        if has_log is None:
+            conn.execute(text("""
+                INSERT INTO feature_transitions (feature_id, event, passes, in_progress, occurred_at)
+                SELECT id, 'created', COALESCE(passes, 0), COALESCE(in_progress, 0), datetime('now')
+                FROM features ORDER BY id
+            """))
+            conn.execute(text("""
+                INSERT INTO feature_transitions (feature_id, event, passes, in_progress, occurred_at)
+                SELECT id, 'passed', 1, 0, datetime('now')
+                FROM features WHERE passes = 1 ORDER BY id
+            """))
+
+        conn.execute(text("""
+            CREATE TRIGGER IF NOT EXISTS trg_feature_transition_insert
+            AFTER INSERT ON features
+            BEGIN
+                INSERT INTO feature_transitions (feature_id, event, passes, in_progress, occurred_at)
+                VALUES (NEW.id, 'created', COALESCE(NEW.passes, 0), COALESCE(NEW.in_progress, 0), datetime('now'));
+            END
+        """))
+        conn.execute(text("""
+            CREATE TRIGGER IF NOT EXISTS trg_feature_transition_update
+            AFTER UPDATE OF passes, in_progress ON features
+            WHEN COALESCE(OLD.passes, 0) != COALESCE(NEW.passes, 0)
+                OR COALESCE(OLD.in_progress, 0) != COALESCE(NEW.in_progress, 0)
+            BEGIN
+                INSERT INTO feature_transitions (feature_id, event, passes, in_progress, occurred_at, cycle_seconds)
+                VALUES (
+                    NEW.id,
+                    CASE
+                        WHEN COALESCE(NEW.passes, 0) = 1 AND COALESCE(OLD.passes, 0) = 0 THEN 'passed'
+                        WHEN COALESCE(NEW.passes, 0) = 0 AND COALESCE(OLD.passes, 0) = 1 THEN 'regressed'
+                        WHEN COALESCE(NEW.in_progress, 0) = 1 THEN 'started'
+                        ELSE 'released'
+                    END,
+                    COALESCE(NEW.passes, 0),
+                    COALESCE(NEW.in_progress, 0),
+                    datetime('now'),
+                    CASE
+                        WHEN COALESCE(NEW.passes, 0) = 1 AND COALESCE(OLD.passes, 0) = 0 THEN
+                            (julianday(datetime('now')) - julianday((
+                                SELECT MAX(occurred_at) FROM feature_transitions
+                                WHERE feature_id = NEW.id AND event = 'started'
+                            ))) * 86400.0
+                    END
+                );
+            END
+        """))
+        conn.execute(text("""
+            CREATE TRIGGER IF NOT EXISTS trg_feature_transition_delete
+            AFTER DELETE ON features
+            BEGIN
+                INSERT INTO feature_transitions (feature_id, event, passes, in_progress, occurred_at)
+                VALUES (OLD.id, 'deleted', COALESCE(OLD.passes, 0), COALESCE(OLD.in_progress, 0), datetime('now'));
+            END
+        """))
+        conn.commit()
+
+
+def _migrate_add_revision_tracking(engine) -> None:
+    """Add per-row revisions, the project revision counter and tombstones.
+
+    Triggers bump feature_sync_state.revision on every write to the features
+    table and stamp the written row with the new revision; deletes leave a
+    tombstone, which an insert reusing the ID removes again. Rows that
+    predate the migration keep revision 0.
+    """
+    import uuid
+
+    with engine.connect() as conn:
+        columns = [row[1] for row in conn.execute(text("PRAGMA table_info(features)")).fetchall()]
+        if "revision" not in columns:
+            conn.execute(text("ALTER TABLE features ADD COLUMN revision INTEGER NOT NULL DEFAULT 0"))
+            conn.execute(text("CREATE INDEX IF NOT EXISTS ix_features_revision ON features (revision)"))
+
+        conn.execute(
+            text("INSERT OR IGNORE INTO feature_sync_state (id, epoch, revision) VALUES (1, :epoch, 0)"),
+            {"epoch": uuid.uuid4().hex},
+        )
+
+        bump = "UPDATE feature_sync_state SET revision = revision + 1 WHERE id = 1;"
+        current = "(SELECT revision FROM feature_sync_state WHERE id = 1)"
+
+        # Databases migrated before inserts cleared tombstones get the trigger replaced
+        insert_sql = conn.execute(text(
+            "SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = 'trg_feature_revision_insert'"
+        )).scalar()
+        if insert_sql is not None and "feature_tombstones" not in insert_sql:
+            conn.execute(text("DROP TRIGGER trg_feature_revision_insert"))
+        conn.execute(text(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_feature_revision_insert
+            AFTER INSERT ON features
+            BEGIN
+                {bump}
+                UPDATE features SET revision = {current} WHERE id = NEW.id;
+                DELETE FROM feature_tombstones WHERE feature_id = NEW.id;
+            END
+        """))
+        conn.execute(text(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_feature_revision_update
+            AFTER UPDATE ON features
+            WHEN NEW.revision IS OLD.revision
+            BEGIN
+                {bump}
+                UPDATE features SET revision = {current} WHERE id = NEW.id;
+            END
+        """))
+        conn.execute(text(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_feature_revision_delete
+            AFTER DELETE ON features
+            BEGIN
+                {bump}
+                INSERT OR REPLACE INTO feature_tombstones (feature_id, revision) VALUES (OLD.id, {current});
+            END
+        """))
+        conn.commit()
+
+
+def get_feature_revision(conn) -> tuple[str, int]:
+    """Return (epoch, revision) for a features database.
+
+    Args:
+        conn: SQLAlchemy Connection or Session bound to the database
+
+    Returns:
+        Tuple of the database epoch and its current write revision
+    """
+    row = conn.execute(text("SELECT epoch, revision FROM feature_sync_state WHERE id = 1")).first()
+    if row is None:
+        return "", 0
+    return row[0], row[1]
+
+
 def _is_network_path(path: Path) -> bool:
     """Detect if path is on a network filesystem.
 
@@ -429,6 +700,12 @@ def create_database(project_dir: Path) -> tuple:
     # Migrate to add schedules tables
     _migrate_add_schedules_tables(engine)
 
+    # Install transition log and analytics rollup triggers
+    _migrate_add_transition_log(engine)
+
+    # Install revision counter for ETag / delta sync
+    _migrate_add_revision_tracking(engine)
+
     SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
     # Cache the engine and session maker
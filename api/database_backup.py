@@ -5,6 +5,20 @@ Feature Database Backup System
 Automatically backs up features.db when changes are made.
 Implements rolling backups with configurable retention.
 
+Backups are taken with SQLite's online backup API in paced page steps, so
+they see one committed state of the database (including pages still in the
+-wal file) without blocking agent writers. Each snapshot is split into
+page-aligned chunks stored once in a content-addressed object store:
+
+    .feature_backups/
+        objects/ab/cdef...        zlib-compressed chunk, named by its hash
+        snapshots/features_<count>_<timestamp>_<reason>.json   manifest
+
+A manifest lists the chunk hashes that make up one snapshot, so successive
+backups only cost disk for the pages that changed in between. Full-copy
+``features_*.db`` backups made by earlier versions are still listed and
+restorable.
+
 Usage:
     from api.database_backup import backup_features_db
 
@@ -15,9 +29,14 @@ Usage:
     restore_from_backup(project_path, backup_file)
 """
 
+import hashlib
+import json
 import os
 import shutil
 import sqlite3
+import tempfile
+import time
+import zlib
 from datetime import datetime
 from pathlib import Path
 from typing import List, Optional
@@ -28,6 +47,19 @@ BACKUP_DIR_NAME = ".feature_backups"
 MAX_BACKUPS = 20  # Keep last 20 backups
 COMPRESS_AFTER_DAYS = 7  # Compress backups older than 7 days
 
+# Content-addressed snapshot store
+OBJECTS_DIR_NAME = "objects"
+SNAPSHOTS_DIR_NAME = "snapshots"
+CHUNK_SIZE = 32 * 1024  # Rounded up to a whole number of database pages
+PAGES_PER_STEP = 1024  # Pages copied per online backup step
+STEP_SLEEP = 0.005  # Pause between backup steps (seconds)
+MAX_RESTARTS = 3  # Copy restarts tolerated before pinning a read snapshot
+GC_GRACE_SECONDS = 3600  # Never collect objects touched more recently than this
+
+
+class _BackupRestarted(Exception):
+    """Raised from the progress callback when a writer keeps restarting the copy."""
+
 
 def get_backup_dir(project_path: Path) -> Path:
     """
@@ -44,19 +76,185 @@ def get_backup_dir(project_path: Path) -> Path:
     return backup_dir
 
 
+def _chunk_digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=20).hexdigest()
+
+
+def _object_path(objects_dir: Path, digest: str) -> Path:
+    return objects_dir / digest[:2] / digest[2:]
+
+
+def _copy_online(
+    source_db: Path,
+    dest_db: Path,
+    pages_per_step: int = PAGES_PER_STEP,
+    step_sleep: float = STEP_SLEEP
+) -> None:
+    """
+    Copy a live database with the online backup API.
+
+    In WAL mode the source connection holds one read transaction for the
+    whole copy: every step reads the same committed snapshot and writers keep
+    appending to the WAL. In rollback-journal mode the shared lock is released
+    between steps so writers can commit; SQLite restarts the copy when they
+    do, and after MAX_RESTARTS restarts the snapshot is pinned instead.
+    """
+    src = sqlite3.connect(str(source_db), timeout=30, isolation_level=None)
+    try:
+        wal_mode = src.execute("PRAGMA journal_mode").fetchone()[0].lower() == "wal"
+        pin_snapshot = wal_mode
+
+        for _ in range(2):
+            if pin_snapshot:
+                src.execute("BEGIN")
+                src.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+
+            progress = {"remaining": None, "restarts": 0}
+
+            def pace(status, remaining, total):
+                previous = progress["remaining"]
+                if previous is not None and remaining > previous:
+                    progress["restarts"] += 1
+                    if not pin_snapshot and progress["restarts"] > MAX_RESTARTS:
+                        raise _BackupRestarted()
+                progress["remaining"] = remaining
+                if remaining and step_sleep:
+                    time.sleep(step_sleep)
+
+            dst = sqlite3.connect(str(dest_db), isolation_level=None)
+            try:
+                src.backup(dst, pages=max(1, pages_per_step), progress=pace)
+                return
+            except _BackupRestarted:
+                pin_snapshot = True
+            finally:
+                dst.close()
+                if src.in_transaction:
+                    src.execute("COMMIT")
+    finally:
+        src.close()
+
+    raise sqlite3.OperationalError(f"Backup of {source_db} did not complete")
+
+
+def _store_chunks(db_file: Path, objects_dir: Path, chunk_size: int) -> tuple:
+    """
+    Add a database file's chunks to the object store.
+
+    Returns:
+        (chunk digests in file order, bytes newly written to the store)
+    """
+    chunks = []
+    stored_bytes = 0
+
+    with open(db_file, "rb") as f:
+        while True:
+            data = f.read(chunk_size)
+            if not data:
+                break
+            digest = _chunk_digest(data)
+            chunks.append(digest)
+
+            object_path = _object_path(objects_dir, digest)
+            if object_path.exists():
+                # Refresh mtime so a concurrent cleanup's grace period covers it
+                os.utime(object_path)
+                continue
+
+            object_path.parent.mkdir(parents=True, exist_ok=True)
+            compressed = zlib.compress(data, 1)
+            tmp_path = object_path.with_name(f"{object_path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, "wb") as out:
+                out.write(compressed)
+            os.replace(tmp_path, object_path)
+            stored_bytes += len(compressed)
+
+    return chunks, stored_bytes
+
+
+def _create_snapshot(
+    project_path: Path,
+    reason: str,
+    pages_per_step: int = PAGES_PER_STEP,
+    step_sleep: float = STEP_SLEEP
+) -> Path:
+    """
+    Take a deduplicated snapshot of features.db and write its manifest.
+
+    Raises:
+        sqlite3.Error: If the database cannot be read
+    """
+    features_db = project_path / "features.db"
+    backup_dir = get_backup_dir(project_path)
+    objects_dir = backup_dir / OBJECTS_DIR_NAME
+    snapshots_dir = backup_dir / SNAPSHOTS_DIR_NAME
+    snapshots_dir.mkdir(exist_ok=True)
+
+    start = time.perf_counter()
+    fd, tmp_name = tempfile.mkstemp(prefix="snapshot-", suffix=".db", dir=backup_dir)
+    os.close(fd)
+    tmp_db = Path(tmp_name)
+
+    try:
+        _copy_online(features_db, tmp_db, pages_per_step, step_sleep)
+
+        # Verify the snapshot is readable before storing it
+        conn = sqlite3.connect(str(tmp_db))
+        try:
+            feature_count = conn.execute("SELECT COUNT(*) FROM features").fetchone()[0]
+            page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        finally:
+            conn.close()
+
+        chunk_size = max(page_size, CHUNK_SIZE // page_size * page_size)
+        chunks, stored_bytes = _store_chunks(tmp_db, objects_dir, chunk_size)
+        snapshot_size = tmp_db.stat().st_size
+    finally:
+        for path in (tmp_db, Path(f"{tmp_db}-wal"), Path(f"{tmp_db}-shm")):
+            path.unlink(missing_ok=True)
+
+    timestamp = datetime.now()
+    manifest = {
+        "timestamp": timestamp.isoformat(),
+        "reason": reason,
+        "feature_count": feature_count,
+        "original_file": str(features_db),
+        "original_size": features_db.stat().st_size,
+        "backup_size": snapshot_size,
+        "stored_bytes": stored_bytes,
+        "page_size": page_size,
+        "chunk_size": chunk_size,
+        "duration_seconds": round(time.perf_counter() - start, 3),
+        "chunks": chunks,
+    }
+
+    manifest_name = f"features_{feature_count}_{timestamp.strftime('%Y%m%d-%H%M%S-%f')}_{reason}.json"
+    manifest_path = snapshots_dir / manifest_name
+    tmp_manifest = manifest_path.with_suffix(".tmp")
+    with open(tmp_manifest, "w") as f:
+        json.dump(manifest, f)
+    os.replace(tmp_manifest, manifest_path)
+
+    return manifest_path
+
+
 def backup_features_db(
     project_path: Path,
-    reason: str = "auto"
+    reason: str = "auto",
+    pages_per_step: int = PAGES_PER_STEP,
+    step_sleep: float = STEP_SLEEP
 ) -> Optional[Path]:
     """
-    Create a timestamped backup of features.db.
+    Create a timestamped, deduplicated snapshot of features.db.
 
     Args:
         project_path: Path to the project directory
         reason: Reason for backup (e.g., "before_feature_create", "before_update")
+        pages_per_step: Database pages copied per online backup step
+        step_sleep: Pause between backup steps, in seconds
 
     Returns:
-        Path to the created backup file, or None if backup failed
+        Path to the snapshot manifest, or None if backup failed
     """
     features_db = project_path / "features.db"
 
@@ -64,46 +262,62 @@ def backup_features_db(
         return None
 
     try:
-        # Verify database is readable before backing up
-        conn = sqlite3.connect(str(features_db))
-        cursor = conn.cursor()
-        cursor.execute("SELECT COUNT(*) FROM features")
-        feature_count = cursor.fetchone()[0]
-        conn.close()
-
-        # Create backup filename with timestamp and reason
-        timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
-        backup_filename = f"features_{feature_count}_{timestamp}_{reason}.db"
-        backup_path = get_backup_dir(project_path) / backup_filename
-
-        # Copy the database
-        shutil.copy2(features_db, backup_path)
-
-        # Create metadata file
-        metadata = {
-            "timestamp": datetime.now().isoformat(),
-            "reason": reason,
-            "feature_count": feature_count,
-            "original_file": str(features_db),
-            "original_size": features_db.stat().st_size,
-            "backup_size": backup_path.stat().st_size
-        }
-
-        metadata_path = backup_path.with_suffix(".json")
-        import json
-        with open(metadata_path, 'w') as f:
-            json.dump(metadata, f, indent=2)
+        manifest_path = _create_snapshot(project_path, reason, pages_per_step, step_sleep)
 
         # Cleanup old backups
         cleanup_old_backups(project_path)
 
-        return backup_path
+        return manifest_path
 
     except Exception as e:
         print(f"Warning: Failed to backup {features_db}: {e}")
         return None
 
 
+def _all_backups(backup_dir: Path) -> List[Path]:
+    """Snapshot manifests and legacy full-copy backups, newest first."""
+    backups = list(backup_dir.glob("features_*.db"))
+    snapshots_dir = backup_dir / SNAPSHOTS_DIR_NAME
+    if snapshots_dir.exists():
+        backups.extend(snapshots_dir.glob("features_*.json"))
+    return sorted(backups, key=lambda p: p.stat().st_mtime, reverse=True)
+
+
+def _is_snapshot(backup_path: Path) -> bool:
+    return backup_path.suffix == ".json" and backup_path.parent.name == SNAPSHOTS_DIR_NAME
+
+
+def _collect_garbage(backup_dir: Path) -> int:
+    """
+    Delete objects no snapshot manifest references.
+
+    Objects touched within GC_GRACE_SECONDS are kept, since a backup running
+    concurrently may be about to reference them.
+
+    Returns:
+        Number of objects removed
+    """
+    objects_dir = backup_dir / OBJECTS_DIR_NAME
+    if not objects_dir.exists():
+        return 0
+
+    referenced = set()
+    for manifest_path in (backup_dir / SNAPSHOTS_DIR_NAME).glob("features_*.json"):
+        with open(manifest_path, "r") as f:
+            referenced.update(json.load(f)["chunks"])
+
+    cutoff = time.time() - GC_GRACE_SECONDS
+    removed = 0
+    for object_path in objects_dir.glob("*/*"):
+        digest = object_path.parent.name + object_path.name
+        if digest in referenced or object_path.stat().st_mtime > cutoff:
+            continue
+        object_path.unlink()
+        removed += 1
+
+    return removed
+
+
 def cleanup_old_backups(
     project_path: Path,
     keep: int = MAX_BACKUPS
@@ -111,6 +325,9 @@ def cleanup_old_backups(
     """
     Remove old backups, keeping only the most recent ones.
 
+    Chunks no longer referenced by any remaining snapshot are deleted from
+    the object store.
+
     Args:
         project_path: Path to the project directory
         keep: Number of backups to keep (default: MAX_BACKUPS)
@@ -124,24 +341,23 @@ def cleanup_old_backups(
         return []
 
     try:
-        # Get all .db backup files (not metadata .json files)
-        backups = sorted(
-            backup_dir.glob("features_*.db"),
-            key=lambda p: p.stat().st_mtime,
-            reverse=True  # Newest first
-        )
+        backups = _all_backups(backup_dir)
 
         # Remove old backups beyond keep limit
         removed = []
         for old_backup in backups[keep:]:
-            # Also remove corresponding metadata file
-            metadata_file = old_backup.with_suffix(".json")
-            if metadata_file.exists():
-                metadata_file.unlink()
+            if not _is_snapshot(old_backup):
+                # Also remove corresponding metadata file
+                metadata_file = old_backup.with_suffix(".json")
+                if metadata_file.exists():
+                    metadata_file.unlink()
 
             old_backup.unlink()
             removed.append(old_backup)
 
+        if any(_is_snapshot(p) for p in removed):
+            _collect_garbage(backup_dir)
+
         return removed
 
     except Exception as e:
@@ -153,11 +369,14 @@ def list_backups(project_path: Path) -> List[dict]:
     """
     List all available backups with metadata.
 
+    For snapshots, size_mb is the size of the restored database and
+    stored_bytes is the new data that snapshot added to the object store.
+
     Args:
         project_path: Path to the project directory
 
     Returns:
-        List of backup info dictionaries
+        List of backup info dictionaries, newest first
     """
     backup_dir = get_backup_dir(project_path)
 
@@ -165,10 +384,9 @@ def list_backups(project_path: Path) -> List[dict]:
         return []
 
     backups = []
-    import json
 
-    for backup_file in sorted(backup_dir.glob("features_*.db"), reverse=True):
-        metadata_file = backup_file.with_suffix(".json")
+    for backup_file in _all_backups(backup_dir):
+        metadata_file = backup_file if _is_snapshot(backup_file) else backup_file.with_suffix(".json")
 
         metadata = {
             "filename": backup_file.name,
@@ -183,7 +401,10 @@ def list_backups(project_path: Path) -> List[dict]:
             try:
                 with open(metadata_file, 'r') as f:
                     data = json.load(f)
-                    metadata.update(data)
+                data.pop("chunks", None)
+                metadata.update(data)
+                if "stored_bytes" in data:
+                    metadata["size_mb"] = round(data["backup_size"] / (1024**2), 2)
             except Exception:
                 pass  # Use default values
 
@@ -192,6 +413,65 @@ def list_backups(project_path: Path) -> List[dict]:
     return backups
 
 
+def _assemble_snapshot(manifest_path: Path, dest: Path) -> None:
+    """Rebuild a snapshot's database file from the object store."""
+    with open(manifest_path, "r") as f:
+        manifest = json.load(f)
+
+    objects_dir = manifest_path.parent.parent / OBJECTS_DIR_NAME
+    with open(dest, "wb") as out:
+        for digest in manifest["chunks"]:
+            with open(_object_path(objects_dir, digest), "rb") as f:
+                data = zlib.decompress(f.read())
+            if _chunk_digest(data) != digest:
+                raise ValueError(f"Corrupt backup chunk {digest}")
+            out.write(data)
+
+
+def _emergency_backup(project_path: Path, features_db: Path) -> Path:
+    """Back up the current database before it is overwritten by a restore."""
+    try:
+        return _create_snapshot(project_path, "emergency")
+    except Exception:
+        # Unreadable database: keep the raw files, WAL included
+        timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        emergency_backup = get_backup_dir(project_path) / f"features_emergency_{timestamp}.db"
+        shutil.copy2(features_db, emergency_backup)
+        for suffix in ("-wal", "-shm"):
+            sidecar = Path(f"{features_db}{suffix}")
+            if sidecar.exists():
+                shutil.copy2(sidecar, Path(f"{emergency_backup}{suffix}"))
+        return emergency_backup
+
+
+def _replace_database(source_db: Path, features_db: Path) -> None:
+    """
+    Overwrite features.db with the contents of source_db.
+
+    Goes through the backup API so the copy is written under SQLite's locks
+    and the live WAL stays consistent. If the current file is too damaged
+    for SQLite to open, it is replaced on disk instead.
+    """
+    src = sqlite3.connect(str(source_db))
+    try:
+        dst = sqlite3.connect(str(features_db), timeout=30)
+        try:
+            src.backup(dst)
+            return
+        except sqlite3.OperationalError:
+            raise
+        except sqlite3.DatabaseError:
+            pass  # Not a database (or corrupt beyond opening)
+        finally:
+            dst.close()
+    finally:
+        src.close()
+
+    shutil.copy2(source_db, features_db)
+    for suffix in ("-wal", "-shm"):
+        Path(f"{features_db}{suffix}").unlink(missing_ok=True)
+
+
 def restore_from_backup(
     project_path: Path,
     backup_file: str | Path
@@ -201,7 +481,7 @@ def restore_from_backup(
 
     Args:
         project_path: Path to the project directory
-        backup_file: Name or path of the backup file
+        backup_file: Name or path of a snapshot manifest or legacy backup file
 
     Returns:
         True if restore succeeded, False otherwise
@@ -212,6 +492,8 @@ def restore_from_backup(
     # If backup_file is just a name, find it in backup dir
     if isinstance(backup_file, str) and not Path(backup_file).is_absolute():
         backup_path = backup_dir / backup_file
+        if not backup_path.exists():
+            backup_path = backup_dir / SNAPSHOTS_DIR_NAME / backup_file
     else:
         backup_path = Path(backup_file)
 
@@ -219,16 +501,32 @@ def restore_from_backup(
         print(f"Backup file not found: {backup_path}")
         return False
 
+    restore_db = None
     try:
+        if _is_snapshot(backup_path):
+            fd, tmp_name = tempfile.mkstemp(prefix="restore-", suffix=".db", dir=backup_dir)
+            os.close(fd)
+            restore_db = Path(tmp_name)
+            _assemble_snapshot(backup_path, restore_db)
+            source_db = restore_db
+        else:
+            source_db = backup_path
+
+        # Check the backup before touching the current database
+        conn = sqlite3.connect(str(source_db))
+        try:
+            if conn.execute("PRAGMA quick_check").fetchone()[0] != "ok":
+                raise sqlite3.DatabaseError(f"{backup_path.name} failed integrity check")
+        finally:
+            conn.close()
+
         # Create a backup of current (possibly corrupted) database before restoring
         if features_db.exists():
-            timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
-            emergency_backup = backup_dir / f"features_emergency_{timestamp}.db"
-            shutil.copy2(features_db, emergency_backup)
+            emergency_backup = _emergency_backup(project_path, features_db)
             print(f"Emergency backup created: {emergency_backup.name}")
 
         # Restore from backup
-        shutil.copy2(backup_path, features_db)
+        _replace_database(source_db, features_db)
 
         # Verify restored database is readable
         conn = sqlite3.connect(str(features_db))
@@ -244,6 +542,11 @@ def restore_from_backup(
         print(f"Failed to restore from backup: {e}")
         return False
 
+    finally:
+        if restore_db is not None:
+            for path in (restore_db, Path(f"{restore_db}-wal"), Path(f"{restore_db}-shm")):
+                path.unlink(missing_ok=True)
+
 
 def get_latest_backup(project_path: Path) -> Optional[Path]:
     """
@@ -261,10 +564,8 @@ def get_latest_backup(project_path: Path) -> Optional[Path]:
         return None
 
     try:
-        backups = list(backup_dir.glob("features_*.db"))
-        if backups:
-            return max(backups, key=lambda p: p.stat().st_mtime)
-        return None
+        backups = _all_backups(backup_dir)
+        return backups[0] if backups else None
     except Exception:
         return None
 
@@ -285,21 +586,25 @@ def backup_project_summary(project_path: Path) -> dict:
     summary = {
         "features_db_exists": features_db.exists(),
         "backup_dir_exists": backup_dir.exists(),
-        "backup_count": len(list(backup_dir.glob("features_*.db"))) if backup_dir.exists() else 0,
+        "backup_count": len(_all_backups(backup_dir)) if backup_dir.exists() else 0,
         "latest_backup": None,
         "total_backup_size_mb": 0
     }
 
     if backup_dir.exists():
-        latest = get_latest_backup(project_path)
-        if latest:
+        backups = list_backups(project_path)
+        if backups:
+            latest = backups[0]
             summary["latest_backup"] = {
-                "filename": latest.name,
-                "timestamp": datetime.fromtimestamp(latest.stat().st_mtime).isoformat(),
-                "size_mb": round(latest.stat().st_size / (1024**2), 2)
+                "filename": latest["filename"],
+                "timestamp": datetime.fromtimestamp(Path(latest["path"]).stat().st_mtime).isoformat(),
+                "size_mb": latest["size_mb"]
             }
 
-        total_size = sum(f.stat().st_size for f in backup_dir.glob("features_*.db"))
+        # Disk actually used: shared chunks, manifests and legacy copies
+        stored = list((backup_dir / OBJECTS_DIR_NAME).glob("*/*"))
+        stored.extend(_all_backups(backup_dir))
+        total_size = sum(f.stat().st_size for f in stored)
         summary["total_backup_size_mb"] = round(total_size / (1024**2), 2)
 
     return summary
@@ -166,6 +166,40 @@ class QuotaBudget:
         used = self.get_usage_5h()
         return (used / self.quota_limit) * 100 if self.quota_limit > 0 else 0
 
+    def get_usage_snapshot(self, burn_window_minutes: int = 15) -> dict:
+        """
+        Get window usage and recent burn rate in a single query.
+
+        Args:
+            burn_window_minutes: How far back to measure the burn rate
+
+        Returns:
+            Dictionary with used, remaining and burn_rate (prompts per hour)
+        """
+        now = datetime.utcnow()
+        cutoff_str = (now - timedelta(hours=self.QUOTA_WINDOW_HOURS)).isoformat()
+        burn_cutoff_str = (now - timedelta(minutes=burn_window_minutes)).isoformat()
+
+        conn = sqlite3.connect(self.db_path)
+        try:
+            used, recent = conn.execute(
+                """
+                SELECT COALESCE(SUM(prompts_used), 0),
+                       COALESCE(SUM(CASE WHEN timestamp > ? THEN prompts_used END), 0)
+                FROM quota_log
+                WHERE timestamp > ?
+                """,
+                (burn_cutoff_str, cutoff_str),
+            ).fetchone()
+        finally:
+            conn.close()
+
+        return {
+            "used": used,
+            "remaining": max(0, self.quota_limit - used),
+            "burn_rate": recent * 60 / burn_window_minutes,
+        }
+
     def is_quota_available(self, prompts_needed: int = 1) -> bool:
         """
         Check if quota is available for requested prompts.
@@ -43,6 +43,7 @@ assistant.db-shm
 .claude_assistant_settings.json
 .claude_settings.expand.*.json
 .progress_cache
+screenshots/
 """
 
 
@@ -167,6 +168,15 @@ def get_expand_settings_path(project_dir: Path, uuid_hex: str) -> Path:
     return project_dir / ".autoforge" / f".claude_settings.expand.{uuid_hex}.json"
 
 
+def get_screenshots_dir(project_dir: Path) -> Path:
+    """Return the directory for screenshots uploaded from the extension.
+
+    Always under ``.autoforge/``: a root-level ``screenshots/`` directory
+    belongs to the project itself.
+    """
+    return get_autoforge_dir(project_dir) / "screenshots"
+
+
 # ---------------------------------------------------------------------------
 # Lock-file safety check
 # ---------------------------------------------------------------------------
@@ -188,7 +188,7 @@ def get_extra_read_paths() -> list[Path]:
 #
 # Tools intentionally omitted from ALL agent lists (UI/orchestrator only):
 #   feature_get_ready, feature_get_blocked, feature_get_graph,
-#   feature_remove_dependency
+#   feature_get_overview, feature_remove_dependency
 #
 # The ghost tool "feature_release_testing" was removed entirely -- it was
 # listed here but never implemented in mcp_server/feature_mcp.py.
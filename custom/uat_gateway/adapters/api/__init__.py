@@ -20,6 +20,12 @@ from .api_adapter import (
     ResponseSchema,
     ValidationResult,
 )
+from .measurement import (
+    EndpointLoadResult,
+    LatencyHistogram,
+    LoadProfile,
+    MeasurementEngine,
+)
 
 __all__ = [
     'APIAdapter',
@@ -35,4 +41,8 @@ __all__ = [
     'SchemaProperty',
     'ResponseSchema',
     'ValidationResult',
+    'EndpointLoadResult',
+    'LatencyHistogram',
+    'LoadProfile',
+    'MeasurementEngine',
 ]
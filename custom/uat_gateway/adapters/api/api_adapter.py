@@ -15,7 +15,7 @@ import re
 import time
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Set, Tuple
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 from enum import Enum
 import sys
 import json
@@ -26,6 +26,18 @@ from datetime import datetime
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from custom.uat_gateway.utils.logger import get_logger
+from custom.uat_gateway.adapters.api.measurement import (
+    EndpointLoadResult,
+    LatencyHistogram,
+    LoadProfile,
+    MeasurementEngine,
+    create_pooled_session,
+)
+from custom.uat_gateway.adapters.api.route_catalog import (
+    RouteCatalog,
+    SourceFile,
+    walk_source_files,
+)
 
 
 # ============================================================================
@@ -94,6 +106,9 @@ class PerformanceStats:
     max_response_time_ms: float = 0.0
     slow_requests_count: int = 0  # Requests exceeding threshold
     last_measurement: Optional[datetime] = None
+    p50_response_time_ms: float = 0.0
+    p90_response_time_ms: float = 0.0
+    p99_response_time_ms: float = 0.0
 
 
 @dataclass
@@ -211,7 +226,9 @@ class APIAdapter:
         self,
         backend_path: Optional[str] = None,
         frameworks: Optional[List[str]] = None,
-        exclude_patterns: Optional[List[str]] = None
+        exclude_patterns: Optional[List[str]] = None,
+        catalog_path: Optional[str] = None,
+        use_catalog: bool = True
     ):
         """
         Initialize the API adapter
@@ -220,11 +237,15 @@ class APIAdapter:
             backend_path: Path to backend code directory
             frameworks: List of frameworks to detect (default: auto-detect)
             exclude_patterns: Patterns to exclude (e.g., ['node_modules', 'test'])
+            catalog_path: Route catalog file (default: <backend>/.autocoder/route_catalog.json)
+            use_catalog: Persist discovery results and only re-parse changed files
         """
         self.logger = get_logger(__name__)
         self.backend_path = Path(backend_path) if backend_path else None
         self.frameworks = frameworks or []
         self.exclude_patterns = exclude_patterns or ['node_modules', '__pycache__', '.git', 'dist', 'build']
+        self.catalog_path = Path(catalog_path) if catalog_path else None
+        self.use_catalog = use_catalog
 
         # Framework detection patterns
         self.framework_patterns = {
@@ -264,10 +285,29 @@ class APIAdapter:
             'options': HTTPMethod.OPTIONS,
         }
 
+        # Keep-alive session shared by measurement calls (created lazily)
+        self._session = None
+
+    def _get_session(self):
+        """Get the pooled keep-alive session used for measurements"""
+        if self._session is None:
+            self._session = create_pooled_session()
+        return self._session
+
+    # Keywords that mark a source file as using a framework, by file suffix
+    FRAMEWORK_HINTS = {
+        '.js': ('express', 'fastify', 'koa'),
+        '.py': ('flask', 'fastapi'),
+    }
+
     def discover_endpoints(self, backend_path: Optional[str] = None) -> DiscoveryResult:
         """
         Scan backend code and discover API endpoints
 
+        The tree is walked once with excluded directories pruned. With the
+        route catalog enabled, files whose mtime/size (or content hash) are
+        unchanged since the last run are not re-read or re-parsed.
+
         Args:
             backend_path: Path to backend code (overrides init value)
 
@@ -286,12 +326,24 @@ class APIAdapter:
 
         self.logger.info(f"Scanning backend code in: {scan_path}")
 
+        catalog = self._open_route_catalog(scan_path)
+        catalog_files = set()
+        if catalog.catalog_path:
+            catalog_files = {str(catalog.catalog_path), str(catalog.catalog_path.with_suffix('.json.tmp'))}
+
+        walk = walk_source_files(
+            scan_path,
+            lambda path: path in catalog_files or self._should_exclude_file(path)
+        )
+        fresh_content = catalog.refresh(walk.source_files, self.FRAMEWORK_HINTS)
+
         # Detect frameworks if not specified
         if not self.frameworks:
-            self.frameworks = self._detect_frameworks(scan_path)
+            self.frameworks = self._detect_frameworks(scan_path, catalog.hints())
             result.frameworks_detected = self.frameworks
 
         if not self.frameworks:
+            catalog.save()
             result.errors.append("No supported frameworks detected")
             self.logger.warning("No supported frameworks detected")
             return result
@@ -301,37 +353,58 @@ class APIAdapter:
         # Scan files based on framework
         for framework in self.frameworks:
             if framework in ['express', 'fastify', 'koa']:
-                endpoints = self._scan_javascript_files(scan_path, framework)
+                suffix = '.js'
             elif framework in ['flask', 'fastapi']:
-                endpoints = self._scan_python_files(scan_path, framework)
+                suffix = '.py'
             else:
                 self.logger.warning(f"Unsupported framework: {framework}")
                 continue
 
-            result.endpoints.extend(endpoints)
+            files = [f for f in walk.source_files if f.suffix == suffix]
+            result.endpoints.extend(
+                self._scan_source_files(files, framework, scan_path, catalog, fresh_content)
+            )
+
+        catalog.save()
 
         # Update statistics
-        result.files_scanned = len(list(scan_path.rglob('*')))
+        result.files_scanned = walk.files_seen
         result.endpoints_found = len(result.endpoints)
 
         self.logger.info(
             f"Discovery complete: {result.endpoints_found} endpoints "
-            f"found in {result.files_scanned} files"
+            f"found in {result.files_scanned} files "
+            f"({catalog.files_parsed} route files parsed)"
         )
 
         return result
 
-    def _detect_frameworks(self, scan_path: Path) -> List[str]:
+    def _open_route_catalog(self, scan_path: Path) -> RouteCatalog:
+        """
+        Open the route catalog for a backend path
+
+        Args:
+            scan_path: Backend path being scanned
+
+        Returns:
+            RouteCatalog (in-memory only when the catalog is disabled)
+        """
+        if not self.use_catalog:
+            return RouteCatalog()
+        return RouteCatalog(self.catalog_path or scan_path / '.autocoder' / 'route_catalog.json')
+
+    def _detect_frameworks(self, scan_path: Path, source_hints: List[str]) -> List[str]:
         """
         Detect which backend frameworks are used
 
         Args:
             scan_path: Path to scan
+            source_hints: Framework keywords found in source files
 
         Returns:
             List of detected framework names
         """
-        detected = set()
+        detected = set(source_hints)
 
         # Check package.json for Node.js frameworks
         package_json = scan_path / 'package.json'
@@ -356,69 +429,74 @@ class APIAdapter:
                 if 'fastapi' in content.lower():
                     detected.add('fastapi')
 
-        # Scan source files for framework imports
-        for js_file in scan_path.rglob('*.js'):
-            if self._should_exclude_file(js_file):
-                continue
-            try:
-                content = js_file.read_text()
-                if 'express' in content:
-                    detected.add('express')
-                if 'fastify' in content:
-                    detected.add('fastify')
-                if 'koa' in content:
-                    detected.add('koa')
-            except Exception:
-                pass
-
-        for py_file in scan_path.rglob('*.py'):
-            if self._should_exclude_file(py_file):
-                continue
-            try:
-                content = py_file.read_text()
-                if 'flask' in content:
-                    detected.add('flask')
-                if 'fastapi' in content:
-                    detected.add('fastapi')
-            except Exception:
-                pass
-
         return list(detected)
 
-    def _scan_javascript_files(
+    def _scan_source_files(
         self,
+        files: List[SourceFile],
+        framework: str,
         scan_path: Path,
-        framework: str
+        catalog: RouteCatalog,
+        fresh_content: Dict[str, Optional[str]]
     ) -> List[APIEndpoint]:
         """
-        Scan JavaScript files for API endpoints
+        Extract endpoints from source files, reusing cataloged results
 
         Args:
-            scan_path: Path to scan
-            framework: Framework name (express, fastify, koa)
+            files: Candidate files for the framework's language
+            framework: Framework name
+            scan_path: Base path for relative file paths
+            catalog: Route catalog holding per-file results
+            fresh_content: Content of files read during this run
 
         Returns:
             List of discovered endpoints
         """
         endpoints = []
 
-        for js_file in scan_path.rglob('*.js'):
-            if self._should_exclude_file(js_file):
-                continue
+        for source in files:
+            key = str(source.path)
+            cached = catalog.get_endpoints(key, framework)
+
+            if cached is None:
+                content = fresh_content.get(key)
+                if content is None:
+                    try:
+                        content = source.path.read_text()
+                    except Exception as e:
+                        self.logger.warning(f"Error scanning {source.path}: {e}")
+                        continue
+
+                if framework in ['flask', 'fastapi']:
+                    file_endpoints = self._extract_from_python(source.path, framework, scan_path, content)
+                else:
+                    file_endpoints = self._extract_from_javascript(source.path, framework, scan_path, content)
 
-            try:
-                file_endpoints = self._extract_from_javascript(js_file, framework, scan_path)
-                endpoints.extend(file_endpoints)
-            except Exception as e:
-                self.logger.warning(f"Error scanning {js_file}: {e}")
+                cached = [self._endpoint_to_dict(e) for e in file_endpoints]
+                catalog.set_endpoints(key, framework, cached)
+
+            endpoints.extend(self._endpoint_from_dict(data) for data in cached)
 
         return endpoints
 
+    @staticmethod
+    def _endpoint_to_dict(endpoint: APIEndpoint) -> Dict[str, Any]:
+        data = asdict(endpoint)
+        data['method'] = endpoint.method.value
+        return data
+
+    @staticmethod
+    def _endpoint_from_dict(data: Dict[str, Any]) -> APIEndpoint:
+        fields = dict(data)
+        fields['method'] = HTTPMethod(fields['method'])
+        return APIEndpoint(**fields)
+
     def _extract_from_javascript(
         self,
         js_file: Path,
         framework: str,
-        scan_path: Path
+        scan_path: Path,
+        content: Optional[str] = None
     ) -> List[APIEndpoint]:
         """
         Extract endpoints from a JavaScript file
@@ -427,6 +505,7 @@ class APIAdapter:
             js_file: Path to JavaScript file
             framework: Framework name
             scan_path: Base path for relative file paths
+            content: File content if already read
 
         Returns:
             List of endpoints found in file
@@ -434,7 +513,8 @@ class APIAdapter:
         endpoints = []
 
         try:
-            content = js_file.read_text()
+            if content is None:
+                content = js_file.read_text()
             lines = content.split('\n')
 
             # Try to make path relative to scan_path
@@ -492,40 +572,12 @@ class APIAdapter:
 
         return endpoints
 
-    def _scan_python_files(
-        self,
-        scan_path: Path,
-        framework: str
-    ) -> List[APIEndpoint]:
-        """
-        Scan Python files for API endpoints
-
-        Args:
-            scan_path: Path to scan
-            framework: Framework name (flask, fastapi)
-
-        Returns:
-            List of discovered endpoints
-        """
-        endpoints = []
-
-        for py_file in scan_path.rglob('*.py'):
-            if self._should_exclude_file(py_file):
-                continue
-
-            try:
-                file_endpoints = self._extract_from_python(py_file, framework)
-                endpoints.extend(file_endpoints)
-            except Exception as e:
-                self.logger.warning(f"Error scanning {py_file}: {e}")
-
-        return endpoints
-
     def _extract_from_python(
         self,
         py_file: Path,
         framework: str,
-        scan_path: Path
+        scan_path: Path,
+        content: Optional[str] = None
     ) -> List[APIEndpoint]:
         """
         Extract endpoints from a Python file
@@ -534,6 +586,7 @@ class APIAdapter:
             py_file: Path to Python file
             framework: Framework name
             scan_path: Base path for relative file paths
+            content: File content if already read
 
         Returns:
             List of endpoints found in file
@@ -541,7 +594,8 @@ class APIAdapter:
         endpoints = []
 
         try:
-            content = py_file.read_text()
+            if content is None:
+                content = py_file.read_text()
             lines = content.split('\n')
 
             # Try to make path relative to scan_path
@@ -877,17 +931,18 @@ class APIAdapter:
         url = f"{base_url.rstrip('/')}{endpoint.path}"
 
         try:
-            # Measure response time
-            start_time = time.time()
+            # Measure response time over the pooled keep-alive session
+            start_time = time.perf_counter()
 
-            response = requests.get(
+            response = self._get_session().get(
                 url,
                 timeout=timeout,
                 headers=headers or {},
                 params=params
             )
+            response_size = len(response.content)
 
-            end_time = time.time()
+            end_time = time.perf_counter()
             response_time_ms = (end_time - start_time) * 1000
 
             # Create measurement
@@ -899,7 +954,7 @@ class APIAdapter:
                 timestamp=datetime.now(),
                 success=response.status_code < 400,
                 error=None if response.status_code < 400 else f"HTTP {response.status_code}",
-                response_size=len(response.content)
+                response_size=response_size
             )
 
             self.logger.debug(
@@ -913,6 +968,41 @@ class APIAdapter:
             self.logger.error(f"Failed to measure {endpoint.path}: {e}")
             return None
 
+    def measure_endpoints(
+        self,
+        endpoints: List[APIEndpoint],
+        base_url: str,
+        profile: Optional[LoadProfile] = None,
+        headers: Optional[Dict[str, str]] = None,
+        params: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, EndpointLoadResult]:
+        """
+        Measure many endpoints concurrently with latency percentiles
+
+        Requests run over pooled keep-alive connections with configurable
+        concurrency and request rate. Warm-up requests are discarded, and
+        latencies are recorded in an HDR-style histogram.
+
+        Args:
+            endpoints: Endpoints to measure
+            base_url: Base URL for the API
+            profile: Load profile (concurrency, rate, warm-up, request count)
+            headers: HTTP headers to include
+            params: Query parameters
+
+        Returns:
+            Dictionary mapping "METHOD path" to EndpointLoadResult
+        """
+        with MeasurementEngine(profile=profile, headers=headers) as engine:
+            results = engine.measure(endpoints, base_url, params=params)
+
+        self.logger.info(
+            f"Measured {len(results)} endpoints "
+            f"({sum(r.total_requests for r in results.values())} requests)"
+        )
+
+        return results
+
     def track_performance(
         self,
         measurements: List[APIMeasurement],
@@ -929,6 +1019,7 @@ class APIAdapter:
             Dictionary mapping endpoint paths to PerformanceStats
         """
         stats_by_endpoint: Dict[str, PerformanceStats] = {}
+        histograms: Dict[str, LatencyHistogram] = {}
 
         for measurement in measurements:
             key = f"{measurement.method} {measurement.endpoint_path}"
@@ -938,8 +1029,10 @@ class APIAdapter:
                     endpoint_path=measurement.endpoint_path,
                     method=measurement.method
                 )
+                histograms[key] = LatencyHistogram()
 
             stats = stats_by_endpoint[key]
+            histograms[key].record_ms(measurement.response_time_ms)
 
             # Update counters
             stats.total_requests += 1
@@ -968,6 +1061,13 @@ class APIAdapter:
             if stats.last_measurement is None or measurement.timestamp > stats.last_measurement:
                 stats.last_measurement = measurement.timestamp
 
+        # Latency percentiles from the per-endpoint histograms
+        for key, stats in stats_by_endpoint.items():
+            histogram = histograms[key]
+            stats.p50_response_time_ms = histogram.value_at_percentile(50) / 1000
+            stats.p90_response_time_ms = histogram.value_at_percentile(90) / 1000
+            stats.p99_response_time_ms = histogram.value_at_percentile(99) / 1000
+
         return stats_by_endpoint
 
     def get_slow_requests(
@@ -1027,6 +1127,8 @@ class APIAdapter:
             lines.append(f"  Avg Response Time:  {stat.avg_response_time_ms:.2f}ms")
             lines.append(f"  Min Response Time:  {stat.min_response_time_ms:.2f}ms")
             lines.append(f"  Max Response Time:  {stat.max_response_time_ms:.2f}ms")
+            lines.append(f"  p50 / p90 / p99:    {stat.p50_response_time_ms:.2f}ms / "
+                         f"{stat.p90_response_time_ms:.2f}ms / {stat.p99_response_time_ms:.2f}ms")
             lines.append(f"  Slow Requests:      {stat.slow_requests_count}")
 
             if stat.last_measurement:
@@ -0,0 +1,396 @@
+"""
+API Measurement Engine - Concurrent, pooled response time measurement
+
+This module is responsible for:
+- Issuing measurement requests over a pooled keep-alive HTTP session
+- Running requests concurrently with an optional global request rate
+- Discarding warm-up requests before recording
+- Recording latencies in an HDR-style log-linear histogram
+- Reporting p50/p90/p99/max and throughput per endpoint
+"""
+
+import math
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from custom.uat_gateway.utils.logger import get_logger
+
+# ============================================================================
+# Latency Histogram
+# ============================================================================
+
+class LatencyHistogram:
+    """
+    HDR-style latency histogram with bounded relative error
+
+    Values are recorded in microseconds. Values below the sub-bucket count are
+    stored exactly; larger values fall into log-linear buckets whose width
+    doubles with each power of two, so the relative error stays within
+    10^-significant_figures regardless of magnitude. Memory is proportional
+    to the number of distinct buckets hit, not the number of samples.
+    """
+
+    def __init__(self, significant_figures: int = 2):
+        """
+        Initialize the histogram
+
+        Args:
+            significant_figures: Decimal digits of precision to preserve (1-5)
+        """
+        if not 1 <= significant_figures <= 5:
+            raise ValueError("significant_figures must be between 1 and 5")
+
+        largest_single_unit = 2 * 10 ** significant_figures
+        self._sub_bucket_bits = int(math.ceil(math.log2(largest_single_unit)))
+        self._sub_bucket_count = 1 << self._sub_bucket_bits
+        self._sub_bucket_half = self._sub_bucket_count >> 1
+
+        self._counts: Dict[int, int] = defaultdict(int)
+        self.total_count = 0
+        self.min_value = 0
+        self.max_value = 0
+        self._sum = 0
+
+    def _index_for(self, value: int) -> int:
+        if value < self._sub_bucket_count:
+            return value
+        shift = value.bit_length() - self._sub_bucket_bits
+        return (
+            self._sub_bucket_count
+            + (shift - 1) * self._sub_bucket_half
+            + ((value >> shift) - self._sub_bucket_half)
+        )
+
+    def _highest_equivalent(self, index: int) -> int:
+        if index < self._sub_bucket_count:
+            return index
+        offset = index - self._sub_bucket_count
+        shift = offset // self._sub_bucket_half + 1
+        sub_bucket = offset % self._sub_bucket_half + self._sub_bucket_half
+        return ((sub_bucket + 1) << shift) - 1
+
+    def record(self, value_us: int) -> None:
+        """
+        Record a latency sample
+
+        Args:
+            value_us: Latency in microseconds (negative values are clamped to 0)
+        """
+        value = max(0, int(value_us))
+        self._counts[self._index_for(value)] += 1
+        if self.total_count == 0 or value < self.min_value:
+            self.min_value = value
+        if value > self.max_value:
+            self.max_value = value
+        self.total_count += 1
+        self._sum += value
+
+    def record_ms(self, value_ms: float) -> None:
+        """Record a latency sample given in milliseconds"""
+        self.record(int(round(value_ms * 1000)))
+
+    def merge(self, other: 'LatencyHistogram') -> None:
+        """Add all samples of another histogram with the same precision"""
+        if other._sub_bucket_bits != self._sub_bucket_bits:
+            raise ValueError("Cannot merge histograms with different precision")
+        if other.total_count == 0:
+            return
+        for index, count in other._counts.items():
+            self._counts[index] += count
+        if self.total_count == 0 or other.min_value < self.min_value:
+            self.min_value = other.min_value
+        self.max_value = max(self.max_value, other.max_value)
+        self.total_count += other.total_count
+        self._sum += other._sum
+
+    def value_at_percentile(self, percentile: float) -> int:
+        """
+        Get the recorded value at a percentile
+
+        Args:
+            percentile: Percentile in the range 0-100
+
+        Returns:
+            Value in microseconds (0 if the histogram is empty)
+        """
+        if self.total_count == 0:
+            return 0
+
+        percentile = min(max(percentile, 0.0), 100.0)
+        target = max(1, int(math.ceil(percentile / 100.0 * self.total_count)))
+
+        running = 0
+        for index in sorted(self._counts):
+            running += self._counts[index]
+            if running >= target:
+                return min(self._highest_equivalent(index), self.max_value)
+
+        return self.max_value
+
+    @property
+    def mean(self) -> float:
+        """Mean of recorded values in microseconds"""
+        return self._sum / self.total_count if self.total_count else 0.0
+
+    def summary_ms(self) -> Dict[str, float]:
+        """
+        Summarize the distribution in milliseconds
+
+        Returns:
+            Dictionary with count, min, mean, p50, p90, p99 and max
+        """
+        return {
+            'count': self.total_count,
+            'min_ms': self.min_value / 1000,
+            'mean_ms': self.mean / 1000,
+            'p50_ms': self.value_at_percentile(50) / 1000,
+            'p90_ms': self.value_at_percentile(90) / 1000,
+            'p99_ms': self.value_at_percentile(99) / 1000,
+            'max_ms': self.max_value / 1000,
+        }
+
+
+# ============================================================================
+# Data Models
+# ============================================================================
+
+@dataclass
+class LoadProfile:
+    """Configuration for a measurement run"""
+    requests_per_endpoint: int = 10  # Recorded requests per endpoint
+    warmup_requests: int = 1  # Requests per endpoint issued and discarded first
+    concurrency: int = 32  # Maximum in-flight requests
+    rate_limit_rps: Optional[float] = None  # Global request rate cap (None = unlimited)
+    timeout: float = 30.0  # Per-request timeout in seconds
+    significant_figures: int = 2  # Histogram precision
+
+
+@dataclass
+class EndpointLoadResult:
+    """Aggregated measurement result for one endpoint"""
+    endpoint_path: str
+    method: str
+    total_requests: int = 0
+    successful_requests: int = 0
+    failed_requests: int = 0
+    min_ms: float = 0.0
+    mean_ms: float = 0.0
+    p50_ms: float = 0.0
+    p90_ms: float = 0.0
+    p99_ms: float = 0.0
+    max_ms: float = 0.0
+    throughput_rps: float = 0.0
+    duration_s: float = 0.0
+    bytes_received: int = 0
+    errors: List[str] = field(default_factory=list)
+
+
+# ============================================================================
+# Measurement Engine
+# ============================================================================
+
+class _RatePacer:
+    """Thread-safe pacer that spaces request start times evenly"""
+
+    def __init__(self, rate_per_second: Optional[float]):
+        self._interval = 1.0 / rate_per_second if rate_per_second else 0.0
+        self._next_slot = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        if not self._interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self._interval
+        delay = slot - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+
+def create_pooled_session(pool_size: int = 32) -> requests.Session:
+    """
+    Create a keep-alive HTTP session with a connection pool
+
+    Args:
+        pool_size: Maximum connections kept open per host
+
+    Returns:
+        requests.Session with pooled HTTP and HTTPS adapters
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=0,
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+class MeasurementEngine:
+    """
+    Measure API endpoint latency concurrently over pooled connections
+
+    All endpoints are measured in the same run: warm-up requests for every
+    endpoint are issued first and discarded, then the recorded requests are
+    interleaved across endpoints and executed by a bounded worker pool. Total
+    wall time therefore tracks the slowest endpoint rather than the sum of all
+    endpoints, as long as concurrency covers the endpoint count.
+    """
+
+    def __init__(
+        self,
+        profile: Optional[LoadProfile] = None,
+        headers: Optional[Dict[str, str]] = None,
+        session: Optional[requests.Session] = None
+    ):
+        """
+        Initialize the measurement engine
+
+        Args:
+            profile: Load profile (default: LoadProfile())
+            headers: HTTP headers sent with every request
+            session: Existing session to reuse (default: new pooled session)
+        """
+        self.logger = get_logger(__name__)
+        self.profile = profile or LoadProfile()
+        self.headers = headers or {}
+        self._owns_session = session is None
+        self.session = session or create_pooled_session(max(1, self.profile.concurrency))
+
+    def close(self) -> None:
+        """Close the underlying session if it was created by this engine"""
+        if self._owns_session:
+            self.session.close()
+
+    def __enter__(self) -> 'MeasurementEngine':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _send(self, method: str, url: str, params: Optional[Dict[str, Any]]) -> Tuple[float, int, int, Optional[str]]:
+        """Issue one request and return (latency_ms, status, size, error)"""
+        start = time.perf_counter()
+        try:
+            response = self.session.request(
+                method,
+                url,
+                headers=self.headers,
+                params=params,
+                timeout=self.profile.timeout,
+            )
+            size = len(response.content)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            error = None if response.status_code < 400 else f"HTTP {response.status_code}"
+            return elapsed_ms, response.status_code, size, error
+        except requests.exceptions.RequestException as e:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            return elapsed_ms, 0, 0, str(e)
+
+    def measure(
+        self,
+        endpoints: List[Any],
+        base_url: str,
+        params: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, EndpointLoadResult]:
+        """
+        Measure a set of endpoints
+
+        Args:
+            endpoints: APIEndpoint objects (anything with .path and .method)
+            base_url: Base URL for the API
+            params: Query parameters sent with every request
+
+        Returns:
+            Dictionary mapping "METHOD path" to EndpointLoadResult
+        """
+        profile = self.profile
+        base = base_url.rstrip('/')
+
+        targets: List[Tuple[str, str, str]] = []
+        results: Dict[str, EndpointLoadResult] = {}
+        for endpoint in endpoints:
+            method = getattr(endpoint.method, 'value', endpoint.method)
+            key = f"{method} {endpoint.path}"
+            if key in results:
+                continue
+            targets.append((key, method, f"{base}{endpoint.path}"))
+            results[key] = EndpointLoadResult(endpoint_path=endpoint.path, method=method)
+
+        histograms = {key: LatencyHistogram(profile.significant_figures) for key in results}
+        first_start: Dict[str, float] = {}
+        last_end: Dict[str, float] = {}
+        lock = threading.Lock()
+        pacer = _RatePacer(profile.rate_limit_rps)
+
+        def run(key: str, method: str, url: str, record: bool) -> None:
+            pacer.wait()
+            started = time.monotonic()
+            elapsed_ms, status, size, error = self._send(method, url, params)
+            if not record:
+                return
+            finished = time.monotonic()
+            with lock:
+                result = results[key]
+                result.total_requests += 1
+                result.bytes_received += size
+                if error is None:
+                    result.successful_requests += 1
+                else:
+                    result.failed_requests += 1
+                    if len(result.errors) < 10:
+                        result.errors.append(error)
+                histograms[key].record_ms(elapsed_ms)
+                first_start[key] = min(first_start.get(key, started), started)
+                last_end[key] = max(last_end.get(key, finished), finished)
+
+        workers = max(1, profile.concurrency)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='api-measure') as pool:
+            if profile.warmup_requests > 0:
+                warmup = [
+                    pool.submit(run, key, method, url, False)
+                    for _ in range(profile.warmup_requests)
+                    for key, method, url in targets
+                ]
+                for future in as_completed(warmup):
+                    future.result()
+
+            recorded = [
+                pool.submit(run, key, method, url, True)
+                for _ in range(profile.requests_per_endpoint)
+                for key, method, url in targets
+            ]
+            for future in as_completed(recorded):
+                future.result()
+
+        for key, result in results.items():
+            summary = histograms[key].summary_ms()
+            result.min_ms = summary['min_ms']
+            result.mean_ms = summary['mean_ms']
+            result.p50_ms = summary['p50_ms']
+            result.p90_ms = summary['p90_ms']
+            result.p99_ms = summary['p99_ms']
+            result.max_ms = summary['max_ms']
+            if key in first_start:
+                result.duration_s = last_end[key] - first_start[key]
+                if result.duration_s > 0:
+                    result.throughput_rps = result.total_requests / result.duration_s
+
+            self.logger.debug(
+                f"Measured {key}: p50={result.p50_ms:.2f}ms "
+                f"p99={result.p99_ms:.2f}ms max={result.max_ms:.2f}ms "
+                f"({result.throughput_rps:.1f} req/s)"
+            )
+
+        return results
@@ -0,0 +1,234 @@
+"""
+Route Catalog - Single-pass source walk and persisted discovery cache
+
+This module is responsible for:
+- Walking a backend tree once with os.scandir, pruning excluded directories
+- Persisting per-file discovery results keyed by mtime, size and content hash
+- Re-parsing only the route files that changed since the last run
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from custom.uat_gateway.utils.logger import get_logger
+
+CATALOG_VERSION = 1
+
+# File extensions that can contain route definitions
+SOURCE_EXTENSIONS = ('.js', '.py')
+
+
+@dataclass
+class SourceFile:
+    """A candidate route file found during the walk"""
+    path: Path
+    mtime_ns: int
+    size: int
+
+    @property
+    def suffix(self) -> str:
+        return self.path.suffix
+
+
+@dataclass
+class WalkResult:
+    """Result of a single source walk"""
+    source_files: List[SourceFile] = field(default_factory=list)
+    files_seen: int = 0  # All non-excluded files, regardless of extension
+
+
+def walk_source_files(
+    scan_path: Path,
+    is_excluded: Callable[[str], bool],
+    extensions: Tuple[str, ...] = SOURCE_EXTENSIONS
+) -> WalkResult:
+    """
+    Walk a directory tree once, collecting candidate route files
+
+    Excluded directories are pruned rather than filtered after the fact, so
+    node_modules, .git and build output are never descended into. Files are
+    returned in depth-first pre-order, matching Path.rglob.
+
+    Args:
+        scan_path: Root directory to walk
+        is_excluded: Predicate on a full path string
+        extensions: File suffixes to collect
+
+    Returns:
+        WalkResult with candidate files and the total non-excluded file count
+    """
+    result = WalkResult()
+    stack = [str(scan_path)]
+
+    while stack:
+        directory = stack.pop()
+        subdirs = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if is_excluded(entry.path):
+                        continue
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                        elif entry.is_file():
+                            result.files_seen += 1
+                            if entry.name.endswith(extensions):
+                                stat = entry.stat()
+                                result.source_files.append(
+                                    SourceFile(Path(entry.path), stat.st_mtime_ns, stat.st_size)
+                                )
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+
+        # Reverse so the first subdirectory is visited next (pre-order)
+        stack.extend(reversed(subdirs))
+
+    return result
+
+
+class RouteCatalog:
+    """
+    Persisted per-file discovery cache
+
+    Each entry records a file's mtime, size and content hash together with
+    the framework hints found in it and the endpoints extracted per
+    framework. Entries whose mtime and size are unchanged are reused without
+    reading the file; if only the mtime changed, the hash decides whether the
+    cached endpoints are still valid.
+    """
+
+    def __init__(self, catalog_path: Optional[Path] = None):
+        """
+        Initialize the catalog
+
+        Args:
+            catalog_path: JSON file to persist to (None = in-memory only)
+        """
+        self.logger = get_logger(__name__)
+        self.catalog_path = Path(catalog_path) if catalog_path else None
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+        self.files_parsed = 0
+        self._load()
+
+    def _load(self) -> None:
+        if not self.catalog_path or not self.catalog_path.exists():
+            return
+        try:
+            with open(self.catalog_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == CATALOG_VERSION:
+                self._entries = data.get('files', {})
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable route catalog {self.catalog_path}: {e}")
+            self._entries = {}
+
+    def save(self) -> None:
+        """Persist the catalog atomically if it changed"""
+        if not self._dirty or not self.catalog_path:
+            return
+        try:
+            self.catalog_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_file = self.catalog_path.with_suffix('.json.tmp')
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump({'version': CATALOG_VERSION, 'files': self._entries}, f)
+            os.replace(temp_file, self.catalog_path)
+            self._dirty = False
+        except OSError as e:
+            self.logger.warning(f"Failed to save route catalog {self.catalog_path}: {e}")
+
+    def refresh(
+        self,
+        source_files: List[SourceFile],
+        hint_keywords: Dict[str, Tuple[str, ...]]
+    ) -> Dict[str, Optional[str]]:
+        """
+        Bring the catalog in line with the current walk
+
+        Unchanged files are reused; changed or new files are read once and
+        their framework hints recomputed. Entries for deleted files are
+        dropped.
+
+        Args:
+            source_files: Files from walk_source_files
+            hint_keywords: Mapping of file suffix to framework keywords to look for
+
+        Returns:
+            Mapping of file key to freshly read content (None when reused)
+        """
+        fresh: Dict[str, Optional[str]] = {}
+        entries: Dict[str, Dict[str, Any]] = {}
+
+        for source in source_files:
+            key = str(source.path)
+            entry = self._entries.get(key)
+
+            if entry and entry['mtime_ns'] == source.mtime_ns and entry['size'] == source.size:
+                entries[key] = entry
+                fresh[key] = None
+                continue
+
+            try:
+                data = source.path.read_bytes()
+            except OSError:
+                continue
+            digest = hashlib.sha1(data).hexdigest()
+
+            if entry and entry['sha1'] == digest:
+                entry['mtime_ns'] = source.mtime_ns
+                entries[key] = entry
+                fresh[key] = None
+                self._dirty = True
+                continue
+
+            try:
+                content = data.decode('utf-8')
+            except UnicodeDecodeError:
+                content = None
+
+            keywords = hint_keywords.get(source.suffix, ())
+            entries[key] = {
+                'mtime_ns': source.mtime_ns,
+                'size': source.size,
+                'sha1': digest,
+                'hints': [kw for kw in keywords if content is not None and kw in content],
+                'endpoints': {},
+            }
+            fresh[key] = content
+            self._dirty = True
+
+        if set(entries) != set(self._entries):
+            self._dirty = True
+        self._entries = entries
+
+        return fresh
+
+    def hints(self) -> List[str]:
+        """Get the union of framework hints across all cataloged files"""
+        found = set()
+        for entry in self._entries.values():
+            found.update(entry['hints'])
+        return sorted(found)
+
+    def get_endpoints(self, key: str, framework: str) -> Optional[List[Dict[str, Any]]]:
+        """Get cached endpoint dicts for a file and framework, if parsed"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        return entry['endpoints'].get(framework)
+
+    def set_endpoints(self, key: str, framework: str, endpoints: List[Dict[str, Any]]) -> None:
+        """Store endpoint dicts for a file and framework"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return
+        entry['endpoints'][framework] = endpoints
+        self.files_parsed += 1
+        self._dirty = True
@@ -3,12 +3,20 @@ API Key Authentication for UAT Gateway API
 
 Implements API key-based authentication for API endpoints.
 Supports key generation, validation, and revocation.
+
+Key changes (create/revoke/delete) are written to disk immediately.
+last_used timestamps are write-behind: kept in memory and flushed in
+batches on a timer, when enough keys are dirty, or on shutdown.
 """
 
+import atexit
 import os
 import secrets
 import hashlib
 import hmac
+import tempfile
+import threading
+import weakref
 from datetime import datetime
 from typing import Optional, Dict, List, Set
 from dataclasses import dataclass, field
@@ -17,6 +25,29 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Authenticators not yet closed; flushed once at interpreter exit. Weak, so
+# registering for the exit flush does not keep an authenticator alive.
+_open_authenticators: "weakref.WeakSet[APIKeyAuthenticator]" = weakref.WeakSet()
+
+
+@atexit.register
+def _close_open_authenticators() -> None:
+    for authenticator in list(_open_authenticators):
+        authenticator.close()
+
+
+def _flush_periodically(authenticator_ref: "weakref.ref", stop_event: threading.Event, interval: float) -> None:
+    """Background thread: flush last_used updates every interval
+
+    Holds the authenticator weakly and exits once it is closed or collected.
+    """
+    while not stop_event.wait(interval):
+        authenticator = authenticator_ref()
+        if authenticator is None:
+            return
+        authenticator.flush()
+        del authenticator
+
 
 @dataclass
 class APIKey:
@@ -51,6 +82,8 @@ class APIKeyConfig:
     key_prefix: str = "uatk_"  # UAT Gateway Key prefix
     key_length: int = 32  # Length of random portion
     storage_file: str = "api_keys.json"
+    flush_interval: float = 30.0  # Seconds between last_used flushes
+    flush_threshold: int = 1000  # Dirty last_used updates that force a flush
 
 
 class APIKeyAuthenticator:
@@ -63,13 +96,16 @@ class APIKeyAuthenticator:
     - Key validation and authentication
     - Key revocation/deactivation
     - File-based persistence (can be extended to database)
+    - Write-behind last_used tracking (no disk write per request)
     """
 
     def __init__(
         self,
         enable_api_key_auth: bool = True,
         key_prefix: str = "uatk_",
-        storage_file: Optional[str] = None
+        storage_file: Optional[str] = None,
+        flush_interval: float = 30.0,
+        flush_threshold: int = 1000
     ):
         """
         Initialize API key authenticator
@@ -78,13 +114,27 @@ class APIKeyAuthenticator:
             enable_api_key_auth: Whether to enable API key auth
             key_prefix: Prefix for generated keys (e.g., "uatk_")
             storage_file: File to store API keys (default: api_keys.json in project root)
+            flush_interval: Seconds between background flushes of last_used
+                timestamps (0 disables the timer; flushes then happen on
+                threshold and shutdown only)
+            flush_threshold: Number of unflushed last_used updates that
+                triggers an immediate flush
         """
         self.config = APIKeyConfig(
             enable_api_key_auth=enable_api_key_auth,
             key_prefix=key_prefix,
-            storage_file=storage_file or os.path.join(os.getcwd(), "api_keys.json")
+            storage_file=storage_file or os.path.join(os.getcwd(), "api_keys.json"),
+            flush_interval=flush_interval,
+            flush_threshold=flush_threshold
         )
 
+        # Guards key state and serializes writes to the storage file
+        self._lock = threading.RLock()
+
+        # last_used updates not yet written to disk
+        self._dirty_count = 0
+        self.saves = 0  # Number of storage file writes (for diagnostics)
+
         # In-memory storage for API keys
         # Format: {key_id: APIKey}
         self._api_keys: Dict[str, APIKey] = {}
@@ -95,6 +145,21 @@ class APIKeyAuthenticator:
         # Load existing keys from storage
         self._load_keys()
 
+        # Background flusher for last_used timestamps
+        self._stop_event = threading.Event()
+        self._flush_thread: Optional[threading.Thread] = None
+        if self.config.flush_interval > 0:
+            self._flush_thread = threading.Thread(
+                target=_flush_periodically,
+                args=(weakref.ref(self), self._stop_event, self.config.flush_interval),
+                name="api-key-last-used-flush",
+                daemon=True
+            )
+            self._flush_thread.start()
+
+        # Flush on exit unless closed first (server.py's lifespan closes it)
+        _open_authenticators.add(self)
+
         logger.info(f"API key authenticator initialized (loaded {len(self._api_keys)} keys)")
 
     def _hash_key(self, key: str) -> str:
@@ -152,22 +217,65 @@ class APIKeyAuthenticator:
             # Continue with empty storage
 
     def _save_keys(self):
-        """Save API keys to storage file"""
-        try:
-            data = {
-                "api_keys": [
-                    api_key.to_dict(include_sensitive=True)
-                    for api_key in self._api_keys.values()
-                ],
-                "updated_at": datetime.now().isoformat()
-            }
-
-            with open(self.config.storage_file, 'w') as f:
-                json.dump(data, f, indent=2)
-
-            logger.debug(f"Saved {len(self._api_keys)} API keys to storage")
-        except Exception as e:
-            logger.error(f"Error saving API keys to storage: {e}")
+        """
+        Save API keys to storage file
+
+        Writes to a temporary file in the same directory, fsyncs it and
+        atomically renames it over the storage file, so a crash mid-write
+        never leaves a truncated api_keys.json behind. Clears the pending
+        last_used updates, since they are included in the snapshot.
+        """
+        with self._lock:
+            try:
+                data = {
+                    "api_keys": [
+                        api_key.to_dict(include_sensitive=True)
+                        for api_key in self._api_keys.values()
+                    ],
+                    "updated_at": datetime.now().isoformat()
+                }
+
+                storage_dir = os.path.dirname(os.path.abspath(self.config.storage_file))
+                fd, temp_path = tempfile.mkstemp(
+                    dir=storage_dir, prefix=".api_keys.", suffix=".tmp"
+                )
+                try:
+                    with os.fdopen(fd, 'w') as f:
+                        json.dump(data, f, indent=2)
+                        f.flush()
+                        os.fsync(f.fileno())
+                    os.replace(temp_path, self.config.storage_file)
+                except BaseException:
+                    if os.path.exists(temp_path):
+                        os.unlink(temp_path)
+                    raise
+
+                self._dirty_count = 0
+                self.saves += 1
+                logger.debug(f"Saved {len(self._api_keys)} API keys to storage")
+            except Exception as e:
+                logger.error(f"Error saving API keys to storage: {e}")
+
+    def flush(self) -> bool:
+        """
+        Write pending last_used updates to storage
+
+        Returns:
+            True if there was anything to write, False otherwise
+        """
+        with self._lock:
+            if not self._dirty_count:
+                return False
+            self._save_keys()
+            return True
+
+    def close(self):
+        """Stop the background flusher and write any pending updates"""
+        _open_authenticators.discard(self)
+        self._stop_event.set()
+        if self._flush_thread is not None and self._flush_thread is not threading.current_thread():
+            self._flush_thread.join(timeout=5)
+        self.flush()
 
     def generate_api_key(
         self,
@@ -204,12 +312,11 @@ class APIKeyAuthenticator:
             scopes=scopes or ["read", "write", "admin"]
         )
 
-        # Store in memory
-        self._api_keys[key_id] = api_key
-        self._key_hash_lookup[hashed_key] = key_id
-
-        # Persist to storage
-        self._save_keys()
+        # Store in memory and persist to storage
+        with self._lock:
+            self._api_keys[key_id] = api_key
+            self._key_hash_lookup[hashed_key] = key_id
+            self._save_keys()
 
         logger.info(f"Generated new API key '{name}' (ID: {key_id})")
 
@@ -251,10 +358,13 @@ class APIKeyAuthenticator:
             logger.warning(f"API key '{api_key.name}' is inactive (ID: {key_id})")
             return None
 
-        # Update last used timestamp
+        # Update last used timestamp (write-behind, see flush())
         if update_last_used:
-            api_key.last_used = datetime.now()
-            self._save_keys()
+            with self._lock:
+                api_key.last_used = datetime.now()
+                self._dirty_count += 1
+                if self._dirty_count >= self.config.flush_threshold:
+                    self._save_keys()
 
         logger.debug(f"API key validated successfully: '{api_key.name}' (ID: {key_id})")
         return api_key
@@ -274,8 +384,9 @@ class APIKeyAuthenticator:
             logger.warning(f"Cannot revoke non-existent key: {key_id}")
             return False
 
-        api_key.is_active = False
-        self._save_keys()
+        with self._lock:
+            api_key.is_active = False
+            self._save_keys()
 
         logger.info(f"Revoked API key '{api_key.name}' (ID: {key_id})")
         return True
@@ -295,14 +406,15 @@ class APIKeyAuthenticator:
             logger.warning(f"Cannot delete non-existent key: {key_id}")
             return False
 
-        # Remove from lookup
-        self._key_hash_lookup.pop(api_key.hashed_key, None)
+        with self._lock:
+            # Remove from lookup
+            self._key_hash_lookup.pop(api_key.hashed_key, None)
 
-        # Remove from storage
-        del self._api_keys[key_id]
+            # Remove from storage
+            self._api_keys.pop(key_id, None)
 
-        # Persist
-        self._save_keys()
+            # Persist
+            self._save_keys()
 
         logger.info(f"Deleted API key '{api_key.name}' (ID: {key_id})")
         return True
@@ -2,13 +2,22 @@
 Journey Persistence Module for UAT Gateway
 
 Provides file-based persistence for journeys, ensuring data survives
-server restarts. Uses JSON file storage with automatic save/load.
+server restarts. Storage is a JSON snapshot plus an append-only journal:
+
+- Every create/update/delete appends one JSON line to the journal, so a
+  mutation costs O(record size) rather than rewriting every journey
+- Once the journal reaches compact_threshold records it is folded into a
+  new snapshot (atomic rename) and truncated
+- Replaced snapshots are kept as a bounded set of .bak files
+- On startup the snapshot is loaded and the journal replayed on top; a
+  torn last line from a crash mid-append is discarded
 
 Feature #379: Data survives application restart
 """
 
 import json
 import logging
+import os
 from pathlib import Path
 from typing import Dict, Any, List
 from datetime import datetime
@@ -17,25 +26,46 @@ import atexit
 
 logger = logging.getLogger(__name__)
 
+SNAPSHOT_VERSION = "1.0"
+
 
 class JourneyPersistence:
     """
-    Manages persistent storage for journeys using JSON files.
+    Manages persistent storage for journeys using a JSON snapshot and journal.
 
     Provides automatic save/load functionality with thread-safe operations.
-    Data is persisted to disk immediately on changes and loaded on startup.
+    Changes are journaled to disk immediately and loaded on startup.
     """
 
-    def __init__(self, storage_file: str = "journeys_data.json"):
+    def __init__(
+        self,
+        storage_file: str = "journeys_data.json",
+        compact_threshold: int = 1000,
+        max_backups: int = 5,
+        fsync: bool = False
+    ):
         """
         Initialize journey persistence manager.
 
         Args:
-            storage_file: Path to JSON file for journey storage
+            storage_file: Path to JSON file for journey storage (the journal
+                lives next to it with a .journal suffix)
+            compact_threshold: Journal records that trigger a snapshot
+            max_backups: Number of previous snapshots to keep as .bak files
+            fsync: Whether to fsync the journal after every record (survives
+                power loss, not just process crashes, at a large cost per write)
         """
         self.storage_file = Path(storage_file)
+        self.journal_file = self.storage_file.with_suffix('.journal')
+        self.compact_threshold = compact_threshold
+        self.max_backups = max_backups
+        self.fsync = fsync
+
         self._lock = threading.RLock()
         self._journeys: Dict[str, Dict[str, Any]] = {}
+        self._sequence = 0  # Sequence number of the last applied mutation
+        self._journal_records = 0  # Records in the journal since the last snapshot
+        self._journal = None
 
         # Load existing data on startup
         self._load()
@@ -45,64 +75,182 @@ class JourneyPersistence:
 
     def _load(self) -> None:
         """
-        Load journeys from storage file.
+        Load journeys from the snapshot and replay the journal.
 
-        Reads the JSON file and populates the in-memory cache.
-        Creates empty storage if file doesn't exist.
+        Creates empty storage if neither file exists. Journal records whose
+        sequence is already covered by the snapshot (left over from a crash
+        during compaction) are skipped.
         """
         with self._lock:
+            snapshot_sequence = 0
             try:
                 if self.storage_file.exists():
                     logger.info(f"Loading journeys from {self.storage_file}")
                     with open(self.storage_file, 'r', encoding='utf-8') as f:
                         data = json.load(f)
-                        self._journeys = data.get("journeys", {})
+                    self._journeys = data.get("journeys", {})
+                    snapshot_sequence = data.get("sequence", 0)
                     logger.info(f"Loaded {len(self._journeys)} journeys from storage")
                 else:
                     logger.info(f"No existing journey storage found at {self.storage_file}")
-                    logger.info("Creating new journey storage")
                     self._journeys = {}
-                    self._save()
             except Exception as e:
                 logger.error(f"Error loading journeys from {self.storage_file}: {e}")
                 logger.warning("Starting with empty journey store")
                 self._journeys = {}
 
-    def _save(self) -> None:
+            self._sequence = snapshot_sequence
+            replayed = self._replay_journal(snapshot_sequence)
+            if replayed:
+                logger.info(f"Replayed {replayed} journal records from {self.journal_file}")
+
+            if not self.storage_file.exists():
+                logger.info("Creating new journey storage")
+                self._compact()
+
+    def _replay_journal(self, snapshot_sequence: int) -> int:
+        """
+        Apply journal records newer than the snapshot.
+
+        Args:
+            snapshot_sequence: Sequence number covered by the loaded snapshot
+
+        Returns:
+            Number of records applied
+        """
+        if not self.journal_file.exists():
+            return 0
+
+        applied = 0
+        valid_bytes = 0
+        with open(self.journal_file, 'rb') as f:
+            for line in f:
+                try:
+                    if not line.endswith(b'\n'):
+                        raise ValueError("incomplete record")
+                    record = json.loads(line)
+                except ValueError:
+                    # Torn write from a crash: everything after it is unusable
+                    logger.warning(
+                        f"Discarding corrupt journal tail at byte {valid_bytes} of {self.journal_file}"
+                    )
+                    break
+
+                valid_bytes += len(line)
+                self._journal_records += 1
+                if record["seq"] <= snapshot_sequence:
+                    continue
+                self._apply(record)
+                self._sequence = record["seq"]
+                applied += 1
+
+        if valid_bytes != self.journal_file.stat().st_size:
+            with open(self.journal_file, 'r+b') as f:
+                f.truncate(valid_bytes)
+
+        return applied
+
+    def _apply(self, record: Dict[str, Any]) -> None:
+        """Apply a single journal record to the in-memory journeys"""
+        op = record["op"]
+        if op == "put":
+            self._journeys[record["id"]] = record["data"]
+        elif op == "delete":
+            self._journeys.pop(record["id"], None)
+        elif op == "clear":
+            self._journeys = {}
+
+    def _append(self, op: str, journey_id: str | None = None, data: Dict[str, Any] | None = None) -> None:
         """
-        Save journeys to storage file.
+        Append a mutation to the journal, compacting when it grows too long.
 
-        Writes the current in-memory journeys to disk as JSON.
-        Uses atomic write with temporary file to prevent corruption.
+        Must be called with the lock held, after the in-memory change.
+
+        Args:
+            op: "put", "delete" or "clear"
+            journey_id: Journey the mutation applies to
+            data: Journey data for "put"
+        """
+        self._sequence += 1
+        record: Dict[str, Any] = {"seq": self._sequence, "op": op}
+        if journey_id is not None:
+            record["id"] = journey_id
+        if data is not None:
+            record["data"] = data
+
+        try:
+            if self._journal is None:
+                self._journal = open(self.journal_file, 'a', encoding='utf-8')
+            self._journal.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n')
+            self._journal.flush()
+            if self.fsync:
+                os.fsync(self._journal.fileno())
+        except Exception as e:
+            logger.error(f"Error writing journal record to {self.journal_file}: {e}")
+            raise
+
+        self._journal_records += 1
+        if self._journal_records >= self.compact_threshold:
+            self._compact()
+
+    def _rotate_backups(self) -> None:
+        """Keep the current snapshot as a .bak file, pruning old ones"""
+        if self.max_backups <= 0 or not self.storage_file.exists():
+            return
+        backup_path = self.storage_file.with_suffix(
+            f'.json.bak.{datetime.now().strftime("%Y%m%d_%H%M%S_%f")}'
+        )
+        try:
+            os.link(self.storage_file, backup_path)
+        except OSError:
+            try:
+                import shutil
+                shutil.copy2(self.storage_file, backup_path)
+            except Exception as e:
+                logger.warning(f"Could not create backup: {e}")
+                return
+        logger.debug(f"Created backup: {backup_path.name}")
+
+        backups = sorted(self.storage_file.parent.glob(f"{self.storage_file.stem}.json.bak.*"))
+        for old in backups[:-self.max_backups]:
+            try:
+                old.unlink()
+            except OSError as e:
+                logger.warning(f"Could not remove old backup {old.name}: {e}")
+
+    def _compact(self) -> None:
+        """
+        Write a snapshot of all journeys and truncate the journal.
+
+        The snapshot records the sequence number it covers and is written to
+        a temporary file and atomically renamed, so a crash at any point
+        leaves either the old snapshot plus full journal or the new one.
         """
         with self._lock:
             try:
-                # Create backup if file exists
-                if self.storage_file.exists():
-                    backup_path = self.storage_file.with_suffix(
-                        f'.json.bak.{datetime.now().strftime("%Y%m%d_%H%M%S")}'
-                    )
-                    try:
-                        import shutil
-                        shutil.copy2(self.storage_file, backup_path)
-                        logger.debug(f"Created backup: {backup_path.name}")
-                    except Exception as e:
-                        logger.warning(f"Could not create backup: {e}")
-
-                # Write to temporary file first (atomic write)
                 temp_file = self.storage_file.with_suffix('.json.tmp')
                 data = {
-                    "version": "1.0",
+                    "version": SNAPSHOT_VERSION,
                     "updated_at": datetime.now().isoformat(),
+                    "sequence": self._sequence,
                     "journey_count": len(self._journeys),
                     "journeys": self._journeys
                 }
 
                 with open(temp_file, 'w', encoding='utf-8') as f:
-                    json.dump(data, f, indent=2, ensure_ascii=False)
+                    json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+                    f.flush()
+                    os.fsync(f.fileno())
 
-                # Atomic rename
+                # Hard-link the outgoing snapshot as a backup, then swap in the new one
+                self._rotate_backups()
                 temp_file.replace(self.storage_file)
+
+                # Journal records up to self._sequence are now in the snapshot
+                if self._journal is not None:
+                    self._journal.close()
+                self._journal = open(self.journal_file, 'w', encoding='utf-8')
+                self._journal_records = 0
                 logger.debug(f"Saved {len(self._journeys)} journeys to {self.storage_file}")
 
             except Exception as e:
@@ -110,9 +258,14 @@ class JourneyPersistence:
                 raise
 
     def _cleanup(self) -> None:
-        """Cleanup on exit - ensure data is saved"""
-        logger.info("JourneyPersistence cleanup - saving data")
-        self._save()
+        """Cleanup on exit - fold the journal into a snapshot"""
+        with self._lock:
+            if self._journal_records:
+                logger.info("JourneyPersistence cleanup - saving data")
+                self._compact()
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
 
     # =========================================================================
     # Public API - Journey CRUD Operations
@@ -154,7 +307,7 @@ class JourneyPersistence:
                 raise ValueError(f"Journey {journey_id} already exists")
 
             self._journeys[journey_id] = journey_data
-            self._save()
+            self._append("put", journey_id, journey_data)
             logger.info(f"Created journey {journey_id}: {journey_data.get('name', 'unnamed')}")
 
     def update_journey(self, journey_id: str, journey_data: Dict[str, Any]) -> None:
@@ -170,7 +323,7 @@ class JourneyPersistence:
                 raise ValueError(f"Journey {journey_id} not found")
 
             self._journeys[journey_id] = journey_data
-            self._save()
+            self._append("put", journey_id, journey_data)
             logger.info(f"Updated journey {journey_id}: {journey_data.get('name', 'unnamed')}")
 
     def delete_journey(self, journey_id: str) -> None:
@@ -186,7 +339,7 @@ class JourneyPersistence:
 
             journey_name = self._journeys[journey_id].get('name', 'unnamed')
             del self._journeys[journey_id]
-            self._save()
+            self._append("delete", journey_id)
             logger.info(f"Deleted journey {journey_id}: {journey_name}")
 
     def journey_exists(self, journey_id: str) -> bool:
@@ -221,7 +374,8 @@ class JourneyPersistence:
         with self._lock:
             count = len(self._journeys)
             self._journeys = {}
-            self._save()
+            self._append("clear")
+            self._compact()
             logger.warning(f"Cleared all {count} journeys")
 
 
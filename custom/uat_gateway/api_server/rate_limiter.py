@@ -1,14 +1,18 @@
 """
 Rate Limiting Middleware for UAT Gateway API
 
-Implements token bucket rate limiting to prevent API abuse.
+Implements GCRA (generic cell rate algorithm) rate limiting to prevent API
+abuse. GCRA is an exact, O(1) formulation of a token bucket: each client
+stores one "theoretical arrival time" per window instead of a list of
+request timestamps.
 """
 
+import math
 import time
-from datetime import datetime, timedelta
+from collections import OrderedDict
+from datetime import datetime
 from typing import Dict, Optional, Tuple
-from collections import defaultdict
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 import hashlib
 
 
@@ -18,35 +22,52 @@ class RateLimitConfig:
     requests_per_minute: int = 60  # Default: 60 requests per minute
     requests_per_hour: int = 1000   # Default: 1000 requests per hour
     burst_size: int = 10            # Default: Allow bursts of 10
+    max_clients: int = 100_000      # Clients tracked before LRU eviction
 
 
 @dataclass
 class ClientBucket:
-    """Token bucket for a client"""
-    tokens: float  # Current token count
-    last_update: float  # Unix timestamp of last update
-    requests_in_window: list = field(default_factory=list)  # Request timestamps in current window
+    """
+    GCRA state for a client
+
+    Each field is the theoretical arrival time (monotonic seconds) for the
+    next request in that window. A value at or before "now" means the client
+    has its full allowance available.
+    """
+    __slots__ = ("minute_tat", "hour_tat")
+    minute_tat: float
+    hour_tat: float
 
 
 @dataclass
 class RateLimitInfo:
     """Information about current rate limit status"""
     remaining: int  # Remaining requests in current window
-    reset_time: datetime  # When the rate limit window resets
+    reset_time: datetime  # When the full allowance is available again
     limit: int  # Maximum requests per window
     window: str  # Window size ('minute' or 'hour')
+    retry_after: Optional[float] = None  # Seconds until the next request is allowed (when limited)
+
+
+# Window name -> (period in seconds, config attribute holding the limit)
+_WINDOWS = {
+    'minute': (60.0, 'requests_per_minute'),
+    'hour': (3600.0, 'requests_per_hour'),
+}
 
 
 class RateLimiterMiddleware:
     """
-    Rate limiting middleware using sliding window algorithm
+    Rate limiting middleware using GCRA
 
     Features:
     - Per-client rate limiting (identified by IP address or API key)
-    - Sliding window for accurate rate limiting
+    - O(1) time and memory per client per request, independent of the limit
     - Configurable limits (per-minute and per-hour)
+    - Bounded client table: idle clients are evicted first, then least
+      recently seen ones once max_clients is reached
     - Returns 429 status when limit exceeded
-    - Includes Retry-After header
+    - Includes accurate Retry-After and reset headers
     """
 
     def __init__(
@@ -54,7 +75,8 @@ class RateLimiterMiddleware:
         requests_per_minute: int = 60,
         requests_per_hour: int = 1000,
         burst_size: int = 10,
-        redis_url: Optional[str] = None
+        redis_url: Optional[str] = None,
+        max_clients: int = 100_000
     ):
         """
         Initialize rate limiter
@@ -64,21 +86,20 @@ class RateLimiterMiddleware:
             requests_per_hour: Maximum requests per hour per client
             burst_size: Maximum burst size (allows temporary spikes)
             redis_url: Optional Redis URL for distributed rate limiting
+            max_clients: Maximum number of clients to track
         """
         self.config = RateLimitConfig(
             requests_per_minute=requests_per_minute,
             requests_per_hour=requests_per_hour,
-            burst_size=burst_size
+            burst_size=burst_size,
+            max_clients=max_clients
         )
 
         # Use in-memory storage for single-instance deployment
-        # Redis would be used for distributed deployments
-        self.client_buckets: Dict[str, ClientBucket] = defaultdict(
-            lambda: ClientBucket(
-                tokens=float(burst_size),
-                last_update=time.time()
-            )
-        )
+        # Redis would be used for distributed deployments.
+        # Ordered least- to most-recently seen for LRU eviction.
+        self.client_buckets: "OrderedDict[str, ClientBucket]" = OrderedDict()
+        self.evicted_clients = 0
 
         self.redis_enabled = redis_url is not None
         if self.redis_enabled:
@@ -126,94 +147,72 @@ class RateLimiterMiddleware:
         # In production with real requests, request.client should always be set
         return "testclient:default"
 
-    def _clean_old_requests(self, bucket: ClientBucket, window_seconds: int) -> None:
+    def _get_bucket(self, client_id: str, now: float) -> ClientBucket:
         """
-        Remove request timestamps outside the current time window
+        Get a client's bucket, marking it most recently used
 
-        Args:
-            bucket: Client's token bucket
-            window_seconds: Window size in seconds (60 for minute, 3600 for hour)
-        """
-        current_time = time.time()
-        cutoff_time = current_time - window_seconds
+        Evicts idle clients (whose allowance has fully refilled, so dropping
+        them loses nothing) from the LRU end, and the least recently seen
+        client if the table is still full.
 
-        # Remove timestamps outside the window
-        bucket.requests_in_window = [
-            ts for ts in bucket.requests_in_window
-            if ts > cutoff_time
-        ]
+        Args:
+            client_id: Unique client identifier
+            now: Current monotonic time
 
-    def _check_rate_limit(
-        self,
-        client_id: str,
-        window: str = 'minute'
-    ) -> Tuple[bool, RateLimitInfo]:
+        Returns:
+            The client's bucket (new buckets start with a full allowance)
+        """
+        buckets = self.client_buckets
+        bucket = buckets.get(client_id)
+        if bucket is not None:
+            buckets.move_to_end(client_id)
+            return bucket
+
+        # Amortized O(1): each client is evicted at most once per insertion
+        while buckets:
+            oldest = next(iter(buckets.values()))
+            idle = max(oldest.minute_tat, oldest.hour_tat) <= now
+            if not idle and len(buckets) < self.config.max_clients:
+                break
+            buckets.popitem(last=False)
+            self.evicted_clients += 1
+
+        bucket = ClientBucket(minute_tat=now, hour_tat=now)
+        buckets[client_id] = bucket
+        return bucket
+
+    def _window_info(self, window: str, tat: float, now: float, wall_now: float) -> RateLimitInfo:
         """
-        Check if client has exceeded rate limit
+        Build rate limit info for a window from its theoretical arrival time
 
         Args:
-            client_id: Unique client identifier
             window: 'minute' or 'hour'
+            tat: Theoretical arrival time after this request
+            now: Current monotonic time
+            wall_now: Current wall clock time (for reset_time)
 
         Returns:
-            Tuple of (allowed: bool, rate_limit_info: RateLimitInfo)
+            RateLimitInfo for the window
         """
-        # Determine window size and limit
-        if window == 'minute':
-            window_seconds = 60
-            limit = self.config.requests_per_minute
-        elif window == 'hour':
-            window_seconds = 3600
-            limit = self.config.requests_per_hour
-        else:
-            raise ValueError(f"Invalid window: {window}. Use 'minute' or 'hour'")
-
-        # Get or create client bucket
-        bucket = self.client_buckets[client_id]
-        current_time = time.time()
-
-        # Clean old requests outside the window
-        self._clean_old_requests(bucket, window_seconds)
-
-        # Check if limit exceeded
-        request_count = len(bucket.requests_in_window)
-        remaining = max(0, limit - request_count)
-        allowed = request_count < limit
-
-        # Calculate reset time
-        if bucket.requests_in_window:
-            oldest_request = min(bucket.requests_in_window)
-            reset_timestamp = oldest_request + window_seconds
-        else:
-            reset_timestamp = current_time + window_seconds
-
-        reset_time = datetime.fromtimestamp(reset_timestamp)
-
-        rate_limit_info = RateLimitInfo(
-            remaining=remaining,
-            reset_time=reset_time,
+        period, limit_attr = _WINDOWS[window]
+        limit = getattr(self.config, limit_attr)
+        interval = period / limit
+        backlog = max(0.0, tat - now)
+
+        return RateLimitInfo(
+            remaining=max(0, int((period - backlog) / interval + 1e-9)),
+            reset_time=datetime.fromtimestamp(wall_now + backlog),
             limit=limit,
             window=window
         )
 
-        return allowed, rate_limit_info
-
-    def _record_request(self, client_id: str) -> None:
-        """
-        Record a request for the client
-
-        Args:
-            client_id: Unique client identifier
-        """
-        bucket = self.client_buckets[client_id]
-        bucket.last_update = time.time()
-        bucket.requests_in_window.append(time.time())
-
     async def check_rate_limit(self, request) -> Tuple[bool, Optional[RateLimitInfo]]:
         """
         Check if request should be rate limited
 
-        This is the main entry point for middleware integration
+        This is the main entry point for middleware integration. Both
+        windows are checked before either is charged, so a request denied
+        by the hourly limit doesn't consume per-minute allowance.
 
         Args:
             request: FastAPI request object
@@ -225,23 +224,29 @@ class RateLimiterMiddleware:
             RateLimitError: If rate limit is exceeded
         """
         client_id = self._get_client_identifier(request)
-
-        # Check per-minute limit
-        allowed_minute, info_minute = self._check_rate_limit(client_id, 'minute')
-
-        if not allowed_minute:
-            # Rate limit exceeded - raise error
-            raise RateLimitError(info_minute)
-
-        # Check per-hour limit
-        allowed_hour, info_hour = self._check_rate_limit(client_id, 'hour')
-
-        if not allowed_hour:
-            # Hourly limit exceeded - raise error
-            raise RateLimitError(info_hour)
+        now = time.monotonic()
+        wall_now = time.time()
+        bucket = self._get_bucket(client_id, now)
+
+        minute_period = _WINDOWS['minute'][0]
+        hour_period = _WINDOWS['hour'][0]
+        minute_tat = max(bucket.minute_tat, now) + minute_period / self.config.requests_per_minute
+        hour_tat = max(bucket.hour_tat, now) + hour_period / self.config.requests_per_hour
+
+        for window, tat, period in (('minute', minute_tat, minute_period), ('hour', hour_tat, hour_period)):
+            if tat - now > period:
+                # Rate limit exceeded - raise error without charging either window
+                current = bucket.minute_tat if window == 'minute' else bucket.hour_tat
+                info = self._window_info(window, current, now, wall_now)
+                info.retry_after = tat - period - now
+                raise RateLimitError(info)
 
         # Request allowed - record it
-        self._record_request(client_id)
+        bucket.minute_tat = minute_tat
+        bucket.hour_tat = hour_tat
+
+        info_minute = self._window_info('minute', minute_tat, now, wall_now)
+        info_hour = self._window_info('hour', hour_tat, now, wall_now)
 
         # Return most restrictive limit info
         return True, info_minute if info_minute.remaining < info_hour.remaining else info_hour
@@ -256,9 +261,12 @@ class RateLimiterMiddleware:
         Returns:
             Seconds until client can retry
         """
+        if rate_limit_info.retry_after is not None:
+            return max(1, math.ceil(rate_limit_info.retry_after))
+
         current_time = datetime.now()
         delta = rate_limit_info.reset_time - current_time
-        return max(1, int(delta.total_seconds()))
+        return max(1, math.ceil(delta.total_seconds()))
 
     def get_rate_limit_headers(self, rate_limit_info: RateLimitInfo) -> Dict[str, str]:
         """
@@ -286,8 +294,7 @@ class RateLimiterMiddleware:
         Args:
             client_id: Client identifier to reset
         """
-        if client_id in self.client_buckets:
-            del self.client_buckets[client_id]
+        self.client_buckets.pop(client_id, None)
 
     def get_stats(self) -> Dict[str, any]:
         """
@@ -296,15 +303,18 @@ class RateLimiterMiddleware:
         Returns:
             Dictionary with rate limiting statistics
         """
-        total_clients = len(self.client_buckets)
+        now = time.monotonic()
+        interval = _WINDOWS['minute'][0] / self.config.requests_per_minute
         total_requests = sum(
-            len(bucket.requests_in_window)
+            math.ceil(max(0.0, bucket.minute_tat - now) / interval)
             for bucket in self.client_buckets.values()
         )
 
         return {
-            'total_clients': total_clients,
+            'total_clients': len(self.client_buckets),
             'total_requests_in_window': total_requests,
+            'evicted_clients': self.evicted_clients,
+            'max_clients': self.config.max_clients,
             'requests_per_minute': self.config.requests_per_minute,
             'requests_per_hour': self.config.requests_per_hour,
             'burst_size': self.config.burst_size
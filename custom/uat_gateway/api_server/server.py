@@ -11,6 +11,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.templating import Jinja2Templates
 from typing import Dict, Any, Optional, List
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
 import uvicorn
 import logging
@@ -308,12 +309,20 @@ def create_app(
         Configured FastAPI application
     """
 
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        yield
+        # Flush write-behind API key last_used timestamps on shutdown
+        if api_key_authenticator is not None:
+            api_key_authenticator.close()
+
     app = FastAPI(
         title="UAT Gateway API",
         description="User Acceptance Testing Gateway API with authentication and rate limiting",
         version="1.0.0",
         docs_url="/docs",
-        redoc_url="/redoc"
+        redoc_url="/redoc",
+        lifespan=lifespan
     )
 
     # Configure CORS
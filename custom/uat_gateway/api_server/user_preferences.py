@@ -1,20 +1,24 @@
 """
 User Preferences Module for UAT Gateway
 
-Provides persistent user preference storage with JSON file backend.
+Provides persistent user preference storage with a SQLite backend.
 """
 
+import atexit
 import json
 import logging
+import sqlite3
 from pathlib import Path
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 from dataclasses import dataclass, asdict, field
 import threading
-import hashlib
 
 logger = logging.getLogger(__name__)
 
+# Bumped when the schema changes; version 1 imports legacy user_*.json files
+SCHEMA_VERSION = 1
+
 
 @dataclass
 class UserPreference:
@@ -115,15 +119,21 @@ class UserPreferencesManager:
     """
     Manages persistent storage of user preferences
 
-    Uses thread-safe JSON file storage with automatic backups.
+    Preferences live in a single SQLite database with one row per
+    (user, key). Users are loaded lazily on first access, so startup cost
+    does not depend on the number of users. Changes are applied to the
+    in-memory cache immediately and written behind: all changes made within
+    flush_delay seconds are coalesced into one transaction.
     """
 
-    def __init__(self, storage_dir: Optional[Path] = None):
+    def __init__(self, storage_dir: Optional[Path] = None, flush_delay: float = 0.25):
         """
         Initialize the preferences manager
 
         Args:
-            storage_dir: Directory to store preference files (default: ./state/preferences)
+            storage_dir: Directory to store the preferences database (default: ./state/preferences)
+            flush_delay: Seconds to wait after a change before writing, so
+                bursts of changes share one transaction (0 = write immediately)
         """
         if storage_dir is None:
             storage_dir = Path("./state/preferences")
@@ -131,61 +141,175 @@ class UserPreferencesManager:
         self.storage_dir = Path(storage_dir)
         self.storage_dir.mkdir(parents=True, exist_ok=True)
 
-        self.preferences_file = self.storage_dir / "user_preferences.json"
-        self.backup_dir = self.storage_dir / "backups"
-        self.backup_dir.mkdir(exist_ok=True)
+        self.db_file = self.storage_dir / "user_preferences.db"
+        self.flush_delay = flush_delay
 
         self._cache: Dict[str, UserPreferences] = {}
-        self._lock = threading.Lock()
+        self._lock = threading.RLock()
 
-        # Load existing preferences
-        self._load_all()
+        # Pending writes: (user_id, key) -> preference, or None to delete
+        self._pending: Dict[tuple, Optional[UserPreference]] = {}
+        # Users whose row (timestamps) must be upserted, or whose data must be
+        # removed before their pending preferences are written
+        self._pending_users: Dict[str, UserPreferences] = {}
+        self._pending_resets: set = set()
+        self._flush_timer: Optional[threading.Timer] = None
+        self.transactions = 0  # Number of write transactions (for diagnostics)
 
-        logger.info(f"UserPreferencesManager initialized with storage: {self.storage_dir}")
+        self._conn = sqlite3.connect(str(self.db_file), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._init_schema()
 
-    def _get_user_file_path(self, user_id: str) -> Path:
-        """Get the preferences file path for a specific user"""
-        # Hash user_id for safe filename
-        safe_id = hashlib.md5(user_id.encode()).hexdigest()[:16]
-        return self.storage_dir / f"user_{safe_id}.json"
+        atexit.register(self.close)
 
-    def _load_all(self) -> None:
-        """Load all user preferences from storage"""
-        with self._lock:
-            self._cache.clear()
+        logger.info(f"UserPreferencesManager initialized with storage: {self.storage_dir}")
 
-            # Load all user preference files
-            for file_path in self.storage_dir.glob("user_*.json"):
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                        prefs = UserPreferences.from_dict(data)
-                        self._cache[prefs.user_id] = prefs
-                        logger.debug(f"Loaded preferences for user: {prefs.user_id}")
-                except Exception as e:
-                    logger.error(f"Failed to load preferences from {file_path}: {e}")
+    def _init_schema(self) -> None:
+        """Create tables and import legacy per-user JSON files once"""
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS users (
+                    user_id TEXT PRIMARY KEY,
+                    created_at TEXT NOT NULL,
+                    updated_at TEXT NOT NULL
+                )
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS preferences (
+                    user_id TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    updated_at TEXT NOT NULL,
+                    PRIMARY KEY (user_id, key)
+                ) WITHOUT ROWID
+            """)
+
+            if self._conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+                self._import_legacy_files()
+                self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def _import_legacy_files(self) -> None:
+        """Import user_*.json files written by earlier versions"""
+        imported = 0
+        for file_path in self.storage_dir.glob("user_*.json"):
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    prefs = UserPreferences.from_dict(json.load(f))
+            except Exception as e:
+                logger.error(f"Failed to import preferences from {file_path}: {e}")
+                continue
+            self._write_user(prefs)
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO preferences VALUES (?, ?, ?, ?, ?)",
+                [self._row(prefs.user_id, pref) for pref in prefs.preferences.values()]
+            )
+            imported += 1
 
-            logger.info(f"Loaded {len(self._cache)} user preferences from storage")
+        if imported:
+            logger.info(f"Imported {imported} legacy user preference files")
 
-    def _save_user(self, prefs: UserPreferences) -> None:
-        """Save user preferences to file"""
-        file_path = self._get_user_file_path(prefs.user_id)
+    @staticmethod
+    def _row(user_id: str, pref: UserPreference) -> tuple:
+        return (user_id, pref.key, json.dumps(pref.value), pref.created_at, pref.updated_at)
 
-        try:
-            # Create backup if file exists
-            if file_path.exists():
-                backup_path = self.backup_dir / f"{file_path.stem}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-                shutil.copy2(file_path, backup_path)
+    def _write_user(self, prefs: UserPreferences) -> None:
+        self._conn.execute(
+            "INSERT INTO users VALUES (?, ?, ?) "
+            "ON CONFLICT(user_id) DO UPDATE SET updated_at = excluded.updated_at",
+            (prefs.user_id, prefs.created_at, prefs.updated_at)
+        )
 
-            # Save to file
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(prefs.to_dict(), f, indent=2, ensure_ascii=False)
+    def _require_open(self) -> None:
+        """Raise if close() has been called"""
+        if self._conn is None:
+            raise RuntimeError(f"User preferences store {self.db_file} is closed")
+
+    def _load_user(self, user_id: str) -> Optional[UserPreferences]:
+        """Load one user's preferences from the database, or None if unknown"""
+        self._require_open()
+        user = self._conn.execute(
+            "SELECT created_at, updated_at FROM users WHERE user_id = ?", (user_id,)
+        ).fetchone()
+        if user is None:
+            return None
+
+        prefs = UserPreferences(user_id=user_id, created_at=user[0], updated_at=user[1])
+        for key, value, created_at, updated_at in self._conn.execute(
+            "SELECT key, value, created_at, updated_at FROM preferences WHERE user_id = ?", (user_id,)
+        ):
+            prefs.preferences[key] = UserPreference(
+                key=key, value=json.loads(value), created_at=created_at, updated_at=updated_at
+            )
+        return prefs
 
-            logger.debug(f"Saved preferences for user: {prefs.user_id}")
+    def _mark_dirty(self, prefs: UserPreferences, keys: List[str], auto_save: bool) -> None:
+        """Queue a user's changed keys for the next flush"""
+        self._pending_users[prefs.user_id] = prefs
+        for key in keys:
+            self._pending[(prefs.user_id, key)] = prefs.preferences.get(key)
+
+        if auto_save:
+            self._schedule_flush()
+
+    def _schedule_flush(self) -> None:
+        if self.flush_delay <= 0:
+            self.flush()
+        elif self._flush_timer is None:
+            self._flush_timer = threading.Timer(self.flush_delay, self.flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def flush(self) -> None:
+        """Write all pending changes in a single transaction"""
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            # A timer that fired while close() held the lock finds nothing to do
+            if self._conn is None:
+                return
+            if not (self._pending or self._pending_users or self._pending_resets):
+                return
+
+            try:
+                with self._conn:
+                    for user_id in self._pending_resets:
+                        self._conn.execute("DELETE FROM preferences WHERE user_id = ?", (user_id,))
+                        if user_id not in self._pending_users:
+                            self._conn.execute("DELETE FROM users WHERE user_id = ?", (user_id,))
+                    for prefs in self._pending_users.values():
+                        self._write_user(prefs)
+
+                    upserts = [self._row(user_id, pref) for (user_id, _), pref in self._pending.items() if pref]
+                    deletes = [key for key, pref in self._pending.items() if pref is None]
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO preferences VALUES (?, ?, ?, ?, ?)", upserts
+                    )
+                    self._conn.executemany(
+                        "DELETE FROM preferences WHERE user_id = ? AND key = ?", deletes
+                    )
+            except Exception as e:
+                logger.error(f"Failed to save user preferences: {e}")
+                raise
+
+            logger.debug(
+                f"Saved {len(self._pending)} preference changes for {len(self._pending_users)} users"
+            )
+            self._pending.clear()
+            self._pending_users.clear()
+            self._pending_resets.clear()
+            self.transactions += 1
 
-        except Exception as e:
-            logger.error(f"Failed to save preferences for user {prefs.user_id}: {e}")
-            raise
+    def close(self) -> None:
+        """Flush pending changes and close the database; later writes raise RuntimeError"""
+        with self._lock:
+            if self._conn is None:
+                return
+            self.flush()
+            self._conn.close()
+            self._conn = None
 
     def get_user_preferences(self, user_id: str) -> UserPreferences:
         """
@@ -199,9 +323,12 @@ class UserPreferencesManager:
         """
         with self._lock:
             if user_id not in self._cache:
-                # Create new preferences for user
-                self._cache[user_id] = UserPreferences(user_id=user_id)
-                logger.info(f"Created new preferences for user: {user_id}")
+                prefs = self._load_user(user_id)
+                if prefs is None:
+                    # Create new preferences for user
+                    prefs = UserPreferences(user_id=user_id)
+                    logger.info(f"Created new preferences for user: {user_id}")
+                self._cache[user_id] = prefs
 
             return self._cache[user_id]
 
@@ -228,14 +355,17 @@ class UserPreferencesManager:
             user_id: User identifier
             key: Preference key
             value: Preference value
-            auto_save: Whether to save immediately
+            auto_save: Whether to schedule a write (otherwise written by the
+                next flush or save_all)
+
+        Raises:
+            RuntimeError: If the store has been closed
         """
         with self._lock:
+            self._require_open()
             prefs = self.get_user_preferences(user_id)
             prefs.set(key, value)
-
-            if auto_save:
-                self._save_user(prefs)
+            self._mark_dirty(prefs, [key], auto_save)
 
             logger.info(f"Set preference for user {user_id}: {key} = {value}")
 
@@ -246,16 +376,19 @@ class UserPreferencesManager:
         Args:
             user_id: User identifier
             preferences: Dictionary of preferences to set
-            auto_save: Whether to save immediately
+            auto_save: Whether to schedule a write (otherwise written by the
+                next flush or save_all)
+
+        Raises:
+            RuntimeError: If the store has been closed
         """
         with self._lock:
+            self._require_open()
             prefs = self.get_user_preferences(user_id)
 
             for key, value in preferences.items():
                 prefs.set(key, value)
-
-            if auto_save:
-                self._save_user(prefs)
+            self._mark_dirty(prefs, list(preferences), auto_save)
 
             logger.info(f"Set {len(preferences)} preferences for user: {user_id}")
 
@@ -266,19 +399,22 @@ class UserPreferencesManager:
         Args:
             user_id: User identifier
             key: Preference key
-            auto_save: Whether to save immediately
+            auto_save: Whether to schedule a write (otherwise written by the
+                next flush or save_all)
 
         Returns:
             True if deleted, False if didn't exist
+
+        Raises:
+            RuntimeError: If the store has been closed
         """
         with self._lock:
+            self._require_open()
             prefs = self.get_user_preferences(user_id)
             deleted = prefs.delete(key)
 
-            if deleted and auto_save:
-                self._save_user(prefs)
-
             if deleted:
+                self._mark_dirty(prefs, [key], auto_save)
                 logger.info(f"Deleted preference for user {user_id}: {key}")
 
             return deleted
@@ -302,14 +438,20 @@ class UserPreferencesManager:
 
         Args:
             user_id: User identifier
-            auto_save: Whether to save immediately
+            auto_save: Whether to schedule a write (otherwise written by the
+                next flush or save_all)
+
+        Raises:
+            RuntimeError: If the store has been closed
         """
         with self._lock:
+            self._require_open()
             prefs = UserPreferences(user_id=user_id)
             self._cache[user_id] = prefs
 
-            if auto_save:
-                self._save_user(prefs)
+            self._pending = {k: v for k, v in self._pending.items() if k[0] != user_id}
+            self._pending_resets.add(user_id)
+            self._mark_dirty(prefs, [], auto_save)
 
             logger.info(f"Reset all preferences for user: {user_id}")
 
@@ -322,29 +464,32 @@ class UserPreferencesManager:
 
         Returns:
             True if deleted, False if didn't exist
+
+        Raises:
+            RuntimeError: If the store has been closed
         """
         with self._lock:
-            if user_id not in self._cache:
+            self._require_open()
+            if user_id not in self._cache and self._load_user(user_id) is None:
                 return False
 
-            # Remove from cache
-            del self._cache[user_id]
-
-            # Delete file
-            file_path = self._get_user_file_path(user_id)
-            if file_path.exists():
-                file_path.unlink()
+            # Remove from cache and pending writes, then from the database
+            self._cache.pop(user_id, None)
+            self._pending = {k: v for k, v in self._pending.items() if k[0] != user_id}
+            self._pending_users.pop(user_id, None)
+            self._pending_resets.add(user_id)
+            self.flush()
 
             logger.info(f"Deleted all preferences for user: {user_id}")
             return True
 
     def save_all(self) -> None:
-        """Save all cached preferences to disk"""
+        """Save all pending preference changes to disk"""
         with self._lock:
-            for prefs in self._cache.values():
-                self._save_user(prefs)
+            pending_users = len(self._pending_users)
+            self.flush()
 
-            logger.info(f"Saved {len(self._cache)} user preferences to disk")
+            logger.info(f"Saved {pending_users} user preferences to disk")
 
     def get_all_users(self) -> List[str]:
         """
@@ -354,7 +499,10 @@ class UserPreferencesManager:
             List of user IDs
         """
         with self._lock:
-            return list(self._cache.keys())
+            self._require_open()
+            stored = [row[0] for row in self._conn.execute("SELECT user_id FROM users")]
+            known = set(stored)
+            return stored + [user_id for user_id in self._cache if user_id not in known]
 
 
 # Singleton instance for use in API
@@ -378,6 +526,3 @@ def get_preferences_manager(storage_dir: Optional[Path] = None) -> UserPreferenc
 
     return _global_manager
 
-
-# Import shutil for backup functionality
-import shutil
@@ -306,7 +306,7 @@ class StateManager:
 
             # Feature #214: Encrypt sensitive fields
             encryption_manager = get_encryption_manager()
-            encrypted_dict = encryption_manager.encrypt_dict(checkpoint_dict, recursive=True)
+            encrypted_dict = encryption_manager.encrypt_record(checkpoint_dict)
 
             with open(checkpoint_file, 'w') as f:
                 json.dump(encrypted_dict, f, indent=2)
@@ -344,7 +344,7 @@ class StateManager:
 
             # Feature #214: Decrypt sensitive fields
             encryption_manager = get_encryption_manager()
-            decrypted_dict = encryption_manager.decrypt_dict(encrypted_data, recursive=True)
+            decrypted_dict = encryption_manager.decrypt_record(encrypted_data)
 
             checkpoint = TestCheckpoint.from_dict(decrypted_dict)
             self.logger.info(f"Loaded checkpoint {checkpoint_id} from disk (decrypted)")
@@ -448,7 +448,7 @@ class StateManager:
 
             # Feature #214: Encrypt sensitive fields
             encryption_manager = get_encryption_manager()
-            encrypted_dict = encryption_manager.encrypt_dict(state_dict, recursive=True)
+            encrypted_dict = encryption_manager.encrypt_record(state_dict)
 
             with open(state_file, 'w') as f:
                 json.dump(encrypted_dict, f, indent=2)
@@ -486,7 +486,7 @@ class StateManager:
 
             # Feature #214: Decrypt sensitive fields
             encryption_manager = get_encryption_manager()
-            decrypted_dict = encryption_manager.decrypt_dict(encrypted_data, recursive=True)
+            decrypted_dict = encryption_manager.decrypt_record(encrypted_data)
 
             state = ExecutionState.from_dict(decrypted_dict)
             self.current_state = state
@@ -5,16 +5,22 @@ This module provides WebSocket-based real-time notifications for test execution,
 including error events, progress updates, and status changes.
 
 Feature #175: Error notifications are sent immediately via WebSocket events.
+
+Each connected client has its own bounded send queue (see ui/fanout.py), so a
+slow client cannot hold up delivery to the others. Progress events for the
+same stage coalesce while queued.
 """
 
 import asyncio
 import json
-from typing import Dict, Any, Optional, Set, Callable
+from typing import Dict, Any, Optional, Callable
 from dataclasses import dataclass, asdict
 from datetime import datetime
 from enum import Enum
 import logging
 
+from custom.uat_gateway.ui.fanout import ClientOutbox
+
 try:
     import websockets
     from websockets.server import WebSocketServerProtocol
@@ -168,19 +174,23 @@ class EventManager:
         await manager.stop()
     """
 
-    def __init__(self, host: str = "localhost", port: int = 8765):
+    def __init__(self, host: str = "localhost", port: int = 8765, max_queue_size: int = 100):
         """
         Initialize event manager
 
         Args:
             host: Host to bind WebSocket server to
             port: Port to bind WebSocket server to
+            max_queue_size: Maximum queued events per client before the oldest is dropped
         """
         self.host = host
         self.port = port
+        self.max_queue_size = max_queue_size
         self.logger = logging.getLogger("event_manager")
-        self._clients: Set[WebSocketServerProtocol] = set()
+        # Connected clients and their send queues
+        self._clients: Dict[WebSocketServerProtocol, ClientOutbox] = {}
         self._server = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
         self._is_running = False
 
         # Event handlers (for testing/monitoring)
@@ -355,24 +365,24 @@ class EventManager:
         Args:
             event: Event to broadcast
         """
-        # Convert event to JSON
-        event_json = json.dumps(event.to_dict())
-
         # Broadcast to all WebSocket clients (if any)
         if self._clients:
-            disconnected = set()
-            for client in self._clients:
-                try:
-                    # Use asyncio to send asynchronously
-                    asyncio.create_task(client.send(event_json))
-                except Exception as e:
-                    self.logger.warning(f"Failed to send event to client: {e}")
-                    disconnected.add(client)
-
-            # Remove disconnected clients
-            for client in disconnected:
-                self._clients.remove(client)
-                self.logger.info(f"Removed disconnected client (remaining: {len(self._clients)})")
+            # Serialized once, queued per client
+            event_json = json.dumps(event.to_dict())
+            coalesce_key = ("progress", event.stage) if isinstance(event, ProgressEvent) else None
+
+            try:
+                in_loop = asyncio.get_running_loop() is self._loop
+            except RuntimeError:
+                in_loop = False
+
+            if in_loop:
+                self._enqueue(event_json, coalesce_key)
+            elif self._loop is not None and self._loop.is_running():
+                # Called from another thread: hand over to the server's loop
+                self._loop.call_soon_threadsafe(self._enqueue, event_json, coalesce_key)
+            else:
+                self.logger.debug("WebSocket event loop not running, skipping client delivery")
         else:
             self.logger.debug("No connected WebSocket clients, only triggering handlers")
 
@@ -385,6 +395,17 @@ class EventManager:
             except Exception as e:
                 self.logger.error(f"Event handler failed: {e}")
 
+    def _enqueue(self, event_json: str, coalesce_key: Optional[tuple]) -> None:
+        """Queue a serialized event for every client (runs on the server loop)"""
+        for outbox in list(self._clients.values()):
+            outbox.put(event_json, coalesce_key)
+
+    def _remove_client(self, websocket: WebSocketServerProtocol, error: Exception) -> None:
+        """Forget a client whose connection failed during a send"""
+        self.logger.warning(f"Failed to send event to client: {error}")
+        if self._clients.pop(websocket, None) is not None:
+            self.logger.info(f"Removed disconnected client (remaining: {len(self._clients)})")
+
     # ========================================================================
     # Event Handlers (for testing/monitoring)
     # ========================================================================
@@ -434,9 +455,14 @@ class EventManager:
 
         self.logger.info(f"Starting WebSocket server on {host}:{port}")
 
-        async def handler(websocket, path):
+        async def handler(websocket, path=None):
             """Handle new WebSocket connections"""
-            self._clients.add(websocket)
+            outbox = ClientOutbox(
+                websocket.send,
+                max_size=self.max_queue_size,
+                on_error=lambda e: self._remove_client(websocket, e),
+            )
+            self._clients[websocket] = outbox
             self.logger.info(f"Client connected (total: {len(self._clients)})")
 
             try:
@@ -447,9 +473,11 @@ class EventManager:
             except websockets.exceptions.ConnectionClosed:
                 self.logger.info("Client connection closed")
             finally:
-                self._clients.discard(websocket)
+                outbox.close()
+                self._clients.pop(websocket, None)
                 self.logger.info(f"Client removed (remaining: {len(self._clients)})")
 
+        self._loop = asyncio.get_running_loop()
         self._server = await websockets.serve(handler, host, port)
         self._is_running = True
 
@@ -463,7 +491,8 @@ class EventManager:
         self.logger.info("Stopping WebSocket server...")
 
         # Close all client connections
-        for client in self._clients:
+        for client, outbox in list(self._clients.items()):
+            outbox.close()
             try:
                 await client.close()
             except Exception:
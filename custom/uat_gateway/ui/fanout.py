@@ -0,0 +1,137 @@
+"""
+Per-client send queues for WebSocket fan-out
+
+Broadcasting by awaiting each client's send in turn lets one slow reader
+stall updates for everyone. Instead, every connected client gets a
+ClientOutbox: a bounded queue drained by its own asyncio task. A broadcast
+serializes the payload once and only enqueues it, so delivery to each client
+proceeds at that client's pace.
+
+Overflow policy:
+- Messages with a coalesce key (e.g. progress for one scenario) replace any
+  still-queued message with the same key in its queue position, so a slow
+  client sees the latest value rather than every intermediate one
+- When the queue is full, the oldest queued message is dropped
+"""
+
+import asyncio
+import itertools
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Hashable, Optional
+
+
+class ClientOutbox:
+    """
+    Bounded send queue for one WebSocket client
+
+    Must be used from the event loop that owns the connection.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[str], Awaitable[None]],
+        max_size: int = 100,
+        on_error: Optional[Callable[[Exception], None]] = None,
+    ):
+        """
+        Initialize the outbox
+
+        Args:
+            send: Coroutine function that delivers one message to the client
+            max_size: Maximum number of queued messages
+            on_error: Called once if a send fails (the outbox is then closed)
+        """
+        self._send = send
+        self.max_size = max(1, max_size)
+        self._on_error = on_error
+
+        # key -> payload, oldest first; uncoalesced messages get unique keys
+        self._pending: "OrderedDict[Hashable, str]" = OrderedDict()
+        self._sequence = itertools.count()
+        self._ready = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._task: Optional[asyncio.Task] = None
+        self.closed = False
+
+        # Counters for diagnostics
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+
+    def put(self, payload: str, coalesce_key: Optional[Hashable] = None) -> None:
+        """
+        Queue a message without waiting for delivery
+
+        Args:
+            payload: Serialized message
+            coalesce_key: Replace a queued message with the same key, if any
+        """
+        if self.closed:
+            return
+
+        if coalesce_key is not None:
+            key = ("coalesce", coalesce_key)
+        else:
+            key = ("message", next(self._sequence))
+
+        if key in self._pending:
+            # Replaced where it stands, so the newer value is not sent after
+            # messages that were queued later than the one it replaces
+            self.coalesced += 1
+        elif len(self._pending) >= self.max_size:
+            self._pending.popitem(last=False)
+            self.dropped += 1
+
+        self._pending[key] = payload
+        self._idle.clear()
+        self._ready.set()
+
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def queued(self) -> int:
+        """Number of messages waiting to be sent"""
+        return len(self._pending)
+
+    async def join(self) -> None:
+        """Wait until every queued message has been sent (or the outbox closed)"""
+        await self._idle.wait()
+
+    def close(self) -> None:
+        """Discard queued messages and stop the sender task"""
+        self.closed = True
+        self._pending.clear()
+        self._idle.set()
+        if self._task is not None and self._task is not asyncio.current_task():
+            self._task.cancel()
+
+    def stats(self) -> Dict[str, int]:
+        """Queue depth and delivery counters"""
+        return {
+            "queued": len(self._pending),
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+        }
+
+    async def _run(self) -> None:
+        while not self.closed:
+            await self._ready.wait()
+            while self._pending:
+                _, payload = self._pending.popitem(last=False)
+                try:
+                    await self._send(payload)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    self.close()
+                    if self._on_error is not None:
+                        self._on_error(e)
+                    return
+                self.sent += 1
+            self._ready.clear()
+            self._idle.set()
+
+
+__all__ = ["ClientOutbox"]
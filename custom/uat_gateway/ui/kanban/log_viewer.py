@@ -5,17 +5,77 @@ This module provides a log viewer component that displays console logs
 with syntax highlighting, timestamps, and error highlighting.
 
 Used in Feature #157: Results modal shows log viewer with syntax highlighting
+
+Large console logs are handled lazily: ingesting messages only records level
+counters and per-level index lists, LogEntry objects (and their HTML) are
+built the first time an entry is displayed and then cached, and to_html /
+to_markdown can render a single page.
 """
 
 import re
 import html
-from typing import List, Dict, Any, Optional
+from collections import Counter
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Iterable
 from datetime import datetime
 from dataclasses import dataclass
 
 from custom.uat_gateway.test_executor.test_executor import ConsoleMessage
 
 
+# Syntax highlighting, applied to HTML-escaped text in a single pass.
+# Alternation order sets priority at a position: keywords, then URLs (so
+# numbers and booleans inside a URL are left alone), numbers, booleans.
+_KEYWORD_PATTERN = r'(?P<keyword>\b(?:Error:|Warning:|Failed:|Exception:|TypeError:|ReferenceError:|SyntaxError:))'
+_HIGHLIGHT_PATTERN = (
+    r'(?P<url>https?://[^\s<>"]+)'
+    r'|(?P<number>(?<!\w)\d+\.?\d*(?!\w))'
+    r'|(?P<boolean>\b(?i:true|false|null|undefined)\b)'
+)
+_HIGHLIGHT_RE = re.compile(_HIGHLIGHT_PATTERN)
+_HIGHLIGHT_WITH_KEYWORDS_RE = re.compile(_KEYWORD_PATTERN + '|' + _HIGHLIGHT_PATTERN)
+
+_HIGHLIGHT_CLASSES = {
+    'keyword': 'log-keyword',
+    'url': 'log-url',
+    'number': 'log-number',
+    'boolean': 'log-boolean',
+}
+
+_LEVEL_STYLES = {
+    'error': ('log-error', '❌'),
+    'warning': ('log-warning', '⚠️'),
+    'info': ('log-info', 'ℹ️'),
+    'log': ('log-log', '📝'),
+    'debug': ('log-debug', '🔍'),
+}
+
+# Levels reported by get_stats (others are counted but not reported)
+_STAT_LEVELS = ('error', 'warning', 'info', 'log', 'debug')
+
+
+def _highlight_span(match: "re.Match") -> str:
+    return f'<span class="{_HIGHLIGHT_CLASSES[match.lastgroup]}">{match.group(0)}</span>'
+
+
+@lru_cache(maxsize=4096)
+def format_log_text(text: str, highlight_keywords: bool = False) -> str:
+    """
+    Escape and syntax-highlight a console message
+
+    Repeated messages (common in console output) hit the cache.
+
+    Args:
+        text: Raw message text
+        highlight_keywords: Also highlight error keywords (error/warning levels)
+
+    Returns:
+        HTML-safe text with highlighting spans
+    """
+    pattern = _HIGHLIGHT_WITH_KEYWORDS_RE if highlight_keywords else _HIGHLIGHT_RE
+    return pattern.sub(_highlight_span, html.escape(text))
+
+
 @dataclass
 class LogEntry:
     """Enhanced log entry with formatted display data"""
@@ -51,68 +111,16 @@ class LogEntry:
         Format log text with syntax highlighting
 
         Applies HTML escaping and syntax highlighting for:
+        - Error keywords (error and warning levels only)
         - URLs
-        - Objects/JSON
-        - Numbers
+        - Numbers (outside URLs)
         - Booleans
-        - Strings
         """
-        text = html.escape(self.text)
-
-        # Highlight error/warning keywords (before other formatting)
-        if self.level in ('error', 'warning'):
-            # Highlight common error keywords (word boundary before, colon after)
-            text = re.sub(
-                r'\b(Error:|Warning:|Failed:|Exception:|TypeError:|ReferenceError:|SyntaxError:)',
-                r'<span class="log-keyword">\1</span>',
-                text
-            )
-
-        # Highlight URLs FIRST (before numbers, so we can skip numbers inside URLs)
-        text = re.sub(
-            r'(https?://[^\s<>"]+)',
-            r'<span class="log-url">\1</span>',
-            text
-        )
-
-        # Highlight numbers, but NOT inside URL spans
-        # This regex matches numbers that are NOT inside <span class="log-url">...</span>
-        def replace_numbers_outside_urls(match):
-            """Replace numbers but skip if inside a URL span"""
-            number = match.group(0)
-            # Check if we're inside a URL span by looking backwards
-            pre_context = text[:match.start()]
-            # Count opening and closing URL spans before this position
-            open_spans = pre_context.count('<span class="log-url">')
-            close_spans = pre_context.count('</span>')
-            # If more opens than closes, we're inside a URL span
-            if open_spans > close_spans:
-                return number  # Don't highlight
-            return f'<span class="log-number">{number}</span>'
-
-        # Find all numbers and process them
-        text = re.sub(r'(?<!\w)(\d+\.?\d*)(?!\w)', replace_numbers_outside_urls, text)
-
-        # Highlight booleans
-        text = re.sub(
-            r'\b(true|false|null|undefined)\b',
-            r'<span class="log-boolean">\1</span>',
-            text,
-            flags=re.IGNORECASE
-        )
-
-        return text
+        return format_log_text(self.text, self.level in ('error', 'warning'))
 
     def _get_level_style(self) -> tuple[str, str]:
         """Get CSS class and emoji for log level"""
-        level_styles = {
-            'error': ('log-error', '❌'),
-            'warning': ('log-warning', '⚠️'),
-            'info': ('log-info', 'ℹ️'),
-            'log': ('log-log', '📝'),
-            'debug': ('log-debug', '🔍'),
-        }
-        return level_styles.get(self.level.lower(), ('log-log', '📝'))
+        return _LEVEL_STYLES.get(self.level.lower(), ('log-log', '📝'))
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization"""
@@ -142,23 +150,67 @@ class LogViewer:
     - Source location (URL, line, column)
     - Filtering by log level
     - HTML output for modal display
+    - Paginated rendering; entries are formatted on first display and cached
     """
 
-    def __init__(self, console_logs: List[ConsoleMessage]):
+    def __init__(self, console_logs: List[ConsoleMessage], page_size: int = 100):
         """
         Initialize log viewer with console messages
 
         Args:
             console_logs: List of ConsoleMessage objects from test execution
+            page_size: Default number of entries per rendered page
+        """
+        self.console_logs: List[ConsoleMessage] = []
+        self.page_size = page_size
+
+        # Built lazily, one slot per console message
+        self._entries: List[Optional[LogEntry]] = []
+        self._entry_html: List[Optional[str]] = []
+        self._entry_markdown: List[Optional[str]] = []
+
+        # Maintained at ingest time
+        self._level_counts: Counter = Counter()
+        self._level_index: Dict[str, List[int]] = {}
+
+        self.add_logs(console_logs)
+
+    def add_logs(self, console_logs: Iterable[ConsoleMessage]) -> None:
+        """
+        Append console messages (e.g. as a running test produces them)
+
+        Args:
+            console_logs: ConsoleMessage objects to add
         """
-        self.console_logs = console_logs
-        self.entries: List[LogEntry] = []
-        self._process_logs()
-
-    def _process_logs(self):
-        """Convert ConsoleMessage objects to LogEntry objects"""
-        self.entries = [
-            LogEntry(
+        index = self._level_index
+        position = len(self.console_logs)
+        for log in console_logs:
+            level = log.level.lower()
+            bucket = index.get(level)
+            if bucket is None:
+                bucket = index[level] = []
+            bucket.append(position)
+            self.console_logs.append(log)
+            position += 1
+
+        added = position - len(self._entries)
+        self._entries.extend([None] * added)
+        self._entry_html.extend([None] * added)
+        self._entry_markdown.extend([None] * added)
+        for level, positions in index.items():
+            self._level_counts[level] = len(positions)
+
+    @property
+    def entries(self) -> List[LogEntry]:
+        """All log entries (formats any not yet displayed)"""
+        return self._get_entries(range(len(self.console_logs)))
+
+    def _entry(self, position: int) -> LogEntry:
+        """Return the LogEntry for a message, building it on first use"""
+        entry = self._entries[position]
+        if entry is None:
+            log = self.console_logs[position]
+            entry = LogEntry(
                 level=log.level,
                 text=log.text,
                 timestamp=log.timestamp,
@@ -167,8 +219,25 @@ class LogViewer:
                 line=log.line,
                 column=log.column
             )
-            for log in self.console_logs
-        ]
+            self._entries[position] = entry
+        return entry
+
+    def _get_entries(self, positions) -> List[LogEntry]:
+        return [self._entry(i) for i in positions]
+
+    def _positions(self, level_filter: Optional[str] = None):
+        """Message positions matching a level filter, in log order"""
+        if level_filter:
+            return self._level_index.get(level_filter.lower(), [])
+        return range(len(self.console_logs))
+
+    def _page_positions(self, level_filter: Optional[str], page: Optional[int], page_size: Optional[int]):
+        positions = self._positions(level_filter)
+        if page is None:
+            return positions
+        size = page_size or self.page_size
+        start = (max(page, 1) - 1) * size
+        return positions[start:start + size]
 
     def get_entries(self, level_filter: Optional[str] = None) -> List[LogEntry]:
         """
@@ -180,9 +249,31 @@ class LogViewer:
         Returns:
             List of LogEntry objects
         """
-        if level_filter:
-            return [e for e in self.entries if e.level.lower() == level_filter.lower()]
-        return self.entries
+        return self._get_entries(self._positions(level_filter))
+
+    def get_page(
+        self,
+        page: int = 1,
+        page_size: Optional[int] = None,
+        level_filter: Optional[str] = None
+    ) -> List[LogEntry]:
+        """
+        Get one page of log entries
+
+        Args:
+            page: 1-based page number
+            page_size: Entries per page (default: the viewer's page_size)
+            level_filter: Optional log level filter
+
+        Returns:
+            List of LogEntry objects on that page
+        """
+        return self._get_entries(self._page_positions(level_filter, page, page_size))
+
+    def get_page_count(self, page_size: Optional[int] = None, level_filter: Optional[str] = None) -> int:
+        """Number of pages for a page size and level filter"""
+        size = page_size or self.page_size
+        return -(-len(self._positions(level_filter)) // size)
 
     def get_error_logs(self) -> List[LogEntry]:
         """Get only error-level logs"""
@@ -199,32 +290,28 @@ class LogViewer:
         Returns:
             Dictionary with counts per level
         """
-        stats = {
-            'error': 0,
-            'warning': 0,
-            'info': 0,
-            'log': 0,
-            'debug': 0,
-        }
-        for entry in self.entries:
-            level = entry.level.lower()
-            if level in stats:
-                stats[level] += 1
-        return stats
-
-    def to_html(self, level_filter: Optional[str] = None) -> str:
+        return {level: self._level_counts.get(level, 0) for level in _STAT_LEVELS}
+
+    def to_html(
+        self,
+        level_filter: Optional[str] = None,
+        page: Optional[int] = None,
+        page_size: Optional[int] = None
+    ) -> str:
         """
         Generate HTML representation of log viewer
 
         Args:
             level_filter: Optional log level filter
+            page: Optional 1-based page to render (default: all entries)
+            page_size: Entries per page (default: the viewer's page_size)
 
         Returns:
             HTML string with formatted log entries
         """
-        entries = self.get_entries(level_filter)
+        positions = self._page_positions(level_filter, page, page_size)
 
-        if not entries:
+        if not positions:
             return self._empty_state_html()
 
         html_parts = ['<div class="log-viewer">']
@@ -238,13 +325,20 @@ class LogViewer:
         html_parts.append(f'<span class="log-stat log-stat--warning">⚠️ {stats["warning"]}</span>')
         html_parts.append(f'<span class="log-stat log-stat--info">ℹ️ {stats["info"]}</span>')
         html_parts.append(f'<span class="log-stat log-stat--log">📝 {stats["log"]}</span>')
+        if page is not None:
+            pages = self.get_page_count(page_size, level_filter)
+            html_parts.append(f'<span class="log-stat log-stat--page">{max(page, 1)} / {pages}</span>')
         html_parts.append('</div>')
         html_parts.append('</div>')
 
         # Log entries
         html_parts.append('<div class="log-viewer__entries">')
-        for entry in entries:
-            html_parts.append(self._entry_to_html(entry))
+        entry_html = self._entry_html
+        for i in positions:
+            rendered = entry_html[i]
+            if rendered is None:
+                rendered = entry_html[i] = self._entry_to_html(self._entry(i))
+            html_parts.append(rendered)
         html_parts.append('</div>')
 
         html_parts.append('</div>')
@@ -288,7 +382,12 @@ class LogViewer:
         </div>
         '''
 
-    def to_markdown(self, level_filter: Optional[str] = None) -> str:
+    def to_markdown(
+        self,
+        level_filter: Optional[str] = None,
+        page: Optional[int] = None,
+        page_size: Optional[int] = None
+    ) -> str:
         """
         Generate markdown representation of log viewer
 
@@ -296,13 +395,15 @@ class LogViewer:
 
         Args:
             level_filter: Optional log level filter
+            page: Optional 1-based page to render (default: all entries)
+            page_size: Entries per page (default: the viewer's page_size)
 
         Returns:
             Markdown string with formatted log entries
         """
-        entries = self.get_entries(level_filter)
+        positions = self._page_positions(level_filter, page, page_size)
 
-        if not entries:
+        if not positions:
             return "## 📋 Console Logs\n\nNo console logs available."
 
         lines = ["## 📋 Console Logs\n"]
@@ -312,14 +413,23 @@ class LogViewer:
         lines.append(f"**Summary:** ❌ {stats['error']} | ⚠️ {stats['warning']} | ℹ️ {stats['info']} | 📝 {stats['log']}\n")
 
         # Add entries
-        for entry in entries:
-            lines.append(f"### {entry.level_emoji} {entry.level.upper()} at {entry.formatted_timestamp}")
+        entry_markdown = self._entry_markdown
+        for i in positions:
+            rendered = entry_markdown[i]
+            if rendered is None:
+                rendered = entry_markdown[i] = self._entry_to_markdown(self._entry(i))
+            lines.append(rendered)
 
-            if entry.url:
-                lines.append(f"**Source:** {entry.url}:{entry.line or '?'}:{entry.column or '?'}")
+        return '\n'.join(lines)
+
+    def _entry_to_markdown(self, entry: LogEntry) -> str:
+        """Convert a single log entry to markdown"""
+        lines = [f"### {entry.level_emoji} {entry.level.upper()} at {entry.formatted_timestamp}"]
 
-            lines.append(f"**Message:**\n```\n{entry.text}\n```\n")
+        if entry.url:
+            lines.append(f"**Source:** {entry.url}:{entry.line or '?'}:{entry.column or '?'}")
 
+        lines.append(f"**Message:**\n```\n{entry.text}\n```\n")
         return '\n'.join(lines)
 
     def get_css_styles(self) -> str:
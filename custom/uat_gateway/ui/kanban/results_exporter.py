@@ -139,6 +139,15 @@ class ResultsModal:
         }
 
 
+# NDJSON record type and export section, in file order
+NDJSON_SECTIONS = (
+    ("export_metadata", "export_metadata"),
+    ("execution_metadata", "execution_metadata"),
+    ("test_result", "test_results"),
+    ("console_log", "console_logs"),
+)
+
+
 class ResultsExporter:
     """
     Handles exporting test results from the results modal
@@ -165,7 +174,8 @@ class ResultsExporter:
     def export_results(
         self,
         modal: ResultsModal,
-        filename: str = None
+        filename: str = None,
+        format: str = "json"
     ) -> str:
         """
         Export results from modal to JSON file
@@ -173,6 +183,8 @@ class ResultsExporter:
         Args:
             modal: ResultsModal containing test results
             filename: Optional filename (auto-generated if None)
+            format: "json" for a single document, or "ndjson" for one typed
+                record per line (streams on import)
 
         Returns:
             Path to the exported file
@@ -180,7 +192,7 @@ class ResultsExporter:
         # Generate filename if not provided
         if filename is None:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"test_results_export_{timestamp}.json"
+            filename = f"test_results_export_{timestamp}.{format}"
 
         output_path = Path(self.output_directory) / filename
 
@@ -189,7 +201,21 @@ class ResultsExporter:
 
         # Write to file
         with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(export_data, f, indent=2, ensure_ascii=False)
+            if format == "ndjson":
+                for record_type, section in NDJSON_SECTIONS:
+                    records = export_data.get(section)
+                    if records is None:
+                        continue
+                    if records == []:
+                        # Keep the empty section, as the JSON form does
+                        f.write(json.dumps({"type": section, "data": []}))
+                        f.write("\n")
+                        continue
+                    for record in (records if isinstance(records, list) else [records]):
+                        f.write(json.dumps({"type": record_type, "data": record}, ensure_ascii=False))
+                        f.write("\n")
+            else:
+                json.dump(export_data, f, indent=2, ensure_ascii=False)
 
         return str(output_path)
 
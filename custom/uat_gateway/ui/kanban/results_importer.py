@@ -5,13 +5,24 @@ This module provides import functionality for test results, journeys, and scenar
 Users can import previously exported test data to restore test results, journeys,
 and scenarios from JSON files.
 
+Two file formats are accepted, and both are read incrementally so large
+exports import in bounded memory:
+- The legacy export document ({"export_metadata": ..., "test_results": [...]}),
+  walked element by element instead of being json.load-ed whole
+- NDJSON, one {"type": "<record type>", "data": {...}} object per line, with
+  record types export_metadata, execution_metadata, journey, scenario,
+  test_result and console_log
+
+Records are validated and materialized in chunks of chunk_size.
+
 Feature: #301 - Import journey and test data
 """
 
+import codecs
 import json
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable, Iterator, Tuple, BinaryIO
 from dataclasses import dataclass, field
 
 from custom.uat_gateway.test_executor.test_executor import TestResult, ConsoleMessage
@@ -31,6 +42,162 @@ class ImportResult:
     warnings: List[str] = field(default_factory=list)
 
 
+@dataclass
+class ImportProgress:
+    """Progress of a running import, passed to progress callbacks"""
+    bytes_read: int
+    total_bytes: int
+    records: int
+    section: str
+
+    @property
+    def fraction(self) -> float:
+        """Fraction of the file consumed (0.0 to 1.0)"""
+        return self.bytes_read / self.total_bytes if self.total_bytes else 1.0
+
+
+# Data sections of the legacy export document
+DATA_SECTIONS = ('journeys', 'scenarios', 'test_results', 'console_logs')
+
+# NDJSON record type -> legacy section name. A record typed with the section
+# name itself carries the whole section (used for empty sections).
+NDJSON_RECORD_TYPES = {
+    'export_metadata': 'export_metadata',
+    'execution_metadata': 'execution_metadata',
+    'journey': 'journeys',
+    'scenario': 'scenarios',
+    'test_result': 'test_results',
+    'console_log': 'console_logs',
+    **{section: section for section in DATA_SECTIONS},
+}
+
+_JSON_DECODER = json.JSONDecoder()
+_WHITESPACE = ' \t\n\r'
+
+
+class _JSONStreamReader:
+    """Incremental reader over a UTF-8 JSON byte stream"""
+
+    def __init__(self, stream: BinaryIO, read_size: int = 1 << 20):
+        self._stream = stream
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self._read_size = read_size
+        self.buf = ''
+        self.pos = 0
+        self.bytes_read = 0
+        self.eof = False
+
+    def _fill(self) -> None:
+        raw = self._stream.read(self._read_size)
+        self.bytes_read += len(raw)
+        self.eof = not raw
+        self.buf = self.buf[self.pos:] + self._decoder.decode(raw, final=self.eof)
+        self.pos = 0
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character ('' at end of input)"""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if self.eof:
+                return ''
+            self._fill()
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise json.JSONDecodeError(f"Expecting '{char}'", self.buf, self.pos)
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value, reading more input as needed"""
+        self.peek()
+        while True:
+            try:
+                value, end = _JSON_DECODER.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+                self._fill()
+                continue
+            # A number at the very end of the buffer may continue in the next chunk
+            if end == len(self.buf) and not self.eof:
+                self._fill()
+                continue
+            self.pos = end
+            return value
+
+
+def iter_json_document(stream: BinaryIO, read_size: int = 1 << 20) -> Iterator[Tuple[str, Any, bool, int]]:
+    """
+    Walk a top-level JSON object without loading it whole
+
+    Elements of top-level arrays are yielded one at a time; empty arrays and
+    other values are yielded whole, so every key is reported.
+
+    Args:
+        stream: Binary file object positioned at the document start
+        read_size: Bytes to read per chunk
+
+    Yields:
+        (key, value, is_array_item, bytes_read) tuples
+
+    Raises:
+        json.JSONDecodeError: If the document is malformed
+    """
+    reader = _JSONStreamReader(stream, read_size)
+    reader.expect('{')
+    if reader.peek() == '}':
+        reader.pos += 1
+    else:
+        while True:
+            key = reader.value()
+            if not isinstance(key, str):
+                raise json.JSONDecodeError("Expecting property name", reader.buf, reader.pos)
+            reader.expect(':')
+
+            if reader.peek() == '[':
+                reader.pos += 1
+                if reader.peek() == ']':
+                    reader.pos += 1
+                    yield key, [], False, reader.bytes_read
+                else:
+                    while True:
+                        yield key, reader.value(), True, reader.bytes_read
+                        char = reader.peek()
+                        reader.pos += 1
+                        if char == ']':
+                            break
+                        if char != ',':
+                            raise json.JSONDecodeError("Expecting ',' delimiter", reader.buf, reader.pos - 1)
+            else:
+                yield key, reader.value(), False, reader.bytes_read
+
+            char = reader.peek()
+            reader.pos += 1
+            if char == '}':
+                break
+            if char != ',':
+                raise json.JSONDecodeError("Expecting ',' delimiter", reader.buf, reader.pos - 1)
+
+    if reader.peek() != '':
+        raise json.JSONDecodeError("Extra data", reader.buf, reader.pos)
+
+
+def _is_ndjson(path: Path) -> bool:
+    """Detect the NDJSON format by extension or by a typed first record"""
+    if path.suffix.lower() in ('.ndjson', '.jsonl'):
+        return True
+    with open(path, 'rb') as f:
+        first_line = f.readline(1 << 20)
+    try:
+        record = json.loads(first_line)
+    except ValueError:
+        return False
+    return isinstance(record, dict) and record.get('type') in NDJSON_RECORD_TYPES and 'data' in record
+
+
 @dataclass
 class JourneyImportData:
     """Data structure for importing journeys"""
@@ -64,21 +231,45 @@ class ResultsImporter:
     """
     Handles importing test results, journeys, and scenarios from JSON files
 
+    Journeys and scenarios are kept in id-keyed dicts, and imported test
+    results are indexed by journey_id as they arrive. With
+    retain_results=False, test results are only handed to the results
+    callback in chunks, which keeps memory bounded for very large exports.
+
     Feature: #301 - Import journey and test data
     """
 
-    def __init__(self):
-        """Initialize the importer"""
+    def __init__(self, retain_results: bool = True, chunk_size: int = 1000):
+        """
+        Initialize the importer
+
+        Args:
+            retain_results: Keep imported TestResult objects in memory
+            chunk_size: Records validated and materialized per batch
+        """
+        self.retain_results = retain_results
+        self.chunk_size = chunk_size
         self.imported_journeys: Dict[str, Journey] = {}
         self.imported_scenarios: Dict[str, Scenario] = {}
         self.imported_results: List[TestResult] = []
-
-    def import_from_file(self, file_path: str) -> ImportResult:
+        self._results_by_journey: Dict[str, List[TestResult]] = {}
+
+    def import_from_file(
+        self,
+        file_path: str,
+        progress_callback: Optional[Callable[[ImportProgress], None]] = None,
+        results_callback: Optional[Callable[[List[TestResult]], None]] = None,
+    ) -> ImportResult:
         """
-        Import data from a JSON file
+        Import data from a JSON or NDJSON file
+
+        The file is streamed; records are imported chunk by chunk, so a
+        malformed document may leave the records before the error imported.
 
         Args:
-            file_path: Path to the JSON file to import
+            file_path: Path to the JSON or NDJSON file to import
+            progress_callback: Called after each chunk with an ImportProgress
+            results_callback: Called with each chunk of imported TestResults
 
         Returns:
             ImportResult with details of what was imported
@@ -92,28 +283,50 @@ class ResultsImporter:
                 result.errors.append(f"File not found: {file_path}")
                 return result
 
-            with open(path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-
-            # Validate file structure
-            if not self._validate_import_format(data, result):
-                return result
+            total_bytes = path.stat().st_size
+            sections_seen = set()
+            records = 0
+            chunk: List[Dict[str, Any]] = []
+            chunk_section = ''
+            bytes_read = 0
+
+            def flush_chunk():
+                nonlocal chunk
+                if not chunk:
+                    return
+                self._import_section(chunk_section, chunk, result, results_callback)
+                chunk = []
+                if progress_callback:
+                    progress_callback(ImportProgress(bytes_read, total_bytes, records, chunk_section))
+
+            for section, value, is_record, bytes_read in self._iter_records(path, result):
+                if section == 'export_metadata':
+                    self._validate_metadata(value, result)
+                    continue
+                if section not in DATA_SECTIONS:
+                    continue
 
-            # Import journeys if present
-            if 'journeys' in data:
-                self._import_journeys(data['journeys'], result)
+                sections_seen.add(section)
+                if not is_record:
+                    # A whole section (empty, or not a list): import it as before
+                    flush_chunk()
+                    self._import_section(section, value, result, results_callback)
+                    continue
 
-            # Import scenarios if present
-            if 'scenarios' in data:
-                self._import_scenarios(data['scenarios'], result)
+                if section != chunk_section:
+                    flush_chunk()
+                    chunk_section = section
+                chunk.append(value)
+                records += 1
+                if len(chunk) >= self.chunk_size:
+                    flush_chunk()
 
-            # Import test results if present
-            if 'test_results' in data:
-                self._import_test_results(data['test_results'], result)
+            flush_chunk()
 
-            # Import console logs if present
-            if 'console_logs' in data:
-                self._import_console_logs(data['console_logs'], result)
+            # Validate file structure
+            if not sections_seen:
+                result.errors.append("No valid data sections found (journeys, scenarios, test_results, console_logs)")
+                return result
 
             result.success = len(result.errors) == 0
 
@@ -124,34 +337,63 @@ class ResultsImporter:
 
         return result
 
-    def _validate_import_format(self, data: Dict[str, Any], result: ImportResult) -> bool:
+    def _iter_records(self, path: Path, result: ImportResult) -> Iterator[Tuple[str, Any, bool, int]]:
         """
-        Validate the imported data structure
+        Yield (section, value, is_record, bytes_read) from either file format
 
         Args:
-            data: Parsed JSON data
-            result: ImportResult to record errors
-
-        Returns:
-            True if format is valid
+            path: File to read
+            result: ImportResult to record per-line NDJSON errors
         """
-        # Must have at least one data section
-        valid_sections = ['journeys', 'scenarios', 'test_results', 'console_logs']
-        has_valid_section = any(section in data for section in valid_sections)
-
-        if not has_valid_section:
-            result.errors.append("No valid data sections found (journeys, scenarios, test_results, console_logs)")
-            return False
-
-        # If export_metadata exists, validate it
-        if 'export_metadata' in data:
-            metadata = data['export_metadata']
-            required_fields = ['exported_at', 'export_version']
-            for field in required_fields:
-                if field not in metadata:
-                    result.warnings.append(f"Missing metadata field: {field}")
+        if not _is_ndjson(path):
+            with open(path, 'rb') as f:
+                yield from iter_json_document(f)
+            return
+
+        bytes_read = 0
+        with open(path, 'rb') as f:
+            for line_number, line in enumerate(f, 1):
+                bytes_read += len(line)
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError as e:
+                    result.errors.append(f"Invalid JSON on line {line_number}: {e}")
+                    continue
 
-        return True
+                section = NDJSON_RECORD_TYPES.get(record.get('type')) if isinstance(record, dict) else None
+                if section is None or 'data' not in record:
+                    result.warnings.append(f"Unknown record on line {line_number}, skipping")
+                    continue
+                is_record = section in DATA_SECTIONS and record['type'] not in DATA_SECTIONS
+                yield section, record['data'], is_record, bytes_read
+
+    def _import_section(
+        self,
+        section: str,
+        records: List[Dict[str, Any]],
+        result: ImportResult,
+        results_callback: Optional[Callable[[List[TestResult]], None]] = None,
+    ) -> None:
+        """Import one chunk of records belonging to a data section"""
+        if section == 'journeys':
+            self._import_journeys(records, result)
+        elif section == 'scenarios':
+            self._import_scenarios(records, result)
+        elif section == 'test_results':
+            imported = self._import_test_results(records, result)
+            if results_callback and imported:
+                results_callback(imported)
+        elif section == 'console_logs':
+            self._import_console_logs(records, result)
+
+    def _validate_metadata(self, metadata: Dict[str, Any], result: ImportResult) -> None:
+        """Record warnings for missing export metadata fields"""
+        required_fields = ['exported_at', 'export_version']
+        for field_name in required_fields:
+            if not isinstance(metadata, dict) or field_name not in metadata:
+                result.warnings.append(f"Missing metadata field: {field_name}")
 
     def _import_journeys(self, journeys_data: List[Dict[str, Any]], result: ImportResult) -> None:
         """
@@ -302,16 +544,20 @@ class ResultsImporter:
             print(f"Error creating scenario from dict: {e}")
             return None
 
-    def _import_test_results(self, results_data: List[Dict[str, Any]], result: ImportResult) -> None:
+    def _import_test_results(self, results_data: List[Dict[str, Any]], result: ImportResult) -> List[TestResult]:
         """
         Import test results from data
 
         Args:
             results_data: List of test result dictionaries
             result: ImportResult to record statistics
+
+        Returns:
+            TestResult objects created from this batch
         """
         from custom.uat_gateway.test_executor.test_executor import TestArtifact
 
+        imported: List[TestResult] = []
         for result_dict in results_data:
             try:
                 test_name = result_dict.get('test_name', '')
@@ -353,12 +599,18 @@ class ResultsImporter:
                     artifacts=artifacts
                 )
 
-                self.imported_results.append(test_result)
+                imported.append(test_result)
+                if self.retain_results:
+                    self.imported_results.append(test_result)
+                    if test_result.journey_id:
+                        self._results_by_journey.setdefault(test_result.journey_id, []).append(test_result)
                 result.imported_test_results += 1
 
             except Exception as e:
                 result.errors.append(f"Error importing test result {result_dict.get('test_name', 'unknown')}: {e}")
 
+        return imported
+
     def _import_console_logs(self, logs_data: List[Dict[str, Any]], result: ImportResult) -> None:
         """
         Import console logs from data
@@ -435,6 +687,18 @@ class ResultsImporter:
         """
         return self.imported_scenarios.get(scenario_id)
 
+    def get_results_for_journey(self, journey_id: str) -> List[TestResult]:
+        """
+        Get imported test results belonging to a journey
+
+        Args:
+            journey_id: Journey ID to look up
+
+        Returns:
+            List of TestResult objects (empty if none)
+        """
+        return list(self._results_by_journey.get(journey_id, []))
+
 
 def create_results_importer() -> ResultsImporter:
     """
@@ -7,12 +7,16 @@ It supports:
 - Connection rejection without valid auth
 - Real-time progress updates
 - Broadcast to authenticated clients
+
+Broadcasts are serialized once and queued on each client's ClientOutbox, so
+a slow reader only delays (and, when its queue fills, loses) its own updates.
+Progress updates for the same scenario coalesce in a client's queue.
 """
 
 import asyncio
 import logging
 import os
-from typing import Dict, Optional, Set
+from typing import Callable, Dict, Optional, Set
 import json
 import secrets
 from datetime import datetime, timedelta
@@ -20,6 +24,8 @@ from datetime import datetime, timedelta
 import websockets
 from websockets.server import WebSocketServerProtocol
 
+from custom.uat_gateway.ui.fanout import ClientOutbox
+
 
 logger = logging.getLogger(__name__)
 
@@ -32,11 +38,23 @@ class AuthenticationError(Exception):
 class WebSocketClient:
     """Represents an authenticated WebSocket client"""
 
-    def __init__(self, websocket: WebSocketServerProtocol, token: str, connected_at: datetime):
+    def __init__(
+        self,
+        websocket: WebSocketServerProtocol,
+        token: str,
+        connected_at: datetime,
+        queue_size: int = 100,
+        on_send_error: Optional[Callable[["WebSocketClient", Exception], None]] = None,
+    ):
         self.websocket = websocket
         self.token = token
         self.connected_at = connected_at
         self.client_id = secrets.token_hex(8)
+        self.outbox = ClientOutbox(
+            websocket.send,
+            max_size=queue_size,
+            on_error=(lambda e: on_send_error(self, e)) if on_send_error else None,
+        )
 
     def to_dict(self) -> Dict:
         """Convert to dictionary for logging"""
@@ -44,6 +62,7 @@ class WebSocketClient:
             "client_id": self.client_id,
             "token": f"{self.token[:8]}..." if len(self.token) > 8 else self.token,
             "connected_at": self.connected_at.isoformat(),
+            **self.outbox.stats(),
         }
 
 
@@ -72,7 +91,7 @@ class WebSocketServer:
             host: Host to bind to
             port: Port to listen on
             auth_token: Token required for authentication (None = use env or default)
-            message_queue_size: Maximum message queue size per client
+            message_queue_size: Maximum queued broadcast messages per client
         """
         self.host = host
         self.port = port
@@ -143,7 +162,9 @@ class WebSocketServer:
                 client = WebSocketClient(
                     websocket=websocket,
                     token=token,
-                    connected_at=datetime.now()
+                    connected_at=datetime.now(),
+                    queue_size=self.message_queue_size,
+                    on_send_error=self._drop_client,
                 )
                 self.clients[client.client_id] = client
 
@@ -203,6 +224,7 @@ class WebSocketServer:
         finally:
             # Clean up client
             if client:
+                client.outbox.close()
                 self.clients.pop(client.client_id, None)
                 logger.info(f"Client removed: {client.client_id}")
 
@@ -234,13 +256,18 @@ class WebSocketServer:
         else:
             logger.warning(f"Unknown message type: {message_type}")
 
-    async def broadcast(self, message_type: str, data: Dict):
+    async def broadcast(self, message_type: str, data: Dict, coalesce_key: Optional[tuple] = None):
         """
         Broadcast a message to all authenticated clients
 
+        The message is serialized once and queued for each client; this
+        returns without waiting for delivery.
+
         Args:
             message_type: Type of message (e.g., "progress", "error")
             data: Message data
+            coalesce_key: Messages with the same key replace each other while
+                still queued for a client (used for progress updates)
         """
         if not self.clients:
             logger.debug("No clients connected, skipping broadcast")
@@ -252,20 +279,15 @@ class WebSocketServer:
             "data": data
         })
 
-        # Send to all clients
-        disconnected_clients = []
-        for client_id, client in self.clients.items():
-            try:
-                await client.websocket.send(message)
-            except Exception as e:
-                logger.warning(f"Failed to send to client {client_id}: {e}")
-                disconnected_clients.append(client_id)
+        for client in list(self.clients.values()):
+            client.outbox.put(message, coalesce_key)
 
-        # Remove disconnected clients
-        for client_id in disconnected_clients:
-            self.clients.pop(client_id, None)
+        logger.debug(f"Broadcast queued for {len(self.clients)} clients")
 
-        logger.debug(f"Broadcast to {len(self.clients) - len(disconnected_clients)} clients")
+    def _drop_client(self, client: WebSocketClient, error: Exception):
+        """Forget a client whose connection failed during a send"""
+        logger.warning(f"Failed to send to client {client.client_id}: {error}")
+        self.clients.pop(client.client_id, None)
 
     async def send_progress_update(self, journey_name: str, scenario_name: str, progress: float):
         """
@@ -280,7 +302,7 @@ class WebSocketServer:
             "journey": journey_name,
             "scenario": scenario_name,
             "progress": progress
-        })
+        }, coalesce_key=("progress", journey_name, scenario_name))
 
     async def send_scenario_complete(self, journey_name: str, scenario_name: str, passed: bool):
         """
@@ -320,7 +342,6 @@ class WebSocketServer:
             self.handle_client,
             self.host,
             self.port,
-            max_size=self.message_queue_size,
             ping_interval=20,
             ping_timeout=20,
         )
@@ -333,6 +354,7 @@ class WebSocketServer:
 
         # Close all client connections
         for client in list(self.clients.values()):
+            client.outbox.close()
             try:
                 await client.websocket.close(code=1001, reason="Server shutting down")
             except Exception:
@@ -8,9 +8,11 @@ Feature #214: UAT gateway encrypts sensitive data
 """
 
 import base64
+import functools
 import os
 import hashlib
 import json
+import re
 from typing import Any, Dict, List, Optional
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
@@ -20,6 +22,33 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+ENCRYPTED_PREFIX = 'ENCRYPTED:'
+
+# Fernet tokens always start with version byte 0x80, i.e. "gAAAAA" in
+# urlsafe base64. Values written before tokens were stored directly were
+# base64-encoded a second time and start with "Z0FBQUFB" instead.
+_FERNET_TOKEN_START = 'gAAAAA'
+
+# Key under which encrypt_record stores the single ciphertext for a record,
+# and the placeholder left in place of each sensitive value (for readers of
+# the stored record only; decryption goes by the paths in the ciphertext)
+BULK_FIELD = '__encrypted_fields__'
+BULK_PLACEHOLDER = 'ENCRYPTED_FIELD:'
+
+PBKDF2_ITERATIONS = 100000
+
+
+@functools.lru_cache(maxsize=32)
+def _derive_key_cached(password: bytes, salt: bytes) -> bytes:
+    """PBKDF2 derivation, cached per (password, salt) for the life of the process"""
+    kdf = PBKDF2HMAC(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=salt,
+        iterations=PBKDF2_ITERATIONS,
+    )
+    return base64.urlsafe_b64encode(kdf.derive(password))
+
 
 class EncryptionManager:
     """
@@ -36,6 +65,9 @@ class EncryptionManager:
         'refresh_token', 'bearer', 'authorization'
     ]
 
+    # Single regex pass instead of one substring test per pattern
+    _SENSITIVE_RE = re.compile('|'.join(map(re.escape, SENSITIVE_PATTERNS)))
+
     def __init__(self, encryption_key: Optional[str] = None):
         """
         Initialize encryption manager
@@ -80,7 +112,9 @@ class EncryptionManager:
         """
         Derive a Fernet-compatible key from a password
 
-        Uses PBKDF2-HMAC with SHA256 and 100,000 iterations.
+        Uses PBKDF2-HMAC with SHA256 and 100,000 iterations. The result is
+        cached per (password, salt), so only the first manager built from a
+        given password pays for the derivation.
 
         Args:
             password: Password string
@@ -90,14 +124,7 @@ class EncryptionManager:
         """
         password_bytes = password.encode() if isinstance(password, str) else password
         salt = b'uat_gateway_salt'  # In production, use random salt per deployment
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=salt,
-            iterations=100000,
-        )
-        key = base64.urlsafe_b64encode(kdf.derive(password_bytes))
-        return key
+        return _derive_key_cached(password_bytes, salt)
 
     def encrypt_data(self, data: str) -> str:
         """
@@ -107,15 +134,15 @@ class EncryptionManager:
             data: Plain text data to encrypt
 
         Returns:
-            Base64-encoded encrypted data (with prefix ENCRYPTED:)
+            Fernet token with prefix ENCRYPTED: (the token is already
+            urlsafe base64, so it is not encoded again)
         """
         if not data:
             return data
 
         try:
-            encrypted_bytes = self.cipher.encrypt(data.encode('utf-8'))
-            encrypted_b64 = base64.b64encode(encrypted_bytes).decode('utf-8')
-            return f"ENCRYPTED:{encrypted_b64}"
+            token = self.cipher.encrypt(data.encode('utf-8')).decode('ascii')
+            return f"{ENCRYPTED_PREFIX}{token}"
         except Exception as e:
             logger.error(f"Encryption failed: {e}")
             raise
@@ -130,14 +157,17 @@ class EncryptionManager:
         Returns:
             Decrypted plain text
         """
-        if not encrypted_data or not encrypted_data.startswith('ENCRYPTED:'):
+        if not encrypted_data or not encrypted_data.startswith(ENCRYPTED_PREFIX):
             return encrypted_data
 
         try:
-            # Remove prefix and decode
-            encrypted_b64 = encrypted_data[len('ENCRYPTED:'):]
-            encrypted_bytes = base64.b64decode(encrypted_b64)
-            decrypted_bytes = self.cipher.decrypt(encrypted_bytes)
+            payload = encrypted_data[len(ENCRYPTED_PREFIX):]
+            if payload.startswith(_FERNET_TOKEN_START):
+                token = payload.encode('ascii')
+            else:
+                # Legacy format: Fernet token base64-encoded a second time
+                token = base64.b64decode(payload)
+            decrypted_bytes = self.cipher.decrypt(token)
             return decrypted_bytes.decode('utf-8')
         except Exception as e:
             logger.error(f"Decryption failed: {e}")
@@ -161,7 +191,7 @@ class EncryptionManager:
 
         for key, value in data.items():
             # Check if this is a sensitive field
-            if self._is_sensitive_field(key) and isinstance(value, (str, int, float, bool)):
+            if _is_sensitive_key(key) and isinstance(value, (str, int, float, bool)):
                 # Encrypt the value
                 encrypted[key] = self.encrypt_data(str(value))
             elif recursive and isinstance(value, dict):
@@ -192,7 +222,7 @@ class EncryptionManager:
         decrypted = {}
 
         for key, value in data.items():
-            if isinstance(value, str) and value.startswith('ENCRYPTED:'):
+            if isinstance(value, str) and value.startswith(ENCRYPTED_PREFIX):
                 # Decrypt the value
                 try:
                     decrypted[key] = self.decrypt_data(value)
@@ -262,6 +292,129 @@ class EncryptionManager:
 
         return decrypted
 
+    def encrypt_record(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Encrypt all sensitive fields of a record with a single cipher call
+
+        Sensitive values anywhere in the record (nested dicts and lists
+        included) are collected in one walk, encrypted together with their
+        paths as one JSON array under BULK_FIELD, and replaced by numbered
+        placeholders. This costs one Fernet encryption per record instead of
+        one per field, and values keep their JSON types on decryption.
+
+        The paths inside the ciphertext say which fields were encrypted, so
+        plaintext values that happen to start with BULK_PLACEHOLDER or
+        ENCRYPTED_PREFIX are left alone on decryption.
+
+        Args:
+            data: Record to encrypt
+
+        Returns:
+            Copy of the record with sensitive fields replaced
+        """
+        if not isinstance(data, dict):
+            return data
+
+        fields: List[List[Any]] = []
+        path: List[Any] = []
+        # Plaintext that decrypt_dict would read as a per-field value
+        prefixed = False
+
+        def walk(node):
+            nonlocal prefixed
+            if isinstance(node, dict):
+                out = {}
+                for key, value in node.items():
+                    if _is_sensitive_key(key) and isinstance(value, (str, int, float, bool)):
+                        out[key] = f"{BULK_PLACEHOLDER}{len(fields)}"
+                        fields.append([path + [key], value])
+                    else:
+                        path.append(key)
+                        out[key] = walk(value)
+                        path.pop()
+                return out
+            if isinstance(node, list):
+                out = []
+                for index, item in enumerate(node):
+                    path.append(index)
+                    out.append(walk(item))
+                    path.pop()
+                return out
+            if isinstance(node, str) and node.startswith(ENCRYPTED_PREFIX):
+                prefixed = True
+            return node
+
+        encrypted = walk(data)
+        if fields or prefixed:
+            # Also written when nothing is sensitive but a plaintext value
+            # carries the prefix, so decrypt_record does not treat the record
+            # as per-field encrypted
+            payload = json.dumps(fields, separators=(',', ':')).encode('utf-8')
+            encrypted[BULK_FIELD] = self.cipher.encrypt(payload).decode('ascii')
+        return encrypted
+
+    def decrypt_record(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Decrypt a record produced by encrypt_record (or by encrypt_dict)
+
+        Args:
+            data: Encrypted record
+
+        Returns:
+            Record with sensitive fields restored
+        """
+        if not isinstance(data, dict):
+            return data
+        if BULK_FIELD not in data:
+            # Per-field encryption from encrypt_dict
+            return self.decrypt_dict(data, recursive=True)
+
+        data = dict(data)
+        try:
+            fields = json.loads(self.cipher.decrypt(data.pop(BULK_FIELD).encode('ascii')))
+        except Exception as e:
+            logger.error(f"Decryption failed: {e}")
+            raise ValueError(f"Unable to decrypt record: {e}")
+
+        # Copy the containers on the way to each encrypted field (once each),
+        # leaving the caller's record untouched
+        copied = {id(data)}
+        for field_path, value in fields:
+            node = data
+            for key in field_path[:-1]:
+                child = node[key]
+                if id(child) not in copied:
+                    child = dict(child) if isinstance(child, dict) else list(child)
+                    copied.add(id(child))
+                    node[key] = child
+                node = child
+            node[field_path[-1]] = value
+        return data
+
+    def encrypt_records(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Encrypt a batch of records (see encrypt_record)
+
+        Args:
+            records: Records to encrypt
+
+        Returns:
+            Encrypted records in the same order
+        """
+        return [self.encrypt_record(record) for record in records]
+
+    def decrypt_records(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Decrypt a batch of records (see decrypt_record)
+
+        Args:
+            records: Encrypted records
+
+        Returns:
+            Decrypted records in the same order
+        """
+        return [self.decrypt_record(record) for record in records]
+
     def _is_sensitive_field(self, field_name: str) -> bool:
         """
         Check if a field name contains sensitive data patterns
@@ -272,8 +425,7 @@ class EncryptionManager:
         Returns:
             True if field appears to be sensitive
         """
-        field_lower = field_name.lower()
-        return any(pattern in field_lower for pattern in self.SENSITIVE_PATTERNS)
+        return _is_sensitive_key(field_name)
 
     def validate_encryption_strength(self) -> Dict[str, Any]:
         """
@@ -311,6 +463,12 @@ class EncryptionManager:
             }
 
 
+@functools.lru_cache(maxsize=4096)
+def _is_sensitive_key(field_name: str) -> bool:
+    """Memoized sensitive-field check; records reuse a small set of keys"""
+    return EncryptionManager._SENSITIVE_RE.search(field_name.lower()) is not None
+
+
 # Global encryption manager instance
 _encryption_manager = None
 
@@ -13,9 +13,11 @@ This is the complete, fixed version.
 
 import asyncio
 import logging
+import threading
 import time
+from collections import deque
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, Callable, List, Tuple
+from typing import Optional, Dict, Any, Callable, Deque, List, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 from functools import wraps
@@ -101,10 +103,23 @@ class RetryConfig:
     retry_on_connection_error: bool = True
 
 
+class CircuitState(Enum):
+    """Circuit breaker states"""
+    CLOSED = "closed"         # Requests flow normally
+    OPEN = "open"             # Requests are rejected until the timeout elapses
+    HALF_OPEN = "half_open"   # A limited number of probe requests are let through
+
+
 @dataclass
 class CircuitBreakerState:
-    """Circuit breaker state to prevent cascading failures"""
-    is_open: bool = False
+    """
+    Circuit breaker state to prevent cascading failures
+
+    Each host has its own breaker with its own lock, so hosts never contend
+    with each other. Timing uses the monotonic clock; the datetime fields are
+    for reporting only.
+    """
+    state: CircuitState = CircuitState.CLOSED
     failure_count: int = 0
     last_failure_time: Optional[datetime] = None
     opened_at: Optional[datetime] = None
@@ -113,8 +128,24 @@ class CircuitBreakerState:
 
     # Thresholds
     failure_threshold: int = 5
-    timeout_seconds: int = 60
-    half_open_max_calls: int = 3
+    timeout_seconds: float = 60
+    half_open_max_calls: int = 3  # Concurrent probes, and successes needed to close
+
+    # Runtime bookkeeping
+    opened_at_monotonic: float = 0.0
+    probes_in_flight: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    @property
+    def is_open(self) -> bool:
+        """Whether requests are currently being rejected outright"""
+        return self.state == CircuitState.OPEN
+
+    def seconds_until_half_open(self) -> float:
+        """Remaining open time, or 0 if not open"""
+        if self.state != CircuitState.OPEN:
+            return 0.0
+        return max(0.0, self.timeout_seconds - (time.monotonic() - self.opened_at_monotonic))
 
 
 @dataclass
@@ -124,7 +155,7 @@ class NetworkHealthStatus:
     total_requests: int = 0
     successful_requests: int = 0
     failed_requests: int = 0
-    recent_failures: List[NetworkFailure] = field(default_factory=list)
+    recent_failures: Deque[NetworkFailure] = field(default_factory=lambda: deque(maxlen=50))
     circuit_breaker_open: bool = False
     last_check: Optional[datetime] = None
 
@@ -143,22 +174,32 @@ class NetworkHealthStatus:
 class NetworkFailureHandler:
     """
     Handles network failures gracefully with retry logic and circuit breaker
+
+    Safe to share between threads and between sync and async callers:
+    breaker state is guarded per host, and health counters and failure
+    histories by a handler-wide lock.
     """
 
     def __init__(self,
                  retry_config: Optional[RetryConfig] = None,
-                 logger: Optional[logging.Logger] = None):
+                 logger: Optional[logging.Logger] = None,
+                 breaker_template: Optional[CircuitBreakerState] = None):
         self.retry_config = retry_config or RetryConfig()
         self.logger = logger or get_logger("network_handler")
 
+        # Thresholds copied into each new per-host breaker
+        self.breaker_template = breaker_template or CircuitBreakerState()
+
         # Circuit breaker state per host
         self.circuit_breakers: Dict[str, CircuitBreakerState] = {}
+        self._breakers_lock = threading.Lock()
 
         # Network health tracking
         self.health_status = NetworkHealthStatus()
+        self._stats_lock = threading.Lock()
 
         # Failure history (last 100)
-        self.failure_history: List[NetworkFailure] = []
+        self.failure_history: Deque[NetworkFailure] = deque(maxlen=100)
 
         # User notification callbacks
         self.notification_callbacks: List[Callable[[NetworkFailure], None]] = []
@@ -296,53 +337,112 @@ class NetworkFailureHandler:
         backoff = min(backoff, self.retry_config.max_backoff_ms)
         return backoff / 1000.0  # Convert to seconds
 
+    def _get_breaker(self, host: str) -> CircuitBreakerState:
+        """Get or create the circuit breaker for a host"""
+        cb = self.circuit_breakers.get(host)
+        if cb is None:
+            with self._breakers_lock:
+                cb = self.circuit_breakers.get(host)
+                if cb is None:
+                    template = self.breaker_template
+                    cb = CircuitBreakerState(
+                        failure_threshold=template.failure_threshold,
+                        timeout_seconds=template.timeout_seconds,
+                        half_open_max_calls=template.half_open_max_calls,
+                    )
+                    self.circuit_breakers[host] = cb
+        return cb
+
     def check_circuit_breaker(self, host: str) -> Tuple[bool, Optional[str]]:
         """
         Check if circuit breaker is open for a host
 
+        A call that is let through while the breaker is half-open holds one
+        of half_open_max_calls probe slots until it reports its outcome with
+        record_success, record_failure or release_probe.
+
         Args:
             host: The host to check
 
         Returns:
             Tuple of (is_open, reason)
         """
-        if host not in self.circuit_breakers:
-            self.circuit_breakers[host] = CircuitBreakerState()
+        cb = self._get_breaker(host)
 
-        cb = self.circuit_breakers[host]
+        with cb.lock:
+            if cb.state == CircuitState.OPEN:
+                # Check if timeout has elapsed
+                if time.monotonic() - cb.opened_at_monotonic < cb.timeout_seconds:
+                    return True, f"Circuit breaker open (opened {cb.opened_at.isoformat()})"
 
-        if cb.is_open:
-            # Check if timeout has elapsed
-            if cb.opened_at and (datetime.now() - cb.opened_at).total_seconds() > cb.timeout_seconds:
                 # Transition to half-open state
                 self.logger.info(f"Circuit breaker for {host} transitioning to half-open")
-                cb.is_open = False
+                cb.state = CircuitState.HALF_OPEN
                 cb.success_count = 0
+                cb.probes_in_flight = 0
+
+            if cb.state == CircuitState.HALF_OPEN:
+                if cb.probes_in_flight >= cb.half_open_max_calls:
+                    return True, "Circuit breaker half-open (probe budget exhausted)"
+                cb.probes_in_flight += 1
                 return False, "Circuit breaker half-open"
-            else:
-                return True, f"Circuit breaker open (opened {cb.opened_at.isoformat()})"
 
         return False, None
 
-    def record_success(self, host: str):
+    def release_probe(self, host: str):
         """
-        Record a successful request for circuit breaker
+        Give back a half-open probe slot without recording an outcome
+
+        Used when an attempt is going to be retried rather than reported.
 
         Args:
-            host: The host that succeeded
+            host: The host the probe was acquired for
+        """
+        cb = self._get_breaker(host)
+        with cb.lock:
+            if cb.state == CircuitState.HALF_OPEN and cb.probes_in_flight > 0:
+                cb.probes_in_flight -= 1
+
+    def get_retry_after(self, host: str) -> int:
         """
-        if host not in self.circuit_breakers:
-            self.circuit_breakers[host] = CircuitBreakerState()
+        Seconds until a rejected caller should try the host again
 
-        cb = self.circuit_breakers[host]
+        Args:
+            host: The host to check
+
+        Returns:
+            Whole seconds until the breaker goes half-open (at least 1)
+        """
+        cb = self._get_breaker(host)
+        with cb.lock:
+            return max(1, int(cb.seconds_until_half_open() + 0.999))
 
-        cb.last_success_time = datetime.now()
-        cb.success_count += 1
+    def record_success(self, host: str, probe: bool = False):
+        """
+        Record a successful request for circuit breaker
 
-        # If we were in half-open and got enough successes, close circuit breaker
-        if cb.success_count >= cb.half_open_max_calls:
-            cb.failure_count = 0
-            self.logger.info(f"Circuit breaker for {host} closed after {cb.success_count} successes")
+        Args:
+            host: The host that succeeded
+            probe: Whether the call holds a half-open probe slot (it is given
+                back); calls let through while closed do not
+        """
+        cb = self._get_breaker(host)
+
+        with cb.lock:
+            cb.last_success_time = datetime.now()
+            cb.success_count += 1
+
+            if cb.state == CircuitState.HALF_OPEN:
+                if probe and cb.probes_in_flight > 0:
+                    cb.probes_in_flight -= 1
+                # Enough successful probes: close circuit breaker
+                if cb.success_count >= cb.half_open_max_calls:
+                    cb.state = CircuitState.CLOSED
+                    cb.failure_count = 0
+                    self.logger.info(f"Circuit breaker for {host} closed after {cb.success_count} successes")
+            else:
+                # Only consecutive failures count toward opening
+                cb.failure_count = 0
 
     def record_failure(self, host: str, failure: NetworkFailure):
         """
@@ -352,44 +452,48 @@ class NetworkFailureHandler:
             host: The host that failed
             failure: The failure that occurred
         """
-        if host not in self.circuit_breakers:
-            self.circuit_breakers[host] = CircuitBreakerState()
-
-        cb = self.circuit_breakers[host]
+        cb = self._get_breaker(host)
 
-        cb.failure_count += 1
-        cb.last_failure_time = datetime.now()
+        with cb.lock:
+            cb.failure_count += 1
+            cb.last_failure_time = datetime.now()
 
-        # Open circuit breaker if threshold exceeded
-        if cb.failure_count >= cb.failure_threshold:
-            if not cb.is_open:
-                cb.is_open = True
+            # A failed probe reopens immediately; otherwise open at the threshold
+            if cb.state == CircuitState.HALF_OPEN or (
+                cb.state == CircuitState.CLOSED and cb.failure_count >= cb.failure_threshold
+            ):
+                cb.state = CircuitState.OPEN
                 cb.opened_at = datetime.now()
+                cb.opened_at_monotonic = time.monotonic()
+                cb.probes_in_flight = 0
                 self.logger.warning(
                     f"Circuit breaker opened for {host} after {cb.failure_count} failures"
                 )
 
-        # Add to health status
-        self.health_status.failed_requests += 1
-        self.health_status.recent_failures.append(failure)
-
-        # Keep only last 50 failures in recent list
-        if len(self.health_status.recent_failures) > 50:
-            self.health_status.recent_failures.pop(0)
+        with self._stats_lock:
+            # Add to health status (deques drop the oldest entries themselves)
+            self.health_status.failed_requests += 1
+            self.health_status.recent_failures.append(failure)
 
-        # Add to history
-        self.failure_history.append(failure)
-        if len(self.failure_history) > 100:
-            self.failure_history.pop(0)
+            # Add to history
+            self.failure_history.append(failure)
 
         # Notify user
         self._notify_user(failure)
 
+    def _count_request(self):
+        with self._stats_lock:
+            self.health_status.total_requests += 1
+
+    def _count_success(self):
+        with self._stats_lock:
+            self.health_status.successful_requests += 1
+
     def get_health_status(self) -> NetworkHealthStatus:
         """Get current network health status"""
         self.health_status.last_check = datetime.now()
         self.health_status.circuit_breaker_open = any(
-            cb.is_open for cb in self.circuit_breakers.values()
+            cb.is_open for cb in list(self.circuit_breakers.values())
         )
         return self.health_status
 
@@ -472,6 +576,12 @@ def handle_network_failures(
             return await requests.get(url)
     """
     def decorator(func):
+        # Create the shared handler up front so concurrent first calls can't
+        # each create their own (and their own breakers)
+        nonlocal handler
+        if handler is None:
+            handler = NetworkFailureHandler()
+
         # Detect if function is async or sync
         is_async = asyncio.iscoroutinefunction(func)
 
@@ -479,10 +589,6 @@ def handle_network_failures(
             # Async wrapper
             @wraps(func)
             async def async_wrapper(*args, **kwargs):
-                nonlocal handler
-                if handler is None:
-                    handler = NetworkFailureHandler()
-
                 # Extract URL/host if provided
                 url = None
                 host = None
@@ -497,6 +603,7 @@ def handle_network_failures(
 
                 while True:
                     # Check circuit breaker
+                    probe_acquired = False
                     if host:
                         is_open, reason = handler.check_circuit_breaker(host)
                         if is_open:
@@ -505,11 +612,13 @@ def handle_network_failures(
                             return {
                                 "success": False,
                                 "error": "Service temporarily unavailable (circuit breaker)",
-                                "retry_after": 60,
+                                "retry_after": handler.get_retry_after(host),
                             }
+                        # Let through by a half-open breaker: this call holds a probe slot
+                        probe_acquired = reason is not None
 
                     # Update health status
-                    handler.health_status.total_requests += 1
+                    handler._count_request()
 
                     try:
                         # Attempt the request
@@ -517,8 +626,9 @@ def handle_network_failures(
 
                         # Record success
                         if host:
-                            handler.record_success(host)
-                        handler.health_status.successful_requests += 1
+                            handler.record_success(host, probe=probe_acquired)
+                            probe_acquired = False
+                        handler._count_success()
 
                         return result
 
@@ -541,12 +651,16 @@ def handle_network_failures(
                                 f"Retrying {func.__name__} in {backoff:.1f}s (attempt {retry_count}/{handler.retry_config.max_retries})"
                             )
 
+                            if probe_acquired:
+                                handler.release_probe(host)
+                                probe_acquired = False
                             await asyncio.sleep(backoff)
                             continue
                         else:
                             # Record failure and return error
                             if host:
                                 handler.record_failure(host, failure)
+                                probe_acquired = False
 
                             # Return error response instead of raising
                             user_message = handler.get_user_friendly_message(failure)
@@ -559,16 +673,19 @@ def handle_network_failures(
                                 "retry_count": retry_count,
                             }
 
+                    finally:
+                        # Cancelled, interrupted or failed while handling the
+                        # error: give the probe slot back, or the breaker stays
+                        # half-open with its budget used up
+                        if probe_acquired:
+                            handler.release_probe(host)
+
             return async_wrapper
 
         else:
             # Sync wrapper
             @wraps(func)
             def sync_wrapper(*args, **kwargs):
-                nonlocal handler
-                if handler is None:
-                    handler = NetworkFailureHandler()
-
                 # Extract URL/host if provided
                 url = None
                 host = None
@@ -583,6 +700,7 @@ def handle_network_failures(
 
                 while True:
                     # Check circuit breaker
+                    probe_acquired = False
                     if host:
                         is_open, reason = handler.check_circuit_breaker(host)
                         if is_open:
@@ -591,11 +709,13 @@ def handle_network_failures(
                             return {
                                 "success": False,
                                 "error": "Service temporarily unavailable (circuit breaker)",
-                                "retry_after": 60,
+                                "retry_after": handler.get_retry_after(host),
                             }
+                        # Let through by a half-open breaker: this call holds a probe slot
+                        probe_acquired = reason is not None
 
                     # Update health status
-                    handler.health_status.total_requests += 1
+                    handler._count_request()
 
                     try:
                         # Attempt the request
@@ -603,8 +723,9 @@ def handle_network_failures(
 
                         # Record success
                         if host:
-                            handler.record_success(host)
-                        handler.health_status.successful_requests += 1
+                            handler.record_success(host, probe=probe_acquired)
+                            probe_acquired = False
+                        handler._count_success()
 
                         return result
 
@@ -627,12 +748,16 @@ def handle_network_failures(
                                 f"Retrying {func.__name__} in {backoff:.1f}s (attempt {retry_count}/{handler.retry_config.max_retries})"
                             )
 
+                            if probe_acquired:
+                                handler.release_probe(host)
+                                probe_acquired = False
                             time.sleep(backoff)
                             continue
                         else:
                             # Record failure and return error
                             if host:
                                 handler.record_failure(host, failure)
+                                probe_acquired = False
 
                             # Return error response instead of raising
                             user_message = handler.get_user_friendly_message(failure)
@@ -645,6 +770,13 @@ def handle_network_failures(
                                 "retry_count": retry_count,
                             }
 
+                    finally:
+                        # Cancelled, interrupted or failed while handling the
+                        # error: give the probe slot back, or the breaker stays
+                        # half-open with its budget used up
+                        if probe_acquired:
+                            handler.release_probe(host)
+
             return sync_wrapper
 
     return decorator
@@ -659,6 +791,7 @@ __all__ = [
     "NetworkErrorSeverity",
     "NetworkFailure",
     "RetryConfig",
+    "CircuitState",
     "CircuitBreakerState",
     "NetworkHealthStatus",
     "NetworkFailureHandler",
@@ -7,12 +7,25 @@ Provides structured logging for security-related events with:
 - Detailed context (user, action, resource, outcome)
 - Tamper-evident logging
 - Integration with existing logger
+- Non-blocking NDJSON audit trail with size-based rotation
+- Indexed queries by user, event type and time range
+
+Events are handed to a background writer thread, which encodes each one to
+JSON exactly once and appends it as a single line to
+``security_audit.ndjson``. Every ``index_block_size`` lines the writer adds a
+block summary (byte range, time range, users, event types) to the sidecar
+``.idx`` file, so queries only read the blocks that can match.
 """
 
+import atexit
 import logging
 import json
-from datetime import datetime
-from typing import Optional, Dict, Any
+import os
+import queue
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Set, Union
 from enum import Enum
 from dataclasses import dataclass, asdict
 
@@ -102,7 +115,7 @@ class SecurityEvent:
 
     def to_json(self) -> str:
         """Convert to JSON string for logging"""
-        return json.dumps(self.to_dict())
+        return json.dumps(self.to_dict(), separators=(",", ":"))
 
     def to_log_message(self) -> str:
         """Format as human-readable log message"""
@@ -127,26 +140,436 @@ class SecurityEvent:
         return " | ".join(parts)
 
 
+# Audit trail file name (rotated copies get .1, .2, ... suffixes)
+AUDIT_LOG_NAME = "security_audit.ndjson"
+INDEX_SUFFIX = ".idx"
+
+_SEVERITY_LEVELS = {
+    SecuritySeverity.INFO.value: logging.INFO,
+    SecuritySeverity.WARNING.value: logging.WARNING,
+    SecuritySeverity.ERROR.value: logging.ERROR,
+    SecuritySeverity.CRITICAL.value: logging.CRITICAL,
+}
+
+# Queue sentinel that tells the writer thread to exit
+_STOP = object()
+
+
+def _format_timestamp(value: Union[datetime, str]) -> str:
+    """Normalize a datetime to the event timestamp format (UTC, microseconds, Z)"""
+    if isinstance(value, str):
+        return value
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.isoformat(timespec="microseconds") + "Z"
+
+
+class _IndexBlock:
+    """Running summary of the lines written since the last index entry"""
+
+    __slots__ = ("offset", "count", "start_ts", "end_ts", "users", "types")
+
+    def __init__(self, offset: int):
+        self.offset = offset
+        self.count = 0
+        self.start_ts: Optional[str] = None
+        self.end_ts: Optional[str] = None
+        self.users: Set[str] = set()
+        self.types: Set[str] = set()
+
+    def add(self, event: Dict[str, Any]) -> None:
+        timestamp = event.get("timestamp") or ""
+        if self.start_ts is None or timestamp < self.start_ts:
+            self.start_ts = timestamp
+        if self.end_ts is None or timestamp > self.end_ts:
+            self.end_ts = timestamp
+        for key in ("user_id", "username"):
+            if event.get(key):
+                self.users.add(str(event[key]))
+        self.types.add(event.get("event_type") or "")
+        self.count += 1
+
+    def to_entry(self, end: int) -> Dict[str, Any]:
+        return {
+            "offset": self.offset,
+            "end": end,
+            "count": self.count,
+            "start_ts": self.start_ts,
+            "end_ts": self.end_ts,
+            "users": sorted(self.users),
+            "types": sorted(self.types),
+        }
+
+
+class AuditLogWriter:
+    """
+    Background writer for the NDJSON security audit trail
+
+    Callers only enqueue events; a single daemon thread serializes them,
+    appends them to the active file, rotates it by size and maintains the
+    block index. The human-readable log line is also emitted from the writer
+    thread, so audit volume never adds file or console I/O to the request path.
+    """
+
+    def __init__(
+        self,
+        log_dir: Path,
+        max_bytes: int = 10 * 1024 * 1024,
+        backup_count: int = 5,
+        index_block_size: int = 256,
+        queue_size: int = 10000,
+        logger: Optional[logging.Logger] = None,
+    ):
+        """
+        Initialize the writer (the thread and files are created on first event)
+
+        Args:
+            log_dir: Directory holding the audit trail and its index
+            max_bytes: Rotate the active file once it would exceed this size
+            backup_count: Number of rotated files to keep
+            index_block_size: Lines per index block
+            queue_size: Maximum queued events before callers block
+            logger: Logger that receives the human-readable event lines
+        """
+        self.log_dir = Path(log_dir)
+        self.log_file = self.log_dir / AUDIT_LOG_NAME
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.index_block_size = index_block_size
+        self.logger = logger
+
+        self.events_written = 0
+        self.rotations = 0
+
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=queue_size)
+        self._start_lock = threading.Lock()
+        # Held by the writer while touching files, and by queries while reading them
+        self._file_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+        self._file = None
+        self._size = 0
+        self._block: Optional[_IndexBlock] = None
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+
+    def submit(self, event: SecurityEvent) -> None:
+        """Queue an event for writing (blocks only if the queue is full)"""
+        if self._thread is None:
+            self._start()
+        if self._closed:
+            return
+        self._queue.put(event)
+
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        """
+        Wait until every queued event has been written
+
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely)
+
+        Returns:
+            True if the queue drained in time
+        """
+        if self._thread is None or self._closed:
+            return True
+        marker = threading.Event()
+        self._queue.put(marker)
+        return marker.wait(timeout)
+
+    def close(self) -> None:
+        """Write queued events, record the open index block and stop the thread"""
+        with self._start_lock:
+            if self._closed:
+                return
+            self._closed = True
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join(timeout=5)
+
+    def _start(self) -> None:
+        with self._start_lock:
+            if self._thread is not None or self._closed:
+                return
+            self.log_dir.mkdir(parents=True, exist_ok=True)
+            self._open()
+            self._thread = threading.Thread(
+                target=self._run,
+                name="security-audit-writer",
+                daemon=True
+            )
+            self._thread.start()
+
+    # ------------------------------------------------------------------
+    # Writer thread
+    # ------------------------------------------------------------------
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < 512:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            events = [item for item in batch if isinstance(item, SecurityEvent)]
+            stop = any(item is _STOP for item in batch)
+            try:
+                with self._file_lock:
+                    for event in events:
+                        self._write_event(event)
+                    self._file.flush()
+                    if stop:
+                        self._close_block()
+                        self._file.close()
+            except Exception as e:
+                # Never let a bad event or full disk kill the writer thread
+                if self.logger is not None:
+                    self.logger.error(f"Security audit writer error: {e}")
+
+            # Release flush() callers waiting on this batch
+            for item in batch:
+                if isinstance(item, threading.Event):
+                    item.set()
+
+            if self.logger is not None:
+                for event in events:
+                    level = _SEVERITY_LEVELS.get(event.severity, logging.INFO)
+                    if self.logger.isEnabledFor(level):
+                        self.logger.log(level, event.to_log_message())
+
+            if stop:
+                return
+
+    def _write_event(self, event: SecurityEvent) -> None:
+        data = event.to_dict()
+        line = (json.dumps(data, separators=(",", ":"), default=str) + "\n").encode("utf-8")
+
+        if self._size and self._size + len(line) > self.max_bytes:
+            self._rotate()
+
+        self._file.write(line)
+        self._block.add(data)
+        self._size += len(line)
+        self.events_written += 1
+
+        if self._block.count >= self.index_block_size:
+            self._close_block()
+
+    def _close_block(self) -> None:
+        """Append the summary of the current block to the index and start a new one"""
+        if self._block is None or self._block.count == 0:
+            return
+        self._file.flush()
+        entry = json.dumps(self._block.to_entry(self._size), separators=(",", ":"))
+        with open(self._index_path(self.log_file), "a", encoding="utf-8") as f:
+            f.write(entry + "\n")
+        self._block = _IndexBlock(self._size)
+
+    def _open(self) -> None:
+        """Open the active file, repairing a torn tail and indexing unindexed lines"""
+        self._file = open(self.log_file, "ab")
+        self._size = self._file.tell()
+
+        indexed_end = 0
+        for entry in self._read_index(self.log_file):
+            indexed_end = max(indexed_end, entry["end"])
+
+        self._block = _IndexBlock(indexed_end)
+        if indexed_end < self._size:
+            # Lines written after the last index entry (e.g. after a crash)
+            with open(self.log_file, "rb") as f:
+                f.seek(indexed_end)
+                tail = f.read()
+            complete = tail[:tail.rfind(b"\n") + 1]
+            if len(complete) < len(tail):
+                self._file.truncate(indexed_end + len(complete))
+                self._size = indexed_end + len(complete)
+            for line in complete.splitlines():
+                try:
+                    self._block.add(json.loads(line))
+                except ValueError:
+                    continue
+            self._close_block()
+
+    def _rotate(self) -> None:
+        """Shift security_audit.ndjson -> .1 -> .2 ..., keeping backup_count files"""
+        self._close_block()
+        self._file.close()
+
+        for i in range(self.backup_count, 0, -1):
+            source = self._rotated_path(i - 1)
+            target = self._rotated_path(i)
+            for src, dst in ((source, target), (self._index_path(source), self._index_path(target))):
+                if i == self.backup_count and dst.exists():
+                    dst.unlink()
+                if src.exists():
+                    os.replace(src, dst)
+        if self.backup_count == 0:
+            for path in (self.log_file, self._index_path(self.log_file)):
+                if path.exists():
+                    path.unlink()
+
+        self._file = open(self.log_file, "ab")
+        self._size = 0
+        self._block = _IndexBlock(0)
+        self.rotations += 1
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def query(
+        self,
+        user: Optional[str] = None,
+        event_type: Optional[str] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Search the audit trail, oldest event first
+
+        Args:
+            user: Match events whose user_id or username equals this value
+            event_type: Match events of this type
+            start: Earliest timestamp (inclusive, event timestamp format)
+            end: Latest timestamp (inclusive, event timestamp format)
+            limit: Return only the most recent matches
+
+        Returns:
+            Matching events as dictionaries
+        """
+        self.flush()
+
+        def block_matches(entry: Dict[str, Any]) -> bool:
+            if start and entry["end_ts"] and entry["end_ts"] < start:
+                return False
+            if end and entry["start_ts"] and entry["start_ts"] > end:
+                return False
+            if user and user not in entry["users"]:
+                return False
+            if event_type and event_type not in entry["types"]:
+                return False
+            return True
+
+        def event_matches(event: Dict[str, Any]) -> bool:
+            timestamp = event.get("timestamp") or ""
+            if start and timestamp < start:
+                return False
+            if end and timestamp > end:
+                return False
+            if user and user not in (event.get("user_id"), event.get("username")):
+                return False
+            if event_type and event.get("event_type") != event_type:
+                return False
+            return True
+
+        results: List[Dict[str, Any]] = []
+        with self._file_lock:
+            for i in range(self.backup_count, -1, -1):
+                path = self._rotated_path(i)
+                if not path.exists():
+                    continue
+
+                ranges = []
+                indexed_end = 0
+                for entry in self._read_index(path):
+                    indexed_end = max(indexed_end, entry["end"])
+                    if block_matches(entry):
+                        ranges.append((entry["offset"], entry["end"]))
+                # Lines after the last index entry belong to the open block
+                ranges.append((indexed_end, None))
+
+                with open(path, "rb") as f:
+                    for offset, stop in ranges:
+                        f.seek(offset)
+                        chunk = f.read() if stop is None else f.read(stop - offset)
+                        for line in chunk.splitlines():
+                            try:
+                                event = json.loads(line)
+                            except ValueError:
+                                continue
+                            if event_matches(event):
+                                results.append(event)
+
+        if limit is not None:
+            results = results[-limit:] if limit > 0 else []
+        return results
+
+    def _rotated_path(self, index: int) -> Path:
+        if index == 0:
+            return self.log_file
+        return self.log_file.with_name(f"{AUDIT_LOG_NAME}.{index}")
+
+    @staticmethod
+    def _index_path(path: Path) -> Path:
+        return path.with_name(path.name + INDEX_SUFFIX)
+
+    def _read_index(self, path: Path) -> List[Dict[str, Any]]:
+        index_path = self._index_path(path)
+        if not index_path.exists():
+            return []
+        entries = []
+        with open(index_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    continue
+        return entries
+
+
 class SecurityAuditLogger:
     """
     Centralized security event logger
 
     Logs all security-related events in a structured, audit-ready format.
-    Integrates with the existing UATGatewayLogger.
+    Integrates with the existing UATGatewayLogger. Events are written by an
+    AuditLogWriter thread; the calling request only builds and queues them.
     """
 
-    def __init__(self, component: str = "security"):
+    def __init__(
+        self,
+        component: str = "security",
+        log_dir: Optional[Path] = None,
+        max_bytes: int = 10 * 1024 * 1024,
+        backup_count: int = 5,
+        index_block_size: int = 256,
+    ):
         """
         Initialize security audit logger
 
         Args:
             component: Component name for logger namespace
+            log_dir: Directory for the NDJSON audit trail (default: ./state/security_audit)
+            max_bytes: Size at which the audit file is rotated
+            backup_count: Number of rotated audit files to keep
+            index_block_size: Events per sidecar index block
         """
         # Import here to avoid circular dependency
         from custom.uat_gateway.utils.logger import get_logger
         self.logger = get_logger(component)
         self.component = component
 
+        if log_dir is None:
+            log_dir = Path("./state/security_audit")
+
+        self.writer = AuditLogWriter(
+            log_dir=Path(log_dir),
+            max_bytes=max_bytes,
+            backup_count=backup_count,
+            index_block_size=index_block_size,
+            logger=self.logger,
+        )
+
+        # Write queued events on exit
+        atexit.register(self.close)
+
     def log_security_event(
         self,
         event_type: SecurityEventType,
@@ -184,7 +607,7 @@ class SecurityAuditLogger:
         """
         # Create security event
         event = SecurityEvent(
-            timestamp=datetime.utcnow().isoformat() + "Z",
+            timestamp=_format_timestamp(datetime.utcnow()),
             event_type=event_type.value,
             severity=severity.value,
             user_id=user_id,
@@ -199,22 +622,53 @@ class SecurityAuditLogger:
             request_id=request_id,
         )
 
-        # Log at appropriate level
-        log_message = event.to_log_message()
+        # Serialization, file I/O and the human-readable log line all happen
+        # on the writer thread
+        self.writer.submit(event)
+
+        return event
+
+    def query_events(
+        self,
+        user: Optional[str] = None,
+        event_type: Optional[Union[SecurityEventType, str]] = None,
+        start: Optional[Union[datetime, str]] = None,
+        end: Optional[Union[datetime, str]] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Search logged security events
 
-        if severity == SecuritySeverity.CRITICAL:
-            self.logger.critical(log_message)
-        elif severity == SecuritySeverity.ERROR:
-            self.logger.error(log_message)
-        elif severity == SecuritySeverity.WARNING:
-            self.logger.warning(log_message)
-        else:
-            self.logger.info(log_message)
+        Naive datetimes are treated as UTC. Pending events are written before
+        the search runs.
 
-        # Also log structured JSON for parsing
-        self.logger.debug(f"SECURITY_EVENT: {event.to_json()}")
+        Args:
+            user: User ID or username
+            event_type: Event type to match
+            start: Earliest event time (inclusive)
+            end: Latest event time (inclusive)
+            limit: Return only the most recent matches
 
-        return event
+        Returns:
+            Matching events as dictionaries, oldest first
+        """
+        if isinstance(event_type, SecurityEventType):
+            event_type = event_type.value
+        return self.writer.query(
+            user=user,
+            event_type=event_type,
+            start=_format_timestamp(start) if start is not None else None,
+            end=_format_timestamp(end) if end is not None else None,
+            limit=limit,
+        )
+
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        """Wait until all logged events are on disk"""
+        return self.writer.flush(timeout)
+
+    def close(self) -> None:
+        """Write pending events and stop the background writer"""
+        self.writer.close()
 
     # Convenience methods for common security events
 
@@ -470,5 +924,6 @@ __all__ = [
     "SecuritySeverity",
     "SecurityEvent",
     "SecurityAuditLogger",
+    "AuditLogWriter",
     "get_security_audit_logger",
 ]
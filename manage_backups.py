@@ -102,7 +102,9 @@ def cmd_backup(args):
 
     if backup_path:
         print(f"✅ Backup created: {backup_path.name}")
-        print(f"   Size: {backup_path.stat().st_size / 1024:.1f} KB")
+        metadata = json.loads(backup_path.read_text())
+        print(f"   Size: {metadata['backup_size'] / 1024:.1f} KB")
+        print(f"   New data stored: {metadata['stored_bytes'] / 1024:.1f} KB")
         return 0
     else:
         print("❌ Backup failed")
@@ -310,7 +310,7 @@ def autoscaler_manual_scale(
     if not success:
         return {
             "success": False,
-            "error": "Failed to update resource limits (service restart failed)"
+            "error": "Failed to update resource limits"
         }
 
     return {
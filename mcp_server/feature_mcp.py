@@ -22,14 +22,20 @@ Tools:
 - feature_get_ready: Get features ready to implement
 - feature_get_blocked: Get features blocked by dependencies (with limit)
 - feature_get_graph: Get the dependency graph
+- feature_get_overview: Get ready + blocked features and stats in one call
+
+Ready/blocked/graph queries are answered from a cached snapshot of the
+resolved graph, rebuilt only when the features table changes.
 
 Note: Feature selection (which feature to work on) is handled by the
 orchestrator, not by agents. Agents receive pre-assigned feature IDs.
 """
 
+import functools
 import json
 import os
 import sys
+import threading
 from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import Annotated
@@ -41,7 +47,7 @@ from sqlalchemy import text
 # Add parent directory to path so we can import from api module
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from api.database import Feature, atomic_transaction, create_database
+from api.database import Feature, atomic_transaction, create_database, get_feature_revision
 from api.dependency_resolver import (
     MAX_DEPENDENCIES_PER_FEATURE,
     compute_scheduling_scores,
@@ -118,6 +124,7 @@ async def server_lifespan(server: FastMCP):
     yield
 
     # Cleanup
+    _graph_cache.close()
     if _engine:
         _engine.dispose()
 
@@ -133,6 +140,157 @@ def get_session():
     return _session_maker()
 
 
+class _GraphSnapshot:
+    """Resolved dependency graph for one database revision.
+
+    Holds everything feature_get_ready, feature_get_blocked, feature_get_graph
+    and feature_get_overview return, so repeated polling by agents costs a
+    slice and a json.dumps instead of a full table scan.
+    """
+
+    def __init__(self, revision: tuple[str, int], features: list[dict]):
+        self.revision = revision
+        passing_ids = {f["id"] for f in features if f["passes"]}
+
+        self.ready: list[dict] = []
+        self.blocked: list[dict] = []
+        self.nodes: list[dict] = []
+        self.edges: list[dict] = []
+        in_progress = 0
+
+        for f in features:
+            deps = f["dependencies"]
+            blocking = [d for d in deps if d not in passing_ids]
+            if f["in_progress"]:
+                in_progress += 1
+
+            if f["passes"]:
+                status = "done"
+            elif blocking:
+                status = "blocked"
+                self.blocked.append({**f, "blocked_by": blocking})
+            elif f["in_progress"]:
+                status = "in_progress"
+            else:
+                status = "pending"
+                self.ready.append(f)
+
+            self.nodes.append({
+                "id": f["id"],
+                "name": f["name"],
+                "category": f["category"],
+                "status": status,
+                "priority": f["priority"],
+                "dependencies": deps
+            })
+            for dep_id in deps:
+                self.edges.append({"source": dep_id, "target": f["id"]})
+
+        # Sort by scheduling score (higher = first), then priority, then id
+        scores = compute_scheduling_scores(features)
+        self.ready.sort(key=lambda f: (-scores.get(f["id"], 0), f["priority"], f["id"]))
+
+        total = len(features)
+        self.stats = {
+            "passing": len(passing_ids),
+            "in_progress": in_progress,
+            "total": total,
+            "percentage": round((len(passing_ids) / total) * 100, 1) if total > 0 else 0.0
+        }
+        self._graph_json: str | None = None
+
+    def graph_json(self) -> str:
+        """Serialized feature_get_graph payload, built once per snapshot."""
+        if self._graph_json is None:
+            self._graph_json = json.dumps({"nodes": self.nodes, "edges": self.edges})
+        return self._graph_json
+
+
+class _GraphCache:
+    """Revision-keyed cache of the resolved dependency graph.
+
+    Validity is checked in two steps. A dedicated read-only connection polls
+    PRAGMA data_version, which changes whenever any other connection (in this
+    or another process) commits; while it is unchanged the snapshot is served
+    without touching the features table. When it does change, the trigger-
+    maintained feature revision decides whether the features table was
+    actually written, so commits to unrelated tables don't force a rebuild.
+    Writes made by this server call invalidate() directly.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshot: _GraphSnapshot | None = None
+        self._watch_conn = None
+        self._data_version: int | None = None
+
+    def invalidate(self) -> None:
+        """Drop the snapshot after a write made by this server."""
+        with self._lock:
+            self._snapshot = None
+
+    def close(self) -> None:
+        """Release the watcher connection and drop the snapshot."""
+        with self._lock:
+            if self._watch_conn is not None:
+                self._watch_conn.close()
+            self._watch_conn = None
+            self._snapshot = None
+            self._data_version = None
+
+    def _poll_data_version(self) -> int:
+        # Raw DBAPI connection: the engine's begin hook would otherwise take a
+        # BEGIN IMMEDIATE write lock just to read a pragma
+        if self._watch_conn is None:
+            self._watch_conn = _engine.raw_connection()
+        cursor = self._watch_conn.cursor()
+        try:
+            cursor.execute("PRAGMA data_version")
+            return cursor.fetchone()[0]
+        finally:
+            cursor.close()
+
+    def get(self) -> _GraphSnapshot:
+        """Return a snapshot that reflects the current database revision."""
+        if _session_maker is None:
+            raise RuntimeError("Database not initialized")
+
+        with self._lock:
+            data_version = self._poll_data_version()
+            if self._snapshot is not None and data_version == self._data_version:
+                return self._snapshot
+
+            session = get_session()
+            try:
+                # Read revision and rows in one transaction so they agree
+                revision = get_feature_revision(session)
+                if self._snapshot is not None and self._snapshot.revision == revision:
+                    self._data_version = data_version
+                    return self._snapshot
+
+                features = [f.to_dict() for f in session.query(Feature).all()]
+            finally:
+                session.close()
+
+            self._snapshot = _GraphSnapshot(revision, features)
+            self._data_version = data_version
+            return self._snapshot
+
+
+_graph_cache = _GraphCache()
+
+
+def _invalidates_graph(func):
+    """Drop the cached graph once a write tool has committed and returned."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _graph_cache.invalidate()
+    return wrapper
+
+
 @mcp.tool()
 def feature_get_stats() -> str:
     """Get statistics about feature completion progress.
@@ -228,6 +386,7 @@ def feature_get_summary(
 
 
 @mcp.tool()
+@_invalidates_graph
 def feature_mark_passing(
     feature_id: Annotated[int, Field(description="The ID of the feature to mark as passing", ge=1)]
 ) -> str:
@@ -272,6 +431,7 @@ def feature_mark_passing(
 
 
 @mcp.tool()
+@_invalidates_graph
 def feature_mark_failing(
     feature_id: Annotated[int, Field(description="The ID of the feature to mark as failing", ge=1)]
 ) -> str:
@@ -323,6 +483,7 @@ def feature_mark_failing(
 
 
 @mcp.tool()
+@_invalidates_graph
 def feature_skip(
     feature_id: Annotated[int, Field(description="The ID of the feature to skip", ge=1)]
 ) -> str:
@@ -385,6 +546,7 @@ def feature_skip(
 
 
 @mcp.tool()
+@_invalidates_graph
 def feature_mark_in_progress(
     feature_id: Annotated[int, Field(description="The ID of the feature to mark as in-progress", ge=1)]
 ) -> str:
@@ -431,6 +593,7 @@ def feature_mark_in_progress(
 
 
 @mcp.tool()
+@_invalidates_graph
 def feature_claim_and_get(
     feature_id: Annotated[int, Field(description="The ID of the feature to claim", ge=1)]
 ) -> str:
@@ -484,6 +647,7 @@ def feature_claim_and_get(
 
 
 @mcp.tool()
+@_invalidates_graph
 def feature_clear_in_progress(
     feature_id: Annotated[int, Field(description="The ID of the feature to clear in-progress status", ge=1)]
 ) -> str:
@@ -523,6 +687,7 @@ def feature_clear_in_progress(
 
 
 @mcp.tool()
+@_invalidates_graph
 def feature_create_bulk(
     features: Annotated[list[dict], Field(description="List of features to create, each with category, name, description, and steps")]
 ) -> str:
@@ -627,6 +792,7 @@ def feature_create_bulk(
 
 
 @mcp.tool()
+@_invalidates_graph
 def feature_create(
     category: Annotated[str, Field(min_length=1, max_length=100, description="Feature category (e.g., 'Authentication', 'API', 'UI')")],
     name: Annotated[str, Field(min_length=1, max_length=255, description="Feature name")],
@@ -681,6 +847,7 @@ def feature_create(
 
 
 @mcp.tool()
+@_invalidates_graph
 def feature_add_dependency(
     feature_id: Annotated[int, Field(ge=1, description="Feature to add dependency to")],
     dependency_id: Annotated[int, Field(ge=1, description="ID of the dependency feature")]
@@ -743,6 +910,7 @@ def feature_add_dependency(
 
 
 @mcp.tool()
+@_invalidates_graph
 def feature_remove_dependency(
     feature_id: Annotated[int, Field(ge=1, description="Feature to remove dependency from")],
     dependency_id: Annotated[int, Field(ge=1, description="ID of dependency to remove")]
@@ -796,31 +964,13 @@ def feature_get_ready(
     Returns:
         JSON with: features (list), count (int), total_ready (int)
     """
-    session = get_session()
-    try:
-        all_features = session.query(Feature).all()
-        passing_ids = {f.id for f in all_features if f.passes}
-
-        ready = []
-        all_dicts = [f.to_dict() for f in all_features]
-        for f in all_features:
-            if f.passes or f.in_progress:
-                continue
-            deps = f.dependencies or []
-            if all(dep_id in passing_ids for dep_id in deps):
-                ready.append(f.to_dict())
-
-        # Sort by scheduling score (higher = first), then priority, then id
-        scores = compute_scheduling_scores(all_dicts)
-        ready.sort(key=lambda f: (-scores.get(f["id"], 0), f["priority"], f["id"]))
-
-        return json.dumps({
-            "features": ready[:limit],
-            "count": len(ready[:limit]),
-            "total_ready": len(ready)
-        })
-    finally:
-        session.close()
+    snapshot = _graph_cache.get()
+    ready = snapshot.ready[:limit]
+    return json.dumps({
+        "features": ready,
+        "count": len(ready),
+        "total_ready": len(snapshot.ready)
+    })
 
 
 @mcp.tool()
@@ -838,30 +988,13 @@ def feature_get_blocked(
     Returns:
         JSON with: features (list with blocked_by field), count (int), total_blocked (int)
     """
-    session = get_session()
-    try:
-        all_features = session.query(Feature).all()
-        passing_ids = {f.id for f in all_features if f.passes}
-
-        blocked = []
-        for f in all_features:
-            if f.passes:
-                continue
-            deps = f.dependencies or []
-            blocking = [d for d in deps if d not in passing_ids]
-            if blocking:
-                blocked.append({
-                    **f.to_dict(),
-                    "blocked_by": blocking
-                })
-
-        return json.dumps({
-            "features": blocked[:limit],
-            "count": len(blocked[:limit]),
-            "total_blocked": len(blocked)
-        })
-    finally:
-        session.close()
+    snapshot = _graph_cache.get()
+    blocked = snapshot.blocked[:limit]
+    return json.dumps({
+        "features": blocked,
+        "count": len(blocked),
+        "total_blocked": len(snapshot.blocked)
+    })
 
 
 @mcp.tool()
@@ -874,48 +1007,40 @@ def feature_get_graph() -> str:
     Returns:
         JSON with: nodes (list), edges (list of {source, target})
     """
-    session = get_session()
-    try:
-        all_features = session.query(Feature).all()
-        passing_ids = {f.id for f in all_features if f.passes}
+    return _graph_cache.get().graph_json()
 
-        nodes = []
-        edges = []
 
-        for f in all_features:
-            deps = f.dependencies or []
-            blocking = [d for d in deps if d not in passing_ids]
-
-            if f.passes:
-                status = "done"
-            elif blocking:
-                status = "blocked"
-            elif f.in_progress:
-                status = "in_progress"
-            else:
-                status = "pending"
+@mcp.tool()
+def feature_get_overview(
+    ready_limit: Annotated[int, Field(default=10, ge=1, le=50, description="Max ready features to return")] = 10,
+    blocked_limit: Annotated[int, Field(default=20, ge=1, le=100, description="Max blocked features to return")] = 20
+) -> str:
+    """Get ready features, blocked features and progress stats in one call.
 
-            nodes.append({
-                "id": f.id,
-                "name": f.name,
-                "category": f.category,
-                "status": status,
-                "priority": f.priority,
-                "dependencies": deps
-            })
+    Equivalent to calling feature_get_ready, feature_get_blocked and
+    feature_get_stats, but answered from a single consistent snapshot.
+    Prefer this when you need more than one of them.
 
-            for dep_id in deps:
-                edges.append({"source": dep_id, "target": f.id})
+    Args:
+        ready_limit: Maximum number of ready features to return (1-50, default 10)
+        blocked_limit: Maximum number of blocked features to return (1-100, default 20)
 
-        return json.dumps({
-            "nodes": nodes,
-            "edges": edges
-        })
-    finally:
-        session.close()
+    Returns:
+        JSON with: ready ({features, count, total_ready}),
+        blocked ({features, count, total_blocked}), stats ({passing, in_progress, total, percentage})
+    """
+    snapshot = _graph_cache.get()
+    ready = snapshot.ready[:ready_limit]
+    blocked = snapshot.blocked[:blocked_limit]
+    return json.dumps({
+        "ready": {"features": ready, "count": len(ready), "total_ready": len(snapshot.ready)},
+        "blocked": {"features": blocked, "count": len(blocked), "total_blocked": len(snapshot.blocked)},
+        "stats": snapshot.stats
+    })
 
 
 @mcp.tool()
+@_invalidates_graph
 def feature_set_dependencies(
     feature_id: Annotated[int, Field(ge=1, description="Feature to set dependencies for")],
     dependency_ids: Annotated[list[int], Field(description="List of dependency feature IDs")]
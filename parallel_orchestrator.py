@@ -33,6 +33,7 @@ from typing import Any, Callable, Literal
 
 from sqlalchemy import text
 
+from agent_pool import AgentPool, AgentPoolError, PooledProcess, pool_enabled
 from api.database import Feature, create_database
 from api.dependency_resolver import are_dependencies_satisfied, compute_scheduling_scores
 from progress import has_features
@@ -187,10 +188,10 @@ class ParallelOrchestrator:
         self._lock = threading.Lock()
         # Coding agents: feature_id -> process
         # Safe to key by feature_id because start_feature() checks for duplicates before spawning
-        self.running_coding_agents: dict[int, subprocess.Popen] = {}
+        self.running_coding_agents: dict[int, subprocess.Popen | PooledProcess] = {}
         # Testing agents: pid -> (feature_id, process)
         # Keyed by PID (not feature_id) because multiple agents can test the same feature
-        self.running_testing_agents: dict[int, tuple[int, subprocess.Popen]] = {}
+        self.running_testing_agents: dict[int, tuple[int, subprocess.Popen | PooledProcess]] = {}
         # Legacy alias for backward compatibility
         self.running_agents = self.running_coding_agents
         self.abort_events: dict[int, threading.Event] = {}
@@ -224,6 +225,15 @@ class ParallelOrchestrator:
         # Database session for this orchestrator
         self._engine, self._session_maker = create_database(project_dir)
 
+        # Warm fork servers for coding/testing agents (None = start them with Popen)
+        self._agent_pool: AgentPool | None = None
+        if pool_enabled():
+            self._agent_pool = AgentPool(
+                AUTOFORGE_ROOT / "autonomous_agent_demo.py",
+                project_dir=self.project_dir,
+                yolo_mode=self.yolo_mode,
+            )
+
     def get_session(self):
         """Get a new database session."""
         return self._session_maker()
@@ -814,6 +824,21 @@ class ParallelOrchestrator:
 
         return True, f"Started batch [{', '.join(str(fid) for fid in feature_ids)}]"
 
+    def _start_agent_process(
+        self, cmd: list[str], popen_kwargs: dict[str, Any]
+    ) -> subprocess.Popen | PooledProcess:
+        """Start a coding or testing agent, through the agent pool when enabled.
+
+        Falls back to Popen when the pool cannot take the assignment, so a
+        failed pool server never stops agents from starting.
+        """
+        if self._agent_pool is not None:
+            try:
+                return self._agent_pool.spawn(cmd, cwd=popen_kwargs["cwd"], env=popen_kwargs["env"])
+            except (AgentPoolError, OSError) as e:
+                debug_log.log("POOL", f"Agent pool unavailable, using Popen: {e}")
+        return subprocess.Popen(cmd, **popen_kwargs)
+
     def _spawn_coding_agent(self, feature_id: int) -> tuple[bool, str]:
         """Spawn a coding agent subprocess for a specific feature."""
         # Create abort event
@@ -851,7 +876,7 @@ class ParallelOrchestrator:
             if sys.platform == "win32":
                 popen_kwargs["creationflags"] = subprocess.CREATE_NO_WINDOW
 
-            proc = subprocess.Popen(cmd, **popen_kwargs)
+            proc = self._start_agent_process(cmd, popen_kwargs)
         except Exception as e:
             # Reset in_progress on failure
             session = self.get_session()
@@ -914,7 +939,7 @@ class ParallelOrchestrator:
             if sys.platform == "win32":
                 popen_kwargs["creationflags"] = subprocess.CREATE_NO_WINDOW
 
-            proc = subprocess.Popen(cmd, **popen_kwargs)
+            proc = self._start_agent_process(cmd, popen_kwargs)
         except Exception as e:
             # Reset in_progress on failure
             session = self.get_session()
@@ -1018,7 +1043,7 @@ class ParallelOrchestrator:
                 if sys.platform == "win32":
                     popen_kwargs["creationflags"] = subprocess.CREATE_NO_WINDOW
 
-                proc = subprocess.Popen(cmd, **popen_kwargs)
+                proc = self._start_agent_process(cmd, popen_kwargs)
             except Exception as e:
                 debug_log.log("TESTING", f"FAILED to spawn testing agent: {e}")
                 return False, f"Failed to start testing agent: {e}"
@@ -1405,6 +1430,11 @@ class ParallelOrchestrator:
         print("=" * 70, flush=True)
         print(flush=True)
 
+        # Start the pool servers now so their imports are done by the first spawn
+        if self._agent_pool is not None:
+            skip_testing = self.yolo_mode or self.testing_agent_ratio == 0
+            self._agent_pool.start(("coding",) if skip_testing else ("coding", "testing"))
+
         # Phase 1: Check if initialization needed
         if not has_features(self.project_dir):
             print("=" * 70, flush=True)
@@ -1633,10 +1663,15 @@ class ParallelOrchestrator:
     def cleanup(self) -> None:
         """Clean up database resources. Safe to call multiple times.
 
-        Forces WAL checkpoint to flush pending writes to main database file,
-        then disposes engine to close all connections. Prevents stale cache
-        issues when the orchestrator restarts.
+        Shuts down the agent pool servers, then forces WAL checkpoint to flush
+        pending writes to main database file and disposes engine to close all
+        connections. Prevents stale cache issues when the orchestrator restarts.
         """
+        agent_pool = self._agent_pool
+        self._agent_pool = None
+        if agent_pool is not None:
+            agent_pool.close()
+
         # Atomically grab and clear the engine reference to prevent re-entry
         engine = self._engine
         self._engine = None
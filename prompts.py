@@ -7,15 +7,103 @@ Functions for loading prompt templates with project-specific support.
 Fallback chain:
 1. Project-specific: {project_dir}/prompts/{name}.md
 2. Base template: .claude/templates/{name}.template.md
+
+Templates are cached by path and (mtime, size): each one is read once per
+change, and its YOLO variant (browser testing stripped) is built once. The
+cache is per process; agents forked by a pool server inherit the templates
+it warmed (see warm_prompt_cache), so they only format per-feature headers.
 """
 
 import re
 import shutil
+import threading
+from dataclasses import dataclass, field
 from pathlib import Path
 
 # Base templates location (generic templates)
 TEMPLATES_DIR = Path(__file__).parent / ".claude" / "templates"
 
+# Browser testing sections replaced in YOLO mode
+_BROWSER_STEP_RE = re.compile(
+    r"### STEP 5: VERIFY WITH BROWSER AUTOMATION.*?(?=### STEP 5\.5:)", re.DOTALL
+)
+_BROWSER_SECTION_RE = re.compile(r"## BROWSER AUTOMATION\n\n.*?(?=---)", re.DOTALL)
+
+
+@dataclass
+class _CachedTemplate:
+    """A template's text as read from disk, plus variants derived from it."""
+    path: Path
+    signature: tuple[int, int]  # (mtime_ns, size) when read
+    text: str
+    variants: dict[str, str] = field(default_factory=dict)
+
+    def variant(self, yolo_mode: bool) -> str:
+        """The template text, with browser testing stripped in YOLO mode."""
+        if not yolo_mode:
+            return self.text
+        if "yolo" not in self.variants:
+            self.variants["yolo"] = _strip_browser_testing_sections(self.text)
+        return self.variants["yolo"]
+
+
+_template_cache: dict[Path, _CachedTemplate] = {}
+_template_cache_lock = threading.Lock()
+
+
+def clear_prompt_cache() -> None:
+    """Drop all cached templates."""
+    with _template_cache_lock:
+        _template_cache.clear()
+
+
+def warm_prompt_cache(project_dir: Path | None = None, yolo_mode: bool = False) -> None:
+    """
+    Read the coding and testing templates (and the coding YOLO variant) now.
+
+    Each agent is its own process, so the cache only helps across spawns if
+    it is filled before they start: agent pool servers call this before
+    forking, and their agents only check each template's (mtime, size).
+
+    Args:
+        project_dir: Project whose prompt overrides the agents will use
+        yolo_mode: Also build the coding prompt's YOLO variant
+    """
+    for name in ("coding_prompt", "testing_prompt"):
+        try:
+            template = _load_template(name, project_dir)
+        except FileNotFoundError:
+            continue
+        if yolo_mode and name == "coding_prompt":
+            template.variant(yolo_mode=True)
+
+
+def _read_template(path: Path) -> _CachedTemplate | None:
+    """
+    Get a template file, reading it only if it changed since it was cached.
+
+    Returns:
+        The cached template, or None if the file does not exist
+
+    Raises:
+        OSError: If the file exists but cannot be read
+    """
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    signature = (st.st_mtime_ns, st.st_size)
+
+    with _template_cache_lock:
+        cached = _template_cache.get(path)
+        if cached is not None and cached.signature == signature:
+            return cached
+
+    template = _CachedTemplate(path, signature, path.read_text(encoding="utf-8"))
+    with _template_cache_lock:
+        _template_cache[path] = template
+    return template
+
 
 def get_project_prompts_dir(project_dir: Path) -> Path:
     """Get the prompts directory for a specific project."""
@@ -41,23 +129,30 @@ def load_prompt(name: str, project_dir: Path | None = None) -> str:
     Raises:
         FileNotFoundError: If prompt not found in any location
     """
+    return _load_template(name, project_dir).text
+
+
+def _load_template(name: str, project_dir: Path | None = None) -> _CachedTemplate:
+    """Resolve a prompt through the fallback chain of load_prompt (cached)."""
     # 1. Try project-specific first
     if project_dir:
         project_prompts = get_project_prompts_dir(project_dir)
         project_path = project_prompts / f"{name}.md"
-        if project_path.exists():
-            try:
-                return project_path.read_text(encoding="utf-8")
-            except (OSError, PermissionError) as e:
-                print(f"Warning: Could not read {project_path}: {e}")
+        try:
+            template = _read_template(project_path)
+            if template is not None:
+                return template
+        except (OSError, PermissionError) as e:
+            print(f"Warning: Could not read {project_path}: {e}")
 
     # 2. Try base template
     template_path = TEMPLATES_DIR / f"{name}.template.md"
-    if template_path.exists():
-        try:
-            return template_path.read_text(encoding="utf-8")
-        except (OSError, PermissionError) as e:
-            print(f"Warning: Could not read {template_path}: {e}")
+    try:
+        template = _read_template(template_path)
+        if template is not None:
+            return template
+    except (OSError, PermissionError) as e:
+        print(f"Warning: Could not read {template_path}: {e}")
 
     raise FileNotFoundError(
         f"Prompt '{name}' not found in:\n"
@@ -87,8 +182,7 @@ def _strip_browser_testing_sections(prompt: str) -> str:
     original_prompt = prompt
 
     # Replace STEP 5 (browser automation verification) with YOLO note
-    prompt = re.sub(
-        r"### STEP 5: VERIFY WITH BROWSER AUTOMATION.*?(?=### STEP 5\.5:)",
+    prompt = _BROWSER_STEP_RE.sub(
         "### STEP 5: VERIFY FEATURE (YOLO MODE)\n\n"
         "**YOLO mode is active.** Skip browser automation testing. "
         "Instead, verify your feature works by ensuring:\n"
@@ -96,7 +190,6 @@ def _strip_browser_testing_sections(prompt: str) -> str:
         "- Server starts without errors after your changes\n"
         "- No obvious runtime errors in server logs\n\n",
         prompt,
-        flags=re.DOTALL,
     )
 
     # Replace the screenshots-only marking rule with YOLO-appropriate wording
@@ -106,13 +199,11 @@ def _strip_browser_testing_sections(prompt: str) -> str:
     )
 
     # Replace the BROWSER AUTOMATION reference section
-    prompt = re.sub(
-        r"## BROWSER AUTOMATION\n\n.*?(?=---)",
+    prompt = _BROWSER_SECTION_RE.sub(
         "## VERIFICATION (YOLO MODE)\n\n"
         "Browser automation is disabled in YOLO mode. "
         "Verify features by running lint, type-check, and confirming the dev server starts without errors.\n\n",
         prompt,
-        flags=re.DOTALL,
     )
 
     # In STEP 4, replace browser automation reference with YOLO guidance
@@ -140,12 +231,8 @@ def get_coding_prompt(project_dir: Path | None = None, yolo_mode: bool = False)
     Returns:
         The coding prompt, optionally stripped of testing instructions.
     """
-    prompt = load_prompt("coding_prompt", project_dir)
-
-    if yolo_mode:
-        prompt = _strip_browser_testing_sections(prompt)
-
-    return prompt
+    # The stripped variant is built once per template version
+    return _load_template("coding_prompt", project_dir).variant(yolo_mode)
 
 
 def get_testing_prompt(
@@ -4,6 +4,9 @@ Project Registry Module
 
 Cross-platform project registry for storing project name to path mappings.
 Uses SQLite database stored at ~/.autoforge/registry.db.
+
+The registry also holds the dev-server port allocation table: one row per
+port, so the database itself guarantees no two projects share a port.
 """
 
 import logging
@@ -17,6 +20,7 @@ from pathlib import Path
 from typing import Any
 
 from sqlalchemy import Column, DateTime, Integer, String, create_engine, text
+from sqlalchemy.exc import IntegrityError, OperationalError
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
 
 # Module logger
@@ -130,6 +134,17 @@ class Settings(Base):
     updated_at = Column(DateTime, nullable=False)
 
 
+class PortAllocation(Base):
+    """SQLAlchemy model for dev-server port assignments (one row per port)."""
+    __tablename__ = "port_allocations"
+
+    port = Column(Integer, primary_key=True)
+    project_path = Column(String, nullable=False, unique=True)  # POSIX format
+    # mtime of the project's config.json when its port was last reconciled
+    config_mtime_ns = Column(Integer, nullable=True)
+    assigned_at = Column(DateTime, nullable=False)
+
+
 # =============================================================================
 # Database Connection
 # =============================================================================
@@ -175,16 +190,25 @@ def _get_engine():
             if _engine is None:
                 db_path = get_registry_path()
                 db_url = f"sqlite:///{db_path.as_posix()}"
-                _engine = create_engine(
+                engine = create_engine(
                     db_url,
                     connect_args={
                         "check_same_thread": False,
                         "timeout": SQLITE_TIMEOUT,
                     }
                 )
-                Base.metadata.create_all(bind=_engine)
-                _migrate_add_default_concurrency(_engine)
-                _SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=_engine)
+                try:
+                    Base.metadata.create_all(bind=engine)
+                except OperationalError as e:
+                    # Another process created the tables between the existence
+                    # check and CREATE TABLE; the second pass finds them
+                    if "already exists" not in str(e):
+                        raise
+                    Base.metadata.create_all(bind=engine)
+                _migrate_add_default_concurrency(engine)
+                # Publish only once initialised, so a failure is retried
+                _SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+                _engine = engine
                 logger.debug("Initialized registry database at: %s", db_path)
 
     return _engine, _SessionLocal
@@ -318,6 +342,7 @@ def unregister_project(name: str) -> bool:
             return False
 
         session.delete(project)
+        session.query(PortAllocation).filter(PortAllocation.project_path == project.path).delete()
 
     logger.info("Unregistered project: %s", name)
     return True
@@ -396,6 +421,9 @@ def update_project_path(name: str, new_path: Path) -> bool:
     """
     Update a project's path (for relocating projects).
 
+    The project's dev-server port allocation moves with it, in the same
+    transaction.
+
     Args:
         name: The project name.
         new_path: The new absolute path.
@@ -410,6 +438,17 @@ def update_project_path(name: str, new_path: Path) -> bool:
         if not project:
             return False
 
+        old_key = _port_key(Path(project.path))
+        new_key = _port_key(new_path)
+        if old_key != new_key and session.query(PortAllocation).filter(
+            PortAllocation.project_path == old_key
+        ).first():
+            # A stale allocation left at the destination gives way to the moved project's
+            session.query(PortAllocation).filter(PortAllocation.project_path == new_key).delete()
+            session.query(PortAllocation).filter(PortAllocation.project_path == old_key).update(
+                {PortAllocation.project_path: new_key}
+            )
+
         project.path = new_path.as_posix()
 
     return True
@@ -514,6 +553,7 @@ def cleanup_stale_projects() -> list[str]:
             path = Path(project.path)
             if not path.exists():
                 session.delete(project)
+                session.query(PortAllocation).filter(PortAllocation.project_path == project.path).delete()
                 removed.append(project.name)
 
     if removed:
@@ -548,6 +588,172 @@ def list_valid_projects() -> list[dict[str, Any]]:
         session.close()
 
 
+# =============================================================================
+# Port Allocation Functions
+# =============================================================================
+
+def _port_key(project_path: Path) -> str:
+    return Path(project_path).resolve().as_posix()
+
+
+def get_port_allocation(project_path: Path) -> dict[str, Any] | None:
+    """
+    Get the port allocated to a project.
+
+    Args:
+        project_path: The project directory.
+
+    Returns:
+        Dict with port and config_mtime_ns, or None if no port is allocated.
+    """
+    _, SessionLocal = _get_engine()
+    session = SessionLocal()
+    try:
+        allocation = (
+            session.query(PortAllocation)
+            .filter(PortAllocation.project_path == _port_key(project_path))
+            .first()
+        )
+        if allocation is None:
+            return None
+        return {"port": allocation.port, "config_mtime_ns": allocation.config_mtime_ns}
+    finally:
+        session.close()
+
+
+def get_allocated_ports(port_min: int, port_max: int) -> set[int]:
+    """Get every allocated port in a range."""
+    _, SessionLocal = _get_engine()
+    session = SessionLocal()
+    try:
+        return {
+            port for (port,) in session.query(PortAllocation.port)
+            .filter(PortAllocation.port.between(port_min, port_max))
+        }
+    finally:
+        session.close()
+
+
+def _claim_port_once(key: str, port_min: int, port_max: int, preferred: int | None,
+                     config_mtime_ns: int | None) -> int:
+    with _get_session() as session:
+        existing = session.query(PortAllocation).filter(PortAllocation.project_path == key).first()
+        if existing:
+            return existing.port
+
+        taken = {
+            port for (port,) in session.query(PortAllocation.port)
+            .filter(PortAllocation.port.between(port_min, port_max))
+        }
+        if preferred is not None and port_min <= preferred <= port_max and preferred not in taken:
+            port = preferred
+        else:
+            port = next((p for p in range(port_min, port_max + 1) if p not in taken), None)
+            if port is None:
+                raise RuntimeError(f"No available ports in range {port_min}-{port_max}")
+
+        session.add(PortAllocation(
+            port=port,
+            project_path=key,
+            config_mtime_ns=config_mtime_ns,
+            assigned_at=datetime.now(),
+        ))
+    return port
+
+
+def claim_port(
+    project_path: Path,
+    port_min: int,
+    port_max: int,
+    preferred: int | None = None,
+    config_mtime_ns: int | None = None,
+) -> int:
+    """
+    Atomically allocate a port to a project.
+
+    Returns the project's existing port if it has one. Otherwise takes
+    ``preferred`` if it is free, else the lowest free port in the range.
+    The unique constraints on port and project make concurrent claims
+    (from any process) safe: the loser of a race retries.
+
+    Args:
+        project_path: The project directory.
+        port_min: Lowest port in the range.
+        port_max: Highest port in the range.
+        preferred: Port to take if it is free.
+        config_mtime_ns: mtime of the project's config file, if the port
+            is already recorded there.
+
+    Returns:
+        The project's port.
+
+    Raises:
+        RuntimeError: If every port in the range is allocated.
+    """
+    key = _port_key(project_path)
+    for _ in range(port_max - port_min + 2):
+        try:
+            return _with_retry(_claim_port_once, key, port_min, port_max, preferred, config_mtime_ns)
+        except IntegrityError:
+            # Another claim took this port (or this project) first
+            continue
+    raise RuntimeError(f"Could not allocate a port in range {port_min}-{port_max}")
+
+
+def set_project_port(project_path: Path, port: int, config_mtime_ns: int | None = None) -> None:
+    """
+    Move a project to a specific port.
+
+    Args:
+        project_path: The project directory.
+        port: The port to allocate.
+        config_mtime_ns: mtime of the project's config file, if the port
+            is already recorded there.
+
+    Raises:
+        ValueError: If the port is allocated to another project.
+    """
+    key = _port_key(project_path)
+
+    def _set() -> None:
+        with _get_session() as session:
+            session.query(PortAllocation).filter(PortAllocation.project_path == key).delete()
+            session.flush()
+            session.add(PortAllocation(
+                port=port,
+                project_path=key,
+                config_mtime_ns=config_mtime_ns,
+                assigned_at=datetime.now(),
+            ))
+
+    try:
+        _with_retry(_set)
+    except IntegrityError:
+        raise ValueError(f"Port {port} is already assigned to another project")
+
+
+def update_port_config_mtime(project_path: Path, config_mtime_ns: int | None) -> None:
+    """Record the config file mtime a project's port was reconciled against."""
+    with _get_session() as session:
+        session.query(PortAllocation).filter(
+            PortAllocation.project_path == _port_key(project_path)
+        ).update({PortAllocation.config_mtime_ns: config_mtime_ns})
+
+
+def release_port(project_path: Path) -> bool:
+    """
+    Release a project's port.
+
+    Returns:
+        True if a port was released, False if none was allocated.
+    """
+    with _get_session() as session:
+        deleted = session.query(PortAllocation).filter(
+            PortAllocation.project_path == _port_key(project_path)
+        ).delete()
+    return bool(deleted)
+
+
 # =============================================================================
 # Settings CRUD Functions
 # =============================================================================
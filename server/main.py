@@ -25,6 +25,7 @@ load_dotenv()
 
 from fastapi import FastAPI, HTTPException, Request, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
 
@@ -166,6 +167,10 @@ else:
     )
 
 
+# Compress larger JSON payloads (feature lists, graphs)
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+
 # ============================================================================
 # Security Middleware
 # ============================================================================
@@ -5,15 +5,20 @@ Analytics Router
 Provides time-series data for project activity tracking:
 - Features created over time
 - Features completed over time
-- Agent activity over time
+- Burn-up, throughput, cycle time and regressions
+
+All series are read from the feature_rollup_hourly / feature_rollup_daily
+tables, which SQLite triggers maintain incrementally from the
+feature_transitions log (see api/database.py), so queries are O(buckets)
+rather than O(features).
 """
 
-import sqlite3
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List
+from typing import Optional
 
 from fastapi import APIRouter
+from sqlalchemy import text
 
 # Add root to path for registry import
 import sys
@@ -21,10 +26,74 @@ _root = Path(__file__).parent.parent.parent
 if str(_root) not in sys.path:
     sys.path.insert(0, str(_root))
 
+from api.database import TRANSITION_EVENTS, create_database, get_database_path
 from registry import list_registered_projects
 
 router = APIRouter(tags=["analytics"])
 
+# Rollup table and trigger bucket format per granularity
+_ROLLUP_TABLES = {
+    "hour": ("feature_rollup_hourly", "%Y-%m-%dT%H"),
+    "day": ("feature_rollup_daily", "%Y-%m-%d"),
+    "week": ("feature_rollup_daily", "%Y-%m-%d"),
+}
+
+_ROLLUP_COUNTERS = TRANSITION_EVENTS + ("cycle_seconds_total", "cycle_count")
+
+
+def _get_project_dir(project_name: str) -> Optional[Path]:
+    """Return the directory of a registered project, or None if unknown."""
+    projects = list_registered_projects()
+    if project_name not in projects:
+        return None
+    return Path(projects[project_name]["path"])
+
+
+def _load_rollups(
+    project_dir: Path,
+    start_date: datetime,
+    granularity: str = "day"
+) -> tuple[list[dict], dict]:
+    """
+    Load rollup buckets from start_date onwards, plus totals before it.
+
+    Weekly granularity folds daily buckets into "%Y-W%W" weeks.
+
+    Returns:
+        (buckets, prior) - buckets are dicts with "date" and one key per
+        rollup counter, in date order; prior holds event totals before
+        start_date.
+    """
+    table, bucket_format = _ROLLUP_TABLES.get(granularity, _ROLLUP_TABLES["day"])
+    start_bucket = start_date.strftime(bucket_format)
+
+    engine, _ = create_database(project_dir)
+    with engine.connect() as conn:
+        rows = conn.execute(
+            text(f"SELECT bucket, {', '.join(_ROLLUP_COUNTERS)} FROM {table} "
+                 "WHERE bucket >= :start ORDER BY bucket"),
+            {"start": start_bucket},
+        ).mappings().all()
+        prior = conn.execute(
+            text("SELECT " + ", ".join(f"COALESCE(SUM({e}), 0) AS {e}" for e in TRANSITION_EVENTS)
+                 + f" FROM {table} WHERE bucket < :start"),
+            {"start": start_bucket},
+        ).mappings().one()
+
+    buckets: list[dict] = []
+    for row in rows:
+        date = row["bucket"]
+        if granularity == "week":
+            date = datetime.strptime(date, bucket_format).strftime("%Y-W%W")
+
+        if buckets and buckets[-1]["date"] == date:
+            for key in _ROLLUP_COUNTERS:
+                buckets[-1][key] += row[key]
+        else:
+            buckets.append({"date": date, **{key: row[key] for key in _ROLLUP_COUNTERS}})
+
+    return buckets, dict(prior)
+
 
 @router.get("/api/analytics/features/{project_name}")
 async def get_features_over_time(
@@ -38,7 +107,7 @@ async def get_features_over_time(
     Args:
         project_name: Name of the project
         days: Number of days to look back (default: 30)
-        granularity: Time bucket size - 'day' or 'week' (default: 'day')
+        granularity: Time bucket size - 'hour', 'day' or 'week' (default: 'day')
 
     Returns:
         {
@@ -49,87 +118,53 @@ async def get_features_over_time(
             "cumulative": {
                 "created": [{"date": str, "total": int}, ...],
                 "completed": [{"date": str, "total": int}, ...]
-            }
+            },
+            "burnup": [{"date": str, "scope": int, "done": int}, ...]
         }
     """
-    projects = list_registered_projects()
-    if project_name not in projects:
+    project_dir = _get_project_dir(project_name)
+    if project_dir is None:
         return {"error": f"Project '{project_name}' not found"}
 
-    project_path = Path(projects[project_name]["path"])
-    features_db = project_path / "features.db"
-
-    if not features_db.exists():
+    if not get_database_path(project_dir).exists():
         return {
             "project": project_name,
             "period": {"start": None, "end": None, "days": 0},
             "created": [],
             "completed": [],
-            "cumulative": {"created": [], "completed": []}
+            "cumulative": {"created": [], "completed": []},
+            "burnup": []
         }
 
-    conn = sqlite3.connect(features_db)
-
-    # Determine date format based on granularity
-    date_format = "%Y-%m-%d" if granularity == "day" else "%Y-W%W"
-    date_trunc = "date" if granularity == "day" else "strftime('%Y-W%W', "
-
     # Calculate period
     end_date = datetime.utcnow()
     start_date = end_date - timedelta(days=days)
 
-    # Query features created over time
-    created_query = f"""
-        SELECT
-            strftime('{date_format}', created_at) as date,
-            COUNT(*) as count
-        FROM features
-        WHERE created_at IS NOT NULL
-            AND created_at >= datetime('{start_date.isoformat()}')
-        GROUP BY date
-        ORDER BY date
-    """
-
-    # Query features completed over time
-    completed_query = f"""
-        SELECT
-            strftime('{date_format}', completed_at) as date,
-            COUNT(*) as count
-        FROM features
-        WHERE completed_at IS NOT NULL
-            AND completed_at >= datetime('{start_date.isoformat()}')
-        GROUP BY date
-        ORDER BY date
-    """
-
-    created_raw = conn.execute(created_query).fetchall()
-    completed_raw = conn.execute(completed_query).fetchall()
-
-    conn.close()
+    buckets, prior = _load_rollups(project_dir, start_date, granularity)
 
-    # Convert to list of dicts
-    created = [{"date": row[0], "count": row[1]} for row in created_raw]
-    completed = [{"date": row[0], "count": row[1]} for row in completed_raw]
+    created = [{"date": b["date"], "count": b["created"]} for b in buckets if b["created"]]
+    completed = [{"date": b["date"], "count": b["passed"]} for b in buckets if b["passed"]]
 
-    # Calculate cumulative totals
+    # Running totals within the period, and absolute scope/done for burn-up
     created_cumulative = []
     completed_cumulative = []
+    burnup = []
 
     created_total = 0
     completed_total = 0
+    scope = prior["created"] - prior["deleted"]
+    done = prior["passed"] - prior["regressed"]
 
-    # Get all unique dates
-    all_dates = sorted(set([r["date"] for r in created] + [r["date"] for r in completed]))
-
-    for date in all_dates:
-        created_count = next((r["count"] for r in created if r["date"] == date), 0)
-        completed_count = next((r["count"] for r in completed if r["date"] == date), 0)
+    for bucket in buckets:
+        created_total += bucket["created"]
+        completed_total += bucket["passed"]
+        scope += bucket["created"] - bucket["deleted"]
+        done += bucket["passed"] - bucket["regressed"]
 
-        created_total += created_count
-        completed_total += completed_count
-
-        created_cumulative.append({"date": date, "total": created_total})
-        completed_cumulative.append({"date": date, "total": completed_total})
+        if bucket["created"] or bucket["passed"]:
+            created_cumulative.append({"date": bucket["date"], "total": created_total})
+            completed_cumulative.append({"date": bucket["date"], "total": completed_total})
+        burnup.append({"date": bucket["date"], "scope": scope, "done": done})
 
     return {
         "project": project_name,
@@ -143,7 +178,8 @@ async def get_features_over_time(
         "cumulative": {
             "created": created_cumulative,
             "completed": completed_cumulative
-        }
+        },
+        "burnup": burnup
     }
 
 
@@ -172,14 +208,11 @@ async def get_throughput_stats(
             "percentage_complete": float
         }
     """
-    projects = list_registered_projects()
-    if project_name not in projects:
+    project_dir = _get_project_dir(project_name)
+    if project_dir is None:
         return {"error": f"Project '{project_name}' not found"}
 
-    project_path = Path(projects[project_name]["path"])
-    features_db = project_path / "features.db"
-
-    if not features_db.exists():
+    if not get_database_path(project_dir).exists():
         return {
             "project": project_name,
             "period_days": days,
@@ -192,68 +225,41 @@ async def get_throughput_stats(
             "percentage_complete": 0.0
         }
 
-    conn = sqlite3.connect(features_db)
-
     # Calculate period
     end_date = datetime.utcnow()
     start_date = end_date - timedelta(days=days)
 
-    # Features completed in period
-    completed_result = conn.execute("""
-        SELECT COUNT(*)
-        FROM features
-        WHERE completed_at IS NOT NULL
-            AND completed_at >= datetime(?)
-    """, (start_date.isoformat(),)).fetchone()
-
-    features_completed = completed_result[0] if completed_result else 0
-
-    # Features created in period
-    created_result = conn.execute("""
-        SELECT COUNT(*)
-        FROM features
-        WHERE created_at IS NOT NULL
-            AND created_at >= datetime(?)
-    """, (start_date.isoformat(),)).fetchone()
+    buckets, _ = _load_rollups(project_dir, start_date)
 
-    features_created = created_result[0] if created_result else 0
+    features_completed = sum(b["passed"] for b in buckets)
+    features_created = sum(b["created"] for b in buckets)
 
     # Total stats
-    total_result = conn.execute("""
-        SELECT
-            COUNT(*) as total,
-            SUM(CASE WHEN passes = 1 THEN 1 ELSE 0 END) as passing
-        FROM features
-    """).fetchone()
+    engine, _ = create_database(project_dir)
+    with engine.connect() as conn:
+        total_result = conn.execute(text("""
+            SELECT
+                COUNT(*) as total,
+                SUM(CASE WHEN passes = 1 THEN 1 ELSE 0 END) as passing
+            FROM features
+        """)).fetchone()
 
     total_features = total_result[0] if total_result else 0
-    total_passing = total_result[1] if total_result else 0
-
-    # Calculate completion streak
-    streak_query = """
-        SELECT DISTINCT date(completed_at) as completion_date
-        FROM features
-        WHERE completed_at IS NOT NULL
-            AND completed_at >= datetime(?)
-        ORDER BY completion_date DESC
-    """
-
-    streak_results = conn.execute(streak_query, (start_date.isoformat(),)).fetchall()
+    total_passing = (total_result[1] or 0) if total_result else 0
 
-    # Calculate consecutive days
+    # Calculate consecutive days with completions, newest first
+    completion_days = [b["date"] for b in reversed(buckets) if b["passed"]]
     current_streak = 0
-    if streak_results:
+    if completion_days:
         current_streak = 1
-        for i in range(len(streak_results) - 1):
-            date1 = datetime.strptime(streak_results[i][0], "%Y-%m-%d")
-            date2 = datetime.strptime(streak_results[i + 1][0], "%Y-%m-%d")
+        for i in range(len(completion_days) - 1):
+            date1 = datetime.strptime(completion_days[i], "%Y-%m-%d")
+            date2 = datetime.strptime(completion_days[i + 1], "%Y-%m-%d")
             if (date1 - date2).days == 1:
                 current_streak += 1
             else:
                 break
 
-    conn.close()
-
     # Calculate metrics
     completion_rate = (features_completed / features_created) if features_created > 0 else 0.0
     average_per_day = features_completed / days
@@ -272,6 +278,109 @@ async def get_throughput_stats(
     }
 
 
+@router.get("/api/analytics/cycle-time/{project_name}")
+async def get_cycle_time_stats(
+    project_name: str,
+    days: int = 30,
+    granularity: str = "day"
+) -> dict:
+    """
+    Get cycle time (in-progress to passing) trends for a project.
+
+    Cycle time is measured from a feature's latest "started" transition to
+    its "passed" transition.
+
+    Args:
+        project_name: Name of the project
+        days: Number of days to analyze (default: 30)
+        granularity: Time bucket size - 'hour', 'day' or 'week' (default: 'day')
+
+    Returns:
+        {
+            "project": str,
+            "period_days": int,
+            "average_seconds": float | None,
+            "samples": int,
+            "series": [{"date": str, "average_seconds": float, "samples": int}, ...]
+        }
+    """
+    project_dir = _get_project_dir(project_name)
+    if project_dir is None:
+        return {"error": f"Project '{project_name}' not found"}
+
+    if not get_database_path(project_dir).exists():
+        return {"project": project_name, "period_days": days, "average_seconds": None, "samples": 0, "series": []}
+
+    start_date = datetime.utcnow() - timedelta(days=days)
+    buckets, _ = _load_rollups(project_dir, start_date, granularity)
+
+    series = [
+        {
+            "date": b["date"],
+            "average_seconds": round(b["cycle_seconds_total"] / b["cycle_count"], 1),
+            "samples": b["cycle_count"],
+        }
+        for b in buckets if b["cycle_count"]
+    ]
+    samples = sum(b["cycle_count"] for b in buckets)
+    total_seconds = sum(b["cycle_seconds_total"] for b in buckets)
+
+    return {
+        "project": project_name,
+        "period_days": days,
+        "average_seconds": round(total_seconds / samples, 1) if samples else None,
+        "samples": samples,
+        "series": series
+    }
+
+
+@router.get("/api/analytics/regressions/{project_name}")
+async def get_regression_stats(
+    project_name: str,
+    days: int = 30,
+    granularity: str = "day"
+) -> dict:
+    """
+    Get regressions (passing -> failing) and released claims over time.
+
+    Args:
+        project_name: Name of the project
+        days: Number of days to analyze (default: 30)
+        granularity: Time bucket size - 'hour', 'day' or 'week' (default: 'day')
+
+    Returns:
+        {
+            "project": str,
+            "period_days": int,
+            "regressions": int,
+            "released": int,
+            "series": [{"date": str, "regressed": int, "released": int, "passed": int}, ...]
+        }
+    """
+    project_dir = _get_project_dir(project_name)
+    if project_dir is None:
+        return {"error": f"Project '{project_name}' not found"}
+
+    if not get_database_path(project_dir).exists():
+        return {"project": project_name, "period_days": days, "regressions": 0, "released": 0, "series": []}
+
+    start_date = datetime.utcnow() - timedelta(days=days)
+    buckets, _ = _load_rollups(project_dir, start_date, granularity)
+
+    series = [
+        {"date": b["date"], "regressed": b["regressed"], "released": b["released"], "passed": b["passed"]}
+        for b in buckets if b["regressed"] or b["released"] or b["passed"]
+    ]
+
+    return {
+        "project": project_name,
+        "period_days": days,
+        "regressions": sum(b["regressed"] for b in buckets),
+        "released": sum(b["released"] for b in buckets),
+        "series": series
+    }
+
+
 @router.get("/api/analytics/summary")
 async def get_all_projects_summary(days: int = 30) -> dict:
     """
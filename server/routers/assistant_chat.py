@@ -9,7 +9,7 @@ import json
 import logging
 from typing import Optional
 
-from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, HTTPException, Query, WebSocket, WebSocketDisconnect
 from pydantic import BaseModel
 
 from ..services.assistant_chat_session import (
@@ -56,12 +56,14 @@ class ConversationMessageModel(BaseModel):
 
 
 class ConversationDetail(BaseModel):
-    """Full conversation with messages."""
+    """Conversation with one page of messages."""
     id: int
     project_name: str
     title: Optional[str]
     created_at: Optional[str]
     updated_at: Optional[str]
+    message_count: int
+    has_more: bool  # More messages exist beyond this page
     messages: list[ConversationMessageModel]
 
 
@@ -91,8 +93,20 @@ async def list_project_conversations(project_name: str):
 
 
 @router.get("/conversations/{project_name}/{conversation_id}", response_model=ConversationDetail)
-async def get_project_conversation(project_name: str, conversation_id: int):
-    """Get a specific conversation with all messages."""
+async def get_project_conversation(
+    project_name: str,
+    conversation_id: int,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    before_id: Optional[int] = None,
+    after_id: Optional[int] = None,
+):
+    """Get a conversation with all of its messages, or one page of them.
+
+    Returns every message unless ``limit`` is given, as the UI does not
+    page history yet. With ``limit``, returns the latest messages; pass
+    ``before_id`` (the oldest message shown) to load earlier messages, or
+    ``after_id`` (the newest message shown) to load later ones.
+    """
     if not validate_project_name(project_name):
         raise HTTPException(status_code=400, detail="Invalid project name")
 
@@ -100,7 +114,9 @@ async def get_project_conversation(project_name: str, conversation_id: int):
     if not project_dir or not project_dir.exists():
         raise HTTPException(status_code=404, detail="Project not found")
 
-    conversation = get_conversation(project_dir, conversation_id)
+    conversation = get_conversation(
+        project_dir, conversation_id, limit=limit, before_id=before_id, after_id=after_id
+    )
     if not conversation:
         raise HTTPException(status_code=404, detail="Conversation not found")
 
@@ -110,6 +126,8 @@ async def get_project_conversation(project_name: str, conversation_id: int):
         title=conversation["title"],
         created_at=conversation["created_at"],
         updated_at=conversation["updated_at"],
+        message_count=conversation["message_count"],
+        has_more=conversation["has_more"],
         messages=[ConversationMessageModel(**m) for m in conversation["messages"]],
     )
 
@@ -391,7 +391,7 @@ async def manual_scale(request: ManualScaleRequest):
         old_limits=old_limits,
         new_limits=new_limits,
         status="success" if success else "failed",
-        error_message=None if success else "Service restart failed",
+        error_message=None if success else "Failed to apply limits",
     )
     autoscaler.log_action(action)
 
@@ -6,6 +6,7 @@ Provides emergency stop functionality to immediately kill all
 AutoCoder processes, agents, and browsers when things go wrong.
 """
 
+import asyncio
 import subprocess
 from pathlib import Path
 from typing import Optional
@@ -14,6 +15,19 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
 import psutil
 
+from ..utils.process_utils import ProcessSnapshot, kill_process_trees
+
+# Command line fragments that identify AutoCoder-related processes
+AUTOCODER_PATTERNS = [
+    'autonomous_agent_demo',
+    'parallel_orchestrator',
+    'uvicorn server.main:app',
+    'playwright',
+    'mcp_server',
+    'coding_agent',
+    'testing_agent',
+]
+
 router = APIRouter(tags=["emergency"])
 
 
@@ -33,90 +47,73 @@ class EmergencyStopResult(BaseModel):
     agents_reset: int = Field(description="Agents reset from in_progress state")
 
 
-def find_all_autocoder_processes():
+def find_autocoder_pids(snapshot: Optional[ProcessSnapshot] = None) -> list[int]:
+    """
+    Find the PIDs of all AutoCoder-related processes.
+
+    Args:
+        snapshot: Process snapshot with command lines (default: take one now)
+
+    Returns:
+        List of PIDs
+    """
+    snapshot = snapshot or ProcessSnapshot.capture(with_cmdline=True)
+    return [
+        info.pid for info in snapshot.processes.values()
+        if info.cmdline and any(
+            pattern in ' '.join(info.cmdline).lower() for pattern in AUTOCODER_PATTERNS
+        )
+    ]
+
+
+def find_all_autocoder_processes(snapshot: Optional[ProcessSnapshot] = None):
     """
     Enumerate all AutoCoder-related processes.
 
+    Args:
+        snapshot: Process snapshot with command lines (default: take one now)
+
     Returns:
         List of psutil.Process objects
     """
     processes = []
 
-    for proc in psutil.process_iter(['pid', 'name', 'cmdline', 'memory_info']):
+    for pid in find_autocoder_pids(snapshot):
         try:
-            cmdline = ' '.join(proc.info['cmdline'] or [])
-
-            # Check if process is AutoCoder-related
-            if any(pattern in cmdline.lower() for pattern in [
-                'autonomous_agent_demo',
-                'parallel_orchestrator',
-                'uvicorn server.main:app',
-                'playwright',
-                'mcp_server',
-                'coding_agent',
-                'testing_agent',
-            ]):
-                processes.append(proc)
-
+            processes.append(psutil.Process(pid))
         except (psutil.NoSuchProcess, psutil.AccessDenied):
             continue
 
     return processes
 
 
-def kill_process_tree_batch(processes: list[psutil.Process], timeout: float = 5.0):
+def kill_process_tree_batch(
+    processes: list[psutil.Process] | list[int],
+    timeout: float = 5.0,
+    snapshot: Optional[ProcessSnapshot] = None,
+):
     """
     Kill multiple process trees with timeout.
 
+    All trees are resolved from one process snapshot, signalled in one sweep
+    and given one shared deadline, so the stop takes about ``timeout`` at
+    most however many trees there are.
+
     Args:
-        processes: List of processes to kill
+        processes: Processes (or PIDs) whose trees to kill
         timeout: Seconds to wait for graceful termination
+        snapshot: Process snapshot to resolve the trees from
 
     Returns:
         dict with statistics
     """
-    terminated = []
-    killed = []
-
-    for proc in processes:
-        try:
-            # Try graceful termination first
-            proc.terminate()
-
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
-            continue
-
-    # Wait for graceful termination
-    import time
-    start = time.time()
-    remaining = []
-
-    for proc in processes:
-        try:
-            if proc.is_running():
-                if time.time() - start < timeout:
-                    remaining.append(proc)
-                    terminated.append(proc)
-                else:
-                    # Timeout exceeded, force kill
-                    proc.kill()
-                    killed.append(proc)
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
-            continue
-
-    # Force kill any remaining processes
-    for proc in remaining:
-        try:
-            if proc.is_running():
-                proc.kill()
-                killed.append(proc)
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
-            continue
+    pids = [p if isinstance(p, int) else p.pid for p in processes]
+    result = kill_process_trees(pids, timeout=timeout, snapshot=snapshot)
 
     return {
-        "terminated_count": len(terminated),
-        "force_killed_count": len(killed),
-        "total_count": len(terminated) + len(killed),
+        "terminated_count": result.terminated,
+        "force_killed_count": result.killed,
+        "total_count": result.processes_found,
     }
 
 
@@ -204,10 +201,11 @@ async def emergency_stop():
 
     WARNING: This is destructive! All work will be lost.
     """
-    # Find all processes
-    processes = find_all_autocoder_processes()
+    # Find all processes from one snapshot, which also resolves their trees
+    snapshot = ProcessSnapshot.capture(with_cmdline=True)
+    pids = find_autocoder_pids(snapshot)
 
-    if not processes:
+    if not pids:
         return EmergencyStopResult(
             killed_count=0,
             terminated_count=0,
@@ -216,8 +214,9 @@ async def emergency_stop():
             agents_reset=reset_stuck_agents(),
         )
 
-    # Kill processes
-    stats = kill_process_tree_batch(processes)
+    # Kill processes (off the event loop: this waits up to the timeout)
+    loop = asyncio.get_running_loop()
+    stats = await loop.run_in_executor(None, kill_process_tree_batch, pids, 5.0, snapshot)
 
     # Cleanup
     lock_files_removed = cleanup_lock_files()
@@ -10,7 +10,8 @@ from contextlib import contextmanager
 from pathlib import Path
 from typing import Literal
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
+from sqlalchemy.orm import defer
 
 from ..schemas import (
     DependencyGraphEdge,
@@ -20,8 +21,10 @@ from ..schemas import (
     FeatureBulkCreate,
     FeatureBulkCreateResponse,
     FeatureCreate,
+    FeatureDeltaResponse,
     FeatureListResponse,
     FeatureResponse,
+    FeatureSummaryResponse,
     FeatureUpdate,
 )
 from ..utils.project_helpers import get_project_path as _get_project_path
@@ -107,8 +110,40 @@ def feature_to_response(f, passing_ids: set[int] | None = None) -> FeatureRespon
     )
 
 
-@router.get("", response_model=FeatureListResponse)
-async def list_features(project_name: str):
+def feature_to_summary(f, passing_ids: set[int]) -> FeatureSummaryResponse:
+    """Convert a Feature model to the lightweight FeatureSummaryResponse."""
+    deps = f.dependencies or []
+    blocking = [d for d in deps if d not in passing_ids]
+    return FeatureSummaryResponse(
+        id=f.id,
+        priority=f.priority,
+        category=f.category,
+        name=f.name,
+        dependencies=deps,
+        passes=f.passes if f.passes is not None else False,
+        in_progress=f.in_progress if f.in_progress is not None else False,
+        blocked=len(blocking) > 0,
+        blocking_dependencies=blocking,
+    )
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Check an If-None-Match header value against a strong ETag."""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+@router.get("", response_model=FeatureListResponse | FeatureDeltaResponse)
+async def list_features(
+    project_name: str,
+    request: Request,
+    response: Response,
+    since: int | None = None,
+    epoch: str | None = None,
+    view: Literal["full", "summary"] = "full",
+):
     """
     List all features for a project organized by status.
 
@@ -116,6 +151,14 @@ async def list_features(project_name: str):
     - pending: passes=False, not currently being worked on
     - in_progress: features currently being worked on (tracked via agent output)
     - done: passes=True
+
+    The response carries a strong ETag derived from the project's write
+    revision; a matching If-None-Match is answered with 304 without reading
+    the features table. With ``since=<revision>&epoch=<epoch>`` only features
+    changed after that revision (plus IDs deleted since) are returned; the
+    epoch identifies the database the revision came from, and a missing or
+    different epoch (the database was recreated or restored) gets the full
+    list. ``view=summary`` omits descriptions and steps.
     """
     project_name = validate_project_name(project_name)
     project_dir = _get_project_path(project_name)
@@ -132,20 +175,66 @@ async def list_features(project_name: str):
         return FeatureListResponse(pending=[], in_progress=[], done=[])
 
     _, Feature = _get_db_classes()
+    from api.database import FeatureTombstone, get_feature_revision
 
     try:
         with get_db_session(project_dir) as session:
-            all_features = session.query(Feature).order_by(Feature.priority).all()
+            db_epoch, revision = get_feature_revision(session)
+            # Delta mode needs a revision from this database: another epoch,
+            # a revision from the future or 0 falls back to the full list
+            delta = since is not None and epoch == db_epoch and 0 < since <= revision
+            etag = f'"{db_epoch}-{revision}-{view}-{since if delta else "all"}"'
+            headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+            if _etag_matches(request.headers.get("if-none-match"), etag):
+                return Response(status_code=304, headers=headers)
+            response.headers.update(headers)
 
             # Compute passing IDs for blocked status calculation
-            passing_ids = {f.id for f in all_features if f.passes}
+            passing_ids = {
+                fid for (fid,) in session.query(Feature.id).filter(Feature.passes == True).all()
+            }
+            to_response = feature_to_summary if view == "summary" else feature_to_response
+            query = session.query(Feature)
+            if view == "summary":
+                query = query.options(defer(Feature.description), defer(Feature.steps))
+
+            if delta:
+                changed = query.filter(Feature.revision > since).order_by(Feature.priority).all()
+                deleted = [
+                    fid for (fid,) in session.query(FeatureTombstone.feature_id)
+                    .filter(FeatureTombstone.revision > since)
+                    .all()
+                ]
+
+                # Blocked status of unchanged rows depends on changed/deleted rows
+                touched = {f.id for f in changed} | set(deleted)
+                if touched:
+                    changed_ids = {f.id for f in changed}
+                    dependent_ids = [
+                        fid for fid, deps in session.query(Feature.id, Feature.dependencies).all()
+                        if fid not in changed_ids and deps and touched.intersection(deps)
+                    ]
+                    if dependent_ids:
+                        changed += query.filter(Feature.id.in_(dependent_ids)).all()
+                        changed.sort(key=lambda f: f.priority)
+
+                return FeatureDeltaResponse(
+                    revision=revision,
+                    epoch=db_epoch,
+                    since=since,
+                    changed=[to_response(f, passing_ids) for f in changed],
+                    deleted=deleted,
+                )
+
+            all_features = query.order_by(Feature.priority).all()
 
             pending = []
             in_progress = []
             done = []
 
             for f in all_features:
-                feature_response = feature_to_response(f, passing_ids)
+                feature_response = to_response(f, passing_ids)
                 if f.passes:
                     done.append(feature_response)
                 elif f.in_progress:
@@ -157,6 +246,8 @@ async def list_features(project_name: str):
                 pending=pending,
                 in_progress=in_progress,
                 done=done,
+                revision=revision,
+                epoch=db_epoch,
             )
     except HTTPException:
         raise
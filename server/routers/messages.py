@@ -4,6 +4,10 @@ Messages Router
 
 API endpoints for bidirectional human-agent communication.
 Enables the Chrome extension to send guidance and receive requests from the agent.
+
+Screenshots are decoded on upload and kept on disk (see
+services/screenshot_store.py); listings return metadata and URLs, and the
+image bytes are served from their own endpoints with ETag and Range support.
 """
 
 import asyncio
@@ -15,7 +19,8 @@ from datetime import datetime
 from pathlib import Path
 from typing import Literal, Optional
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import FileResponse, Response
 from pydantic import BaseModel
 
 # Add root to path for registry import
@@ -23,8 +28,11 @@ _root = Path(__file__).parent.parent.parent
 if str(_root) not in sys.path:
     sys.path.insert(0, str(_root))
 
+from autoforge_paths import get_screenshots_dir
 from registry import get_project_path as registry_get_project_path
 
+from ..services.screenshot_store import ScreenshotError, ScreenshotStore, ScreenshotTooLargeError
+
 
 router = APIRouter(prefix="/api/projects/{project_name}", tags=["messages"])
 
@@ -87,7 +95,8 @@ class MessageStore:
     def __init__(self):
         self._messages: dict[str, list[dict]] = {}  # project_name -> messages
         self._requests: dict[str, list[dict]] = {}  # project_name -> requests
-        self._screenshots: dict[str, list[dict]] = {}  # project_name -> screenshots
+        self._screenshots: dict[str, list[dict]] = {}  # project_name -> screenshot metadata
+        self._screenshot_stores: dict[str, ScreenshotStore] = {}  # project_name -> image files
         self._callbacks: dict[str, list] = {}  # project_name -> callbacks
         self._lock = asyncio.Lock()
 
@@ -163,8 +172,25 @@ class MessageStore:
                     return req
             return None
 
-    async def add_screenshot(self, project: str, screenshot: dict) -> dict:
-        """Add a screenshot."""
+    def get_screenshot_store(self, project: str, project_dir: Path) -> ScreenshotStore:
+        """Get the image store for a project, opening it on first use."""
+        if project not in self._screenshot_stores:
+            self._screenshot_stores[project] = ScreenshotStore(get_screenshots_dir(project_dir))
+        return self._screenshot_stores[project]
+
+    async def add_screenshot(self, project: str, project_dir: Path, screenshot: dict) -> dict:
+        """
+        Add a screenshot.
+
+        The ``image`` data URL is decoded and written to disk off the event
+        loop; only its metadata is kept in memory.
+
+        Raises:
+            ScreenshotError: If the image data is invalid
+        """
+        store = self.get_screenshot_store(project, project_dir)
+        image = await asyncio.to_thread(store.put_data_url, screenshot.pop("image"))
+
         async with self._lock:
             if project not in self._screenshots:
                 self._screenshots[project] = []
@@ -173,19 +199,45 @@ class MessageStore:
                 "id": str(uuid.uuid4()),
                 "created_at": datetime.now().isoformat(),
                 **screenshot,
+                "digest": image.digest,
+                "content_type": image.content_type,
+                "size": image.size,
+                "width": image.width,
+                "height": image.height,
+                "has_thumbnail": image.has_thumbnail,
             }
             self._screenshots[project].append(ss)
 
             # Keep only last 20 screenshots
-            if len(self._screenshots[project]) > 20:
-                self._screenshots[project] = self._screenshots[project][-20:]
+            evicted = self._screenshots[project][:-20]
+            self._screenshots[project] = self._screenshots[project][-20:]
+
+        for old in evicted:
+            store.release(old["digest"])
 
-            return ss
+        return ss
 
     async def get_screenshots(self, project: str) -> list[dict]:
-        """Get screenshots for a project."""
+        """Get screenshot metadata for a project."""
         async with self._lock:
-            return self._screenshots.get(project, [])
+            return list(self._screenshots.get(project, []))
+
+    async def get_screenshot(self, project: str, screenshot_id: str) -> Optional[dict]:
+        """Get one screenshot's metadata."""
+        async with self._lock:
+            for ss in self._screenshots.get(project, []):
+                if ss["id"] == screenshot_id:
+                    return ss
+            return None
+
+    def get_screenshot_path(self, project: str, screenshot: dict, thumbnail: bool = False) -> Optional[Path]:
+        """Path of a screenshot's image (or thumbnail) file."""
+        store = self._screenshot_stores.get(project)
+        if store is None:
+            return None
+        if thumbnail:
+            return store.thumbnail_path(screenshot["digest"])
+        return store.image_path(screenshot["digest"])
 
     def add_callback(self, project: str, callback):
         """Add a callback for message events."""
@@ -306,55 +358,99 @@ async def respond_to_request(project_name: str, request_id: str, response: dict)
     return result
 
 
-@router.post("/screenshots")
-async def upload_screenshot(project_name: str, screenshot: ScreenshotUpload) -> dict:
-    """Upload a screenshot from the extension."""
+def _screenshot_metadata(project_name: str, ss: dict) -> dict:
+    """Public view of a screenshot: metadata and the URLs of its image files."""
+    base_url = f"/api/projects/{project_name}/screenshots/{ss['id']}"
+    return {
+        "id": ss["id"],
+        "url": ss.get("url"),
+        "title": ss.get("title"),
+        "timestamp": ss.get("timestamp"),
+        "created_at": ss["created_at"],
+        "has_image": True,
+        "content_type": ss["content_type"],
+        "size": ss["size"],
+        "width": ss["width"],
+        "height": ss["height"],
+        "image_url": f"{base_url}/image",
+        "thumbnail_url": f"{base_url}/thumbnail" if ss["has_thumbnail"] else None,
+    }
+
+
+async def _serve_screenshot_file(project_name: str, screenshot_id: str, request: Request, thumbnail: bool):
+    """Serve an image file; its content hash is the ETag, so it never changes."""
     get_project_dir(project_name)
+    ss = await message_store.get_screenshot(project_name, screenshot_id)
+    path = message_store.get_screenshot_path(project_name, ss, thumbnail) if ss else None
+    if path is None or not path.exists():
+        raise HTTPException(status_code=404, detail="Screenshot not found")
 
-    # Validate image data
-    if not screenshot.image.startswith("data:image/"):
-        raise HTTPException(status_code=400, detail="Invalid image data")
+    etag = f'"{ss["digest"]}-thumb"' if thumbnail else f'"{ss["digest"]}"'
+    headers = {"ETag": etag, "Cache-Control": "private, max-age=31536000, immutable"}
 
-    ss = await message_store.add_screenshot(project_name, {
-        "image": screenshot.image,
-        "url": screenshot.url,
-        "title": screenshot.title,
-        "timestamp": screenshot.timestamp,
-    })
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")] or if_none_match == "*":
+        return Response(status_code=304, headers=headers)
 
-    return {"id": ss["id"], "created_at": ss["created_at"]}
+    # FileResponse streams the file and answers Range / If-Range requests
+    media_type = "image/jpeg" if thumbnail else ss["content_type"]
+    return FileResponse(path, media_type=media_type, headers=headers)
+
+
+@router.post("/screenshots")
+async def upload_screenshot(project_name: str, screenshot: ScreenshotUpload) -> dict:
+    """Upload a screenshot from the extension."""
+    project_dir = get_project_dir(project_name)
+
+    try:
+        ss = await message_store.add_screenshot(project_name, project_dir, {
+            "image": screenshot.image,
+            "url": screenshot.url,
+            "title": screenshot.title,
+            "timestamp": screenshot.timestamp,
+        })
+    except ScreenshotTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ScreenshotError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    metadata = _screenshot_metadata(project_name, ss)
+    return {
+        "id": ss["id"],
+        "created_at": ss["created_at"],
+        "image_url": metadata["image_url"],
+        "thumbnail_url": metadata["thumbnail_url"],
+    }
 
 
 @router.get("/screenshots")
 async def get_screenshots(project_name: str) -> list[dict]:
-    """Get screenshots for a project (without image data)."""
+    """Get screenshots for a project (metadata and image URLs, no image data)."""
     get_project_dir(project_name)
     screenshots = await message_store.get_screenshots(project_name)
-
-    # Return without full image data (just metadata)
-    return [
-        {
-            "id": ss["id"],
-            "url": ss.get("url"),
-            "title": ss.get("title"),
-            "created_at": ss["created_at"],
-            "has_image": bool(ss.get("image")),
-        }
-        for ss in screenshots
-    ]
+    return [_screenshot_metadata(project_name, ss) for ss in screenshots]
 
 
 @router.get("/screenshots/{screenshot_id}")
 async def get_screenshot(project_name: str, screenshot_id: str) -> dict:
-    """Get a specific screenshot with image data."""
+    """Get a specific screenshot's metadata; the image is at ``image_url``."""
     get_project_dir(project_name)
-    screenshots = await message_store.get_screenshots(project_name)
+    ss = await message_store.get_screenshot(project_name, screenshot_id)
+    if not ss:
+        raise HTTPException(status_code=404, detail="Screenshot not found")
+    return _screenshot_metadata(project_name, ss)
+
+
+@router.get("/screenshots/{screenshot_id}/image")
+async def get_screenshot_image(project_name: str, screenshot_id: str, request: Request):
+    """Get a screenshot's image bytes."""
+    return await _serve_screenshot_file(project_name, screenshot_id, request, thumbnail=False)
 
-    for ss in screenshots:
-        if ss["id"] == screenshot_id:
-            return ss
 
-    raise HTTPException(status_code=404, detail="Screenshot not found")
+@router.get("/screenshots/{screenshot_id}/thumbnail")
+async def get_screenshot_thumbnail(project_name: str, screenshot_id: str, request: Request):
+    """Get a screenshot's JPEG thumbnail."""
+    return await _serve_screenshot_file(project_name, screenshot_id, request, thumbnail=True)
 
 
 class AgentMessage(BaseModel):
@@ -171,11 +171,35 @@ class FeatureResponse(FeatureBase):
         from_attributes = True
 
 
+class FeatureSummaryResponse(BaseModel):
+    """Lightweight feature projection without description and steps."""
+    id: int
+    priority: int
+    category: str
+    name: str
+    dependencies: list[int] = Field(default_factory=list)
+    passes: bool
+    in_progress: bool
+    blocked: bool = False
+    blocking_dependencies: list[int] = Field(default_factory=list)
+
+
 class FeatureListResponse(BaseModel):
     """Response containing list of features organized by status."""
-    pending: list[FeatureResponse]
-    in_progress: list[FeatureResponse]
-    done: list[FeatureResponse]
+    pending: list[FeatureResponse | FeatureSummaryResponse]
+    in_progress: list[FeatureResponse | FeatureSummaryResponse]
+    done: list[FeatureResponse | FeatureSummaryResponse]
+    revision: int | None = None  # Project write revision this list reflects
+    epoch: str | None = None  # Database identity; send back with since= for deltas
+
+
+class FeatureDeltaResponse(BaseModel):
+    """Features changed since a client's revision, plus deleted feature IDs."""
+    revision: int
+    epoch: str
+    since: int
+    changed: list[FeatureResponse | FeatureSummaryResponse]
+    deleted: list[int]
 
 
 class FeatureBulkCreate(BaseModel):
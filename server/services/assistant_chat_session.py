@@ -23,7 +23,7 @@ from dotenv import load_dotenv
 from .assistant_database import (
     add_message,
     create_conversation,
-    get_messages,
+    get_history_context,
 )
 from .chat_constants import ROOT_DIR
 
@@ -38,6 +38,7 @@ READONLY_FEATURE_MCP_TOOLS = [
     "mcp__features__feature_get_by_id",
     "mcp__features__feature_get_ready",
     "mcp__features__feature_get_blocked",
+    "mcp__features__feature_get_overview",
 ]
 
 # Feature management tools (create/skip but not mark_passing)
@@ -124,6 +125,7 @@ If the user asks you to modify code, explain that you're a project assistant and
 - **feature_get_by_id**: Get details for a specific feature
 - **feature_get_ready**: See features ready for implementation
 - **feature_get_blocked**: See features blocked by dependencies
+- **feature_get_overview**: Ready features, blocked features and progress in one call
 - **feature_create**: Create a single feature in the backlog
 - **feature_create_bulk**: Create multiple features at once
 - **feature_skip**: Move a feature to the end of the queue
@@ -344,21 +346,23 @@ class AssistantChatSession:
             yield {"type": "error", "content": "No conversation ID set."}
             return
 
-        # Store user message in database
-        add_message(self.project_dir, self.conversation_id, "user", user_message)
-
-        # For resumed conversations, include history context in first message
+        # For resumed conversations, include history context in first message.
+        # Read it before storing the new message so the window ends before it.
         message_to_send = user_message
         if not self._history_loaded:
             self._history_loaded = True
-            history = get_messages(self.project_dir, self.conversation_id)
-            # Exclude the message we just added (last one)
-            history = history[:-1] if history else []
-            # Cap history to last 35 messages to prevent context overload
-            history = history[-35:] if len(history) > 35 else history
+            # Last 35 messages verbatim, older ones via the cached rolling summary
+            context = get_history_context(self.project_dir, self.conversation_id, limit=35)
+            history = context["messages"]
             if history:
                 # Format history as context for Claude
-                history_lines = ["[Previous conversation history for context:]"]
+                history_lines = []
+                if context["summary"]:
+                    history_lines.append(
+                        f"[Summary of {context['summarized_count']} earlier messages:]"
+                    )
+                    history_lines.append(context["summary"])
+                history_lines.append("[Previous conversation history for context:]")
                 for msg in history:
                     role = "User" if msg["role"] == "user" else "Assistant"
                     content = msg["content"]
@@ -371,6 +375,9 @@ class AssistantChatSession:
                 message_to_send = "\n".join(history_lines)
                 logger.info(f"Loaded {len(history)} messages from conversation history")
 
+        # Store user message in database
+        add_message(self.project_dir, self.conversation_id, "user", user_message)
+
         try:
             async for chunk in self._query_claude(message_to_send):
                 yield chunk
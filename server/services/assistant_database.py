@@ -4,6 +4,12 @@ Assistant Database
 
 SQLAlchemy models and functions for persisting assistant conversations.
 Each project has its own assistant.db file in the project directory.
+
+Messages are read a page at a time with keyset pagination on
+(timestamp, id), served by a composite (conversation_id, timestamp) index,
+so opening a conversation costs the same however long it is. Each
+conversation also has a summary row with its message count and a rolling
+digest of older messages, used as context when a session is resumed.
 """
 
 import logging
@@ -12,7 +18,19 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text, create_engine, func
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    create_engine,
+    func,
+    text,
+    tuple_,
+)
 from sqlalchemy.engine import Engine
 from sqlalchemy.orm import DeclarativeBase, relationship, sessionmaker
 
@@ -30,6 +48,11 @@ _engine_cache: dict[str, Engine] = {}
 # Prevents race conditions when multiple threads create engines simultaneously
 _cache_lock = threading.Lock()
 
+# Rolling summary limits: one line per message folded in, oldest lines
+# dropped once the digest exceeds the maximum length
+SUMMARY_LINE_CHARS = 200
+SUMMARY_MAX_CHARS = 4000
+
 
 def _utc_now() -> datetime:
     """Return current UTC time. Replacement for deprecated datetime.utcnow()."""
@@ -47,12 +70,21 @@ class Conversation(Base):
     updated_at = Column(DateTime, default=_utc_now, onupdate=_utc_now)
 
     messages = relationship("ConversationMessage", back_populates="conversation", cascade="all, delete-orphan")
+    summary = relationship(
+        "ConversationSummary", back_populates="conversation", uselist=False, cascade="all, delete-orphan"
+    )
 
 
 class ConversationMessage(Base):
     """A single message within a conversation."""
     __tablename__ = "conversation_messages"
 
+    # Serves keyset pagination; SQLite appends the rowid (id) to every index
+    # entry, so the index also orders ties on timestamp by id
+    __table_args__ = (
+        Index("ix_conversation_messages_conversation_timestamp", "conversation_id", "timestamp"),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
     conversation_id = Column(Integer, ForeignKey("conversations.id"), nullable=False, index=True)
     role = Column(String(20), nullable=False)  # "user" | "assistant" | "system"
@@ -62,6 +94,21 @@ class ConversationMessage(Base):
     conversation = relationship("Conversation", back_populates="messages")
 
 
+class ConversationSummary(Base):
+    """Cached per-conversation totals and rolling digest of older messages."""
+    __tablename__ = "conversation_summaries"
+
+    conversation_id = Column(Integer, ForeignKey("conversations.id"), primary_key=True)
+    message_count = Column(Integer, nullable=False, default=0)
+    last_message_id = Column(Integer, nullable=True)
+    summary = Column(Text, nullable=False, default="")
+    # Messages up to this id have been folded into the summary
+    summarized_through_id = Column(Integer, nullable=False, default=0)
+    summarized_count = Column(Integer, nullable=False, default=0)
+
+    conversation = relationship("Conversation", back_populates="summary")
+
+
 def get_db_path(project_dir: Path) -> Path:
     """Get the path to the assistant database for a project."""
     from autoforge_paths import get_assistant_db_path
@@ -98,12 +145,40 @@ def get_engine(project_dir: Path):
                 }
             )
             Base.metadata.create_all(engine)
+            _migrate_add_message_paging(engine)
             _engine_cache[cache_key] = engine
             logger.debug(f"Created new database engine for {cache_key}")
 
     return _engine_cache[cache_key]
 
 
+def _migrate_add_message_paging(engine) -> None:
+    """Add the paging index and summary rows to databases created before them.
+
+    create_all() only creates indexes together with new tables, so the
+    composite index is added explicitly; conversations without a summary
+    row get one with their current message count.
+    """
+    with engine.connect() as conn:
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_conversation_messages_conversation_timestamp "
+            "ON conversation_messages (conversation_id, timestamp)"
+        ))
+        conn.execute(text(
+            """
+            INSERT INTO conversation_summaries
+                (conversation_id, message_count, last_message_id, summary,
+                 summarized_through_id, summarized_count)
+            SELECT c.id, COUNT(m.id), MAX(m.id), '', 0, 0
+            FROM conversations c
+            LEFT JOIN conversation_messages m ON m.conversation_id = c.id
+            WHERE c.id NOT IN (SELECT conversation_id FROM conversation_summaries)
+            GROUP BY c.id
+            """
+        ))
+        conn.commit()
+
+
 def dispose_engine(project_dir: Path) -> bool:
     """Dispose of and remove the cached engine for a project.
 
@@ -143,6 +218,7 @@ def create_conversation(project_dir: Path, project_name: str, title: Optional[st
             project_name=project_name,
             title=title,
         )
+        conversation.summary = ConversationSummary()
         session.add(conversation)
         session.commit()
         session.refresh(conversation)
@@ -155,30 +231,17 @@ def create_conversation(project_dir: Path, project_name: str, title: Optional[st
 def get_conversations(project_dir: Path, project_name: str) -> list[dict]:
     """Get all conversations for a project with message counts.
 
-    Uses a subquery for message_count to avoid N+1 query problem.
+    Message counts come from the summary rows, so listing does not scan
+    the messages table.
     """
     session = get_session(project_dir)
     try:
-        # Subquery to count messages per conversation (avoids N+1 query)
-        message_count_subquery = (
-            session.query(
-                ConversationMessage.conversation_id,
-                func.count(ConversationMessage.id).label("message_count")
-            )
-            .group_by(ConversationMessage.conversation_id)
-            .subquery()
-        )
-
-        # Join conversation with message counts
         conversations = (
             session.query(
                 Conversation,
-                func.coalesce(message_count_subquery.c.message_count, 0).label("message_count")
-            )
-            .outerjoin(
-                message_count_subquery,
-                Conversation.id == message_count_subquery.c.conversation_id
+                func.coalesce(ConversationSummary.message_count, 0).label("message_count")
             )
+            .outerjoin(ConversationSummary, Conversation.id == ConversationSummary.conversation_id)
             .filter(Conversation.project_name == project_name)
             .order_by(Conversation.updated_at.desc())
             .all()
@@ -198,28 +261,43 @@ def get_conversations(project_dir: Path, project_name: str) -> list[dict]:
         session.close()
 
 
-def get_conversation(project_dir: Path, conversation_id: int) -> Optional[dict]:
-    """Get a conversation with all its messages."""
+def get_conversation(
+    project_dir: Path,
+    conversation_id: int,
+    limit: Optional[int] = None,
+    before_id: Optional[int] = None,
+    after_id: Optional[int] = None,
+) -> Optional[dict]:
+    """Get a conversation with one page of its messages.
+
+    Args:
+        project_dir: Project directory
+        conversation_id: Conversation to load
+        limit: Page size; None returns every message in the range
+        before_id: Return the latest messages older than this message
+        after_id: Return the earliest messages newer than this message
+
+    Returns:
+        Conversation dict with ``messages`` (oldest first), ``message_count``
+        (whole conversation) and ``has_more`` (further messages exist in the
+        paging direction), or None if the conversation does not exist
+    """
     session = get_session(project_dir)
     try:
         conversation = session.query(Conversation).filter(Conversation.id == conversation_id).first()
         if not conversation:
             return None
+        messages, has_more = _query_messages(session, conversation_id, limit, before_id, after_id)
+        summary = conversation.summary
         return {
             "id": conversation.id,
             "project_name": conversation.project_name,
             "title": conversation.title,
             "created_at": conversation.created_at.isoformat() if conversation.created_at else None,
             "updated_at": conversation.updated_at.isoformat() if conversation.updated_at else None,
-            "messages": [
-                {
-                    "id": m.id,
-                    "role": m.role,
-                    "content": m.content,
-                    "timestamp": m.timestamp.isoformat() if m.timestamp else None,
-                }
-                for m in sorted(conversation.messages, key=lambda x: x.timestamp or datetime.min)
-            ],
+            "message_count": summary.message_count if summary else len(messages),
+            "has_more": has_more,
+            "messages": [_message_to_dict(m) for m in messages],
         }
     finally:
         session.close()
@@ -232,6 +310,10 @@ def delete_conversation(project_dir: Path, conversation_id: int) -> bool:
         conversation = session.query(Conversation).filter(Conversation.id == conversation_id).first()
         if not conversation:
             return False
+        # Bulk delete rather than loading every message for the ORM cascade
+        session.query(ConversationMessage).filter(
+            ConversationMessage.conversation_id == conversation_id
+        ).delete(synchronize_session=False)
         session.delete(conversation)
         session.commit()
         logger.info(f"Deleted conversation {conversation_id}")
@@ -244,6 +326,65 @@ def delete_conversation(project_dir: Path, conversation_id: int) -> bool:
 # Message Operations
 # ============================================================================
 
+def _message_to_dict(message: ConversationMessage) -> dict:
+    return {
+        "id": message.id,
+        "role": message.role,
+        "content": message.content,
+        "timestamp": message.timestamp.isoformat() if message.timestamp else None,
+    }
+
+
+def _query_messages(
+    session,
+    conversation_id: int,
+    limit: Optional[int],
+    before_id: Optional[int],
+    after_id: Optional[int],
+) -> tuple[list[ConversationMessage], bool]:
+    """Fetch one keyset page of messages, oldest first.
+
+    Pages are ordered by (timestamp, id) and bounded by the position of the
+    anchor message, so each page is an index range scan regardless of how
+    many messages come before it.
+
+    Returns:
+        (messages, has_more)
+    """
+    key = tuple_(ConversationMessage.timestamp, ConversationMessage.id)
+    query = session.query(ConversationMessage).filter(ConversationMessage.conversation_id == conversation_id)
+
+    for anchor_id, older in ((before_id, True), (after_id, False)):
+        if anchor_id is None:
+            continue
+        anchor = (
+            session.query(ConversationMessage.timestamp)
+            .filter(ConversationMessage.id == anchor_id, ConversationMessage.conversation_id == conversation_id)
+            .first()
+        )
+        if anchor is None:
+            return [], False
+        bound = tuple_(anchor.timestamp, anchor_id)
+        query = query.filter(key < bound if older else key > bound)
+
+    # Without after_id the page is the newest end of the range
+    newest_first = after_id is None and limit is not None
+    if newest_first:
+        query = query.order_by(ConversationMessage.timestamp.desc(), ConversationMessage.id.desc())
+    else:
+        query = query.order_by(ConversationMessage.timestamp.asc(), ConversationMessage.id.asc())
+
+    if limit is None:
+        return query.all(), False
+
+    messages = query.limit(limit + 1).all()
+    has_more = len(messages) > limit
+    messages = messages[:limit]
+    if newest_first:
+        messages.reverse()
+    return messages, has_more
+
+
 def add_message(project_dir: Path, conversation_id: int, role: str, content: str) -> Optional[dict]:
     """Add a message to a conversation."""
     session = get_session(project_dir)
@@ -267,38 +408,141 @@ def add_message(project_dir: Path, conversation_id: int, role: str, content: str
             # Take first 50 chars of first user message as title
             conversation.title = content[:50] + ("..." if len(content) > 50 else "")
 
+        session.flush()
+
+        # Keep the cached totals in step, in the same transaction
+        updated = (
+            session.query(ConversationSummary)
+            .filter(ConversationSummary.conversation_id == conversation_id)
+            .update(
+                {
+                    ConversationSummary.message_count: ConversationSummary.message_count + 1,
+                    ConversationSummary.last_message_id: message.id,
+                },
+                synchronize_session=False,
+            )
+        )
+        if not updated:
+            message_count = (
+                session.query(func.count(ConversationMessage.id))
+                .filter(ConversationMessage.conversation_id == conversation_id)
+                .scalar()
+            )
+            session.add(ConversationSummary(
+                conversation_id=conversation_id,
+                message_count=message_count,
+                last_message_id=message.id,
+            ))
+
         session.commit()
         session.refresh(message)
 
         logger.debug(f"Added {role} message to conversation {conversation_id}")
-        return {
-            "id": message.id,
-            "role": message.role,
-            "content": message.content,
-            "timestamp": message.timestamp.isoformat() if message.timestamp else None,
-        }
+        return _message_to_dict(message)
     finally:
         session.close()
 
 
-def get_messages(project_dir: Path, conversation_id: int) -> list[dict]:
-    """Get all messages for a conversation."""
+def get_messages(
+    project_dir: Path,
+    conversation_id: int,
+    limit: Optional[int] = None,
+    before_id: Optional[int] = None,
+    after_id: Optional[int] = None,
+) -> list[dict]:
+    """Get messages for a conversation, oldest first.
+
+    Args:
+        project_dir: Project directory
+        conversation_id: Conversation to read
+        limit: Page size; None returns every message in the range
+        before_id: Return the latest messages older than this message
+        after_id: Return the earliest messages newer than this message
+    """
     session = get_session(project_dir)
     try:
-        messages = (
+        messages, _ = _query_messages(session, conversation_id, limit, before_id, after_id)
+        return [_message_to_dict(m) for m in messages]
+    finally:
+        session.close()
+
+
+def _summary_line(message: ConversationMessage) -> str:
+    role = "User" if message.role == "user" else "Assistant"
+    content = " ".join(message.content.split())
+    if len(content) > SUMMARY_LINE_CHARS:
+        content = content[:SUMMARY_LINE_CHARS] + "..."
+    return f"{role}: {content}"
+
+
+def get_history_context(project_dir: Path, conversation_id: int, limit: int = 35) -> dict:
+    """Get the context for resuming a conversation.
+
+    Returns the latest ``limit`` messages plus the conversation's rolling
+    summary of everything older. Messages that have dropped out of the
+    window since the last call are folded into the cached summary row, so
+    each call reads only the window and the newly aged-out messages.
+
+    Returns:
+        Dict with ``messages`` (oldest first), ``summary`` (str, may be
+        empty) and ``summarized_count`` (messages covered by the summary)
+    """
+    session = get_session(project_dir)
+    try:
+        messages, _ = _query_messages(session, conversation_id, limit, None, None)
+        summary = (
+            session.query(ConversationSummary)
+            .filter(ConversationSummary.conversation_id == conversation_id)
+            .first()
+        )
+        if summary is None or not messages:
+            return {"messages": [_message_to_dict(m) for m in messages], "summary": "", "summarized_count": 0}
+
+        # Message ids increase in insertion order, so everything before the
+        # window and after the last folded message is new to the summary
+        boundary_id = messages[0].id
+        aged_out = (
             session.query(ConversationMessage)
-            .filter(ConversationMessage.conversation_id == conversation_id)
-            .order_by(ConversationMessage.timestamp.asc())
+            .filter(
+                ConversationMessage.conversation_id == conversation_id,
+                ConversationMessage.id > summary.summarized_through_id,
+                ConversationMessage.id < boundary_id,
+            )
+            .order_by(ConversationMessage.id.asc())
             .all()
         )
-        return [
-            {
-                "id": m.id,
-                "role": m.role,
-                "content": m.content,
-                "timestamp": m.timestamp.isoformat() if m.timestamp else None,
-            }
-            for m in messages
-        ]
+
+        summary_text = summary.summary
+        summarized_count = summary.summarized_count
+        if aged_out:
+            lines = summary_text.splitlines() + [_summary_line(m) for m in aged_out]
+            while len(lines) > 1 and sum(len(line) + 1 for line in lines) > SUMMARY_MAX_CHARS:
+                lines.pop(0)
+            summary_text = "\n".join(lines)
+            summarized_count += len(aged_out)
+
+            # Only advance if no concurrent caller already folded these in
+            (
+                session.query(ConversationSummary)
+                .filter(
+                    ConversationSummary.conversation_id == conversation_id,
+                    ConversationSummary.summarized_through_id == summary.summarized_through_id,
+                )
+                .update(
+                    {
+                        ConversationSummary.summary: summary_text,
+                        ConversationSummary.summarized_through_id: aged_out[-1].id,
+                        ConversationSummary.summarized_count: summarized_count,
+                    },
+                    synchronize_session=False,
+                )
+            )
+            session.commit()
+
+        return {
+            "messages": [_message_to_dict(m) for m in messages],
+            "summary": summary_text,
+            "summarized_count": summarized_count,
+        }
     finally:
         session.close()
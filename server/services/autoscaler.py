@@ -7,6 +7,16 @@ Intelligent resource autoscaling service for AutoCoder.
 Monitors resource usage and automatically adjusts systemd service limits
 (CPU quota, memory, process count) based on workload patterns.
 
+Limits are applied live by writing the service's cgroup v2 control files
+(see server/utils/cgroup_limits.py), so scaling never restarts the service.
+The unit file is rewritten afterwards only so the limits survive a restart.
+
+Each monitoring tick takes one snapshot of cgroup usage plus workload signals
+(running agents from the process manager, pending features from each active
+project's database, quota burn rate from the quota budget). All database
+access goes through one long-lived connection; metrics are inserted in
+batches, and raw samples older than a day are downsampled to hourly rows.
+
 Features:
 - Threshold-based scaling (MVP)
 - Trend-aware scaling (Phase 2)
@@ -16,17 +26,21 @@ Features:
 """
 
 import asyncio
+import atexit
 import os
+import re
 import sqlite3
 import subprocess
+import threading
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
 from pydantic import BaseModel, Field
 
+from ..utils.cgroup_limits import MEMORY_HIGH_RATIO, CgroupLimitError, CgroupLimits, find_service_cgroup
 from ..utils.resource_monitor import ResourceMetrics
 
 
@@ -34,6 +48,17 @@ from ..utils.resource_monitor import ResourceMetrics
 AUTOSCALER_DB = Path.home() / ".autocoder" / "autoscaler.db"
 AUTOSCALER_DB.parent.mkdir(parents=True, exist_ok=True)
 
+# Metrics storage
+METRICS_BATCH_SIZE = 10  # Buffered samples per INSERT batch
+RAW_METRICS_RETENTION = timedelta(days=1)  # Older samples are downsampled
+HOURLY_METRICS_RETENTION = timedelta(days=30)
+MAINTENANCE_INTERVAL = timedelta(hours=1)
+
+_METRICS_COLUMNS = (
+    "timestamp", "cpu_percent", "memory_gb", "process_count", "agent_count",
+    "testing_agent_count", "api_quota_remaining", "features_pending", "quota_burn_rate",
+)
+
 
 class ScalingMode(str, Enum):
     """Autoscaler operational mode."""
@@ -62,6 +87,310 @@ class ScalingAction:
     error_message: Optional[str] = None
 
 
+class AutoscalerStore:
+    """
+    Single long-lived connection to the autoscaler database.
+
+    Shared by the config, history and metrics writers (guarded by a lock,
+    since routers and the monitoring loop may run on different threads).
+    Metrics are buffered and inserted METRICS_BATCH_SIZE rows at a time.
+    """
+
+    def __init__(self, db_path: Path | str, batch_size: int = METRICS_BATCH_SIZE):
+        """
+        Open the database and create the schema.
+
+        Args:
+            db_path: Database file (or ":memory:")
+            batch_size: Buffered metrics samples per INSERT batch
+        """
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self._lock = threading.RLock()
+        self._pending_metrics: list[tuple] = []
+        self._last_maintenance: Optional[datetime] = None
+
+        self.conn = sqlite3.connect(str(db_path), timeout=30, check_same_thread=False)
+        if str(db_path) != ":memory:":
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._init_schema()
+
+    def _init_schema(self):
+        """Initialize database schema."""
+        with self._lock:
+            conn = self.conn
+            # Config table
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS autoscaler_config (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    mode TEXT DEFAULT 'enabled',
+                    policy TEXT DEFAULT 'balanced',
+                    scale_up_cpu_percent INTEGER DEFAULT 85,
+                    scale_up_memory_percent INTEGER DEFAULT 80,
+                    scale_up_tasks_percent INTEGER DEFAULT 85,
+                    scale_down_cpu_percent INTEGER DEFAULT 40,
+                    scale_down_memory_percent INTEGER DEFAULT 50,
+                    scale_down_tasks_percent INTEGER DEFAULT 30,
+                    check_interval_seconds INTEGER DEFAULT 30,
+                    scale_cooldown_seconds INTEGER DEFAULT 300,
+                    consecutive_scale_up_checks INTEGER DEFAULT 3,
+                    consecutive_scale_down_checks INTEGER DEFAULT 10,
+                    scale_up_factor REAL DEFAULT 1.5,
+                    scale_down_factor REAL DEFAULT 0.6,
+                    min_cpu_quota INTEGER DEFAULT 100,
+                    max_cpu_quota INTEGER DEFAULT 800,
+                    min_memory_max INTEGER DEFAULT 8,
+                    max_memory_max INTEGER DEFAULT 192,
+                    min_tasks_max INTEGER DEFAULT 100,
+                    max_tasks_max INTEGER DEFAULT 1500,
+                    system_cpu_cores INTEGER DEFAULT 1,
+                    system_memory_gb INTEGER DEFAULT 8,
+                    system_processes INTEGER DEFAULT 50
+                )
+            """)
+
+            # Metrics history
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS autoscaler_metrics (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    cpu_percent REAL NOT NULL,
+                    memory_gb REAL NOT NULL,
+                    process_count INTEGER NOT NULL,
+                    agent_count INTEGER NOT NULL,
+                    testing_agent_count INTEGER NOT NULL,
+                    api_quota_remaining INTEGER NOT NULL,
+                    features_pending INTEGER NOT NULL
+                )
+            """)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(autoscaler_metrics)")}
+            if "quota_burn_rate" not in columns:
+                conn.execute("ALTER TABLE autoscaler_metrics ADD COLUMN quota_burn_rate REAL NOT NULL DEFAULT 0")
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_autoscaler_metrics_timestamp ON autoscaler_metrics(timestamp)"
+            )
+
+            # Downsampled metrics (one row per hour, "YYYY-MM-DD HH")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS autoscaler_metrics_hourly (
+                    hour TEXT PRIMARY KEY,
+                    samples INTEGER NOT NULL,
+                    cpu_percent_avg REAL NOT NULL,
+                    cpu_percent_max REAL NOT NULL,
+                    memory_gb_avg REAL NOT NULL,
+                    memory_gb_max REAL NOT NULL,
+                    process_count_max INTEGER NOT NULL,
+                    agent_count_max INTEGER NOT NULL,
+                    testing_agent_count_max INTEGER NOT NULL,
+                    features_pending_avg REAL NOT NULL,
+                    quota_burn_rate_avg REAL NOT NULL
+                )
+            """)
+
+            # Scale history
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS autoscaler_history (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    action TEXT NOT NULL,
+                    trigger_type TEXT NOT NULL,
+                    reason TEXT NOT NULL,
+                    old_cpu_quota INTEGER NOT NULL,
+                    old_memory_max INTEGER NOT NULL,
+                    old_tasks_max INTEGER NOT NULL,
+                    new_cpu_quota INTEGER NOT NULL,
+                    new_memory_max INTEGER NOT NULL,
+                    new_tasks_max INTEGER NOT NULL,
+                    status TEXT NOT NULL,
+                    error_message TEXT
+                )
+            """)
+
+            # Insert default config if not exists
+            conn.execute(
+                "INSERT OR IGNORE INTO autoscaler_config (id) VALUES (1)"
+            )
+
+            conn.commit()
+
+    def fetchone(self, sql: str, params: tuple = ()) -> Optional[tuple]:
+        """Run a query and return its first row."""
+        with self._lock:
+            return self.conn.execute(sql, params).fetchone()
+
+    def execute(self, sql: str, params: tuple = ()) -> None:
+        """Run a statement and commit it."""
+        with self._lock:
+            try:
+                self.conn.execute(sql, params)
+                self.conn.commit()
+            except Exception:
+                self.conn.rollback()
+                raise
+
+    def record_metrics(self, metrics: ResourceMetrics) -> None:
+        """Buffer one metrics sample, flushing when the batch is full."""
+        row = (
+            metrics.timestamp.isoformat(sep=" "),
+            metrics.cpu_percent,
+            metrics.memory_gb,
+            metrics.process_count,
+            metrics.agent_count,
+            metrics.testing_agent_count,
+            metrics.api_quota_remaining,
+            metrics.features_pending,
+            metrics.quota_burn_rate,
+        )
+        with self._lock:
+            self._pending_metrics.append(row)
+            if len(self._pending_metrics) >= self.batch_size:
+                self.flush_metrics()
+
+    def flush_metrics(self) -> int:
+        """
+        Insert all buffered metrics samples in one transaction.
+
+        Returns:
+            Number of samples written
+        """
+        with self._lock:
+            rows, self._pending_metrics = self._pending_metrics, []
+            if not rows:
+                return 0
+            placeholders = ", ".join("?" * len(_METRICS_COLUMNS))
+            with self.conn:
+                self.conn.executemany(
+                    f"INSERT INTO autoscaler_metrics ({', '.join(_METRICS_COLUMNS)}) VALUES ({placeholders})",
+                    rows,
+                )
+            return len(rows)
+
+    def apply_retention(self, now: Optional[datetime] = None, force: bool = False) -> int:
+        """
+        Downsample old raw metrics into hourly rows and drop expired data.
+
+        Raw samples older than RAW_METRICS_RETENTION (cut at an hour
+        boundary, so an hour is never split) are folded into
+        autoscaler_metrics_hourly and deleted. Hourly rows older than
+        HOURLY_METRICS_RETENTION are deleted. Runs at most once per
+        MAINTENANCE_INTERVAL unless forced.
+
+        Args:
+            now: Current time (UTC)
+            force: Run even if the interval has not elapsed
+
+        Returns:
+            Number of raw samples downsampled
+        """
+        now = now or datetime.utcnow()
+        with self._lock:
+            if (not force and self._last_maintenance is not None
+                    and now - self._last_maintenance < MAINTENANCE_INTERVAL):
+                return 0
+            self._last_maintenance = now
+            self.flush_metrics()
+
+            cutoff = (now - RAW_METRICS_RETENTION).replace(minute=0, second=0, microsecond=0)
+            cutoff_str = cutoff.isoformat(sep=" ")
+            hourly_cutoff = (now - HOURLY_METRICS_RETENTION).strftime("%Y-%m-%d %H")
+
+            with self.conn:
+                self.conn.execute(
+                    """
+                    INSERT INTO autoscaler_metrics_hourly
+                    (hour, samples, cpu_percent_avg, cpu_percent_max, memory_gb_avg, memory_gb_max,
+                     process_count_max, agent_count_max, testing_agent_count_max,
+                     features_pending_avg, quota_burn_rate_avg)
+                    SELECT substr(timestamp, 1, 13), COUNT(*), AVG(cpu_percent), MAX(cpu_percent),
+                           AVG(memory_gb), MAX(memory_gb), MAX(process_count), MAX(agent_count),
+                           MAX(testing_agent_count), AVG(features_pending), AVG(quota_burn_rate)
+                    FROM autoscaler_metrics
+                    WHERE timestamp < ?
+                    GROUP BY substr(timestamp, 1, 13)
+                    ON CONFLICT(hour) DO UPDATE SET
+                        cpu_percent_avg = (cpu_percent_avg * samples + excluded.cpu_percent_avg * excluded.samples)
+                                          / (samples + excluded.samples),
+                        memory_gb_avg = (memory_gb_avg * samples + excluded.memory_gb_avg * excluded.samples)
+                                        / (samples + excluded.samples),
+                        features_pending_avg = (features_pending_avg * samples
+                                                + excluded.features_pending_avg * excluded.samples)
+                                               / (samples + excluded.samples),
+                        quota_burn_rate_avg = (quota_burn_rate_avg * samples
+                                               + excluded.quota_burn_rate_avg * excluded.samples)
+                                              / (samples + excluded.samples),
+                        cpu_percent_max = MAX(cpu_percent_max, excluded.cpu_percent_max),
+                        memory_gb_max = MAX(memory_gb_max, excluded.memory_gb_max),
+                        process_count_max = MAX(process_count_max, excluded.process_count_max),
+                        agent_count_max = MAX(agent_count_max, excluded.agent_count_max),
+                        testing_agent_count_max = MAX(testing_agent_count_max, excluded.testing_agent_count_max),
+                        samples = samples + excluded.samples
+                    """,
+                    (cutoff_str,),
+                )
+                downsampled = self.conn.execute(
+                    "DELETE FROM autoscaler_metrics WHERE timestamp < ?", (cutoff_str,)
+                ).rowcount
+                self.conn.execute("DELETE FROM autoscaler_metrics_hourly WHERE hour < ?", (hourly_cutoff,))
+
+            return downsampled
+
+    def log_history(self, action: "ScalingAction") -> None:
+        """Record a scaling action."""
+        self.execute(
+            """
+            INSERT INTO autoscaler_history
+            (timestamp, action, trigger_type, reason,
+             old_cpu_quota, old_memory_max, old_tasks_max,
+             new_cpu_quota, new_memory_max, new_tasks_max,
+             status, error_message)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                action.timestamp.isoformat(sep=" "),
+                action.action,
+                action.trigger_type,
+                action.reason,
+                action.old_limits["cpu_quota"],
+                action.old_limits["memory_max"],
+                action.old_limits["tasks_max"],
+                action.new_limits["cpu_quota"],
+                action.new_limits["memory_max"],
+                action.new_limits["tasks_max"],
+                action.status,
+                action.error_message,
+            ),
+        )
+
+    def close(self) -> None:
+        """Flush buffered metrics and close the connection."""
+        with self._lock:
+            try:
+                self.flush_metrics()
+            finally:
+                self.conn.close()
+
+
+_stores: dict[str, AutoscalerStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(db_path: Optional[Path] = None) -> AutoscalerStore:
+    """
+    Get the shared store for an autoscaler database (default: AUTOSCALER_DB).
+
+    Buffered metrics are flushed at interpreter exit.
+    """
+    key = str(db_path or AUTOSCALER_DB)
+    with _stores_lock:
+        if key not in _stores:
+            store = AutoscalerStore(key)
+            atexit.register(store.flush_metrics)
+            _stores[key] = store
+        return _stores[key]
+
+
+
 @dataclass
 class AutoscalerConfig:
     """Autoscaler configuration."""
@@ -103,51 +432,45 @@ class AutoscalerConfig:
     system_processes: int = 50
 
     @classmethod
-    def load(cls) -> "AutoscalerConfig":
+    def load(cls, store: Optional[AutoscalerStore] = None) -> "AutoscalerConfig":
         """Load configuration from database."""
-        conn = sqlite3.connect(AUTOSCALER_DB)
-        try:
-            cursor = conn.execute(
-                "SELECT * FROM autoscaler_config WHERE id = 1"
+        store = store or get_store()
+        row = store.fetchone("SELECT * FROM autoscaler_config WHERE id = 1")
+        if row:
+            return cls(
+                mode=ScalingMode(row[1] or "enabled"),
+                policy=ScalingPolicy(row[2] or "balanced"),
+                scale_up_cpu_percent=row[3] or 85,
+                scale_up_memory_percent=row[4] or 80,
+                scale_up_tasks_percent=row[5] or 85,
+                scale_down_cpu_percent=row[6] or 40,
+                scale_down_memory_percent=row[7] or 50,
+                scale_down_tasks_percent=row[8] or 30,
+                check_interval_seconds=row[9] or 30,
+                scale_cooldown_seconds=row[10] or 300,
+                consecutive_scale_up_checks=row[11] or 3,
+                consecutive_scale_down_checks=row[12] or 10,
+                scale_up_factor=row[13] or 1.5,
+                scale_down_factor=row[14] or 0.6,
+                min_cpu_quota=row[15] or 100,
+                max_cpu_quota=row[16] or 800,
+                min_memory_max=row[17] or 8,
+                max_memory_max=row[18] or 192,
+                min_tasks_max=row[19] or 100,
+                max_tasks_max=row[20] or 1500,
+                system_cpu_cores=row[21] or 1,
+                system_memory_gb=row[22] or 8,
+                system_processes=row[23] or 50,
             )
-            row = cursor.fetchone()
-            if row:
-                return cls(
-                    mode=ScalingMode(row[1] or "enabled"),
-                    policy=ScalingPolicy(row[2] or "balanced"),
-                    scale_up_cpu_percent=row[3] or 85,
-                    scale_up_memory_percent=row[4] or 80,
-                    scale_up_tasks_percent=row[5] or 85,
-                    scale_down_cpu_percent=row[6] or 40,
-                    scale_down_memory_percent=row[7] or 50,
-                    scale_down_tasks_percent=row[8] or 30,
-                    check_interval_seconds=row[9] or 30,
-                    scale_cooldown_seconds=row[10] or 300,
-                    consecutive_scale_up_checks=row[11] or 3,
-                    consecutive_scale_down_checks=row[12] or 10,
-                    scale_up_factor=row[13] or 1.5,
-                    scale_down_factor=row[14] or 0.6,
-                    min_cpu_quota=row[15] or 100,
-                    max_cpu_quota=row[16] or 800,
-                    min_memory_max=row[17] or 8,
-                    max_memory_max=row[18] or 192,
-                    min_tasks_max=row[19] or 100,
-                    max_tasks_max=row[20] or 1500,
-                    system_cpu_cores=row[21] or 1,
-                    system_memory_gb=row[22] or 8,
-                    system_processes=row[23] or 50,
-                )
-        finally:
-            conn.close()
 
         # Return defaults if not configured
         return cls()
 
-    def save(self) -> bool:
+    def save(self, store: Optional[AutoscalerStore] = None) -> bool:
         """Save configuration to database."""
-        conn = sqlite3.connect(AUTOSCALER_DB)
+        store = store or get_store()
         try:
-            conn.execute(
+            store.execute(
                 """
                 INSERT OR REPLACE INTO autoscaler_config
                 (id, mode, policy,
@@ -188,13 +511,10 @@ class AutoscalerConfig:
                     self.system_processes,
                 ),
             )
-            conn.commit()
             return True
         except Exception as e:
             print(f"Failed to save autoscaler config: {e}")
             return False
-        finally:
-            conn.close()
 
 
 class ThresholdScaler:
@@ -202,7 +522,8 @@ class ThresholdScaler:
     Threshold-based autoscaler (MVP implementation).
 
     Scales resources when usage thresholds are breached for consecutive checks.
-    Implements hysteresis to prevent thrashing.
+    Implements hysteresis to prevent thrashing. Never scales down while
+    agents are still working through a backlog of pending features.
     """
 
     def __init__(self, config: AutoscalerConfig):
@@ -237,10 +558,12 @@ class ThresholdScaler:
             self.scale_up_count = 0
 
         # Check scale DOWN conditions (all must be true)
+        backlog_in_progress = metrics.agent_count > 0 and metrics.features_pending > 0
         scale_down = (
             metrics.cpu_percent < self.config.scale_down_cpu_percent and
             metrics.memory_gb < (self.config.max_memory_max * self.config.scale_down_memory_percent / 100) and
-            (metrics.process_count / self.config.max_tasks_max * 100) < self.config.scale_down_tasks_percent
+            (metrics.process_count / self.config.max_tasks_max * 100) < self.config.scale_down_tasks_percent and
+            not backlog_in_progress
         )
 
         if scale_down:
@@ -304,6 +627,108 @@ def round_to_nearest(value: int, multiple: int) -> int:
     return ((value + multiple // 2) // multiple) * multiple
 
 
+@dataclass
+class WorkloadSignals:
+    """Workload inputs for one monitoring tick."""
+    agent_count: int = 0
+    testing_agent_count: int = 0
+    features_pending: int = 0
+    api_quota_remaining: int = 0
+    quota_burn_rate: float = 0.0  # Prompts per hour
+
+
+class SignalCollector:
+    """
+    Gathers workload signals for the monitoring loop in one snapshot.
+
+    - Running agents: subprocesses of each active AgentProcessManager,
+      grouped by their --agent-type
+    - Pending features: non-passing features in each active project's
+      features.db, read through connections kept open between ticks
+    - Quota: remaining prompts and recent burn rate from the QuotaBudget
+
+    A source that fails contributes zeros rather than aborting the tick.
+    """
+
+    def __init__(
+        self,
+        get_managers: Optional[Callable[[], list]] = None,
+        quota_budget=None,
+    ):
+        """
+        Initialize the collector.
+
+        Args:
+            get_managers: Returns the active process managers
+                (default: process_manager.get_active_managers)
+            quota_budget: QuotaBudget to read (default: the global instance)
+        """
+        self._get_managers = get_managers
+        self._quota_budget = quota_budget
+        self._feature_dbs: dict[Path, sqlite3.Connection] = {}
+
+    def _pending_features(self, db_path: Path) -> int:
+        conn = self._feature_dbs.get(db_path)
+        if conn is None:
+            conn = sqlite3.connect(
+                f"{db_path.as_uri()}?mode=ro", uri=True, timeout=5, check_same_thread=False
+            )
+            self._feature_dbs[db_path] = conn
+        return conn.execute("SELECT COUNT(*) FROM features WHERE passes = 0").fetchone()[0]
+
+    def snapshot(self) -> WorkloadSignals:
+        """Collect the current workload signals."""
+        signals = WorkloadSignals()
+
+        try:
+            if self._get_managers is None:
+                from .process_manager import get_active_managers
+                self._get_managers = get_active_managers
+            managers = self._get_managers()
+        except Exception as e:
+            print(f"Autoscaler: agent counts unavailable: {e}")
+            managers = []
+
+        from api.database import get_database_path
+
+        active_dbs = set()
+        for manager in managers:
+            counts = manager.get_agent_counts()
+            signals.testing_agent_count += counts.get("testing", 0)
+            signals.agent_count += sum(n for kind, n in counts.items() if kind != "testing")
+
+            db_path = get_database_path(manager.project_dir)
+            if not db_path.exists():
+                continue
+            active_dbs.add(db_path)
+            try:
+                signals.features_pending += self._pending_features(db_path)
+            except sqlite3.Error as e:
+                print(f"Autoscaler: pending count unavailable for {manager.project_name}: {e}")
+
+        # Close connections to projects that are no longer running
+        for db_path in set(self._feature_dbs) - active_dbs:
+            self._feature_dbs.pop(db_path).close()
+
+        try:
+            if self._quota_budget is None:
+                from api.quota_budget import get_quota_budget
+                self._quota_budget = get_quota_budget()
+            quota = self._quota_budget.get_usage_snapshot()
+            signals.api_quota_remaining = quota["remaining"]
+            signals.quota_burn_rate = quota["burn_rate"]
+        except Exception as e:
+            print(f"Autoscaler: quota usage unavailable: {e}")
+
+        return signals
+
+    def close(self) -> None:
+        """Close the feature database connections."""
+        for conn in self._feature_dbs.values():
+            conn.close()
+        self._feature_dbs.clear()
+
+
 class AutoScaler:
     """
     Main autoscaling service.
@@ -311,93 +736,43 @@ class AutoScaler:
     Orchestrates resource monitoring, threshold evaluation, and limit updates.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        cgroup_limits: Optional[CgroupLimits] = None,
+        store: Optional[AutoscalerStore] = None,
+        signals: Optional["SignalCollector"] = None,
+    ):
+        """
+        Initialize the autoscaler.
+
+        Args:
+            cgroup_limits: Limits writer for the service cgroup; located
+                automatically on first use if not given
+            store: Database store (default: the shared AUTOSCALER_DB store)
+            signals: Workload signal source (default: live process manager,
+                feature databases and quota budget)
+        """
         self.is_running = False
         self.current_limits = {}
+        self.cgroup_limits = cgroup_limits
         self.last_scale_time = None  # Track last scaling action
-        self._init_db()  # Initialize database FIRST
-        self.config = AutoscalerConfig.load()  # THEN load config
+        self.store = store or get_store()  # Creates the schema
+        self.config = AutoscalerConfig.load(self.store)
         self.scaler = ThresholdScaler(self.config)
+        self.signals = signals or SignalCollector()
 
-    def _init_db(self):
-        """Initialize database schema."""
-        conn = sqlite3.connect(AUTOSCALER_DB)
-        try:
-            # Config table
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS autoscaler_config (
-                    id INTEGER PRIMARY KEY CHECK (id = 1),
-                    mode TEXT DEFAULT 'enabled',
-                    policy TEXT DEFAULT 'balanced',
-                    scale_up_cpu_percent INTEGER DEFAULT 85,
-                    scale_up_memory_percent INTEGER DEFAULT 80,
-                    scale_up_tasks_percent INTEGER DEFAULT 85,
-                    scale_down_cpu_percent INTEGER DEFAULT 40,
-                    scale_down_memory_percent INTEGER DEFAULT 50,
-                    scale_down_tasks_percent INTEGER DEFAULT 30,
-                    check_interval_seconds INTEGER DEFAULT 30,
-                    scale_cooldown_seconds INTEGER DEFAULT 300,
-                    consecutive_scale_up_checks INTEGER DEFAULT 3,
-                    consecutive_scale_down_checks INTEGER DEFAULT 10,
-                    scale_up_factor REAL DEFAULT 1.5,
-                    scale_down_factor REAL DEFAULT 0.6,
-                    min_cpu_quota INTEGER DEFAULT 100,
-                    max_cpu_quota INTEGER DEFAULT 800,
-                    min_memory_max INTEGER DEFAULT 8,
-                    max_memory_max INTEGER DEFAULT 192,
-                    min_tasks_max INTEGER DEFAULT 100,
-                    max_tasks_max INTEGER DEFAULT 1500,
-                    system_cpu_cores INTEGER DEFAULT 1,
-                    system_memory_gb INTEGER DEFAULT 8,
-                    system_processes INTEGER DEFAULT 50
-                )
-            """)
+    def _get_cgroup_limits(self) -> Optional[CgroupLimits]:
+        """Find the running service's cgroup, if there is one."""
+        if self.cgroup_limits is None:
+            from server.routers.systemd import SERVICE_NAME
 
-            # Metrics history
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS autoscaler_metrics (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    cpu_percent REAL NOT NULL,
-                    memory_gb REAL NOT NULL,
-                    process_count INTEGER NOT NULL,
-                    agent_count INTEGER NOT NULL,
-                    testing_agent_count INTEGER NOT NULL,
-                    api_quota_remaining INTEGER NOT NULL,
-                    features_pending INTEGER NOT NULL
-                )
-            """)
-
-            # Scale history
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS autoscaler_history (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    action TEXT NOT NULL,
-                    trigger_type TEXT NOT NULL,
-                    reason TEXT NOT NULL,
-                    old_cpu_quota INTEGER NOT NULL,
-                    old_memory_max INTEGER NOT NULL,
-                    old_tasks_max INTEGER NOT NULL,
-                    new_cpu_quota INTEGER NOT NULL,
-                    new_memory_max INTEGER NOT NULL,
-                    new_tasks_max INTEGER NOT NULL,
-                    status TEXT NOT NULL,
-                    error_message TEXT
-                )
-            """)
+            cgroup_path = find_service_cgroup(SERVICE_NAME)
+            if cgroup_path is not None:
+                self.cgroup_limits = CgroupLimits(cgroup_path)
+        return self.cgroup_limits
 
-            # Insert default config if not exists
-            conn.execute(
-                "INSERT OR IGNORE INTO autoscaler_config (id) VALUES (1)"
-            )
-
-            conn.commit()
-        finally:
-            conn.close()
-
-    def get_current_limits(self) -> dict:
-        """Get current resource limits from systemd service file."""
+    def _read_unit_file_limits(self) -> dict:
+        """Get resource limits from systemd service file."""
         try:
             from server.routers.systemd import SERVICE_FILE
 
@@ -409,7 +784,6 @@ class AutoScaler:
                 }
 
             content = SERVICE_FILE.read_text()
-            import re
 
             # Parse CPUQuota
             match = re.search(r'CPUQuota=(\d+)%', content)
@@ -437,123 +811,203 @@ class AutoScaler:
                 "tasks_max": 250,
             }
 
-    async def update_limits(self, new_limits: dict) -> bool:
+    def get_current_limits(self) -> dict:
         """
-        Update systemd service file with new resource limits.
+        Get current resource limits.
 
-        Args:
-            new_limits: Dict with cpu_quota, memory_max, tasks_max
+        Reads the live cgroup when the service is running; limits the cgroup
+        leaves unset fall back to the systemd service file.
+        """
+        limits = self._read_unit_file_limits()
 
-        Returns:
-            True if successful, False otherwise
+        cgroup_limits = self._get_cgroup_limits()
+        if cgroup_limits is not None:
+            for key, value in cgroup_limits.read_limits().items():
+                if value is not None:
+                    limits[key] = value
+
+        return limits
+
+    def _persist_limits(self, new_limits: dict) -> bool:
         """
-        try:
-            from server.routers.systemd import SERVICE_FILE
+        Write limits to the systemd service file and reload the daemon.
 
-            # Backup current file
-            backup_file = SERVICE_FILE.with_suffix('.service.backup')
-            backup_file.write_text(SERVICE_FILE.read_text())
+        The service is not restarted; this only makes the limits survive the
+        next restart. MemoryHigh is written too, since on reload systemd
+        re-applies every limit in the unit to the running cgroup.
 
-            # Read and update content
-            content = SERVICE_FILE.read_text()
+        Returns:
+            True if the service file was updated, False if there is none
 
-            # Update CPUQuota
-            content = re.sub(
-                r'CPUQuota=\d+%',
-                f'CPUQuota={new_limits["cpu_quota"]}%',
-                content
-            )
+        Raises:
+            Exception: If the file or daemon-reload fails (file is restored)
+        """
+        from server.routers.systemd import SERVICE_FILE
 
-            # Update MemoryMax
-            content = re.sub(
-                r'MemoryMax=\d+G?',
-                f'MemoryMax={new_limits["memory_max"]}G',
-                content
-            )
+        if not SERVICE_FILE.exists():
+            return False
 
-            # Update TasksMax
+        # Backup current file
+        original = SERVICE_FILE.read_text()
+        backup_file = SERVICE_FILE.with_suffix('.service.backup')
+        backup_file.write_text(original)
+
+        memory_high = int(new_limits["memory_max"] * 1024 * MEMORY_HIGH_RATIO)
+        content = re.sub(r'CPUQuota=\d+%', f'CPUQuota={new_limits["cpu_quota"]}%', original)
+        content = re.sub(r'MemoryMax=\d+G?', f'MemoryMax={new_limits["memory_max"]}G', content)
+        content = re.sub(r'TasksMax=\d+', f'TasksMax={new_limits["tasks_max"]}', content)
+        if re.search(r'MemoryHigh=\d+[MG]?', content):
+            content = re.sub(r'MemoryHigh=\d+[MG]?', f'MemoryHigh={memory_high}M', content)
+        else:
             content = re.sub(
-                r'TasksMax=\d+',
-                f'TasksMax={new_limits["tasks_max"]}',
-                content
+                r'^(MemoryMax=.*)$', rf'\1\nMemoryHigh={memory_high}M', content, count=1, flags=re.M
             )
 
-            # Write updated file
+        try:
             SERVICE_FILE.write_text(content)
-
-            # Reload systemd and restart service
             subprocess.run(
                 ["systemctl", "--user", "daemon-reload"],
                 check=True,
                 capture_output=True,
                 timeout=10,
             )
-            subprocess.run(
-                ["systemctl", "--user", "restart", "autocoder-ui.service"],
-                check=True,
-                capture_output=True,
-                timeout=30,
-            )
+        except Exception:
+            SERVICE_FILE.write_text(original)
+            raise
+        return True
 
-            return True
+    async def update_limits(self, new_limits: dict) -> bool:
+        """
+        Apply new resource limits to the running service.
 
-        except Exception as e:
-            print(f"Failed to update limits: {e}")
+        Writes the limits to the service cgroup (validated, and rolled back
+        on failure), then persists them to the systemd service file. Running
+        agents and WebSocket connections are unaffected.
 
-            # Rollback
+        Args:
+            new_limits: Dict with cpu_quota, memory_max, tasks_max
+
+        Returns:
+            True if the limits are in effect, False otherwise (including when
+            there is neither a service cgroup nor a service file to update)
+        """
+        cgroup_limits = self._get_cgroup_limits()
+        if cgroup_limits is not None:
             try:
-                if backup_file.exists():
-                    backup_file.rename(SERVICE_FILE)
-            except Exception:
-                pass
+                cgroup_limits.apply(new_limits)
+            except CgroupLimitError as e:
+                print(f"Failed to update limits: {e}")
+                return False
+
+        try:
+            persisted = await asyncio.to_thread(self._persist_limits, new_limits)
+        except Exception as e:
+            if cgroup_limits is None:
+                print(f"Failed to update limits: {e}")
+                return False
+            # Live limits are in effect; they just won't survive a restart
+            print(f"Warning: limits applied but not persisted to service file: {e}")
+            return True
 
+        if cgroup_limits is None and not persisted:
+            print("Failed to update limits: no service cgroup or service file found")
             return False
+        return True
 
     def log_action(self, action: ScalingAction):
         """Log a scaling action to database."""
-        conn = sqlite3.connect(AUTOSCALER_DB)
-        try:
-            conn.execute(
-                """
-                INSERT INTO autoscaler_history
-                (timestamp, action, trigger_type, reason,
-                 old_cpu_quota, old_memory_max, old_tasks_max,
-                 new_cpu_quota, new_memory_max, new_tasks_max,
-                 status, error_message)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    action.timestamp,
-                    action.action,
-                    action.trigger_type,
-                    action.reason,
-                    action.old_limits["cpu_quota"],
-                    action.old_limits["memory_max"],
-                    action.old_limits["tasks_max"],
-                    action.new_limits["cpu_quota"],
-                    action.new_limits["memory_max"],
-                    action.new_limits["tasks_max"],
-                    action.status,
-                    action.error_message,
-                ),
-            )
-            conn.commit()
-        finally:
-            conn.close()
+        self.store.log_history(action)
 
-    def should_scale(self) -> bool:
+    def should_scale(self, now: Optional[datetime] = None) -> bool:
         """
         Check if scaling is allowed (cooldown period passed).
 
+        Args:
+            now: Current time (UTC); defaults to the wall clock
+
         Returns:
             True if scaling is allowed, False if in cooldown
         """
         if self.last_scale_time is None:
             return True
 
-        elapsed = (datetime.utcnow() - self.last_scale_time).total_seconds()
+        elapsed = ((now or datetime.utcnow()) - self.last_scale_time).total_seconds()
         return elapsed >= self.config.scale_cooldown_seconds
 
+    def collect_metrics(self, monitor) -> ResourceMetrics:
+        """Take one snapshot of cgroup usage and workload signals."""
+        signals = self.signals.snapshot()
+        return monitor.collect_metrics(
+            agent_count=signals.agent_count,
+            testing_agent_count=signals.testing_agent_count,
+            api_quota_remaining=signals.api_quota_remaining,
+            features_pending=signals.features_pending,
+            quota_burn_rate=signals.quota_burn_rate,
+        )
+
+    async def tick(self, metrics: ResourceMetrics, now: Optional[datetime] = None) -> Optional[ScalingAction]:
+        """
+        Record one metrics snapshot and scale if thresholds call for it.
+
+        Args:
+            metrics: Snapshot for this tick
+            now: Current time (UTC); defaults to the wall clock
+
+        Returns:
+            The scaling action taken, or None
+        """
+        now = now or datetime.utcnow()
+
+        self.store.record_metrics(metrics)
+        self.store.apply_retention(now)
+
+        if self.config.mode != ScalingMode.ENABLED or not self.should_scale(now):
+            return None
+
+        # Check thresholds
+        direction = self.scaler.check_metrics(metrics)
+        if not direction:
+            return None
+
+        # Calculate new limits
+        self.current_limits = self.get_current_limits()
+        old_limits = self.current_limits.copy()
+        new_limits = self.scaler.calculate_new_limits(old_limits, direction)
+
+        # Reset counters
+        self.scaler.scale_up_count = 0
+        self.scaler.scale_down_count = 0
+
+        if new_limits == old_limits:
+            return None  # Already at the hard limit
+
+        # Execute scaling action
+        success = await self.update_limits(new_limits)
+
+        # Log the action
+        action = ScalingAction(
+            timestamp=now,
+            action=direction,
+            trigger_type="threshold",
+            reason=f"Thresholds breached: CPU={metrics.cpu_percent:.1f}%, "
+                   f"Memory={metrics.memory_gb:.1f}GB, "
+                   f"Processes={metrics.process_count}, "
+                   f"Agents={metrics.agent_count + metrics.testing_agent_count}, "
+                   f"Pending={metrics.features_pending}",
+            old_limits=old_limits,
+            new_limits=new_limits,
+            status="success" if success else "failed",
+            error_message=None if success else "Failed to apply limits",
+        )
+
+        self.log_action(action)
+
+        if success:
+            self.current_limits = new_limits
+            self.last_scale_time = now
+
+        return action
+
     async def run_monitoring_loop(self):
         """
         Main monitoring loop - runs indefinitely.
@@ -566,81 +1020,10 @@ class AutoScaler:
             monitor = get_resource_monitor()
 
             while self.is_running:
-                # Collect metrics (TODO: get agent counts from orchestrator)
-                metrics = monitor.collect_metrics(
-                    agent_count=0,  # TODO: Get from parallel_orchestrator
-                    testing_agent_count=0,
-                    api_quota_remaining=0,  # TODO: Get from quota_budget
-                    features_pending=0,  # TODO: Get from features db
-                )
+                # Snapshot off the event loop: reads cgroup files, /proc and SQLite
+                metrics = await asyncio.to_thread(self.collect_metrics, monitor)
 
-                # Store metrics in database
-                conn = sqlite3.connect(AUTOSCALER_DB)
-                try:
-                    conn.execute(
-                        """
-                        INSERT INTO autoscaler_metrics
-                        (timestamp, cpu_percent, memory_gb, process_count,
-                         agent_count, testing_agent_count, api_quota_remaining, features_pending)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                        """,
-                        (
-                            metrics.timestamp,
-                            metrics.cpu_percent,
-                            metrics.memory_gb,
-                            metrics.process_count,
-                            metrics.agent_count,
-                            metrics.testing_agent_count,
-                            metrics.api_quota_remaining,
-                            metrics.features_pending,
-                        ),
-                    )
-                    conn.commit()
-                finally:
-                    conn.close()
-
-                # Check if we should scale
-                if self.config.mode == ScalingMode.ENABLED and self.should_scale():
-                    self.current_limits = self.get_current_limits()
-
-                    # Check thresholds
-                    direction = self.scaler.check_metrics(metrics)
-
-                    if direction and self.should_scale():
-                        # Calculate new limits
-                        new_limits = self.scaler.calculate_new_limits(
-                            self.current_limits,
-                            direction
-                        )
-
-                        # Execute scaling action
-                        old_limits = self.current_limits.copy()
-
-                        success = await self.update_limits(new_limits)
-
-                        # Log the action
-                        action = ScalingAction(
-                            timestamp=datetime.utcnow(),
-                            action=direction,
-                            trigger_type="threshold",
-                            reason=f"Thresholds breached: CPU={metrics.cpu_percent:.1f}%, "
-                                   f"Memory={metrics.memory_gb:.1f}GB, "
-                                   f"Processes={metrics.process_count}",
-                            old_limits=old_limits,
-                            new_limits=new_limits,
-                            status="success" if success else "failed",
-                            error_message=None if success else "Service restart failed",
-                        )
-
-                        self.log_action(action)
-
-                        if success:
-                            self.current_limits = new_limits
-                            self.last_scale_time = datetime.utcnow()
-
-                        # Reset counters
-                        self.scaler.scale_up_count = 0
-                        self.scaler.scale_down_count = 0
+                await self.tick(metrics)
 
                 # Wait for next check
                 await asyncio.sleep(self.config.check_interval_seconds)
@@ -650,6 +1033,8 @@ class AutoScaler:
         except Exception as e:
             print(f"Error in monitoring loop: {e}")
             await asyncio.sleep(self.config.check_interval_seconds)
+        finally:
+            self.store.flush_metrics()
 
     def start(self):
         """Start the autoscaler service."""
@@ -662,12 +1047,13 @@ class AutoScaler:
     def stop(self):
         """Stop the autoscaler service."""
         self.is_running = False
+        self.store.flush_metrics()
         return True
 
     def set_mode(self, mode: ScalingMode) -> bool:
         """Set the operational mode."""
         self.config.mode = mode
-        return self.config.save()
+        return self.config.save(self.store)
 
     def set_policy(self, policy: ScalingPolicy) -> bool:
         """Set the scaling policy."""
@@ -692,7 +1078,7 @@ class AutoScaler:
             self.config.scale_cooldown_seconds = 300
             self.config.scale_up_factor = 1.5
 
-        return self.config.save()
+        return self.config.save(self.store)
 
     def get_status(self) -> dict:
         """Get current autoscaler status."""
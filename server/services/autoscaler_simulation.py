@@ -0,0 +1,149 @@
+"""
+Autoscaler Simulation Harness
+=============================
+
+Replays synthetic load curves through the autoscaler's decision path
+(thresholds, consecutive-check hysteresis, cooldown and limit calculation)
+on a simulated clock, with an in-memory database and limits backend, so
+policy changes can be evaluated without a running service.
+
+Usage:
+    from server.services.autoscaler_simulation import load_curve, replay
+
+    result = asyncio.run(replay(load_curve("spike", hours=6)))
+    for action in result.actions:
+        print(action.timestamp, action.action, action.new_limits)
+"""
+
+import math
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional
+
+from ..utils.resource_monitor import ResourceMetrics
+from .autoscaler import AutoScaler, AutoscalerConfig, AutoscalerStore, ScalingAction, ThresholdScaler
+
+LOAD_CURVES = ("steady", "ramp", "spike", "diurnal")
+
+DEFAULT_LIMITS = {"cpu_quota": 200, "memory_max": 32, "tasks_max": 250}
+
+
+def _load_level(kind: str, position: float) -> float:
+    """Load level in [0, 1] at a position in [0, 1) through the curve."""
+    if kind == "steady":
+        return 0.55
+    if kind == "ramp":
+        return 0.1 + 0.9 * position
+    if kind == "spike":
+        return 0.95 if 1 / 3 <= position < 2 / 3 else 0.15
+    if kind == "diurnal":
+        return 0.5 - 0.45 * math.cos(2 * math.pi * position)
+    raise ValueError(f"Unknown load curve {kind!r}; expected one of {LOAD_CURVES}")
+
+
+def load_curve(
+    kind: str,
+    hours: float = 6,
+    interval_seconds: int = 30,
+    start: Optional[datetime] = None,
+    seed: int = 0,
+    backlog: Optional[int] = None,
+) -> List[ResourceMetrics]:
+    """
+    Generate one metrics sample per monitoring interval for a load shape.
+
+    CPU follows the load level (plus a little noise). Agents scale with
+    load, and pending features appear while load is high, so the queue
+    empties in quiet periods.
+
+    Args:
+        kind: One of LOAD_CURVES
+        hours: Simulated duration
+        interval_seconds: Time between samples
+        start: Timestamp of the first sample (default: now, UTC)
+        seed: Random seed for the noise
+        backlog: If set, this many features stay pending throughout
+
+    Returns:
+        List of ResourceMetrics in time order
+    """
+    rng = random.Random(seed)
+    start = start or datetime.utcnow()
+    ticks = int(hours * 3600 / interval_seconds)
+
+    samples = []
+    for tick in range(ticks):
+        level = _load_level(kind, tick / ticks)
+        cpu = min(100.0, max(0.0, 100 * level + rng.uniform(-3, 3)))
+        agents = round(5 * level)
+        pending = backlog if backlog is not None else (round(200 * level) if level >= 0.3 else 0)
+        samples.append(ResourceMetrics(
+            timestamp=start + timedelta(seconds=tick * interval_seconds),
+            cpu_percent=cpu,
+            cpu_cores_used=cpu / 100 * 2,
+            memory_gb=4 + 40 * level,
+            process_count=int(20 + 150 * level),
+            agent_count=agents,
+            testing_agent_count=round(2 * level),
+            api_quota_remaining=5000,
+            features_pending=pending,
+            quota_burn_rate=60 * agents,
+        ))
+    return samples
+
+
+@dataclass
+class SimulationResult:
+    """Outcome of replaying a load curve."""
+    actions: List[ScalingAction] = field(default_factory=list)
+    limits: List[dict] = field(default_factory=list)  # Limits in effect after each tick
+
+
+class _SimulatedAutoScaler(AutoScaler):
+    """AutoScaler whose limits live in memory instead of a cgroup."""
+
+    def __init__(self, config: AutoscalerConfig, limits: dict):
+        super().__init__(store=AutoscalerStore(":memory:"))
+        self.config = config
+        self.scaler = ThresholdScaler(config)
+        self._limits = dict(limits)
+
+    def get_current_limits(self) -> dict:
+        return dict(self._limits)
+
+    async def update_limits(self, new_limits: dict) -> bool:
+        self._limits = dict(new_limits)
+        return True
+
+
+async def replay(
+    metrics: Iterable[ResourceMetrics],
+    config: Optional[AutoscalerConfig] = None,
+    initial_limits: Optional[dict] = None,
+) -> SimulationResult:
+    """
+    Feed metrics samples through the autoscaler, one tick per sample.
+
+    The sample timestamps drive the clock, so cooldowns and retention
+    behave as they would in real time.
+
+    Args:
+        metrics: Samples in time order (e.g. from load_curve)
+        config: Autoscaler configuration (default: AutoscalerConfig())
+        initial_limits: Limits in effect at the start (default: DEFAULT_LIMITS)
+
+    Returns:
+        SimulationResult with the actions taken and the limit timeline
+    """
+    autoscaler = _SimulatedAutoScaler(config or AutoscalerConfig(), initial_limits or DEFAULT_LIMITS)
+    result = SimulationResult()
+    try:
+        for sample in metrics:
+            action = await autoscaler.tick(sample, now=sample.timestamp)
+            if action is not None:
+                result.actions.append(action)
+            result.limits.append(autoscaler.get_current_limits())
+    finally:
+        autoscaler.store.close()
+    return result
@@ -23,7 +23,7 @@ import psutil
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from auth import AUTH_ERROR_HELP_SERVER as AUTH_ERROR_HELP  # noqa: E402
 from auth import is_auth_error
-from server.utils.process_utils import kill_process_tree
+from server.utils.process_utils import POOL_MARKER, kill_process_tree
 
 logger = logging.getLogger(__name__)
 
@@ -565,6 +565,46 @@ class AgentProcessManager:
 
         return True
 
+    def get_agent_counts(self) -> dict[str, int]:
+        """
+        Count the agent subprocesses currently running under this manager.
+
+        Agents are the orchestrator's child processes started with
+        ``--agent-type``; they are grouped by that value. Agent pool servers
+        carry the agent type they serve plus ``--agent-pool``, which their
+        forked agents inherit, so a marked process only counts if its parent
+        is marked too.
+
+        Returns:
+            Mapping of agent type (coding, testing, initializer) to count
+        """
+        counts: dict[str, int] = {}
+        if not self.process or self.status not in ("running", "paused"):
+            return counts
+
+        try:
+            children = psutil.Process(self.process.pid).children(recursive=True)
+        except psutil.Error:
+            return counts
+
+        cmdlines: dict[int, tuple[int, list[str]]] = {}
+        for child in children:
+            try:
+                cmdlines[child.pid] = (child.ppid(), child.cmdline())
+            except psutil.Error:
+                continue
+        pool_pids = {pid for pid, (_, cmdline) in cmdlines.items() if POOL_MARKER in cmdline}
+
+        for ppid, cmdline in cmdlines.values():
+            if POOL_MARKER in cmdline and ppid not in pool_pids:
+                continue  # A pool server, not an agent
+            if "--agent-type" in cmdline:
+                index = cmdline.index("--agent-type") + 1
+                if index < len(cmdline):
+                    counts[cmdline[index]] = counts.get(cmdline[index], 0) + 1
+
+        return counts
+
     def get_status_dict(self) -> dict:
         """Get current status as a dictionary."""
         return {
@@ -602,6 +642,12 @@ def get_manager(project_name: str, project_dir: Path, root_dir: Path) -> AgentPr
         return _managers[key]
 
 
+def get_active_managers() -> list[AgentProcessManager]:
+    """Get the managers whose agent is running or paused (thread-safe)."""
+    with _managers_lock:
+        return [m for m in _managers.values() if m.status in ("running", "paused")]
+
+
 async def cleanup_all_managers() -> None:
     """Stop all running agents. Called on server shutdown."""
     with _managers_lock:
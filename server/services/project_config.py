@@ -7,12 +7,23 @@ Detects project types by scanning for configuration files and provides
 default or custom dev commands for each project.
 
 Configuration is stored in {project_dir}/.autoforge/config.json.
+
+Dev-server ports are allocated in the registry database (see
+registry.claim_port); config.json keeps a copy for the user to read and
+edit, and is re-read only when its mtime changes.
+
+Parsed files and detection results are cached per process, keyed by the
+mtime and size of each file consulted, so repeated status and config
+requests only stat the project's marker files.
 """
 
+import copy
 import json
 import logging
+import sys
+import threading
 from pathlib import Path
-from typing import TypedDict
+from typing import Any, Callable, TypedDict
 
 # Python 3.11+ has tomllib in the standard library
 try:
@@ -85,6 +96,73 @@ PROJECT_TYPE_COMMANDS: dict[str, str] = {
 }
 
 
+# =============================================================================
+# File Caches
+# =============================================================================
+
+# Upper bound on cached files and detection results (oldest dropped first)
+_CACHE_MAX_ENTRIES = 4096
+
+_cache_lock = threading.Lock()
+# path -> ((mtime_ns, size), parsed contents)
+_file_cache: dict[Path, tuple[tuple[int, int], Any]] = {}
+# project dir -> (marker file signatures, detected type)
+_detection_cache: dict[Path, tuple[tuple, str | None]] = {}
+
+
+def _file_signature(path: Path) -> tuple[int, int] | None:
+    """(mtime_ns, size) of a file, or None if it does not exist."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _cache_put(cache: dict, key: Path, value: tuple) -> None:
+    with _cache_lock:
+        cache.pop(key, None)
+        cache[key] = value
+        while len(cache) > _CACHE_MAX_ENTRIES:
+            del cache[next(iter(cache))]
+
+
+def _read_parsed(path: Path, parse: Callable[[Path], Any], default: Any = None) -> Any:
+    """
+    Parse a file, reusing the previous result while it is unchanged.
+
+    The cached result is shared: callers must not mutate it.
+
+    Args:
+        path: File to read.
+        parse: Reads and parses the file. OSError is propagated and the
+            result is not cached.
+        default: Returned if the file does not exist.
+
+    Returns:
+        The parsed contents, or default.
+    """
+    signature = _file_signature(path)
+    if signature is None:
+        return default
+
+    with _cache_lock:
+        cached = _file_cache.get(path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    value = parse(path)
+    _cache_put(_file_cache, path, (signature, value))
+    return value
+
+
+def clear_project_config_cache() -> None:
+    """Drop all cached files and detection results."""
+    with _cache_lock:
+        _file_cache.clear()
+        _detection_cache.clear()
+
+
 # =============================================================================
 # Configuration File Handling
 # =============================================================================
@@ -124,29 +202,33 @@ def _load_config(project_dir: Path) -> dict:
     """
     config_path = _get_config_path(project_dir)
 
-    if not config_path.exists():
+    try:
+        config = _read_parsed(config_path, _parse_config, default={})
+    except OSError as e:
+        logger.warning("Failed to read config at %s: %s", config_path, e)
         return {}
 
+    # The cached copy is shared; callers update and save what they get
+    return copy.deepcopy(config)
+
+
+def _parse_config(config_path: Path) -> dict:
     try:
         with open(config_path, "r", encoding="utf-8") as f:
             config = json.load(f)
-
-        if not isinstance(config, dict):
-            logger.warning(
-                "Invalid config format in %s: expected dict, got %s",
-                config_path, type(config).__name__
-            )
-            return {}
-
-        return config
-
     except json.JSONDecodeError as e:
         logger.warning("Failed to parse config at %s: %s", config_path, e)
         return {}
-    except OSError as e:
-        logger.warning("Failed to read config at %s: %s", config_path, e)
+
+    if not isinstance(config, dict):
+        logger.warning(
+            "Invalid config format in %s: expected dict, got %s",
+            config_path, type(config).__name__
+        )
         return {}
 
+    return config
+
 
 def _save_config(project_dir: Path, config: dict) -> None:
     """
@@ -173,6 +255,11 @@ def _save_config(project_dir: Path, config: dict) -> None:
     except OSError as e:
         logger.error("Failed to save config to %s: %s", config_path, e)
         raise
+    finally:
+        # A rewrite within the filesystem's timestamp resolution could
+        # otherwise keep the same (mtime, size)
+        with _cache_lock:
+            _file_cache.pop(config_path, None)
 
 
 # =============================================================================
@@ -180,29 +267,51 @@ def _save_config(project_dir: Path, config: dict) -> None:
 # =============================================================================
 
 
+class _MarkerProbe:
+    """Checks marker files for one detection, recording each one consulted."""
+
+    def __init__(self, project_dir: Path):
+        self.project_dir = project_dir
+        self.consulted: dict[str, tuple[int, int] | None] = {}
+
+    def exists(self, name: str) -> bool:
+        if name not in self.consulted:
+            self.consulted[name] = _file_signature(self.project_dir / name)
+        return self.consulted[name] is not None
+
+    def signature(self) -> tuple:
+        return tuple(self.consulted.items())
+
+
+def _markers_unchanged(project_dir: Path, signature: tuple) -> bool:
+    return all(_file_signature(project_dir / name) == sig for name, sig in signature)
+
+
 def _parse_package_json(project_dir: Path) -> dict | None:
     """
     Parse package.json if it exists.
 
+    The result is cached until the file changes and must not be mutated.
+
     Args:
         project_dir: Path to the project directory.
 
     Returns:
         Parsed package.json as dict, or None if not found or invalid.
     """
-    package_json_path = project_dir / "package.json"
-
-    if not package_json_path.exists():
-        return None
+    def parse(path: Path) -> dict | None:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except json.JSONDecodeError as e:
+            logger.debug("Failed to parse package.json in %s: %s", project_dir, e)
+            return None
+        return data if isinstance(data, dict) else None
 
     try:
-        with open(package_json_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            if isinstance(data, dict):
-                return data
-            return None
-    except (json.JSONDecodeError, OSError) as e:
-        logger.debug("Failed to parse package.json in %s: %s", project_dir, e)
+        return _read_parsed(project_dir / "package.json", parse)
+    except OSError as e:
+        logger.debug("Failed to read package.json in %s: %s", project_dir, e)
         return None
 
 
@@ -225,12 +334,20 @@ def _is_poetry_project(project_dir: Path) -> bool:
 
     # If tomllib is available (Python 3.11+), parse and check for [tool.poetry]
     if tomllib is not None:
+        def parse(path: Path) -> bool:
+            try:
+                with open(path, "rb") as f:
+                    data = tomllib.load(f)
+                return "poetry" in data.get("tool", {})
+            except OSError:
+                raise
+            except Exception:
+                # If parsing fails, fall back to False
+                return False
+
         try:
-            with open(pyproject_path, "rb") as f:
-                data = tomllib.load(f)
-            return "poetry" in data.get("tool", {})
-        except Exception:
-            # If parsing fails, fall back to False
+            return _read_parsed(pyproject_path, parse, default=False)
+        except OSError:
             return False
 
     # Fallback for older Python: simple file existence check
@@ -251,6 +368,9 @@ def detect_project_type(project_dir: Path) -> str | None:
     6. Cargo.toml -> rust
     7. go.mod -> go
 
+    The result is cached until one of the marker files it was decided on
+    changes, appears or disappears; a cache hit only stats those files.
+
     Args:
         project_dir: Path to the project directory.
 
@@ -260,12 +380,25 @@ def detect_project_type(project_dir: Path) -> str | None:
     """
     project_dir = Path(project_dir).resolve()
 
-    if not project_dir.exists() or not project_dir.is_dir():
+    if not project_dir.is_dir():
         logger.debug("Project directory does not exist: %s", project_dir)
         return None
 
+    with _cache_lock:
+        cached = _detection_cache.get(project_dir)
+    if cached is not None and _markers_unchanged(project_dir, cached[0]):
+        return cached[1]
+
+    probe = _MarkerProbe(project_dir)
+    project_type = _detect_project_type(project_dir, probe)
+    _cache_put(_detection_cache, project_dir, (probe.signature(), project_type))
+    return project_type
+
+
+def _detect_project_type(project_dir: Path, probe: _MarkerProbe) -> str | None:
+    """Run the detection rules of detect_project_type, uncached."""
     # Check for Node.js projects (package.json)
-    package_json = _parse_package_json(project_dir)
+    package_json = _parse_package_json(project_dir) if probe.exists("package.json") else None
     if package_json is not None:
         scripts = package_json.get("scripts", {})
         if isinstance(scripts, dict):
@@ -279,30 +412,30 @@ def detect_project_type(project_dir: Path) -> str | None:
                 return "nodejs-cra"
 
     # Check for Python Poetry project (must have [tool.poetry] in pyproject.toml)
-    if _is_poetry_project(project_dir):
+    if probe.exists("pyproject.toml") and _is_poetry_project(project_dir):
         logger.debug("Detected python-poetry project in %s", project_dir)
         return "python-poetry"
 
     # Check for Django project
-    if (project_dir / "manage.py").exists():
+    if probe.exists("manage.py"):
         logger.debug("Detected python-django project in %s", project_dir)
         return "python-django"
 
     # Check for Python FastAPI project (requirements.txt + main.py or app.py)
-    if (project_dir / "requirements.txt").exists():
-        has_main = (project_dir / "main.py").exists()
-        has_app = (project_dir / "app.py").exists()
+    if probe.exists("requirements.txt"):
+        has_main = probe.exists("main.py")
+        has_app = probe.exists("app.py")
         if has_main or has_app:
             logger.debug("Detected python-fastapi project in %s", project_dir)
             return "python-fastapi"
 
     # Check for Rust project
-    if (project_dir / "Cargo.toml").exists():
+    if probe.exists("Cargo.toml"):
         logger.debug("Detected rust project in %s", project_dir)
         return "rust"
 
     # Check for Go project
-    if (project_dir / "go.mod").exists():
+    if probe.exists("go.mod"):
         logger.debug("Detected go project in %s", project_dir)
         return "go"
 
@@ -315,40 +448,86 @@ def detect_project_type(project_dir: Path) -> str | None:
 # =============================================================================
 
 
-def get_all_assigned_ports() -> set[int]:
-    """
-    Scan all .autocoder/config.json files to find assigned ports.
-
-    This helps prevent port conflicts when assigning new ports.
+# Whether existing config.json ports have been imported into the registry
+# table by this process (the registry records it across processes too)
+_ports_seeded = False
+_ports_seed_lock = threading.Lock()
+_PORTS_SEEDED_SETTING = "port_allocations_seeded"
 
-    Returns:
-        Set of all currently assigned ports across all projects.
-    """
-    import sys
-    from pathlib import Path
 
-    # Add root to path for registry import
+def _import_registry():
+    """Import the registry module from the project root."""
     _root = Path(__file__).parent.parent.parent
     if str(_root) not in sys.path:
         sys.path.insert(0, str(_root))
 
+    import registry
+    return registry
+
+
+def _valid_port(port) -> bool:
+    return isinstance(port, int) and DEVSERVER_PORT_MIN <= port <= DEVSERVER_PORT_MAX
+
+
+def _config_mtime_ns(project_dir: Path) -> int | None:
+    """mtime of the project's config file, or None if there is none."""
     try:
-        from registry import list_registered_projects
+        return _get_config_path(project_dir).stat().st_mtime_ns
+    except OSError:
+        return None
 
-        assigned_ports = set()
-        projects = list_registered_projects()
 
-        for name, info in projects.items():
-            project_path = Path(info.get("path", ""))
-            if not project_path.exists():
-                continue
+def _seed_port_registry() -> None:
+    """
+    Import ports already recorded in config files into the registry table.
 
-            config = _load_config(project_path)
-            port = config.get("assigned_port")
-            if isinstance(port, int) and DEVSERVER_PORT_MIN <= port <= DEVSERVER_PORT_MAX:
-                assigned_ports.add(port)
+    Runs once per registry database: projects assigned ports before the
+    table existed keep them, and new claims cannot collide with them.
+    """
+    global _ports_seeded
+    if _ports_seeded:
+        return
 
-        return assigned_ports
+    with _ports_seed_lock:
+        if _ports_seeded:
+            return
+        registry = _import_registry()
+        if registry.get_setting(_PORTS_SEEDED_SETTING) != "1":
+            for info in registry.list_registered_projects().values():
+                project_path = Path(info.get("path", ""))
+                if not project_path.exists():
+                    continue
+                port = _load_config(project_path).get("assigned_port")
+                if not _valid_port(port):
+                    continue
+                claimed = registry.claim_port(
+                    project_path, DEVSERVER_PORT_MIN, DEVSERVER_PORT_MAX,
+                    preferred=port, config_mtime_ns=_config_mtime_ns(project_path),
+                )
+                if claimed != port:
+                    # Duplicate in the config files: reconciled on next use
+                    registry.update_port_config_mtime(project_path, None)
+            try:
+                registry.set_setting(_PORTS_SEEDED_SETTING, "1")
+            except Exception:
+                # Another process seeding at the same time marked it first
+                if registry.get_setting(_PORTS_SEEDED_SETTING) != "1":
+                    raise
+        _ports_seeded = True
+
+
+def get_all_assigned_ports() -> set[int]:
+    """
+    Get the ports allocated to projects in the registry.
+
+    This helps prevent port conflicts when assigning new ports.
+
+    Returns:
+        Set of all currently assigned ports across all projects.
+    """
+    try:
+        _seed_port_registry()
+        return _import_registry().get_allocated_ports(DEVSERVER_PORT_MIN, DEVSERVER_PORT_MAX)
     except Exception as e:
         logger.warning("Failed to get assigned ports: %s", e)
         return set()
@@ -358,6 +537,8 @@ def get_next_available_port(exclude_ports: set[int] | None = None) -> int:
     """
     Find the next available port in the DEVSERVER_PORT range.
 
+    Does not allocate the port; use get_assigned_port() to claim one.
+
     Args:
         exclude_ports: Optional set of ports to exclude from selection.
 
@@ -385,8 +566,10 @@ def get_assigned_port(project_dir: Path) -> int:
     """
     Get or assign a port for this project.
 
-    If the project already has an assigned port in config, return it.
-    Otherwise, assign the next available port and save it to config.
+    The port comes from the registry table. config.json is only parsed
+    when it changed since the port was last reconciled with it; a port
+    edited there by hand is adopted if no other project holds it. A new
+    port is claimed atomically and written back to config.
 
     Args:
         project_dir: Path to the project directory.
@@ -398,27 +581,46 @@ def get_assigned_port(project_dir: Path) -> int:
         RuntimeError: If no ports are available.
     """
     project_dir = Path(project_dir).resolve()
+    _seed_port_registry()
+    registry = _import_registry()
+
+    mtime = _config_mtime_ns(project_dir)
+    allocation = registry.get_port_allocation(project_dir)
+    if allocation and mtime is not None and allocation["config_mtime_ns"] == mtime:
+        return allocation["port"]
 
-    # Check if port is already assigned
+    # Config changed (or was never reconciled): read it once
     config = _load_config(project_dir)
-    existing_port = config.get("assigned_port")
+    config_port = config.get("assigned_port")
 
-    if isinstance(existing_port, int) and DEVSERVER_PORT_MIN <= existing_port <= DEVSERVER_PORT_MAX:
-        logger.debug("Using existing port %d for %s", existing_port, project_dir.name)
-        return existing_port
+    if _valid_port(config_port):
+        if allocation and allocation["port"] == config_port:
+            registry.update_port_config_mtime(project_dir, mtime)
+            logger.debug("Using existing port %d for %s", config_port, project_dir.name)
+            return config_port
+        try:
+            registry.set_project_port(project_dir, config_port, config_mtime_ns=mtime)
+            logger.debug("Using port %d from config for %s", config_port, project_dir.name)
+            return config_port
+        except ValueError:
+            logger.warning(
+                "Port %d in %s config is assigned to another project; reassigning",
+                config_port, project_dir.name,
+            )
 
-    # Assign new port
-    new_port = get_next_available_port()
-    config["assigned_port"] = new_port
+    # Keep the registry's port if there is one, otherwise claim a new one
+    port = registry.claim_port(project_dir, DEVSERVER_PORT_MIN, DEVSERVER_PORT_MAX)
+    config["assigned_port"] = port
 
     try:
         _save_config(project_dir, config)
-        logger.info("Assigned port %d to project %s", new_port, project_dir.name)
+        registry.update_port_config_mtime(project_dir, _config_mtime_ns(project_dir))
+        logger.info("Assigned port %d to project %s", port, project_dir.name)
     except OSError as e:
         logger.error("Failed to save port assignment for %s: %s", project_dir.name, e)
         # Still return the port even if save failed
 
-    return new_port
+    return port
 
 
 def set_assigned_port(project_dir: Path, port: int) -> None:
@@ -436,26 +638,30 @@ def set_assigned_port(project_dir: Path, port: int) -> None:
     project_dir = Path(project_dir).resolve()
 
     # Validate port range
-    if not isinstance(port, int) or not (DEVSERVER_PORT_MIN <= port <= DEVSERVER_PORT_MAX):
+    if not _valid_port(port):
         raise ValueError(
             f"Port must be between {DEVSERVER_PORT_MIN} and {DEVSERVER_PORT_MAX}, got {port}"
         )
 
-    # Check if port is already assigned to a different project
-    config = _load_config(project_dir)
-    current_port = config.get("assigned_port")
-
-    # If changing to a different port, check for conflicts
-    if current_port != port:
-        assigned_ports = get_all_assigned_ports()
-        if port in assigned_ports:
-            raise ValueError(
-                f"Port {port} is already assigned to another project"
-            )
+    _seed_port_registry()
+    registry = _import_registry()
+    previous = registry.get_port_allocation(project_dir)
+
+    # Claim in the registry first: raises ValueError if another project has it
+    registry.set_project_port(project_dir, port)
 
     # Update and save config
+    config = _load_config(project_dir)
     config["assigned_port"] = port
-    _save_config(project_dir, config)
+    try:
+        _save_config(project_dir, config)
+    except OSError:
+        if previous:
+            registry.set_project_port(project_dir, previous["port"], previous["config_mtime_ns"])
+        else:
+            registry.release_port(project_dir)
+        raise
+    registry.update_port_config_mtime(project_dir, _config_mtime_ns(project_dir))
     logger.info("Set port %d for project %s", port, project_dir.name)
 
 
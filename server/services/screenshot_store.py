@@ -0,0 +1,243 @@
+"""
+Screenshot Store
+================
+
+Disk-backed, content-addressed storage for screenshots uploaded by the
+Chrome extension.
+
+Uploads arrive as base64 data URLs. Each one is decoded once and written
+to ``.autoforge/screenshots/objects/`` under the SHA-256 of its bytes, next
+to a small JPEG thumbnail, so identical screenshots are stored once and
+nothing but metadata stays in memory. Images are reference counted by the
+screenshot entries that point at them and deleted when the last one goes.
+
+Thumbnails need Pillow; without it screenshots are stored without one.
+"""
+
+import base64
+import binascii
+import hashlib
+import io
+import os
+import re
+import tempfile
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+# Accepted image types and the file extension they are stored under
+IMAGE_TYPES = {
+    "image/png": "png",
+    "image/jpeg": "jpg",
+    "image/webp": "webp",
+    "image/gif": "gif",
+}
+MAX_IMAGE_BYTES = 20 * 1024 * 1024
+THUMBNAIL_SIZE = (320, 320)
+THUMBNAIL_QUALITY = 80
+
+_DATA_URL_RE = re.compile(r"^data:(image/[a-z0-9.+-]+);base64,", re.IGNORECASE)
+
+
+class ScreenshotError(ValueError):
+    """Raised when uploaded image data is invalid."""
+
+
+class ScreenshotTooLargeError(ScreenshotError):
+    """Raised when an uploaded image exceeds MAX_IMAGE_BYTES."""
+
+
+@dataclass
+class StoredImage:
+    """An image in the store."""
+    digest: str  # SHA-256 of the image bytes
+    content_type: str
+    size: int
+    width: Optional[int] = None
+    height: Optional[int] = None
+    has_thumbnail: bool = False
+
+
+def decode_data_url(data_url: str) -> tuple[str, bytes]:
+    """
+    Decode a base64 image data URL.
+
+    Args:
+        data_url: String of the form ``data:image/png;base64,...``
+
+    Returns:
+        (content_type, image bytes)
+
+    Raises:
+        ScreenshotError: If the data URL is malformed or of an unsupported type
+        ScreenshotTooLargeError: If the image is larger than MAX_IMAGE_BYTES
+    """
+    match = _DATA_URL_RE.match(data_url)
+    if not match:
+        raise ScreenshotError("Invalid image data")
+
+    content_type = match.group(1).lower()
+    if content_type not in IMAGE_TYPES:
+        raise ScreenshotError(f"Unsupported image type: {content_type}")
+
+    # Reject oversized uploads before decoding (4 base64 chars per 3 bytes)
+    if (len(data_url) - match.end()) * 3 // 4 > MAX_IMAGE_BYTES:
+        raise ScreenshotTooLargeError(f"Image exceeds {MAX_IMAGE_BYTES // (1024 * 1024)} MB")
+
+    try:
+        data = base64.b64decode(data_url[match.end():], validate=True)
+    except (binascii.Error, ValueError) as e:
+        raise ScreenshotError(f"Invalid base64 image data: {e}") from e
+
+    if not data:
+        raise ScreenshotError("Empty image")
+    return content_type, data
+
+
+class ScreenshotStore:
+    """
+    Content-addressed image files for one project.
+
+    Thread-safe: uploads are written from worker threads.
+    """
+
+    def __init__(self, root: Path):
+        """
+        Open the store, removing images left over from a previous run.
+
+        Screenshot metadata is held in memory, so images on disk from an
+        earlier server process can no longer be referenced.
+
+        Args:
+            root: Store directory (e.g. .autoforge/screenshots)
+        """
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.thumbnails_dir = self.root / "thumbnails"
+        self._lock = threading.Lock()
+        self._refs: dict[str, int] = {}
+        self._images: dict[str, StoredImage] = {}
+
+        for directory in (self.objects_dir, self.thumbnails_dir):
+            if directory.exists():
+                for path in directory.rglob("*"):
+                    if path.is_file():
+                        path.unlink(missing_ok=True)
+            directory.mkdir(parents=True, exist_ok=True)
+
+    def _object_path(self, digest: str, content_type: str) -> Path:
+        return self.objects_dir / digest[:2] / f"{digest}.{IMAGE_TYPES[content_type]}"
+
+    def _thumbnail_path(self, digest: str) -> Path:
+        return self.thumbnails_dir / digest[:2] / f"{digest}.jpg"
+
+    def _write_atomic(self, path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    def _make_thumbnail(self, data: bytes) -> tuple[Optional[bytes], Optional[int], Optional[int]]:
+        """Return (JPEG thumbnail bytes, width, height) of an image."""
+        if not PIL_AVAILABLE:
+            return None, None, None
+        try:
+            with Image.open(io.BytesIO(data)) as image:
+                width, height = image.size
+                image.draft("RGB", THUMBNAIL_SIZE)  # Cheap downscale while decoding JPEGs
+                thumbnail = image.convert("RGB")
+                thumbnail.thumbnail(THUMBNAIL_SIZE)
+                out = io.BytesIO()
+                thumbnail.save(out, "JPEG", quality=THUMBNAIL_QUALITY, optimize=True)
+                return out.getvalue(), width, height
+        except Exception as e:
+            print(f"Failed to create screenshot thumbnail: {e}")
+            return None, None, None
+
+    def put(self, content_type: str, data: bytes) -> StoredImage:
+        """
+        Store an image and take a reference to it.
+
+        An image already in the store is not written again.
+
+        Args:
+            content_type: One of IMAGE_TYPES
+            data: Decoded image bytes
+
+        Returns:
+            The stored image
+        """
+        digest = hashlib.sha256(data).hexdigest()
+
+        with self._lock:
+            if digest in self._images:
+                self._refs[digest] += 1
+                return self._images[digest]
+
+        # Write outside the lock; concurrent writers of the same digest
+        # produce identical files and os.replace is atomic
+        self._write_atomic(self._object_path(digest, content_type), data)
+        thumbnail, width, height = self._make_thumbnail(data)
+        if thumbnail is not None:
+            self._write_atomic(self._thumbnail_path(digest), thumbnail)
+
+        image = StoredImage(
+            digest=digest,
+            content_type=content_type,
+            size=len(data),
+            width=width,
+            height=height,
+            has_thumbnail=thumbnail is not None,
+        )
+        with self._lock:
+            image = self._images.setdefault(digest, image)
+            self._refs[digest] = self._refs.get(digest, 0) + 1
+            # A release() of the same image may have raced with the write
+            path = self._object_path(digest, image.content_type)
+            if not path.exists():
+                self._write_atomic(path, data)
+            if thumbnail is not None and not self._thumbnail_path(digest).exists():
+                self._write_atomic(self._thumbnail_path(digest), thumbnail)
+            return image
+
+    def put_data_url(self, data_url: str) -> StoredImage:
+        """Decode a base64 data URL and store the image (see put)."""
+        return self.put(*decode_data_url(data_url))
+
+    def release(self, digest: str) -> None:
+        """Drop a reference to an image, deleting it when none remain."""
+        with self._lock:
+            remaining = self._refs.get(digest, 0) - 1
+            if remaining > 0:
+                self._refs[digest] = remaining
+                return
+            self._refs.pop(digest, None)
+            image = self._images.pop(digest, None)
+            if image is None:
+                return
+            self._object_path(digest, image.content_type).unlink(missing_ok=True)
+            self._thumbnail_path(digest).unlink(missing_ok=True)
+
+    def image_path(self, digest: str) -> Optional[Path]:
+        """Path of a stored image, or None if it is not in the store."""
+        with self._lock:
+            image = self._images.get(digest)
+        return self._object_path(digest, image.content_type) if image else None
+
+    def thumbnail_path(self, digest: str) -> Optional[Path]:
+        """Path of an image's thumbnail, or None if it has none."""
+        with self._lock:
+            image = self._images.get(digest)
+        return self._thumbnail_path(digest) if image and image.has_thumbnail else None
@@ -0,0 +1,184 @@
+"""
+Unit tests for the feature transition log and analytics rollups.
+
+Verifies that:
+1. Triggers record transitions for ORM and raw SQL writers alike
+2. Hourly/daily rollups stay consistent with the transition log
+3. Analytics endpoints built on rollups match a direct scan of the log
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import text
+
+from api.database import Feature, create_database, dispose_engine
+from server.routers import analytics
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    project_dir = tmp_path / "proj"
+    project_dir.mkdir()
+    monkeypatch.setattr(
+        analytics, "list_registered_projects",
+        lambda: {"proj": {"path": str(project_dir)}},
+    )
+    engine, session_maker = create_database(project_dir)
+    yield project_dir, engine, session_maker
+    dispose_engine(project_dir)
+
+
+def _add_features(session_maker, count):
+    session = session_maker()
+    for i in range(count):
+        session.add(Feature(priority=i, category="c", name=f"f{i}", description="d", steps=[]))
+    session.commit()
+    session.close()
+
+
+def _events(engine):
+    with engine.connect() as conn:
+        return [tuple(r) for r in conn.execute(
+            text("SELECT feature_id, event FROM feature_transitions ORDER BY id")
+        )]
+
+
+class TestTransitionLog:
+    def test_orm_and_raw_writes_are_recorded(self, project):
+        _, engine, session_maker = project
+        _add_features(session_maker, 2)
+
+        with engine.connect() as conn:
+            conn.execute(text("UPDATE features SET in_progress = 1 WHERE id = 1"))
+            conn.execute(text("UPDATE features SET passes = 1, in_progress = 0 WHERE id = 1"))
+            conn.execute(text("UPDATE features SET passes = 0 WHERE id = 1"))
+            conn.execute(text("UPDATE features SET in_progress = 1 WHERE id = 2"))
+            conn.execute(text("UPDATE features SET in_progress = 0 WHERE id = 2"))
+            conn.execute(text("UPDATE features SET priority = 5 WHERE id = 2"))
+            conn.execute(text("DELETE FROM features WHERE id = 2"))
+            conn.commit()
+
+        assert _events(engine) == [
+            (1, "created"), (2, "created"),
+            (1, "started"), (1, "passed"), (1, "regressed"),
+            (2, "started"), (2, "released"), (2, "deleted"),
+        ]
+
+        with engine.connect() as conn:
+            cycle = conn.execute(text(
+                "SELECT cycle_seconds FROM feature_transitions WHERE event = 'passed'"
+            )).scalar()
+        assert cycle is not None and cycle >= 0
+
+    def test_rollups_match_log(self, project):
+        _, engine, session_maker = project
+        _add_features(session_maker, 5)
+        with engine.connect() as conn:
+            conn.execute(text("UPDATE features SET passes = 1 WHERE id <= 3"))
+            conn.commit()
+            for table in ("feature_rollup_hourly", "feature_rollup_daily"):
+                totals = conn.execute(text(f"SELECT SUM(created), SUM(passed) FROM {table}")).one()
+                assert tuple(totals) == (5, 3)
+
+
+def _seed_history(engine, now):
+    """Insert transitions with explicit timestamps spread across 20 days."""
+    rows = []
+    feature_id = 0
+    for day in range(20):
+        stamp = (now - timedelta(days=day, hours=1)).strftime("%Y-%m-%d %H:%M:%S")
+        for _ in range(day % 4 + 1):
+            feature_id += 1
+            rows.append({"fid": feature_id, "event": "created", "at": stamp, "cycle": None})
+            if feature_id % 2 == 0:
+                rows.append({"fid": feature_id, "event": "passed", "at": stamp, "cycle": 60.0 * day})
+            if feature_id % 7 == 0:
+                rows.append({"fid": feature_id, "event": "regressed", "at": stamp, "cycle": None})
+    with engine.connect() as conn:
+        conn.execute(text(
+            "INSERT INTO feature_transitions (feature_id, event, passes, in_progress, occurred_at, cycle_seconds) "
+            "VALUES (:fid, :event, 0, 0, :at, :cycle)"
+        ), rows)
+        conn.commit()
+
+
+def _reference_series(engine, start, event):
+    """Per-day counts computed by scanning the raw log."""
+    with engine.connect() as conn:
+        rows = conn.execute(text(
+            "SELECT date(occurred_at) AS d, COUNT(*) FROM feature_transitions "
+            "WHERE event = :event AND date(occurred_at) >= :start GROUP BY d ORDER BY d"
+        ), {"event": event, "start": start.strftime("%Y-%m-%d")}).fetchall()
+    return [{"date": d, "count": c} for d, c in rows]
+
+
+class TestAnalyticsEndpoints:
+    def test_features_over_time_matches_log_scan(self, project):
+        _, engine, _ = project
+        now = datetime.utcnow()
+        _seed_history(engine, now)
+
+        result = asyncio.run(analytics.get_features_over_time("proj", days=10))
+        start = datetime.fromisoformat(result["period"]["start"])
+
+        expected_created = _reference_series(engine, start, "created")
+        expected_completed = _reference_series(engine, start, "passed")
+        assert result["created"] == expected_created
+        assert result["completed"] == expected_completed
+
+        # Cumulative totals use the same O(n^2) definition as before
+        dates = sorted({r["date"] for r in expected_created + expected_completed})
+        created_total = completed_total = 0
+        for i, date in enumerate(dates):
+            created_total += next((r["count"] for r in expected_created if r["date"] == date), 0)
+            completed_total += next((r["count"] for r in expected_completed if r["date"] == date), 0)
+            assert result["cumulative"]["created"][i] == {"date": date, "total": created_total}
+            assert result["cumulative"]["completed"][i] == {"date": date, "total": completed_total}
+
+        # Burn-up ends at the absolute totals of the whole log
+        with engine.connect() as conn:
+            counts = dict(conn.execute(text(
+                "SELECT event, COUNT(*) FROM feature_transitions GROUP BY event"
+            )).fetchall())
+        assert result["burnup"][-1] == {
+            "date": dates[-1],
+            "scope": counts["created"],
+            "done": counts["passed"] - counts["regressed"],
+        }
+
+    def test_throughput_and_cycle_time(self, project):
+        _, engine, _ = project
+        now = datetime.utcnow()
+        _seed_history(engine, now)
+
+        throughput = asyncio.run(analytics.get_throughput_stats("proj", days=10))
+        start = (now - timedelta(days=10)).strftime("%Y-%m-%d")
+        with engine.connect() as conn:
+            passed, created = conn.execute(text(
+                "SELECT SUM(event = 'passed'), SUM(event = 'created') FROM feature_transitions "
+                "WHERE date(occurred_at) >= :start"
+            ), {"start": start}).one()
+            avg_cycle = conn.execute(text(
+                "SELECT AVG(cycle_seconds) FROM feature_transitions "
+                "WHERE event = 'passed' AND date(occurred_at) >= :start"
+            ), {"start": start}).scalar()
+
+        assert throughput["features_completed"] == passed
+        assert throughput["features_created"] == created
+        assert throughput["current_streak"] >= 1
+
+        cycle = asyncio.run(analytics.get_cycle_time_stats("proj", days=10))
+        assert cycle["samples"] == passed
+        assert cycle["average_seconds"] == pytest.approx(avg_cycle, abs=0.1)
+
+    def test_weekly_granularity_folds_days(self, project):
+        _, engine, _ = project
+        _seed_history(engine, datetime.utcnow())
+
+        daily = asyncio.run(analytics.get_features_over_time("proj", days=30))
+        weekly = asyncio.run(analytics.get_features_over_time("proj", days=30, granularity="week"))
+
+        assert sum(r["count"] for r in weekly["created"]) == sum(r["count"] for r in daily["created"])
+        assert all("-W" in r["date"] for r in weekly["created"])
@@ -205,6 +205,8 @@ class TestGetSingleConversation:
                     "title": "Test Conversation",
                     "created_at": "2024-01-01T00:00:00Z",
                     "updated_at": "2024-01-01T00:00:00Z",
+                    "message_count": 1,
+                    "has_more": False,
                     "messages": [
                         {
                             "id": 1,
@@ -228,6 +230,21 @@ class TestGetSingleConversation:
                 assert len(data["messages"]) == 1
                 assert data["messages"][0]["role"] == "user"
 
+                # The UI does not page history, so the default is the whole conversation
+                mock_get_conv.assert_called_once_with(
+                    mock_project_dir, conversation_id, limit=None, before_id=None, after_id=None
+                )
+
+                # A page is returned only when requested
+                mock_get_conv.reset_mock()
+                response = client.get(
+                    f"/api/assistant/conversations/{project_name}/{conversation_id}?limit=50&before_id=9"
+                )
+                assert response.status_code == 200
+                mock_get_conv.assert_called_once_with(
+                    mock_project_dir, conversation_id, limit=50, before_id=9, after_id=None
+                )
+
 
 class TestCreateConversation:
     """Tests for POST /api/assistant/conversations/{project_name}"""
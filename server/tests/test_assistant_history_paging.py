@@ -0,0 +1,203 @@
+"""
+Unit tests for paginated assistant conversation history.
+
+Verifies that:
+1. Messages are paged with keysets (latest N, before/after a message id),
+   with ties on timestamp ordered by id
+2. Page queries are served by the (conversation_id, timestamp) index
+3. Existing databases gain the index and backfilled summary rows
+4. The rolling summary folds in only messages that left the resume window
+
+The benchmark opens the first page of conversations from 1k to 50k
+messages and reports the latency for each size.
+"""
+
+import sqlite3
+import statistics
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import inspect, text
+
+from server.services import assistant_database as db
+
+
+@pytest.fixture
+def project_dir(tmp_path):
+    project = tmp_path / "proj"
+    (project / ".autoforge").mkdir(parents=True)
+    yield project
+    db.dispose_engine(project)
+
+
+def _bulk_insert(project_dir, conversation_id, count, start=datetime(2026, 1, 1), step=timedelta(seconds=1)):
+    """Insert messages directly, keeping the summary row in step."""
+    conn = sqlite3.connect(str(db.get_db_path(project_dir)))
+    conn.executemany(
+        "INSERT INTO conversation_messages (conversation_id, role, content, timestamp) VALUES (?, ?, ?, ?)",
+        (
+            (conversation_id, "user" if i % 2 == 0 else "assistant", f"message {i} " + "x" * 100,
+             (start + step * i).strftime("%Y-%m-%d %H:%M:%S.%f"))  # SQLAlchemy's format
+            for i in range(count)
+        ),
+    )
+    conn.execute(
+        "UPDATE conversation_summaries SET message_count = message_count + ?, "
+        "last_message_id = (SELECT MAX(id) FROM conversation_messages WHERE conversation_id = ?) "
+        "WHERE conversation_id = ?",
+        (count, conversation_id, conversation_id),
+    )
+    conn.commit()
+    conn.close()
+
+
+def _contents(messages):
+    return [int(m["content"].split()[1]) for m in messages]
+
+
+class TestKeysetPaging:
+    def test_latest_page_and_scrolling_back(self, project_dir):
+        conversation = db.create_conversation(project_dir, "proj")
+        _bulk_insert(project_dir, conversation.id, 120)
+
+        page = db.get_conversation(project_dir, conversation.id, limit=50)
+        assert _contents(page["messages"]) == list(range(70, 120))
+        assert page["has_more"] and page["message_count"] == 120
+
+        older = db.get_conversation(project_dir, conversation.id, limit=50, before_id=page["messages"][0]["id"])
+        assert _contents(older["messages"]) == list(range(20, 70))
+
+        oldest = db.get_conversation(project_dir, conversation.id, limit=50, before_id=older["messages"][0]["id"])
+        assert _contents(oldest["messages"]) == list(range(0, 20))
+        assert not oldest["has_more"]
+
+        newer = db.get_messages(project_dir, conversation.id, limit=30, after_id=oldest["messages"][-1]["id"])
+        assert _contents(newer) == list(range(20, 50))
+
+        # Without a limit the whole conversation is returned, as before
+        assert _contents(db.get_messages(project_dir, conversation.id)) == list(range(120))
+
+    def test_equal_timestamps_are_ordered_by_id(self, project_dir):
+        conversation = db.create_conversation(project_dir, "proj")
+        _bulk_insert(project_dir, conversation.id, 10, step=timedelta(0))
+
+        first = db.get_messages(project_dir, conversation.id, limit=4)
+        second = db.get_messages(project_dir, conversation.id, limit=4, before_id=first[0]["id"])
+        third = db.get_messages(project_dir, conversation.id, limit=4, before_id=second[0]["id"])
+        assert _contents(third + second + first) == list(range(10))
+
+    def test_unknown_anchor_returns_empty_page(self, project_dir):
+        conversation = db.create_conversation(project_dir, "proj")
+        other = db.create_conversation(project_dir, "proj")
+        message = db.add_message(project_dir, other.id, "user", "message 0")
+        assert db.get_messages(project_dir, conversation.id, limit=10, before_id=message["id"]) == []
+
+    def test_page_query_uses_index(self, project_dir):
+        db.get_engine(project_dir)
+        conn = sqlite3.connect(str(db.get_db_path(project_dir)))
+        plan = " ".join(row[3] for row in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM conversation_messages WHERE conversation_id = 1 "
+            "AND (timestamp, id) < ('2026-01-01 00:00:00', 5) ORDER BY timestamp DESC, id DESC LIMIT 51"
+        ))
+        conn.close()
+        assert "ix_conversation_messages_conversation_timestamp" in plan
+        assert "TEMP B-TREE" not in plan
+
+
+class TestSummaryRow:
+    def test_counts_follow_add_and_delete(self, project_dir):
+        conversation = db.create_conversation(project_dir, "proj")
+        for i in range(3):
+            db.add_message(project_dir, conversation.id, "user", f"message {i}")
+
+        assert db.get_conversations(project_dir, "proj")[0]["message_count"] == 3
+        assert db.delete_conversation(project_dir, conversation.id)
+
+        engine = db.get_engine(project_dir)
+        with engine.connect() as conn:
+            for table in ("conversations", "conversation_messages", "conversation_summaries"):
+                assert conn.execute(text(f"SELECT COUNT(*) FROM {table}")).scalar() == 0
+
+    def test_existing_database_is_migrated(self, project_dir):
+        conn = sqlite3.connect(str(db.get_db_path(project_dir)))
+        conn.executescript(
+            """
+            CREATE TABLE conversations (id INTEGER PRIMARY KEY, project_name VARCHAR(100) NOT NULL,
+                title VARCHAR(200), created_at DATETIME, updated_at DATETIME);
+            CREATE TABLE conversation_messages (id INTEGER PRIMARY KEY,
+                conversation_id INTEGER NOT NULL REFERENCES conversations(id),
+                role VARCHAR(20) NOT NULL, content TEXT NOT NULL, timestamp DATETIME);
+            INSERT INTO conversations (id, project_name) VALUES (1, 'proj'), (2, 'proj');
+            INSERT INTO conversation_messages (conversation_id, role, content, timestamp)
+                VALUES (1, 'user', 'message 0', '2026-01-01 00:00:00.000000'),
+                       (1, 'assistant', 'message 1', '2026-01-01 00:00:01.000000');
+            """
+        )
+        conn.close()
+
+        engine = db.get_engine(project_dir)
+        indexes = [idx["name"] for idx in inspect(engine).get_indexes("conversation_messages")]
+        assert "ix_conversation_messages_conversation_timestamp" in indexes
+        counts = {c["id"]: c["message_count"] for c in db.get_conversations(project_dir, "proj")}
+        assert counts == {1: 2, 2: 0}
+
+        # A message added after the migration keeps the count current
+        db.add_message(project_dir, 2, "user", "message 2")
+        assert db.get_conversation(project_dir, 2)["message_count"] == 1
+
+    def test_rolling_summary_folds_only_new_messages(self, project_dir, monkeypatch):
+        conversation = db.create_conversation(project_dir, "proj")
+        _bulk_insert(project_dir, conversation.id, 100)
+
+        context = db.get_history_context(project_dir, conversation.id, limit=35)
+        assert _contents(context["messages"]) == list(range(65, 100))
+        assert context["summarized_count"] == 65
+        assert context["summary"].splitlines()[-1].startswith("User: message 64")
+
+        # Ten more messages: only the ten that left the window are read and folded in
+        _bulk_insert(project_dir, conversation.id, 10, start=datetime(2026, 1, 2))
+        folded = []
+        real_line = db._summary_line
+        monkeypatch.setattr(db, "_summary_line", lambda m: folded.append(m.id) or real_line(m))
+        context = db.get_history_context(project_dir, conversation.id, limit=35)
+        assert len(folded) == 10 and context["summarized_count"] == 75
+        assert context["summary"].splitlines()[-1].startswith("User: message 74")
+
+        # The digest stays bounded by dropping its oldest lines
+        _bulk_insert(project_dir, conversation.id, 200, start=datetime(2026, 1, 3))
+        context = db.get_history_context(project_dir, conversation.id, limit=35)
+        assert len(context["summary"]) <= db.SUMMARY_MAX_CHARS
+        assert context["summarized_count"] == 275
+
+
+def test_first_page_latency_benchmark(project_dir):
+    sizes = (1_000, 10_000, 50_000)
+    latencies = {}
+    for size in sizes:
+        conversation = db.create_conversation(project_dir, "proj")
+        _bulk_insert(project_dir, conversation.id, size)
+        db.get_conversation(project_dir, conversation.id, limit=50)  # Warm the connection pool
+
+        timings = []
+        for _ in range(20):
+            start = time.perf_counter()
+            page = db.get_conversation(project_dir, conversation.id, limit=50)
+            timings.append((time.perf_counter() - start) * 1000)
+        assert page["message_count"] == size and len(page["messages"]) == 50
+        latencies[size] = statistics.median(timings)
+
+    start = time.perf_counter()
+    full = db.get_messages(project_dir, conversation.id)
+    full_ms = (time.perf_counter() - start) * 1000
+    assert len(full) == sizes[-1]
+
+    print(
+        "\nfirst page (50 messages): "
+        + ", ".join(f"{size // 1000}k msgs {ms:.2f} ms" for size, ms in latencies.items())
+        + f" | full 50k load {full_ms:.0f} ms"
+    )
+
+    # Page latency does not grow with conversation length
+    assert latencies[50_000] < latencies[1_000] * 3 + 2
+    assert latencies[50_000] * 10 < full_ms
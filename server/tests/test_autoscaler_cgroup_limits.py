@@ -0,0 +1,232 @@
+"""
+Unit tests for live cgroup v2 limit updates in the autoscaler.
+
+Verifies that:
+1. Limits are written to cpu.max, memory.high/memory.max and pids.max
+2. A failed write or read-back rolls every changed file back
+3. Limits below current usage are refused before anything is written
+4. update_limits persists to the unit file with daemon-reload, never a restart
+
+Runs against a fake cgroupfs directory tree. The benchmark scales limits
+repeatedly while TCP clients exchange messages with an in-process server,
+and reports per-update latency and whether any connection dropped.
+"""
+
+import asyncio
+import statistics
+import subprocess
+import time
+
+import pytest
+
+from server.routers import systemd
+from server.services import autoscaler as autoscaler_module
+from server.utils.cgroup_limits import GB, CgroupLimitError, CgroupLimits, find_service_cgroup
+
+SERVICE_PATH = "user.slice/user-1000.slice/user@1000.service/app.slice/autocoder-ui.service"
+
+UNIT_FILE = """[Unit]
+Description=AutoCoder UI
+
+[Service]
+ExecStart=/usr/bin/python -m uvicorn server.main:app
+CPUQuota=200%
+MemoryMax=32G
+TasksMax=250
+"""
+
+
+@pytest.fixture
+def cgroup(tmp_path):
+    path = tmp_path / "cgroup" / SERVICE_PATH
+    path.mkdir(parents=True)
+    files = {
+        "cpu.max": "200000 100000",
+        "memory.max": str(32 * GB),
+        "memory.high": "max",
+        "memory.current": str(2 * GB),
+        "pids.max": "250",
+        "pids.current": "40",
+    }
+    for name, value in files.items():
+        (path / name).write_text(value + "\n")
+    return path
+
+
+@pytest.fixture
+def scaler(tmp_path, cgroup, monkeypatch):
+    unit_file = tmp_path / "autocoder-ui.service"
+    unit_file.write_text(UNIT_FILE)
+    monkeypatch.setattr(systemd, "SERVICE_FILE", unit_file)
+    monkeypatch.setattr(autoscaler_module, "AUTOSCALER_DB", tmp_path / "autoscaler.db")
+
+    commands = []
+
+    def fake_run(command, **kwargs):
+        commands.append(command)
+        return subprocess.CompletedProcess(command, 0, b"", b"")
+
+    monkeypatch.setattr(autoscaler_module.subprocess, "run", fake_run)
+    return autoscaler_module.AutoScaler(CgroupLimits(cgroup)), unit_file, commands
+
+
+def _read(cgroup, name):
+    return (cgroup / name).read_text().strip()
+
+
+class TestCgroupLimits:
+    def test_find_service_cgroup_from_proc(self, tmp_path, cgroup):
+        proc = tmp_path / "proc-cgroup"
+        proc.write_text(f"0::/{SERVICE_PATH}\n")
+        assert find_service_cgroup("autocoder-ui.service", tmp_path / "cgroup", proc) == cgroup
+
+        # Not inside the service: fall back to searching the hierarchy
+        proc.write_text("0::/user.slice/other.scope\n")
+        assert find_service_cgroup("autocoder-ui.service", tmp_path / "cgroup", proc) == cgroup
+
+    def test_apply_writes_control_files(self, cgroup):
+        limits = CgroupLimits(cgroup)
+        limits.apply({"cpu_quota": 350, "memory_max": 48, "tasks_max": 400})
+
+        assert _read(cgroup, "cpu.max") == "350000 100000"
+        assert _read(cgroup, "memory.max") == str(48 * GB)
+        assert int(_read(cgroup, "memory.high")) <= 48 * GB * 0.9
+        assert _read(cgroup, "pids.max") == "400"
+        assert limits.read_limits() == {"cpu_quota": 350, "memory_max": 48, "tasks_max": 400}
+
+    def test_shrinking_memory_lowers_high_first(self, cgroup):
+        writes = CgroupLimits(cgroup).plan({"cpu_quota": 100, "memory_max": 16, "tasks_max": 100})
+        names = [name for name, _ in writes]
+        assert names.index("memory.high") < names.index("memory.max")
+
+    def test_failed_write_rolls_back(self, cgroup):
+        before = {name: _read(cgroup, name) for name in ("cpu.max", "pids.max", "memory.max", "memory.high")}
+
+        # The kernel rejects memory.high: earlier writes must be undone
+        (cgroup / "memory.high").unlink()
+        (cgroup / "memory.high").mkdir()
+        with pytest.raises(CgroupLimitError):
+            CgroupLimits(cgroup).apply({"cpu_quota": 400, "memory_max": 64, "tasks_max": 500})
+
+        for name in ("cpu.max", "pids.max", "memory.max"):
+            assert _read(cgroup, name) == before[name]
+
+    def test_read_back_mismatch_rolls_back(self, cgroup, monkeypatch):
+        limits = CgroupLimits(cgroup)
+        real_write = limits._write
+
+        def clamping_write(name, value):
+            # Simulate a parent cgroup clamping pids.max
+            real_write(name, "300" if (name, value) == ("pids.max", "500") else value)
+
+        monkeypatch.setattr(limits, "_write", clamping_write)
+        with pytest.raises(CgroupLimitError, match="pids.max"):
+            limits.apply({"cpu_quota": 400, "memory_max": 64, "tasks_max": 500})
+
+        assert _read(cgroup, "cpu.max") == "200000 100000"
+        assert _read(cgroup, "pids.max") == "250"
+
+    def test_limits_below_usage_are_refused(self, cgroup):
+        (cgroup / "memory.current").write_text(str(20 * GB))
+        with pytest.raises(CgroupLimitError, match="below current usage"):
+            CgroupLimits(cgroup).apply({"cpu_quota": 100, "memory_max": 16, "tasks_max": 100})
+        assert _read(cgroup, "cpu.max") == "200000 100000"
+
+
+class TestAutoScalerUpdateLimits:
+    def test_live_update_and_persist_without_restart(self, scaler, cgroup):
+        autoscaler, unit_file, commands = scaler
+        new_limits = {"cpu_quota": 300, "memory_max": 40, "tasks_max": 350}
+
+        assert asyncio.run(autoscaler.update_limits(new_limits))
+
+        assert autoscaler.get_current_limits() == new_limits
+        content = unit_file.read_text()
+        assert "CPUQuota=300%" in content and "MemoryMax=40G" in content and "TasksMax=350" in content
+        assert "MemoryHigh=36864M" in content
+        assert commands == [["systemctl", "--user", "daemon-reload"]]
+
+    def test_cgroup_failure_leaves_unit_file_alone(self, scaler, cgroup):
+        autoscaler, unit_file, commands = scaler
+        (cgroup / "pids.max").unlink()
+
+        assert not asyncio.run(autoscaler.update_limits({"cpu_quota": 300, "memory_max": 40, "tasks_max": 350}))
+        assert unit_file.read_text() == UNIT_FILE
+        assert _read(cgroup, "cpu.max") == "200000 100000"
+        assert commands == []
+
+    def test_reload_failure_restores_unit_file(self, scaler, cgroup, monkeypatch):
+        autoscaler, unit_file, _ = scaler
+
+        def failing_run(command, **kwargs):
+            raise subprocess.CalledProcessError(1, command)
+
+        monkeypatch.setattr(autoscaler_module.subprocess, "run", failing_run)
+
+        # Live limits still apply; only persistence is undone
+        assert asyncio.run(autoscaler.update_limits({"cpu_quota": 300, "memory_max": 40, "tasks_max": 350}))
+        assert _read(cgroup, "cpu.max") == "300000 100000"
+        assert unit_file.read_text() == UNIT_FILE
+
+    def test_nothing_to_update_reports_failure(self, scaler, monkeypatch):
+        _, unit_file, commands = scaler
+        unit_file.unlink()
+        monkeypatch.setattr(autoscaler_module, "find_service_cgroup", lambda name: None)
+        autoscaler = autoscaler_module.AutoScaler()
+
+        assert not asyncio.run(autoscaler.update_limits({"cpu_quota": 300, "memory_max": 40, "tasks_max": 350}))
+        assert commands == []
+
+
+def test_scaling_keeps_connections_benchmark(scaler):
+    autoscaler, _, _ = scaler
+
+    async def run():
+        async def echo(reader, writer):
+            while line := await reader.readline():
+                writer.write(line)
+                await writer.drain()
+            writer.close()
+
+        server = await asyncio.start_server(echo, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        clients = [await asyncio.open_connection("127.0.0.1", port) for _ in range(20)]
+        stop = asyncio.Event()
+        echoed = [0] * len(clients)
+
+        async def chatter(index, reader, writer):
+            while not stop.is_set():
+                writer.write(b"ping\n")
+                await writer.drain()
+                assert await reader.readline() == b"ping\n"
+                echoed[index] += 1
+                await asyncio.sleep(0.001)
+
+        tasks = [asyncio.create_task(chatter(i, r, w)) for i, (r, w) in enumerate(clients)]
+
+        timings = []
+        for step in range(40):
+            limits = {"cpu_quota": 200 + 50 * (step % 4), "memory_max": 32 + 8 * (step % 3), "tasks_max": 250}
+            start = time.perf_counter()
+            assert await autoscaler.update_limits(limits)
+            timings.append((time.perf_counter() - start) * 1000)
+            await asyncio.sleep(0.005)
+
+        stop.set()
+        await asyncio.gather(*tasks)
+        open_connections = sum(not w.is_closing() for _, w in clients)
+        for _, writer in clients:
+            writer.close()
+        server.close()
+        await server.wait_closed()
+        return timings, echoed, open_connections
+
+    timings, echoed, open_connections = asyncio.run(run())
+    print(
+        f"\n40 scale events: p50 {statistics.median(timings):.2f} ms, max {max(timings):.2f} ms | "
+        f"{open_connections}/20 connections open, {sum(echoed)} messages echoed"
+    )
+
+    assert open_connections == 20
+    assert all(count > 0 for count in echoed)
+    assert statistics.median(timings) < 50
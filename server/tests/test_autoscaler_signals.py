@@ -0,0 +1,256 @@
+"""
+Unit tests for autoscaler workload signals and metrics storage.
+
+Verifies that:
+1. One snapshot reports running agents, pending features and quota burn rate
+2. Metrics go through one long-lived connection in batched inserts
+3. Samples older than the raw retention window are downsampled to hourly rows
+4. Replayed load curves drive scale-up and scale-down decisions, and a
+   pending backlog with agents still running blocks scale-down
+
+The benchmark compares a connection-per-insert writer (the previous
+behaviour) against the batched store for a day of 30-second samples.
+"""
+
+import asyncio
+import sqlite3
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+
+import psutil
+import pytest
+
+from api.database import Feature, create_database, dispose_engine
+from api.quota_budget import QuotaBudget
+from server.services.autoscaler import (
+    AutoscalerConfig,
+    AutoscalerStore,
+    ScalingAction,
+    SignalCollector,
+)
+from server.services.autoscaler_simulation import load_curve, replay
+from server.services.process_manager import AgentProcessManager
+from server.utils.resource_monitor import ResourceMetrics
+
+# Parent process that starts agent-like children, the way the orchestrator does
+ORCHESTRATOR = """
+import subprocess, sys, time
+child = "import time; time.sleep(60)"
+procs = [subprocess.Popen([sys.executable, "-c", child, "--agent-type", kind])
+         for kind in ("coding", "coding", "testing")]
+print("ready", flush=True)
+time.sleep(60)
+"""
+
+START = datetime(2026, 1, 5, 0, 0, 0)
+
+
+def _sample(timestamp, cpu=50.0, agents=1):
+    return ResourceMetrics(
+        timestamp=timestamp,
+        cpu_percent=cpu,
+        cpu_cores_used=1.0,
+        memory_gb=4.0,
+        process_count=40,
+        agent_count=agents,
+        testing_agent_count=0,
+        api_quota_remaining=300,
+        features_pending=5,
+        quota_burn_rate=12.0,
+    )
+
+
+@pytest.fixture
+def quota(tmp_path):
+    budget = QuotaBudget(db_path=tmp_path / "quota.db", quota_limit=400)
+    for _ in range(10):
+        budget.track_usage("sonnet", prompts_used=3)
+    return budget
+
+
+@pytest.fixture
+def running_manager(tmp_path):
+    project_dir = tmp_path / "proj"
+    project_dir.mkdir()
+    _, session_maker = create_database(project_dir)
+    session = session_maker()
+    for i in range(7):
+        session.add(Feature(priority=i, category="core", name=f"F{i}", description="d", steps=[], passes=i < 3))
+    session.commit()
+    session.close()
+
+    manager = AgentProcessManager("proj", project_dir, tmp_path)
+    manager.process = subprocess.Popen(
+        [sys.executable, "-c", ORCHESTRATOR], stdout=subprocess.PIPE, text=True
+    )
+    assert manager.process.stdout.readline().strip() == "ready"
+    manager._status = "running"
+
+    yield manager
+
+    for child in psutil.Process(manager.process.pid).children(recursive=True):
+        child.kill()
+    manager.process.kill()
+    manager.process.wait()
+    manager.process.stdout.close()
+    dispose_engine(project_dir)
+
+
+class TestSignalCollector:
+    def test_quota_usage_snapshot(self, quota):
+        usage = quota.get_usage_snapshot(burn_window_minutes=15)
+        assert usage["used"] == 30
+        assert usage["remaining"] == 370
+        assert usage["burn_rate"] == 120  # 30 prompts in 15 minutes
+
+    def test_snapshot_reads_live_sources(self, running_manager, quota):
+        collector = SignalCollector(get_managers=lambda: [running_manager], quota_budget=quota)
+        try:
+            signals = collector.snapshot()
+            assert signals.agent_count == 2
+            assert signals.testing_agent_count == 1
+            assert signals.features_pending == 4
+            assert signals.api_quota_remaining == 370
+            assert signals.quota_burn_rate > 0
+
+            # The feature database connection is reused, then closed once the
+            # project stops running
+            assert len(collector._feature_dbs) == 1
+            collector._get_managers = lambda: []
+            signals = collector.snapshot()
+            assert signals.agent_count == signals.features_pending == 0
+            assert collector._feature_dbs == {}
+        finally:
+            collector.close()
+
+    def test_failing_source_contributes_zeros(self, quota):
+        def broken():
+            raise RuntimeError("boom")
+
+        signals = SignalCollector(get_managers=broken, quota_budget=quota).snapshot()
+        assert signals.agent_count == 0
+        assert signals.api_quota_remaining == 370
+
+
+class TestAutoscalerStore:
+    def test_metrics_are_batched(self, tmp_path):
+        store = AutoscalerStore(tmp_path / "autoscaler.db", batch_size=10)
+        for i in range(25):
+            store.record_metrics(_sample(START + timedelta(seconds=30 * i)))
+
+        def rows():
+            return store.fetchone("SELECT COUNT(*) FROM autoscaler_metrics")[0]
+
+        assert rows() == 20
+        store.flush_metrics()
+        assert rows() == 25
+        store.close()
+
+    def test_config_and_history_share_connection(self, tmp_path):
+        store = AutoscalerStore(tmp_path / "autoscaler.db")
+        config = AutoscalerConfig(scale_up_cpu_percent=70)
+        assert config.save(store)
+        assert AutoscalerConfig.load(store).scale_up_cpu_percent == 70
+
+        limits = {"cpu_quota": 200, "memory_max": 32, "tasks_max": 250}
+        store.log_history(ScalingAction(START, "scale_up", "threshold", "test", limits, limits, "success"))
+        assert store.fetchone("SELECT action FROM autoscaler_history")[0] == "scale_up"
+        store.close()
+
+    def test_retention_downsamples_to_hourly(self, tmp_path):
+        store = AutoscalerStore(tmp_path / "autoscaler.db")
+        samples = [_sample(START + timedelta(minutes=10 * i), cpu=float(i % 6) * 10) for i in range(3 * 24 * 6)]
+        for sample in samples:
+            store.record_metrics(sample)
+
+        now = samples[-1].timestamp + timedelta(minutes=5)
+        downsampled = store.apply_retention(now, force=True)
+
+        cutoff = (now - timedelta(days=1)).replace(minute=0)
+        kept = [s for s in samples if s.timestamp >= cutoff]
+        assert downsampled == len(samples) - len(kept)
+        assert store.fetchone("SELECT COUNT(*) FROM autoscaler_metrics")[0] == len(kept)
+
+        # Six samples per hour with CPU 0..50: average 25, maximum 50
+        hours, samples_total, cpu_avg, cpu_max = store.fetchone(
+            "SELECT COUNT(*), SUM(samples), AVG(cpu_percent_avg), MAX(cpu_percent_max) "
+            "FROM autoscaler_metrics_hourly"
+        )
+        assert hours == downsampled // 6 and samples_total == downsampled
+        assert cpu_avg == pytest.approx(25) and cpu_max == 50
+
+        # Within the maintenance interval nothing runs again
+        assert store.apply_retention(now + timedelta(minutes=1)) == 0
+        store.close()
+
+
+class TestSimulation:
+    def test_spike_scales_up_then_down(self):
+        samples = load_curve("spike", hours=6, start=START)
+        result = asyncio.run(replay(samples))
+
+        spike_start, spike_end = START + timedelta(hours=2), START + timedelta(hours=4)
+        ups = [a for a in result.actions if a.action == "scale_up"]
+        downs_after = [a for a in result.actions if a.action == "scale_down" and a.timestamp >= spike_end]
+
+        assert ups and all(spike_start <= a.timestamp < spike_end for a in ups)
+        assert downs_after
+        peak = max(limits["cpu_quota"] for limits in result.limits)
+        assert peak > result.limits[0]["cpu_quota"]
+        assert result.limits[-1]["cpu_quota"] < peak
+
+    def test_steady_load_takes_no_action(self):
+        result = asyncio.run(replay(load_curve("steady", hours=3, start=START)))
+        assert result.actions == []
+
+    def test_pending_backlog_blocks_scale_down(self):
+        idle = asyncio.run(replay(load_curve("spike", hours=6, start=START)))
+        backlog = asyncio.run(replay(load_curve("spike", hours=6, start=START, backlog=50)))
+
+        assert any(a.action == "scale_down" for a in idle.actions)
+        assert not any(a.action == "scale_down" for a in backlog.actions)
+        assert any(a.action == "scale_up" for a in backlog.actions)
+
+    def test_unknown_curve(self):
+        with pytest.raises(ValueError):
+            load_curve("sawtooth")
+
+
+def test_metrics_write_benchmark(tmp_path):
+    samples = [_sample(START + timedelta(seconds=30 * i)) for i in range(2880)]
+    columns = (
+        "timestamp, cpu_percent, memory_gb, process_count, agent_count, "
+        "testing_agent_count, api_quota_remaining, features_pending, quota_burn_rate"
+    )
+
+    per_row_db = tmp_path / "per_row.db"
+    AutoscalerStore(per_row_db).close()
+    start = time.perf_counter()
+    for s in samples:
+        conn = sqlite3.connect(str(per_row_db))
+        conn.execute(
+            f"INSERT INTO autoscaler_metrics ({columns}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (s.timestamp.isoformat(sep=" "), s.cpu_percent, s.memory_gb, s.process_count,
+             s.agent_count, s.testing_agent_count, s.api_quota_remaining, s.features_pending,
+             s.quota_burn_rate),
+        )
+        conn.commit()
+        conn.close()
+    per_row = time.perf_counter() - start
+
+    store = AutoscalerStore(tmp_path / "batched.db")
+    start = time.perf_counter()
+    for s in samples:
+        store.record_metrics(s)
+    store.flush_metrics()
+    batched = time.perf_counter() - start
+    assert store.fetchone("SELECT COUNT(*) FROM autoscaler_metrics")[0] == len(samples)
+    store.close()
+
+    print(
+        f"\n{len(samples)} samples: connection per insert {per_row * 1000:.0f} ms, "
+        f"batched store {batched * 1000:.0f} ms ({per_row / batched:.1f}x)"
+    )
+    assert batched < per_row
@@ -0,0 +1,208 @@
+"""
+Unit tests for ETag / delta sync on the features list endpoint.
+
+Verifies that:
+1. Every write to the features table bumps the project revision
+2. A matching If-None-Match is answered with 304
+3. ``since=<revision>`` returns only changed rows, dependents and tombstones
+4. A delta is only served for the database's own epoch; a recreated or
+   restored database answers with the full list
+5. Re-inserting a deleted ID clears its tombstone
+6. ``view=summary`` omits descriptions and steps
+
+The benchmark test reports payload bytes and server time per refresh for
+full, summary, delta and conditional requests on a 2,000 feature project.
+"""
+
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from api.database import Feature, _migrate_add_revision_tracking, create_database, dispose_engine
+from server.routers import features as features_router
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    project_dir = tmp_path / "proj"
+    project_dir.mkdir()
+    monkeypatch.setattr(features_router, "_get_project_path", lambda name: project_dir)
+    engine, session_maker = create_database(project_dir)
+
+    app = FastAPI()
+    app.include_router(features_router.router)
+    yield TestClient(app), engine, session_maker
+    dispose_engine(project_dir)
+
+
+def _seed(session_maker, count, description="x" * 400):
+    session = session_maker()
+    for i in range(count):
+        session.add(Feature(
+            priority=i + 1,
+            category="core",
+            name=f"Feature {i + 1}",
+            description=description,
+            steps=[f"step {n}" for n in range(5)],
+            dependencies=[i] if i else None,
+        ))
+    session.commit()
+    session.close()
+
+
+URL = "/api/projects/proj/features"
+
+
+class TestConditionalGet:
+    def test_etag_round_trip(self, project):
+        client, engine, session_maker = project
+        _seed(session_maker, 3)
+
+        first = client.get(URL)
+        assert first.status_code == 200
+        etag = first.headers["etag"]
+
+        cached = client.get(URL, headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.content == b""
+
+        with engine.connect() as conn:
+            conn.execute(text("UPDATE features SET in_progress = 1 WHERE id = 2"))
+            conn.commit()
+
+        after_write = client.get(URL, headers={"If-None-Match": etag})
+        assert after_write.status_code == 200
+        assert after_write.headers["etag"] != etag
+        assert after_write.json()["revision"] > first.json()["revision"]
+
+    def test_views_have_distinct_etags(self, project):
+        client, _, session_maker = project
+        _seed(session_maker, 2)
+
+        full = client.get(URL)
+        summary = client.get(URL, params={"view": "summary"})
+        assert full.headers["etag"] != summary.headers["etag"]
+        assert "description" not in summary.json()["pending"][0]
+        assert "steps" not in summary.json()["pending"][0]
+
+
+class TestDeltaSync:
+    def test_changed_rows_dependents_and_tombstones(self, project):
+        client, engine, session_maker = project
+        _seed(session_maker, 5)
+        full = client.get(URL).json()
+        revision, epoch = full["revision"], full["epoch"]
+
+        with engine.connect() as conn:
+            # Feature 3 passing unblocks feature 4 (which depends on it)
+            conn.execute(text("UPDATE features SET passes = 1 WHERE id = 3"))
+            conn.execute(text("DELETE FROM features WHERE id = 5"))
+            conn.commit()
+
+        delta = client.get(URL, params={"since": revision, "epoch": epoch}).json()
+        assert delta["since"] == revision and delta["epoch"] == epoch
+        assert delta["revision"] > revision
+        assert [f["id"] for f in delta["changed"]] == [3, 4]
+        assert delta["changed"][1]["blocked"] is False
+        assert delta["deleted"] == [5]
+
+        empty = client.get(URL, params={"since": delta["revision"], "epoch": epoch}).json()
+        assert empty["changed"] == [] and empty["deleted"] == []
+
+    def test_reinserted_id_is_not_reported_deleted(self, project):
+        client, engine, session_maker = project
+        _seed(session_maker, 3)
+        full = client.get(URL).json()
+
+        with engine.connect() as conn:
+            conn.execute(text("DELETE FROM features WHERE id = 2"))
+            conn.execute(text(
+                "INSERT INTO features (id, priority, category, name, description, steps, passes, in_progress) "
+                "VALUES (2, 2, 'core', 'Feature 2 again', 'x', '[]', 0, 0)"
+            ))
+            conn.commit()
+
+        delta = client.get(URL, params={"since": full["revision"], "epoch": full["epoch"]}).json()
+        assert [f["id"] for f in delta["changed"]] == [2, 3]
+        assert delta["changed"][0]["name"] == "Feature 2 again"
+        assert delta["deleted"] == []
+
+    def test_old_insert_trigger_is_replaced(self, project):
+        _, engine, session_maker = project
+        with engine.connect() as conn:
+            conn.execute(text("DROP TRIGGER trg_feature_revision_insert"))
+            conn.execute(text(
+                "CREATE TRIGGER trg_feature_revision_insert AFTER INSERT ON features BEGIN "
+                "UPDATE feature_sync_state SET revision = revision + 1 WHERE id = 1; END"
+            ))
+            conn.commit()
+
+        _migrate_add_revision_tracking(engine)
+        _seed(session_maker, 1)
+        with engine.connect() as conn:
+            conn.execute(text("DELETE FROM features WHERE id = 1"))
+            conn.execute(text(
+                "INSERT INTO features (id, priority, category, name, description, steps, passes, in_progress) "
+                "VALUES (1, 1, 'core', 'Back', 'x', '[]', 0, 0)"
+            ))
+            conn.commit()
+            assert conn.execute(text("SELECT COUNT(*) FROM feature_tombstones")).scalar() == 0
+
+    def test_other_epoch_gets_full_list(self, project):
+        client, engine, session_maker = project
+        _seed(session_maker, 3)
+        full = client.get(URL).json()
+
+        # As if the database had been recreated with a revision at least as high
+        with engine.connect() as conn:
+            conn.execute(text("UPDATE feature_sync_state SET epoch = 'restored', revision = revision + 5"))
+            conn.commit()
+
+        for params in ({"since": full["revision"], "epoch": full["epoch"]}, {"since": full["revision"]}):
+            result = client.get(URL, params=params)
+            body = result.json()
+            assert "pending" in body and "changed" not in body
+            assert body["epoch"] == "restored"
+            assert result.headers["etag"].endswith('-full-all"')
+
+    def test_future_revision_falls_back_to_full_list(self, project):
+        client, _, session_maker = project
+        _seed(session_maker, 2)
+
+        result = client.get(URL, params={"since": 10_000}).json()
+        assert "pending" in result
+        assert len(result["pending"]) + len(result["done"]) + len(result["in_progress"]) == 2
+
+
+def test_refresh_payload_benchmark(project):
+    client, engine, session_maker = project
+    _seed(session_maker, 2000)
+
+    def timed(**kwargs):
+        start = time.perf_counter()
+        response = client.get(URL, **kwargs)
+        return response, (time.perf_counter() - start) * 1000
+
+    full, full_ms = timed()
+    summary, summary_ms = timed(params={"view": "summary"})
+    not_modified, not_modified_ms = timed(headers={"If-None-Match": full.headers["etag"]})
+
+    with engine.connect() as conn:
+        conn.execute(text("UPDATE features SET in_progress = 1 WHERE id = 1000"))
+        conn.commit()
+    delta, delta_ms = timed(params={"since": full.json()["revision"], "epoch": full.json()["epoch"]})
+
+    print(
+        f"\nfull: {len(full.content)} B {full_ms:.1f} ms | "
+        f"summary: {len(summary.content)} B {summary_ms:.1f} ms | "
+        f"delta: {len(delta.content)} B {delta_ms:.1f} ms | "
+        f"304: {len(not_modified.content)} B {not_modified_ms:.1f} ms"
+    )
+
+    assert not_modified.status_code == 304
+    assert len(summary.content) * 3 < len(full.content)
+    assert len(delta.content) * 100 < len(full.content)
+    assert not_modified_ms < full_ms
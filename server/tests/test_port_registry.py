@@ -0,0 +1,252 @@
+"""
+Unit tests for dev-server port allocation in the registry database.
+
+Verifies that:
+1. Parallel starts (threads and separate processes) never share a port
+2. A project's config.json is only re-read when its mtime changes, and a
+   port edited there by hand is adopted if it is free
+3. Setting a port held by another project is rejected
+4. Releasing or unregistering a project frees its port, and relocating it
+   keeps its port
+5. Ports already recorded in config files are imported once
+
+The benchmark compares the previous scan of every registered project's
+config against the registry lookup for 100 projects.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+import registry
+from server.services import project_config
+from server.services.project_config import (
+    DEVSERVER_PORT_MAX,
+    DEVSERVER_PORT_MIN,
+    get_all_assigned_ports,
+    get_assigned_port,
+    set_assigned_port,
+)
+
+ROOT = Path(__file__).resolve().parents[2]
+
+START_PROJECT = """
+import sys
+from pathlib import Path
+sys.path.insert(0, sys.argv[1])
+from server.services.project_config import get_assigned_port
+print(get_assigned_port(Path(sys.argv[2])))
+"""
+
+
+def _reset_registry():
+    if registry._engine is not None:
+        registry._engine.dispose()
+    registry._engine = None
+    registry._SessionLocal = None
+    project_config._ports_seeded = False
+
+
+@pytest.fixture
+def home(tmp_path, monkeypatch):
+    home = tmp_path / "home"
+    home.mkdir()
+    monkeypatch.setenv("HOME", str(home))
+    monkeypatch.setenv("USERPROFILE", str(home))
+    _reset_registry()
+    yield home
+    _reset_registry()
+
+
+def _projects(tmp_path, count):
+    projects = []
+    for i in range(count):
+        project = tmp_path / f"proj{i}"
+        project.mkdir()
+        projects.append(project)
+    return projects
+
+
+def _write_port(project, port):
+    config_path = project / ".autoforge" / "config.json"
+    config_path.parent.mkdir(exist_ok=True)
+    config = json.loads(config_path.read_text()) if config_path.exists() else {}
+    config["assigned_port"] = port
+    config_path.write_text(json.dumps(config))
+    # Make sure the mtime moves on filesystems with coarse timestamps
+    stat = config_path.stat()
+    os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+class TestParallelStarts:
+    def test_threads_get_distinct_ports(self, home, tmp_path):
+        projects = _projects(tmp_path, 40)
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            ports = list(pool.map(get_assigned_port, projects))
+
+        assert len(set(ports)) == len(projects)
+        assert all(DEVSERVER_PORT_MIN <= p <= DEVSERVER_PORT_MAX for p in ports)
+        assert get_all_assigned_ports() == set(ports)
+
+        # Each port was written back to the project's config
+        for project, port in zip(projects, ports):
+            assert json.loads((project / ".autoforge" / "config.json").read_text())["assigned_port"] == port
+
+    def test_processes_get_distinct_ports(self, home, tmp_path):
+        projects = _projects(tmp_path, 12)
+        env = {**os.environ, "HOME": str(home), "USERPROFILE": str(home)}
+        procs = [
+            subprocess.Popen(
+                [sys.executable, "-c", START_PROJECT, str(ROOT), str(project)],
+                stdout=subprocess.PIPE, text=True, env=env,
+            )
+            for project in projects
+        ]
+        ports = []
+        for proc in procs:
+            out, _ = proc.communicate(timeout=60)
+            assert proc.returncode == 0
+            ports.append(int(out.strip().splitlines()[-1]))
+
+        assert len(set(ports)) == len(projects)
+        assert get_all_assigned_ports() == set(ports)
+
+    def test_range_exhaustion(self, home, tmp_path, monkeypatch):
+        monkeypatch.setattr(project_config, "DEVSERVER_PORT_MAX", DEVSERVER_PORT_MIN + 2)
+        projects = _projects(tmp_path, 4)
+        for project in projects[:3]:
+            get_assigned_port(project)
+        with pytest.raises(RuntimeError):
+            get_assigned_port(projects[3])
+
+
+class TestReconciliation:
+    def test_config_read_only_when_mtime_changes(self, home, tmp_path, monkeypatch):
+        (project,) = _projects(tmp_path, 1)
+        port = get_assigned_port(project)
+
+        loads = []
+        real_load = project_config._load_config
+        monkeypatch.setattr(project_config, "_load_config", lambda p: loads.append(p) or real_load(p))
+
+        for _ in range(10):
+            assert get_assigned_port(project) == port
+        assert loads == []
+
+        # A hand edit to a free port is adopted
+        _write_port(project, 4050)
+        assert get_assigned_port(project) == 4050
+        assert len(loads) == 1
+        assert get_assigned_port(project) == 4050
+        assert len(loads) == 1
+        assert port not in get_all_assigned_ports()
+
+    def test_hand_edit_to_taken_port_is_reassigned(self, home, tmp_path):
+        first, second = _projects(tmp_path, 2)
+        taken = get_assigned_port(first)
+        own = get_assigned_port(second)
+
+        _write_port(second, taken)
+        assert get_assigned_port(second) == own
+        config = json.loads((second / ".autoforge" / "config.json").read_text())
+        assert config["assigned_port"] == own
+
+    def test_set_assigned_port(self, home, tmp_path):
+        first, second = _projects(tmp_path, 2)
+        taken = get_assigned_port(first)
+        get_assigned_port(second)
+
+        with pytest.raises(ValueError):
+            set_assigned_port(second, taken)
+        with pytest.raises(ValueError):
+            set_assigned_port(second, DEVSERVER_PORT_MAX + 1)
+
+        set_assigned_port(second, 4077)
+        assert get_assigned_port(second) == 4077
+        assert registry.get_port_allocation(second)["config_mtime_ns"] is not None
+
+
+class TestRelease:
+    def test_release_and_unregister_free_ports(self, home, tmp_path):
+        first, second = _projects(tmp_path, 2)
+        registry.register_project("second", second)
+        port_first = get_assigned_port(first)
+        port_second = get_assigned_port(second)
+
+        assert registry.release_port(first)
+        assert not registry.release_port(first)
+        assert registry.unregister_project("second")
+        assert get_all_assigned_ports().isdisjoint({port_first, port_second})
+
+    def test_existing_config_ports_are_imported(self, home, tmp_path):
+        projects = _projects(tmp_path, 3)
+        for i, (project, port) in enumerate(zip(projects, (4010, 4011, 4010))):
+            _write_port(project, port)
+            registry.register_project(f"proj{i}", project)
+
+        assert get_all_assigned_ports() == {4010, 4011, DEVSERVER_PORT_MIN}
+        ports = {get_assigned_port(p) for p in projects}
+        assert len(ports) == 3 and {4010, 4011} <= ports
+
+        # Imported once: a later process does not scan the configs again
+        _reset_registry()
+        assert registry.get_setting(project_config._PORTS_SEEDED_SETTING) == "1"
+
+
+class TestRelocation:
+    def test_port_moves_with_project(self, home, tmp_path):
+        (project,) = _projects(tmp_path, 1)
+        registry.register_project("app", project)
+        port = get_assigned_port(project)
+
+        moved = tmp_path / "moved"
+        project.rename(moved)
+        assert registry.update_project_path("app", moved)
+
+        assert get_assigned_port(moved) == port
+        assert get_all_assigned_ports() == {port}
+        assert registry.get_port_allocation(project) is None
+
+
+def test_port_lookup_benchmark(home, tmp_path):
+    projects = _projects(tmp_path, 100)
+    for i, project in enumerate(projects):
+        registry.register_project(f"proj{i}", project)
+        get_assigned_port(project)
+
+    def scan_configs():
+        # The previous get_all_assigned_ports: parse every registered config
+        ports = set()
+        for info in registry.list_registered_projects().values():
+            config = json.loads((Path(info["path"]) / ".autoforge" / "config.json").read_text())
+            ports.add(config["assigned_port"])
+        return ports
+
+    rounds = 20
+    start = time.perf_counter()
+    for _ in range(rounds):
+        scanned = scan_configs()
+    scan_ms = (time.perf_counter() - start) * 1000 / rounds
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        allocated = get_all_assigned_ports()
+    table_ms = (time.perf_counter() - start) * 1000 / rounds
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        get_assigned_port(projects[50])
+    lookup_ms = (time.perf_counter() - start) * 1000 / rounds
+
+    print(
+        f"\n100 projects: config scan {scan_ms:.2f} ms, allocation table {table_ms:.2f} ms "
+        f"({scan_ms / table_ms:.0f}x) | get_assigned_port {lookup_ms:.2f} ms"
+    )
+    assert scanned == allocated
+    assert table_ms < scan_ms
@@ -0,0 +1,215 @@
+"""
+Unit tests for snapshot-based process tree termination.
+
+Verifies that:
+1. One process snapshot resolves whole trees, grandchildren included
+2. Trees are stopped together: SIGTERM first, SIGKILL for processes that
+   ignore it, all against one shared deadline
+3. kill_process_tree keeps reporting per-tree statistics
+4. A PID that was reused since the snapshot, and the calling process, are
+   never signalled
+5. The emergency router finds and stops AutoCoder processes by command line
+
+The benchmark stops hundreds of dummy process trees (some ignoring SIGTERM)
+one tree at a time, the previous way, and then in one batch, and reports
+the total stop time of each.
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+import psutil
+import pytest
+
+from server.routers import emergency
+from server.utils import process_utils
+from server.utils.process_utils import (
+    ProcessInfo,
+    ProcessSnapshot,
+    kill_process_tree,
+    kill_process_trees,
+)
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="uses POSIX shell process trees")
+
+# A shell with two sleeping children, and one whose tree ignores SIGTERM
+TREE = "sleep 60 & sleep 60 & wait"
+STUBBORN_TREE = "trap '' TERM; sleep 60 & sleep 60 & wait"
+NESTED_TREE = "sh -c 'sleep 60 & wait' & sleep 60 & wait"
+
+
+def _spawn(scripts, argv0="tree"):
+    procs = [subprocess.Popen(["sh", "-c", script, argv0]) for script in scripts]
+    # Wait until every shell has started its children
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        snapshot = ProcessSnapshot.capture()
+        if all(len(snapshot.descendants(p.pid)) >= 2 for p in procs):
+            return procs
+        time.sleep(0.05)
+    raise AssertionError("process trees did not start")
+
+
+def _reap(procs):
+    kill_process_trees([p.pid for p in procs if p.poll() is None], timeout=0)
+    for p in procs:
+        p.wait(timeout=10)
+
+
+@pytest.fixture
+def spawned():
+    procs = []
+    yield procs
+    _reap(procs)
+
+
+def _alive(pids):
+    alive = []
+    for pid in pids:
+        try:
+            if psutil.Process(pid).status() != psutil.STATUS_ZOMBIE:
+                alive.append(pid)
+        except psutil.NoSuchProcess:
+            pass
+    return alive
+
+
+class TestSnapshot:
+    def test_descendants_include_grandchildren(self, spawned):
+        spawned += _spawn([NESTED_TREE])
+        root = spawned[0].pid
+        snapshot = ProcessSnapshot.capture(with_cmdline=True)
+
+        descendants = snapshot.descendants(root)
+        assert len(descendants) == 3
+        grandchildren = [pid for child in snapshot.children(root) for pid in snapshot.children(child)]
+        assert len(grandchildren) == 1 and grandchildren[0] in descendants
+        assert snapshot.processes[root].cmdline == ["sh", "-c", NESTED_TREE, "tree"]
+        assert snapshot.processes[root].ppid == os.getpid()
+
+
+class TestBatchKill:
+    def test_trees_stop_together(self, spawned):
+        spawned += _spawn([TREE, TREE, NESTED_TREE, STUBBORN_TREE])
+        snapshot = ProcessSnapshot.capture()
+        everything = [pid for p in spawned for pid in [p.pid, *snapshot.descendants(p.pid)]]
+
+        start = time.monotonic()
+        result = kill_process_trees([p.pid for p in spawned], timeout=0.5, snapshot=snapshot)
+        elapsed = time.monotonic() - start
+
+        assert result.roots == 4
+        assert result.processes_found == len(everything) == 13
+        assert result.killed == 3  # The stubborn shell and its two children
+        assert result.terminated == 10
+        assert result.survivors == []
+        assert _alive(everything) == []
+        assert 0.5 <= elapsed < 0.5 + process_utils.KILL_WAIT_SECONDS
+
+    def test_psutil_fallback_without_pidfd(self, spawned, monkeypatch):
+        monkeypatch.setattr(process_utils, "PIDFD_AVAILABLE", False)
+        spawned += _spawn([TREE, STUBBORN_TREE])
+        snapshot = ProcessSnapshot.capture()
+        everything = [pid for p in spawned for pid in [p.pid, *snapshot.descendants(p.pid)]]
+
+        result = kill_process_trees([p.pid for p in spawned], timeout=0.3, snapshot=snapshot)
+        assert (result.terminated, result.killed, result.survivors) == (3, 3, [])
+        assert _alive(everything) == []
+
+    def test_single_tree_statistics(self, spawned):
+        spawned += _spawn([TREE, STUBBORN_TREE])
+        graceful, stubborn = spawned
+
+        result = kill_process_tree(graceful, timeout=2)
+        assert (result.status, result.children_found, result.children_terminated) == ("success", 2, 2)
+        assert graceful.returncode is not None
+
+        result = kill_process_tree(stubborn, timeout=0.2)
+        assert result.status == "partial"
+        assert result.children_killed == 2 and result.parent_forcekilled
+        # The shell may exit by itself once its children are killed
+        assert stubborn.returncode in (0, -9)
+
+    def test_reused_pid_and_own_process_are_skipped(self, spawned):
+        spawned += _spawn([TREE])
+        root = spawned[0].pid
+        real = ProcessSnapshot.capture()
+
+        # Same PIDs, different start time: as if they had been reused
+        stale = ProcessSnapshot({
+            pid: ProcessInfo(pid, info.ppid, info.start_time - 1)
+            for pid, info in real.processes.items()
+        })
+        result = kill_process_trees([root], timeout=0.1, snapshot=stale)
+        assert result.killed == 0 and result.terminated == 3
+        assert len(_alive([root, *real.descendants(root)])) == 3
+
+        own = ProcessSnapshot({os.getpid(): real.processes[os.getpid()]})
+        assert kill_process_trees([os.getpid()], snapshot=own).processes_found == 0
+
+
+class TestEmergencyRouter:
+    def test_finds_and_stops_agents_by_cmdline(self, spawned):
+        spawned += _spawn([TREE, TREE], argv0="coding_agent")
+        spawned += _spawn([TREE])
+        agents = {p.pid for p in spawned[:2]}
+
+        snapshot = ProcessSnapshot.capture(with_cmdline=True)
+        found = set(emergency.find_autocoder_pids(snapshot))
+        assert agents <= found and spawned[2].pid not in found
+        assert {p.pid for p in emergency.find_all_autocoder_processes(snapshot)} >= agents
+
+        stats = emergency.kill_process_tree_batch(sorted(agents), timeout=2, snapshot=snapshot)
+        assert stats == {"terminated_count": 6, "force_killed_count": 0, "total_count": 6}
+        for p in spawned[:2]:
+            assert p.wait(timeout=5) is not None
+        assert spawned[2].poll() is None
+
+
+def _sequential_kill(proc, timeout):
+    """The previous kill_process_tree: walk, stop and wait on one tree at a time."""
+    children = psutil.Process(proc.pid).children(recursive=True)
+    for child in children:
+        child.terminate()
+    _, still_alive = psutil.wait_procs(children, timeout=timeout)
+    for child in still_alive:
+        child.kill()
+    proc.terminate()
+    try:
+        proc.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+
+
+def test_emergency_stop_benchmark(spawned):
+    trees, stubborn, timeout = 200, 4, 0.5
+    scripts = [STUBBORN_TREE if i % (trees // stubborn) == 0 else TREE for i in range(trees)]
+
+    spawned += _spawn(scripts)
+    start = time.monotonic()
+    for proc in spawned:
+        _sequential_kill(proc, timeout)
+    sequential = time.monotonic() - start
+    spawned.clear()
+
+    spawned += _spawn(scripts)
+    snapshot = ProcessSnapshot.capture()
+    pids = [pid for p in spawned for pid in [p.pid, *snapshot.descendants(p.pid)]]
+    start = time.monotonic()
+    result = kill_process_trees([p.pid for p in spawned], timeout=timeout)
+    batch = time.monotonic() - start
+
+    mode = "pidfd" if process_utils.PIDFD_AVAILABLE else "psutil"
+    print(
+        f"\n{trees} trees / {len(pids)} processes ({stubborn} trees ignoring SIGTERM, {timeout}s timeout): "
+        f"one tree at a time {sequential:.2f} s, batch ({mode}) {batch:.2f} s ({sequential / batch:.1f}x)"
+    )
+
+    assert result.processes_found == len(pids) == trees * 3
+    assert result.killed == stubborn * 3 and result.survivors == []
+    assert _alive(pids) == []
+    assert sequential >= stubborn * timeout
+    assert batch < timeout + process_utils.KILL_WAIT_SECONDS + 2
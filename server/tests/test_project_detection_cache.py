@@ -0,0 +1,204 @@
+"""
+Unit tests for cached project type and dev command detection.
+
+Verifies that:
+1. Each project type is still detected by the same rules
+2. Repeated detection, dev command and config calls read no files once warm
+3. The cache is invalidated exactly by changes to the marker files the
+   detection consulted, and not by others
+4. Config dicts handed to callers are copies of the cached one
+
+The benchmark runs detection, and config plus dev command lookups, over
+100 projects cold and warm and reports the time and files opened per pass.
+"""
+
+import builtins
+import json
+import os
+import time
+
+import pytest
+
+import registry
+from server.services import project_config
+from server.services.project_config import (
+    clear_project_config_cache,
+    detect_project_type,
+    get_dev_command,
+    get_project_config,
+    set_dev_command,
+)
+
+PROJECT_FILES = {
+    "nodejs-vite": {"package.json": json.dumps({"scripts": {"dev": "vite"}})},
+    "nodejs-cra": {"package.json": json.dumps({"scripts": {"start": "react-scripts start"}})},
+    "python-poetry": {"pyproject.toml": "[tool.poetry]\nname = 'app'\n"},
+    "python-django": {"manage.py": ""},
+    "python-fastapi": {"requirements.txt": "fastapi\n", "main.py": ""},
+    "rust": {"Cargo.toml": "[package]\n"},
+    "go": {"go.mod": "module app\n"},
+}
+
+
+@pytest.fixture(autouse=True)
+def home(tmp_path, monkeypatch):
+    home = tmp_path / "home"
+    home.mkdir()
+    monkeypatch.setenv("HOME", str(home))
+    monkeypatch.setenv("USERPROFILE", str(home))
+    for attr in ("_engine", "_SessionLocal"):
+        monkeypatch.setattr(registry, attr, None)
+    monkeypatch.setattr(project_config, "_ports_seeded", False)
+    clear_project_config_cache()
+    yield home
+    if registry._engine is not None:
+        registry._engine.dispose()
+    clear_project_config_cache()
+
+
+@pytest.fixture
+def opened(monkeypatch):
+    """Files opened by project_config."""
+    paths = []
+
+    def counting_open(file, *args, **kwargs):
+        paths.append(file)
+        return builtins.open(file, *args, **kwargs)
+
+    monkeypatch.setattr(project_config, "open", counting_open, raising=False)
+    return paths
+
+
+def _project(tmp_path, name, files):
+    project = tmp_path / name
+    project.mkdir()
+    for filename, content in files.items():
+        (project / filename).write_text(content)
+    return project
+
+
+def _touch(path, content):
+    """Rewrite a file and move its mtime on, whatever the timestamp resolution."""
+    path.write_text(content)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+class TestDetection:
+    @pytest.mark.parametrize("project_type", sorted(PROJECT_FILES))
+    def test_project_types(self, tmp_path, project_type):
+        project = _project(tmp_path, project_type, PROJECT_FILES[project_type])
+        assert detect_project_type(project) == project_type
+        assert detect_project_type(project) == project_type
+
+    def test_unknown_and_missing_projects(self, tmp_path):
+        assert detect_project_type(_project(tmp_path, "empty", {})) is None
+        assert detect_project_type(tmp_path / "missing") is None
+        pyproject = _project(tmp_path, "plain", {"pyproject.toml": "[project]\nname = 'x'\n"})
+        assert detect_project_type(pyproject) is None
+
+
+class TestWarmCalls:
+    def test_no_files_read_after_warm_up(self, tmp_path, opened):
+        project = _project(tmp_path, "app", PROJECT_FILES["nodejs-vite"])
+        set_dev_command(project, "npm run dev")
+        get_project_config(project)
+        get_dev_command(project)
+
+        opened.clear()
+        for _ in range(20):
+            config = get_project_config(project)
+            assert get_dev_command(project) == "npm run dev"
+            assert detect_project_type(project) == "nodejs-vite"
+        assert opened == []
+        assert config["detected_command"].startswith("npm run dev -- --port ")
+
+    def test_config_copies_are_independent(self, tmp_path):
+        project = _project(tmp_path, "app", {})
+        set_dev_command(project, "make run")
+        project_config._load_config(project)["dev_command"] = "changed"
+        assert get_dev_command(project) == "make run"
+
+
+class TestInvalidation:
+    def test_consulted_marker_change_redetects(self, tmp_path):
+        project = _project(tmp_path, "app", PROJECT_FILES["nodejs-vite"])
+        assert detect_project_type(project) == "nodejs-vite"
+
+        _touch(project / "package.json", json.dumps({"scripts": {"start": "node ."}}))
+        assert detect_project_type(project) == "nodejs-cra"
+
+        (project / "package.json").unlink()
+        assert detect_project_type(project) is None
+
+    def test_new_marker_that_was_checked_redetects(self, tmp_path):
+        project = _project(tmp_path, "app", PROJECT_FILES["go"])
+        assert detect_project_type(project) == "go"
+
+        (project / "manage.py").write_text("")
+        assert detect_project_type(project) == "python-django"
+
+    def test_unconsulted_marker_keeps_cache(self, tmp_path, monkeypatch):
+        project = _project(tmp_path, "app", PROJECT_FILES["nodejs-vite"])
+        assert detect_project_type(project) == "nodejs-vite"
+
+        runs = []
+        real_detect = project_config._detect_project_type
+        monkeypatch.setattr(
+            project_config, "_detect_project_type",
+            lambda path, probe: runs.append(path) or real_detect(path, probe),
+        )
+
+        # package.json decided the type, so go.mod is never looked at
+        (project / "go.mod").write_text("module app\n")
+        assert detect_project_type(project) == "nodejs-vite"
+        assert runs == []
+
+        _touch(project / "package.json", json.dumps({"scripts": {"dev": "vite --host"}}))
+        assert detect_project_type(project) == "nodejs-vite"
+        assert len(runs) == 1
+
+    def test_config_edit_is_picked_up(self, tmp_path):
+        project = _project(tmp_path, "app", {})
+        set_dev_command(project, "make run")
+        assert get_dev_command(project) == "make run"
+
+        config_path = project / ".autoforge" / "config.json"
+        _touch(config_path, json.dumps({"dev_command": "make serve"}))
+        assert get_dev_command(project) == "make serve"
+
+
+def test_detection_benchmark(tmp_path, opened):
+    kinds = sorted(PROJECT_FILES)
+    projects = [
+        _project(tmp_path, f"proj{i}", PROJECT_FILES[kinds[i % len(kinds)]]) for i in range(100)
+    ]
+    for project in projects:
+        get_project_config(project)  # Assign ports up front
+
+    def run_pass(call):
+        opened.clear()
+        start = time.perf_counter()
+        for project in projects:
+            call(project)
+        return (time.perf_counter() - start) * 1000, len(opened)
+
+    def config_and_command(project):
+        get_project_config(project)
+        get_dev_command(project)
+
+    clear_project_config_cache()
+    detect_cold_ms, detect_cold_opens = run_pass(detect_project_type)
+    detect_warm_ms, detect_warm_opens = run_pass(detect_project_type)
+
+    clear_project_config_cache()
+    cold_ms, cold_opens = run_pass(config_and_command)
+    warm_ms, warm_opens = run_pass(config_and_command)
+
+    print(
+        f"\n100 projects: detect_project_type cold {detect_cold_ms:.1f} ms, warm {detect_warm_ms:.1f} ms "
+        f"({detect_cold_opens} -> {detect_warm_opens} files opened) | config + dev command cold {cold_ms:.1f} ms "
+        f"({cold_opens} files opened), warm {warm_ms:.1f} ms ({warm_opens} files opened)"
+    )
+    assert detect_cold_opens > 0 and detect_warm_opens == 0
+    assert cold_opens >= 100 and warm_opens == 0
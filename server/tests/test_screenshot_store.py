@@ -0,0 +1,187 @@
+"""
+Unit tests for the disk-backed screenshot store behind the messages router.
+
+Verifies that:
+1. Uploads are decoded once into content-addressed files with a thumbnail
+2. Identical uploads share one file, which is deleted with its last entry
+3. The list endpoint returns metadata and URLs only
+4. Image bytes are served with a content ETag, 304 revalidation and ranges
+5. Invalid and oversized uploads are rejected
+
+The benchmark uploads a burst of large screenshots and reports server RSS
+growth and the list payload size against the inline base64 images.
+"""
+
+import base64
+import gc
+import io
+import json
+import os
+
+import psutil
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from PIL import Image
+
+from server.routers import messages
+from server.services import screenshot_store
+
+
+def _png(width=640, height=400, seed=0, noise=False):
+    if noise:
+        image = Image.frombytes("RGB", (width, height), os.urandom(width * height * 3))
+    else:
+        image = Image.new("RGB", (width, height), (seed % 256, 120, 200))
+    out = io.BytesIO()
+    image.save(out, "PNG")
+    return out.getvalue()
+
+
+def _data_url(data, content_type="image/png"):
+    return f"data:{content_type};base64,{base64.b64encode(data).decode()}"
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    project_dir = tmp_path / "proj"
+    project_dir.mkdir()
+    monkeypatch.setattr(messages, "registry_get_project_path", lambda name: project_dir)
+    monkeypatch.setattr(messages, "message_store", messages.MessageStore())
+
+    app = FastAPI()
+    app.include_router(messages.router)
+    return TestClient(app), project_dir
+
+
+def _upload(client, data, **extra):
+    return client.post(
+        "/api/projects/proj/screenshots",
+        json={"image": _data_url(data), "timestamp": "2026-01-01T00:00:00", **extra},
+    )
+
+
+def _objects(project_dir):
+    return sorted(p for p in (project_dir / ".autoforge" / "screenshots" / "objects").rglob("*") if p.is_file())
+
+
+class TestScreenshotUpload:
+    def test_upload_stores_file_and_thumbnail(self, client):
+        client, project_dir = client
+        data = _png(1600, 1000)
+        response = _upload(client, data, url="http://localhost:3000", title="Home")
+        assert response.status_code == 200
+        body = response.json()
+        assert body["image_url"].endswith(f"/screenshots/{body['id']}/image")
+
+        (path,) = _objects(project_dir)
+        assert path.read_bytes() == data
+
+        meta = client.get(f"/api/projects/proj/screenshots/{body['id']}").json()
+        assert (meta["width"], meta["height"], meta["size"]) == (1600, 1000, len(data))
+        assert "image" not in meta
+
+        thumb = client.get(body["thumbnail_url"])
+        assert thumb.headers["content-type"] == "image/jpeg"
+        with Image.open(io.BytesIO(thumb.content)) as image:
+            assert max(image.size) <= max(screenshot_store.THUMBNAIL_SIZE)
+
+    def test_identical_uploads_share_a_file_until_evicted(self, client):
+        client, project_dir = client
+        shared = _png(seed=1)
+        first = _upload(client, shared).json()
+        _upload(client, shared)
+        assert len(_objects(project_dir)) == 1
+
+        # Push both copies out of the 20-entry window
+        for i in range(20):
+            _upload(client, _png(seed=10 + i))
+        ids = [s["id"] for s in client.get("/api/projects/proj/screenshots").json()]
+        assert first["id"] not in ids and len(ids) == 20
+        assert len(_objects(project_dir)) == 20
+        assert client.get(first["image_url"]).status_code == 404
+
+    def test_invalid_uploads_are_rejected(self, client, monkeypatch):
+        client, _ = client
+        assert client.post("/api/projects/proj/screenshots", json={
+            "image": "not a data url", "timestamp": "t"}).status_code == 400
+        assert client.post("/api/projects/proj/screenshots", json={
+            "image": "data:image/png;base64,@@@@", "timestamp": "t"}).status_code == 400
+        assert client.post("/api/projects/proj/screenshots", json={
+            "image": _data_url(b"<svg/>", "image/svg+xml"), "timestamp": "t"}).status_code == 400
+
+        monkeypatch.setattr(screenshot_store, "MAX_IMAGE_BYTES", 1000)
+        assert _upload(client, _png(noise=True)).status_code == 413
+
+    def test_leftover_files_are_removed_on_open(self, tmp_path):
+        root = tmp_path / "screenshots"
+        stale = root / "objects" / "ab" / "abc.png"
+        stale.parent.mkdir(parents=True)
+        stale.write_bytes(b"x")
+        screenshot_store.ScreenshotStore(root)
+        assert not stale.exists()
+
+
+class TestScreenshotServing:
+    def test_etag_and_revalidation(self, client):
+        client, _ = client
+        data = _png(seed=3)
+        body = _upload(client, data).json()
+
+        response = client.get(body["image_url"])
+        assert response.status_code == 200 and response.content == data
+        etag = response.headers["etag"]
+        assert response.headers["content-type"] == "image/png"
+
+        assert client.get(body["image_url"], headers={"If-None-Match": etag}).status_code == 304
+        assert client.get(body["image_url"], headers={"If-None-Match": '"other"'}).status_code == 200
+
+    def test_range_requests(self, client):
+        client, _ = client
+        data = _png(noise=True)
+        body = _upload(client, data).json()
+
+        response = client.get(body["image_url"], headers={"Range": "bytes=100-199"})
+        assert response.status_code == 206
+        assert response.content == data[100:200]
+        assert response.headers["content-range"] == f"bytes 100-199/{len(data)}"
+
+        etag = client.get(body["image_url"]).headers["etag"]
+        resumed = client.get(body["image_url"], headers={"Range": "bytes=-50", "If-Range": etag})
+        assert resumed.status_code == 206 and resumed.content == data[-50:]
+
+
+def test_upload_burst_benchmark(client):
+    client, project_dir = client
+    process = psutil.Process()
+
+    # ~4 MB PNGs (incompressible noise), 5.3 MB as base64
+    images = [_png(1200, 1200, noise=True) for _ in range(4)]
+    data_url_bytes = 0
+
+    _upload(client, _png(seed=99))
+    gc.collect()
+    rss_before = process.memory_info().rss
+
+    for i in range(40):
+        data = images[i % 4][:-12] + i.to_bytes(4, "big") + images[i % 4][-8:]  # Distinct content
+        data_url_bytes += len(_data_url(data))
+        assert _upload(client, data).status_code == 200
+
+    gc.collect()
+    rss_growth_mb = (process.memory_info().rss - rss_before) / (1024 * 1024)
+
+    listing = client.get("/api/projects/proj/screenshots")
+    list_bytes = len(listing.content)
+    retained = json.loads(listing.content)
+    inline_bytes = data_url_bytes * len(retained) // 40
+
+    print(
+        f"\n40 uploads ({data_url_bytes / (1024 * 1024):.0f} MB of base64): RSS growth {rss_growth_mb:.1f} MB | "
+        f"list payload {list_bytes / 1024:.1f} KB vs {inline_bytes / (1024 * 1024):.0f} MB inline "
+        f"({inline_bytes // list_bytes}x smaller)"
+    )
+
+    assert len(retained) == 20 and len(_objects(project_dir)) == 20
+    assert rss_growth_mb < 60  # Holding 20 images in memory would be ~100 MB
+    assert list_bytes * 1000 < inline_bytes
@@ -0,0 +1,227 @@
+"""
+Cgroup Limits - Live Resource Limit Writer
+==========================================
+
+Applies CPU, memory and process limits to a running service by writing its
+cgroup v2 control files directly. Limits change in place, so the service
+(and the agents and WebSocket sessions it hosts) keeps running.
+
+Limits use the same units as the systemd unit file:
+- cpu_quota: percent of one core (200 = 2 cores)    -> cpu.max
+- memory_max: GB                                    -> memory.max, memory.high
+- tasks_max: process count                          -> pids.max
+
+memory.high is set to MEMORY_HIGH_RATIO of memory.max so the kernel
+throttles and reclaims before the hard limit triggers the OOM killer.
+"""
+
+import mmap
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+PROC_SELF_CGROUP = Path("/proc/self/cgroup")
+
+CPU_PERIOD_USEC = 100_000
+MEMORY_HIGH_RATIO = 0.9
+GB = 1024**3
+
+
+class CgroupLimitError(Exception):
+    """Raised when limits cannot be applied; the cgroup is left as it was."""
+
+
+def find_service_cgroup(
+    service_name: str,
+    cgroup_root: Path = CGROUP_ROOT,
+    proc_cgroup: Path = PROC_SELF_CGROUP
+) -> Optional[Path]:
+    """
+    Find the cgroup v2 directory of a systemd service.
+
+    Checks the current process's own cgroup first (the server normally runs
+    inside the service), then searches the hierarchy.
+
+    Args:
+        service_name: Unit name, e.g. "autocoder-ui.service"
+        cgroup_root: Mount point of the cgroup v2 hierarchy
+        proc_cgroup: The /proc/<pid>/cgroup file to check first
+
+    Returns:
+        Path to the service cgroup, or None if not found
+    """
+    try:
+        for line in proc_cgroup.read_text().splitlines():
+            hierarchy, _, path = line.split(":", 2)
+            if hierarchy != "0":
+                continue
+            parts = Path(path.lstrip("/")).parts
+            if service_name in parts:
+                candidate = cgroup_root.joinpath(*parts[:parts.index(service_name) + 1])
+                if candidate.is_dir():
+                    return candidate
+    except (OSError, ValueError):
+        pass
+
+    try:
+        for candidate in cgroup_root.rglob(service_name):
+            if candidate.is_dir():
+                return candidate
+    except OSError:
+        pass
+
+    return None
+
+
+def _page_align(value: int) -> int:
+    """The kernel rounds memory limits down to a whole number of pages."""
+    return value // mmap.PAGESIZE * mmap.PAGESIZE
+
+
+class CgroupLimits:
+    """
+    Reads and writes resource limits of one cgroup v2 directory.
+    """
+
+    def __init__(self, cgroup_path: Path):
+        """
+        Initialize for a cgroup directory
+
+        Args:
+            cgroup_path: Path to the cgroup (e.g. .../autocoder-ui.service)
+        """
+        self.cgroup_path = Path(cgroup_path)
+
+    def _read(self, name: str) -> Optional[str]:
+        try:
+            return (self.cgroup_path / name).read_text().strip()
+        except OSError:
+            return None
+
+    def _write(self, name: str, value: str) -> None:
+        # Control files must be written in a single write() call
+        with open(self.cgroup_path / name, "w") as f:
+            f.write(value)
+
+    def read_limits(self) -> Dict[str, Optional[int]]:
+        """
+        Read the current limits.
+
+        Returns:
+            Dict with cpu_quota, memory_max and tasks_max; a value is None
+            when the limit is unset ("max") or the controller is unavailable
+        """
+        limits: Dict[str, Optional[int]] = {"cpu_quota": None, "memory_max": None, "tasks_max": None}
+
+        cpu_max = self._read("cpu.max")
+        if cpu_max:
+            quota, _, period = cpu_max.partition(" ")
+            if quota != "max":
+                limits["cpu_quota"] = round(int(quota) * 100 / int(period or CPU_PERIOD_USEC))
+
+        memory_max = self._read("memory.max")
+        if memory_max and memory_max != "max":
+            limits["memory_max"] = round(int(memory_max) / GB)
+
+        pids_max = self._read("pids.max")
+        if pids_max and pids_max != "max":
+            limits["tasks_max"] = int(pids_max)
+
+        return limits
+
+    def plan(self, limits: dict) -> List[Tuple[str, str]]:
+        """
+        Translate limits into (control file, value) writes, in write order.
+
+        When memory shrinks, memory.high is lowered first so the kernel can
+        reclaim gradually before the hard limit moves; when it grows,
+        memory.max is raised first.
+        """
+        memory_bytes = limits["memory_max"] * GB
+        memory_high = _page_align(int(memory_bytes * MEMORY_HIGH_RATIO))
+        cpu_quota_usec = limits["cpu_quota"] * CPU_PERIOD_USEC // 100
+
+        current_max = self._read("memory.max")
+        growing = current_max == "max" or current_max is None or memory_bytes >= int(current_max)
+        memory_writes = [("memory.max", str(memory_bytes)), ("memory.high", str(memory_high))]
+        if not growing:
+            memory_writes.reverse()
+
+        return [
+            ("cpu.max", f"{cpu_quota_usec} {CPU_PERIOD_USEC}"),
+            ("pids.max", str(limits["tasks_max"])),
+            *memory_writes,
+        ]
+
+    def check(self, limits: dict) -> None:
+        """
+        Refuse limits below current usage.
+
+        Lowering memory.max under memory.current would invoke the OOM killer
+        on running agents, and pids.max under pids.current blocks every fork.
+
+        Raises:
+            CgroupLimitError: If a limit is below current usage
+        """
+        memory_current = self._read("memory.current")
+        if memory_current and int(memory_current) > limits["memory_max"] * GB:
+            raise CgroupLimitError(
+                f"memory_max {limits['memory_max']}G is below current usage "
+                f"{int(memory_current) / GB:.1f}G"
+            )
+
+        pids_current = self._read("pids.current")
+        if pids_current and int(pids_current) > limits["tasks_max"]:
+            raise CgroupLimitError(
+                f"tasks_max {limits['tasks_max']} is below current process count {pids_current}"
+            )
+
+    def apply(self, limits: dict) -> Dict[str, str]:
+        """
+        Apply new limits to the running cgroup.
+
+        Each control file is written, then read back to confirm the kernel
+        accepted the value. If any write or check fails, every file already
+        changed is restored to its previous value.
+
+        Args:
+            limits: Dict with cpu_quota, memory_max and tasks_max
+
+        Returns:
+            Previous raw value of each control file
+
+        Raises:
+            CgroupLimitError: If the limits could not be applied (after rollback)
+        """
+        self.check(limits)
+
+        writes = self.plan(limits)
+        previous = {}
+        for name, _ in writes:
+            value = self._read(name)
+            if value is None:
+                raise CgroupLimitError(f"{self.cgroup_path / name} is not available")
+            previous[name] = value
+
+        written = []
+        try:
+            for name, value in writes:
+                written.append(name)
+                self._write(name, value)
+                actual = self._read(name)
+                if actual != value:
+                    raise CgroupLimitError(f"{name} reads back {actual!r}, expected {value!r}")
+        except (OSError, CgroupLimitError) as e:
+            rollback_errors = []
+            for name in reversed(written):
+                try:
+                    self._write(name, previous[name])
+                except OSError as rollback_error:
+                    rollback_errors.append(f"{name}: {rollback_error}")
+
+            message = f"Failed to apply limits to {self.cgroup_path}: {e}"
+            if rollback_errors:
+                message += f" (rollback failed for {', '.join(rollback_errors)})"
+            raise CgroupLimitError(message) from e
+
+        return previous
@@ -3,17 +3,41 @@ Process Utilities
 =================
 
 Shared utilities for process management across the codebase.
+
+Process trees are found from a single snapshot of the process table (read
+straight from /proc on Linux, via psutil elsewhere) with a parent -> children
+index, so any number of trees can be resolved without walking psutil per
+root. Every target is then signalled in one sweep and all are waited on
+together against one deadline. On Linux 5.3+ targets are held as pidfds,
+which cannot be confused with a process that later reuses the PID.
 """
 
 import logging
+import os
+import select
+import signal
 import subprocess
-from dataclasses import dataclass
-from typing import Literal
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Iterable, Literal
 
 import psutil
 
 logger = logging.getLogger(__name__)
 
+_PROC_AVAILABLE = sys.platform.startswith("linux") and os.path.isdir("/proc")
+PIDFD_AVAILABLE = (
+    _PROC_AVAILABLE and hasattr(os, "pidfd_open") and hasattr(signal, "pidfd_send_signal")
+)
+
+# Marker argument on agent pool server command lines, inherited by the
+# agents they fork (see agent_pool.py)
+POOL_MARKER = "--agent-pool"
+
+# How long to wait for processes to disappear after SIGKILL
+KILL_WAIT_SECONDS = 1.0
+
 
 @dataclass
 class KillResult:
@@ -37,6 +61,327 @@ class KillResult:
     parent_forcekilled: bool = False
 
 
+@dataclass
+class BatchKillResult:
+    """Result of killing several process trees at once.
+
+    Attributes:
+        roots: Number of root PIDs requested
+        processes_found: Processes in those trees that were signalled
+        terminated: Processes that exited after SIGTERM (or were already gone)
+        killed: Processes that required SIGKILL
+        survivors: PIDs still running after SIGKILL
+    """
+
+    roots: int
+    processes_found: int = 0
+    terminated: int = 0
+    killed: int = 0
+    survivors: list[int] = field(default_factory=list)
+
+
+@dataclass
+class ProcessInfo:
+    """One process in a ProcessSnapshot."""
+
+    pid: int
+    ppid: int
+    # Opaque start time used to detect PID reuse: clock ticks since boot
+    # from /proc on Linux, psutil create_time elsewhere
+    start_time: float
+    cmdline: list[str] | None = None
+
+
+def _read_proc_stat(pid: int) -> tuple[int, int] | None:
+    """(ppid, start time in ticks) from /proc/<pid>/stat, or None if gone."""
+    try:
+        with open(f"/proc/{pid}/stat", "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    # comm may contain spaces and parentheses: fields resume after the last ")"
+    fields = data[data.rindex(b")") + 2:].split()
+    return int(fields[1]), int(fields[19])
+
+
+def _read_proc_cmdline(pid: int) -> list[str] | None:
+    try:
+        with open(f"/proc/{pid}/cmdline", "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    return [arg.decode("utf-8", "replace") for arg in data.split(b"\0")[:-1]]
+
+
+def _start_time(pid: int) -> float | None:
+    """Current start time of a PID, in the units of ProcessInfo.start_time."""
+    if _PROC_AVAILABLE:
+        stat = _read_proc_stat(pid)
+        return stat[1] if stat else None
+    try:
+        return psutil.Process(pid).create_time()
+    except (psutil.NoSuchProcess, psutil.AccessDenied):
+        return None
+
+
+class ProcessSnapshot:
+    """Point-in-time view of the process table with a parent -> children index."""
+
+    def __init__(self, processes: dict[int, ProcessInfo]):
+        self.processes = processes
+        self._children: dict[int, list[int]] = {}
+        for info in processes.values():
+            if info.ppid != info.pid:
+                self._children.setdefault(info.ppid, []).append(info.pid)
+
+    @classmethod
+    def capture(cls, with_cmdline: bool = False) -> "ProcessSnapshot":
+        """Read every process once.
+
+        Args:
+            with_cmdline: Also read each process's command line
+
+        Returns:
+            The snapshot
+        """
+        processes: dict[int, ProcessInfo] = {}
+        if _PROC_AVAILABLE:
+            for entry in os.listdir("/proc"):
+                if not entry.isdigit():
+                    continue
+                pid = int(entry)
+                stat = _read_proc_stat(pid)
+                if stat is None:
+                    continue  # Exited while scanning
+                processes[pid] = ProcessInfo(
+                    pid=pid,
+                    ppid=stat[0],
+                    start_time=stat[1],
+                    cmdline=_read_proc_cmdline(pid) if with_cmdline else None,
+                )
+        else:
+            attrs = ["pid", "ppid", "create_time"] + (["cmdline"] if with_cmdline else [])
+            for proc in psutil.process_iter(attrs):
+                info = proc.info
+                processes[info["pid"]] = ProcessInfo(
+                    pid=info["pid"],
+                    ppid=info["ppid"] or 0,
+                    start_time=info["create_time"] or 0.0,
+                    cmdline=info.get("cmdline"),
+                )
+        return cls(processes)
+
+    def __contains__(self, pid: int) -> bool:
+        return pid in self.processes
+
+    def __len__(self) -> int:
+        return len(self.processes)
+
+    def children(self, pid: int) -> list[int]:
+        """Direct children of a process."""
+        return list(self._children.get(pid, ()))
+
+    def descendants(self, pid: int) -> list[int]:
+        """All descendants of a process, parents before their children."""
+        result: list[int] = []
+        seen = {pid}
+        queue = [pid]
+        while queue:
+            for child in self._children.get(queue.pop(0), ()):
+                if child not in seen:
+                    seen.add(child)
+                    result.append(child)
+                    queue.append(child)
+        return result
+
+
+class _Target:
+    """A process to stop, held by pidfd where available."""
+
+    def __init__(self, pid: int, pidfd: int | None = None, proc: psutil.Process | None = None):
+        self.pid = pid
+        self.pidfd = pidfd
+        self.proc = proc
+
+    @classmethod
+    def open(cls, info: ProcessInfo) -> "_Target | None":
+        """Take hold of a snapshotted process; None if it exited or the PID was reused."""
+        if PIDFD_AVAILABLE:
+            try:
+                pidfd = os.pidfd_open(info.pid)
+            except ProcessLookupError:
+                return None
+            except OSError:
+                pidfd = None  # e.g. ENOSYS on an older kernel
+            if pidfd is not None:
+                # Checked after opening: the pidfd now pins this exact process
+                if _start_time(info.pid) != info.start_time:
+                    os.close(pidfd)
+                    return None
+                return cls(info.pid, pidfd=pidfd)
+        try:
+            proc = psutil.Process(info.pid)
+            if _start_time(info.pid) != info.start_time:
+                return None
+        except psutil.NoSuchProcess:
+            return None
+        return cls(info.pid, proc=proc)
+
+    def send(self, sig: int) -> bool:
+        """Send SIGTERM or SIGKILL; False if the process is already gone."""
+        try:
+            if self.pidfd is not None:
+                signal.pidfd_send_signal(self.pidfd, sig)
+            elif sig == signal.SIGTERM:
+                self.proc.terminate()
+            else:
+                self.proc.kill()
+            return True
+        except (ProcessLookupError, psutil.NoSuchProcess):
+            return False
+        except (PermissionError, psutil.AccessDenied) as e:
+            logger.debug("Cannot signal PID %d: %s", self.pid, e)
+            return True
+
+    def close(self) -> None:
+        if self.pidfd is not None:
+            os.close(self.pidfd)
+            self.pidfd = None
+
+
+def _wait_all(targets: list[_Target], deadline: float) -> list[_Target]:
+    """Wait for targets to exit until a shared deadline; return those still alive."""
+    alive = [t for t in targets if t.pidfd is None]
+    pending = {t.pidfd: t for t in targets if t.pidfd is not None}
+
+    if pending:
+        poller = select.poll()
+        for fd in pending:
+            poller.register(fd, select.POLLIN)
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            # A pidfd becomes readable when its process exits
+            for fd, _ in poller.poll(remaining * 1000):
+                poller.unregister(fd)
+                pending.pop(fd, None)
+        alive.extend(pending.values())
+
+    procs = [t.proc for t in alive if t.pidfd is None]
+    while procs:
+        remaining = deadline - time.monotonic()
+        _, procs = psutil.wait_procs(procs, timeout=min(0.05, max(0.0, remaining)))
+        # Exited processes whose parent has not reaped them count as gone
+        procs = [p for p in procs if not _is_zombie(p)]
+        if remaining <= 0:
+            break
+    still_alive_pids = {p.pid for p in procs}
+    return [t for t in alive if t.pidfd is not None or t.pid in still_alive_pids]
+
+
+def _is_zombie(proc: psutil.Process) -> bool:
+    try:
+        return proc.status() == psutil.STATUS_ZOMBIE
+    except psutil.NoSuchProcess:
+        return True
+    except psutil.AccessDenied:
+        return False
+
+
+def _terminate_pids(
+    pids: Iterable[int], snapshot: ProcessSnapshot, timeout: float
+) -> dict[int, str]:
+    """
+    Stop a set of snapshotted processes together.
+
+    SIGTERM goes to every process in one sweep, then all are waited on
+    against one deadline; whatever remains gets SIGKILL.
+
+    Returns:
+        Outcome per PID: "gone" (exited before it was signalled),
+        "terminated", "killed" or "alive" (survived SIGKILL)
+    """
+    outcomes: dict[int, str] = {}
+    targets: list[_Target] = []
+    try:
+        for pid in pids:
+            target = _Target.open(snapshot.processes[pid])
+            if target is None:
+                outcomes[pid] = "gone"
+            else:
+                targets.append(target)
+
+        signalled = [t for t in targets if t.send(signal.SIGTERM)]
+        for target in targets:
+            outcomes[target.pid] = "terminated"
+
+        stubborn = _wait_all(signalled, time.monotonic() + timeout)
+        for target in stubborn:
+            if target.send(signal.SIGKILL):
+                outcomes[target.pid] = "killed"
+
+        for target in _wait_all(stubborn, time.monotonic() + KILL_WAIT_SECONDS):
+            outcomes[target.pid] = "alive"
+    finally:
+        for target in targets:
+            target.close()
+
+    return outcomes
+
+
+def kill_process_trees(
+    root_pids: Iterable[int],
+    timeout: float = 5.0,
+    snapshot: ProcessSnapshot | None = None,
+) -> BatchKillResult:
+    """Kill several process trees at once.
+
+    The trees are resolved from one process snapshot, every process in them
+    gets SIGTERM in a single sweep (children before their parents), and all
+    of them share one graceful-exit deadline before SIGKILL. Total time is
+    bounded by about ``timeout`` however many trees there are. The calling
+    process is never signalled.
+
+    Args:
+        root_pids: PIDs whose trees to kill; overlapping trees are fine
+        timeout: Seconds to wait for graceful termination before force-killing
+        snapshot: Process snapshot to use (default: take one now)
+
+    Returns:
+        BatchKillResult with statistics about the termination
+    """
+    roots = list(dict.fromkeys(root_pids))
+    result = BatchKillResult(roots=len(roots))
+    snapshot = snapshot or ProcessSnapshot.capture()
+    own_pid = os.getpid()
+
+    pids: dict[int, None] = {}
+    for root in roots:
+        if root not in snapshot:
+            continue
+        for pid in [*reversed(snapshot.descendants(root)), root]:
+            if pid != own_pid:
+                pids[pid] = None
+
+    outcomes = _terminate_pids(pids, snapshot, timeout)
+    for pid, outcome in outcomes.items():
+        if outcome in ("gone", "terminated"):
+            result.terminated += 1
+        else:
+            result.killed += 1
+            if outcome == "alive":
+                result.survivors.append(pid)
+    result.processes_found = len(outcomes)
+
+    logger.debug(
+        "Killed %d process trees: %d processes (%d terminated, %d force-killed, %d survived)",
+        result.roots, result.processes_found, result.terminated,
+        result.killed, len(result.survivors),
+    )
+    return result
+
+
 def kill_process_tree(proc: subprocess.Popen, timeout: float = 5.0) -> KillResult:
     """Kill a process and all its child processes.
 
@@ -54,9 +399,12 @@ def kill_process_tree(proc: subprocess.Popen, timeout: float = 5.0) -> KillResul
     result = KillResult(status="success", parent_pid=proc.pid)
 
     try:
-        parent = psutil.Process(proc.pid)
+        snapshot = ProcessSnapshot.capture()
+        if proc.pid not in snapshot:
+            raise psutil.NoSuchProcess(proc.pid)
+
         # Get all children recursively before terminating
-        children = parent.children(recursive=True)
+        children = snapshot.descendants(proc.pid)
         result.children_found = len(children)
 
         logger.debug(
@@ -64,50 +412,37 @@ def kill_process_tree(proc: subprocess.Popen, timeout: float = 5.0) -> KillResul
             proc.pid, len(children)
         )
 
-        # Terminate children first (graceful)
-        for child in children:
-            try:
-                logger.debug("Terminating child PID %d (%s)", child.pid, child.name())
-                child.terminate()
-            except (psutil.NoSuchProcess, psutil.AccessDenied) as e:
-                # NoSuchProcess: already dead
-                # AccessDenied: Windows can raise this for system processes or already-exited processes
-                logger.debug("Child PID %d already gone or inaccessible: %s", child.pid, e)
+        # Children and parent are signalled together (children first) and
+        # share one deadline
+        outcomes = _terminate_pids([*reversed(children), proc.pid], snapshot, timeout)
 
-        # Wait for children to terminate
-        gone, still_alive = psutil.wait_procs(children, timeout=timeout)
-        result.children_terminated = len(gone)
+        for child in children:
+            if outcomes.get(child) in ("gone", "terminated"):
+                result.children_terminated += 1
+            else:
+                result.children_killed += 1
 
         logger.debug(
-            "Children after graceful wait: %d terminated, %d still alive",
-            len(gone), len(still_alive)
+            "Children after graceful wait: %d terminated, %d force-killed",
+            result.children_terminated, result.children_killed
         )
 
-        # Force kill any remaining children
-        for child in still_alive:
-            try:
-                logger.debug("Force-killing child PID %d", child.pid)
-                child.kill()
-                result.children_killed += 1
-            except (psutil.NoSuchProcess, psutil.AccessDenied) as e:
-                logger.debug("Child PID %d gone during force-kill: %s", child.pid, e)
-
         if result.children_killed > 0:
             result.status = "partial"
 
-        # Now terminate the parent
-        logger.debug("Terminating parent PID %d", proc.pid)
-        proc.terminate()
-        try:
-            proc.wait(timeout=timeout)
-            logger.debug("Parent PID %d terminated gracefully", proc.pid)
-        except subprocess.TimeoutExpired:
-            logger.debug("Parent PID %d did not terminate, force-killing", proc.pid)
-            proc.kill()
-            proc.wait()
+        parent_outcome = outcomes.get(proc.pid)
+        if parent_outcome in ("killed", "alive"):
+            logger.debug("Parent PID %d did not terminate, force-killed", proc.pid)
             result.parent_forcekilled = True
             result.status = "partial"
 
+        # Reap the parent
+        try:
+            proc.wait(timeout=KILL_WAIT_SECONDS if parent_outcome == "alive" else timeout)
+        except subprocess.TimeoutExpired:
+            logger.debug("Parent PID %d survived SIGKILL", proc.pid)
+            result.status = "failure"
+
         logger.debug(
             "Process tree kill complete: status=%s, children=%d (terminated=%d, killed=%d)",
             result.status, result.children_found,
@@ -29,6 +29,7 @@ class ResourceMetrics:
     testing_agent_count: int = 0
     api_quota_remaining: int = 0
     features_pending: int = 0
+    quota_burn_rate: float = 0.0  # Prompts per hour
 
 
 class ResourceMonitor:
@@ -213,7 +214,8 @@ class ResourceMonitor:
                        agent_count: int = 0,
                        testing_agent_count: int = 0,
                        api_quota_remaining: int = 0,
-                       features_pending: int = 0) -> ResourceMetrics:
+                       features_pending: int = 0,
+                       quota_burn_rate: float = 0.0) -> ResourceMetrics:
         """
         Collect a complete snapshot of resource metrics.
 
@@ -222,6 +224,7 @@ class ResourceMonitor:
             testing_agent_count: Current number of testing agents running
             api_quota_remaining: Remaining API quota prompts
             features_pending: Number of features pending
+            quota_burn_rate: Recent API usage in prompts per hour
 
         Returns:
             ResourceMetrics snapshot
@@ -240,6 +243,7 @@ class ResourceMonitor:
             testing_agent_count=testing_agent_count,
             api_quota_remaining=api_quota_remaining,
             features_pending=features_pending,
+            quota_burn_rate=quota_burn_rate,
         )
 
     def get_system_totals(self) -> dict:
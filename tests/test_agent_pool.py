@@ -0,0 +1,317 @@
+"""
+Unit tests for the warm agent process pool.
+
+Verifies that:
+1. Pooled agents behave like Popen children: output pipe, exit status,
+   termination and process tree cleanup
+2. Every assignment runs in a fresh process with its own environment and
+   working directory, and module state does not carry over
+3. A server is replaced after max_tasks forks and drains its running agents
+4. Pool servers are not counted as agents, their forked agents are
+5. The orchestrator falls back to Popen when the pool cannot take an
+   assignment
+
+The benchmark starts a stub agent that imports the agent's database stack
+and prints its first action, with a fresh Popen per assignment (the
+previous behaviour) and through the pool, and reports the median
+time-to-first-action of each.
+"""
+import os
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from types import SimpleNamespace
+
+import psutil
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import agent_pool
+from agent_pool import AgentPool, AgentPoolError, PooledProcess
+
+pytestmark = pytest.mark.skipif(not agent_pool.FORK_AVAILABLE, reason="needs fork and Unix sockets")
+
+ROOT = Path(__file__).parent.parent.resolve()
+
+# Stand-in for autonomous_agent_demo.py: same imports as the agent's
+# database layer, then the first thing an agent does
+STUB_AGENT = f"""
+import os, sys, time
+sys.path.insert(0, {str(ROOT)!r})
+import api.database
+import sqlalchemy
+
+previous = getattr(api.database, "_stub_task", None)
+api.database._stub_task = os.environ.get("TASK")
+print("first action", os.environ.get("TASK"), os.getcwd(), previous, sys.argv[1:], flush=True)
+
+mode = os.environ.get("MODE", "exit")
+if mode == "tree":
+    import subprocess
+    subprocess.Popen(["sleep", "60"])
+    print("child started", flush=True)
+    time.sleep(60)
+elif mode == "sleep":
+    time.sleep(60)
+elif mode == "env":
+    print("SERVER_ONLY", os.environ.get("SERVER_ONLY"), flush=True)
+elif mode == "raise":
+    raise RuntimeError("agent failed")
+sys.exit(int(os.environ.get("RC", "0")))
+"""
+
+PRELOAD = ("api.database", "sqlalchemy")
+
+
+@pytest.fixture
+def stub(tmp_path):
+    path = tmp_path / "stub_agent.py"
+    path.write_text(STUB_AGENT)
+    return path
+
+
+@pytest.fixture
+def pool(stub):
+    pools = []
+
+    def make(**kwargs):
+        created = AgentPool(stub, preload=PRELOAD, **kwargs)
+        pools.append(created)
+        return created
+
+    yield make
+    for created in pools:
+        created.close()
+
+
+def _cmd(stub, agent_type="coding", *args):
+    return [sys.executable, "-u", str(stub), "--agent-type", agent_type, *args]
+
+
+def _env(**values):
+    return {**os.environ, "PYTHONUNBUFFERED": "1", **values}
+
+
+def _first_line(proc):
+    return proc.stdout.readline().rstrip("\n")
+
+
+class TestPooledProcess:
+    def test_output_and_exit_status(self, pool, stub, tmp_path):
+        agents = pool()
+        proc = agents.spawn(_cmd(stub, "coding", "--feature-id", "7"), cwd=str(tmp_path), env=_env(TASK="a", RC="3"))
+
+        assert isinstance(proc, PooledProcess)
+        lines = proc.stdout.read().splitlines()
+        assert lines == [f"first action a {tmp_path} None ['--agent-type', 'coding', '--feature-id', '7']"]
+        assert proc.wait(timeout=10) == 3 and proc.poll() == 3
+
+        failing = agents.spawn(_cmd(stub), cwd=str(tmp_path), env=_env(MODE="raise"))
+        output = failing.stdout.read()
+        assert "RuntimeError: agent failed" in output
+        assert failing.wait(timeout=10) == 1
+
+    def test_terminate_and_kill_process_tree(self, pool, stub, tmp_path):
+        from server.utils.process_utils import kill_process_tree
+
+        agents = pool()
+        sleeper = agents.spawn(_cmd(stub), cwd=str(tmp_path), env=_env(MODE="tree"))
+        assert _first_line(sleeper).startswith("first action")
+        assert _first_line(sleeper) == "child started"
+        children = psutil.Process(sleeper.pid).children(recursive=True)
+        assert len(children) == 1
+
+        result = kill_process_tree(sleeper, timeout=2)
+        assert result.status == "success" and result.children_terminated == 1
+        assert sleeper.returncode == -15
+        assert not any(child.is_running() and child.status() != psutil.STATUS_ZOMBIE for child in children)
+
+        other = agents.spawn(_cmd(stub), cwd=str(tmp_path), env=_env(MODE="sleep"))
+        _first_line(other)
+        other.kill()
+        assert other.wait(timeout=10) == -9
+        other.kill()  # Already reaped: no signal is sent
+
+    def test_rejects_other_commands(self, pool, stub, tmp_path):
+        agents = pool()
+        with pytest.raises(AgentPoolError):
+            agents.spawn([sys.executable, "-u", str(tmp_path / "other.py")], cwd=str(tmp_path), env=_env())
+        with pytest.raises(AgentPoolError):
+            agents.spawn([sys.executable, str(stub)], cwd=str(tmp_path), env=_env())
+
+
+class TestIsolation:
+    def test_fresh_process_environment_and_cwd(self, pool, stub, tmp_path):
+        agents = pool()
+        seen = []
+        for task in range(4):
+            workdir = tmp_path / f"task{task}"
+            workdir.mkdir()
+            proc = agents.spawn(_cmd(stub), cwd=str(workdir), env=_env(TASK=str(task)))
+            seen.append((proc.pid, _first_line(proc)))
+            proc.wait(timeout=10)
+            proc.stdout.close()
+
+        assert len({pid for pid, _ in seen}) == 4
+        for task, (_, line) in enumerate(seen):
+            # The previous assignment's module state is not visible
+            assert line.startswith(f"first action {task} {tmp_path / f'task{task}'} None")
+
+    def test_environment_is_replaced_not_merged(self, stub, tmp_path, monkeypatch):
+        # Set when the server starts, absent from the assignment's environment
+        monkeypatch.setenv("SERVER_ONLY", "1")
+        agents = AgentPool(stub, preload=PRELOAD)
+        try:
+            env = {key: value for key, value in _env(MODE="env").items() if key != "SERVER_ONLY"}
+            proc = agents.spawn(_cmd(stub), cwd=str(tmp_path), env=env)
+            assert proc.stdout.read().splitlines()[-1] == "SERVER_ONLY None"
+            assert proc.wait(timeout=10) == 0
+        finally:
+            agents.close()
+
+
+class TestRecycling:
+    def test_server_replaced_after_max_tasks(self, pool, stub, tmp_path):
+        agents = pool(max_tasks=2)
+        sleeper = agents.spawn(_cmd(stub), cwd=str(tmp_path), env=_env(MODE="sleep"))
+        first_server = agents._servers["coding"]
+        procs = [agents.spawn(_cmd(stub), cwd=str(tmp_path), env=_env(TASK=str(i))) for i in range(2)]
+        for proc in procs:
+            assert proc.wait(timeout=10) == 0
+
+        assert agents.servers_started == 2
+        # The retired server keeps running until its last agent exits
+        assert first_server.retiring and first_server.process.poll() is None
+        _first_line(sleeper)
+        sleeper.terminate()
+        assert sleeper.wait(timeout=10) == -15
+        assert first_server.process.wait(timeout=10) == 0
+
+    def test_concurrent_assignments_across_retirements(self, pool, stub, tmp_path):
+        agents = pool(max_tasks=2)
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            procs = list(executor.map(
+                lambda task: agents.spawn(_cmd(stub), cwd=str(tmp_path), env=_env(RC=str(task))),
+                range(12),
+            ))
+        assert sorted(proc.wait(timeout=10) for proc in procs) == list(range(12))
+        assert len({proc.pid for proc in procs}) == 12
+
+    def test_lost_server_is_replaced(self, pool, stub, tmp_path):
+        agents = pool()
+        proc = agents.spawn(_cmd(stub), cwd=str(tmp_path), env=_env())
+        proc.wait(timeout=10)
+        server = agents._servers["coding"]
+        server.process.kill()
+        server.process.wait()
+
+        deadline = time.monotonic() + 10
+        while not server.lost and time.monotonic() < deadline:
+            time.sleep(0.01)
+        proc = agents.spawn(_cmd(stub), cwd=str(tmp_path), env=_env(RC="4"))
+        assert proc.wait(timeout=10) == 4
+        assert agents.servers_started == 2
+
+
+def test_agent_counts_skip_pool_servers(pool, stub, tmp_path):
+    from server.services.process_manager import AgentProcessManager
+
+    agents = pool()
+    procs = [
+        agents.spawn(_cmd(stub, agent_type), cwd=str(tmp_path), env=_env(MODE="sleep"))
+        for agent_type in ("coding", "coding", "testing")
+    ]
+    for proc in procs:
+        _first_line(proc)
+
+    manager = AgentProcessManager("proj", tmp_path, tmp_path)
+    manager.process = SimpleNamespace(pid=os.getpid())
+    manager._status = "running"
+    try:
+        assert manager.get_agent_counts() == {"coding": 2, "testing": 1}
+    finally:
+        for proc in procs:
+            proc.kill()
+            proc.wait(timeout=10)
+
+
+def test_orchestrator_falls_back_to_popen(pool, stub, tmp_path, monkeypatch):
+    import parallel_orchestrator
+    from parallel_orchestrator import ParallelOrchestrator
+
+    monkeypatch.setattr(parallel_orchestrator.debug_log, "log_file", tmp_path / "debug.log")
+    agents = pool()
+    orchestrator = SimpleNamespace(_agent_pool=agents)
+    popen_kwargs = {
+        "stdin": subprocess.DEVNULL,
+        "stdout": subprocess.PIPE,
+        "stderr": subprocess.STDOUT,
+        "text": True,
+        "cwd": str(tmp_path),
+        "env": _env(TASK="fallback"),
+    }
+
+    pooled = ParallelOrchestrator._start_agent_process(orchestrator, _cmd(stub), popen_kwargs)
+    assert isinstance(pooled, PooledProcess)
+    assert pooled.wait(timeout=10) == 0
+
+    # Not the pool's script: started with Popen instead
+    other = tmp_path / "other_agent.py"
+    other.write_text(STUB_AGENT)
+    fallback = ParallelOrchestrator._start_agent_process(orchestrator, _cmd(other), popen_kwargs)
+    assert isinstance(fallback, subprocess.Popen)
+    assert fallback.communicate(timeout=30)[0].startswith("first action fallback")
+    assert "using Popen" in (tmp_path / "debug.log").read_text()
+
+
+def test_imports_without_resource_module():
+    # `resource` does not exist on Windows; the server and orchestrator must still import.
+    # psutil's Linux backend needs it, so load psutil before hiding it
+    script = (
+        "import sys, psutil; sys.modules['resource'] = None; "
+        f"sys.path.insert(0, {str(ROOT)!r}); "
+        "import agent_pool, parallel_orchestrator, server.services.process_manager; "
+        "print(agent_pool.POOL_MARKER)"
+    )
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, cwd=ROOT, timeout=60)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.splitlines()[-1] == "--agent-pool"
+
+
+def test_time_to_first_action_benchmark(pool, stub, tmp_path):
+    assignments = 8
+    agents = pool()
+    agents.start(("coding",))
+    assert agents._servers["coding"].ready.wait(30)
+
+    def time_to_first_action(start_agent):
+        timings = []
+        for task in range(assignments):
+            start = time.perf_counter()
+            proc = start_agent(_cmd(stub), str(tmp_path), _env(TASK=str(task)))
+            line = _first_line(proc)
+            timings.append((time.perf_counter() - start) * 1000)
+            assert line.startswith(f"first action {task}")
+            assert proc.wait(timeout=30) == 0
+            proc.stdout.close()
+        return statistics.median(timings)
+
+    def popen(cmd, cwd, env):
+        return subprocess.Popen(
+            cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+            text=True, encoding="utf-8", errors="replace", cwd=cwd, env=env,
+        )
+
+    popen_ms = time_to_first_action(popen)
+    pooled_ms = time_to_first_action(lambda cmd, cwd, env: agents.spawn(cmd, cwd=cwd, env=env))
+
+    print(
+        f"\n{assignments} stub agent assignments, median time-to-first-action: "
+        f"Popen {popen_ms:.1f} ms, pool {pooled_ms:.1f} ms ({popen_ms / pooled_ms:.1f}x)"
+    )
+    assert pooled_ms < popen_ms
@@ -0,0 +1,101 @@
+"""
+Tests for cached, incremental API endpoint discovery.
+
+Verifies that the single-pass walk with the persisted route catalog finds
+exactly the same endpoints as a fresh scan, prunes excluded directories, and
+only re-parses route files that changed.
+"""
+import os
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from custom.uat_gateway.adapters.api.api_adapter import APIAdapter
+
+
+def _endpoint_set(result):
+    return {(e.method.value, e.path, e.file, e.line) for e in result.endpoints}
+
+
+def _make_project(root: Path, route_files: int = 20) -> None:
+    (root / "package.json").write_text('{"dependencies": {"express": "^4"}}')
+    (root / "routes").mkdir()
+    for i in range(route_files):
+        (root / "routes" / f"r{i}.js").write_text(
+            "const express = require('express');\n"
+            "const router = express.Router();\n"
+            f"router.get('/api/items{i}/:id', handler);\n"
+            f"router.post('/api/items{i}', handler);\n"
+        )
+    (root / "api").mkdir()
+    (root / "api" / "main.py").write_text(
+        "from fastapi import FastAPI\n"
+        "app = FastAPI()\n"
+        "@app.get('/api/health')\n"
+        "def health():\n"
+        "    return {}\n"
+    )
+    # Excluded trees must never contribute endpoints
+    for excluded in ("node_modules/lib", ".git/hooks", "build"):
+        (root / excluded).mkdir(parents=True)
+        (root / excluded / "server.js").write_text("app.get('/should/not/appear', h);\n")
+
+
+class TestIncrementalDiscovery:
+    def test_warm_run_matches_cold_run(self, tmp_path):
+        _make_project(tmp_path)
+
+        cold = APIAdapter().discover_endpoints(str(tmp_path))
+        warm_adapter = APIAdapter()
+        warm = warm_adapter.discover_endpoints(str(tmp_path))
+        uncached = APIAdapter(use_catalog=False).discover_endpoints(str(tmp_path))
+
+        assert _endpoint_set(cold) == _endpoint_set(warm) == _endpoint_set(uncached)
+        assert cold.files_scanned == warm.files_scanned
+        assert sorted(cold.frameworks_detected) == sorted(warm.frameworks_detected) == ["express", "fastapi"]
+        assert ("GET", "/api/health") in {(m, p) for m, p, _, _ in _endpoint_set(cold)}
+        assert len(cold.endpoints) == 41
+
+    def test_excluded_directories_are_pruned(self, tmp_path):
+        _make_project(tmp_path)
+
+        result = APIAdapter(use_catalog=False).discover_endpoints(str(tmp_path))
+
+        assert all("/should/not/appear" != e.path for e in result.endpoints)
+
+    def test_only_changed_files_are_reparsed(self, tmp_path, monkeypatch):
+        _make_project(tmp_path)
+        APIAdapter().discover_endpoints(str(tmp_path))
+
+        parsed = []
+        original = APIAdapter._extract_from_javascript
+
+        def tracking(self, js_file, *args, **kwargs):
+            parsed.append(js_file.name)
+            return original(self, js_file, *args, **kwargs)
+
+        monkeypatch.setattr(APIAdapter, "_extract_from_javascript", tracking)
+
+        APIAdapter().discover_endpoints(str(tmp_path))
+        assert parsed == []
+
+        changed = tmp_path / "routes" / "r3.js"
+        changed.write_text(changed.read_text() + "router.delete('/api/items3/:id', handler);\n")
+        stat = changed.stat()
+        os.utime(changed, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        result = APIAdapter().discover_endpoints(str(tmp_path))
+        assert parsed == ["r3.js"]
+        assert ("DELETE", "/api/items3/:id") in {(e.method.value, e.path) for e in result.endpoints}
+
+    def test_deleted_files_drop_out(self, tmp_path):
+        _make_project(tmp_path)
+        APIAdapter().discover_endpoints(str(tmp_path))
+
+        (tmp_path / "routes" / "r0.js").unlink()
+        result = APIAdapter().discover_endpoints(str(tmp_path))
+
+        assert not any(e.file.endswith("r0.js") for e in result.endpoints)
+        assert len(result.endpoints) == 39
@@ -0,0 +1,158 @@
+"""
+Tests for write-behind last_used tracking in APIKeyAuthenticator.
+
+Verifies that validating a key no longer rewrites api_keys.json per request,
+that pending timestamps are flushed on threshold, timer, close and exit
+(without the exit hook keeping authenticators alive), and that writes are
+atomic. The load test drives validation from a thread pool and compares
+file writes and p99 latency against write-through behaviour.
+"""
+import gc
+import json
+import sys
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from custom.uat_gateway.api_server import api_key_auth
+from custom.uat_gateway.api_server.api_key_auth import APIKeyAuthenticator
+
+
+def _make(tmp_path, **kwargs):
+    tmp_path.mkdir(exist_ok=True)
+    kwargs.setdefault("flush_interval", 0)
+    return APIKeyAuthenticator(storage_file=str(tmp_path / "api_keys.json"), **kwargs)
+
+
+def _stored_last_used(tmp_path):
+    data = json.loads((tmp_path / "api_keys.json").read_text())
+    return [k["last_used"] for k in data["api_keys"]]
+
+
+class TestWriteBehind:
+    def test_validation_does_not_write(self, tmp_path):
+        auth = _make(tmp_path)
+        key = auth.generate_api_key("ci")
+        saves = auth.saves
+
+        for _ in range(50):
+            assert auth.validate_api_key(key) is not None
+
+        assert auth.saves == saves
+        assert _stored_last_used(tmp_path) == [None]
+
+        auth.close()
+        assert auth.saves == saves + 1
+        assert _stored_last_used(tmp_path)[0] is not None
+
+    def test_threshold_forces_flush(self, tmp_path):
+        auth = _make(tmp_path, flush_threshold=10)
+        key = auth.generate_api_key("ci")
+        saves = auth.saves
+
+        for _ in range(25):
+            auth.validate_api_key(key)
+
+        assert auth.saves == saves + 2
+        auth.close()
+
+    def test_timer_flushes(self, tmp_path):
+        auth = _make(tmp_path, flush_interval=0.05)
+        key = auth.generate_api_key("ci")
+        auth.validate_api_key(key)
+
+        deadline = time.monotonic() + 2
+        while _stored_last_used(tmp_path) == [None] and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert _stored_last_used(tmp_path)[0] is not None
+        auth.close()
+
+    def test_reload_sees_flushed_timestamps(self, tmp_path):
+        auth = _make(tmp_path)
+        key = auth.generate_api_key("ci")
+        validated = auth.validate_api_key(key)
+        auth.close()
+
+        reloaded = _make(tmp_path)
+        assert reloaded.list_api_keys()[0]["last_used"] == validated.last_used.isoformat()
+        assert list(tmp_path.glob("*.tmp")) == []
+        reloaded.close()
+
+    def test_exit_flush_does_not_keep_authenticators_alive(self, tmp_path):
+        auth = _make(tmp_path / "open", flush_interval=0.05)
+        key = auth.generate_api_key("ci")
+        auth.validate_api_key(key)
+        closed = _make(tmp_path / "closed")
+        closed.close()
+        assert auth in api_key_auth._open_authenticators
+        assert closed not in api_key_auth._open_authenticators
+
+        # The exit hook flushes authenticators that were never closed
+        api_key_auth._close_open_authenticators()
+        assert _stored_last_used(tmp_path / "open")[0] is not None
+        assert auth not in api_key_auth._open_authenticators
+
+        # An unreferenced authenticator (and its flush thread) goes away
+        dropped = _make(tmp_path / "dropped", flush_interval=0.05)
+        ref, thread = weakref.ref(dropped), dropped._flush_thread
+        del dropped
+        gc.collect()
+        assert ref() is None
+        thread.join(timeout=2)
+        assert not thread.is_alive()
+
+
+def _load(auth, key, requests, rate=2000):
+    """Issue validations at roughly `rate` per second; return per-call latencies."""
+    interval = 1.0 / rate
+    start = time.perf_counter()
+
+    def one(i):
+        # Pace submissions so the offered load approximates the target rate
+        delay = start + i * interval - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        t0 = time.perf_counter()
+        auth.validate_api_key(key)
+        return time.perf_counter() - t0
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        return sorted(pool.map(one, range(requests)))
+
+
+def test_load_file_writes_and_p99(tmp_path):
+    requests = 2000
+
+    # Write-through baseline: one flush per validated request
+    (tmp_path / "through").mkdir()
+    through = _make(tmp_path / "through", flush_threshold=1)
+    key = through.generate_api_key("load")
+    saves = through.saves
+    through_latency = _load(through, key, requests)
+    through_writes = through.saves - saves
+    through.close()
+
+    (tmp_path / "behind").mkdir()
+    behind = _make(tmp_path / "behind", flush_interval=30.0)
+    key = behind.generate_api_key("load")
+    saves = behind.saves
+    behind_latency = _load(behind, key, requests)
+    behind_writes = behind.saves - saves
+    behind.close()
+
+    def p99(latencies):
+        return latencies[int(len(latencies) * 0.99)] * 1000
+
+    print(
+        f"\nwrite-through: {through_writes} writes, p99 {p99(through_latency):.3f} ms | "
+        f"write-behind: {behind_writes} writes, p99 {p99(behind_latency):.3f} ms"
+    )
+
+    assert through_writes == requests
+    assert behind_writes <= 2
+    assert p99(behind_latency) < p99(through_latency)
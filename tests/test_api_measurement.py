@@ -0,0 +1,141 @@
+"""
+Tests for the pooled, concurrent API measurement engine.
+
+Runs the engine against a local stub HTTP server to verify:
+- Latency percentiles are recorded within histogram precision
+- Warm-up requests are issued but not recorded
+- Endpoints are measured concurrently (wall time ~ slowest endpoint)
+- Connections are reused across requests
+"""
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from custom.uat_gateway.adapters.api.api_adapter import APIAdapter, APIEndpoint, HTTPMethod
+from custom.uat_gateway.adapters.api.measurement import LatencyHistogram, LoadProfile
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.hits[self.path] = server.hits.get(self.path, 0) + 1
+            server.connections.add(self.client_address)
+        # Paths look like /slow/<ms>/<id> or /fast
+        if self.path.startswith("/slow/"):
+            time.sleep(int(self.path.split("/")[2]) / 1000)
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class _StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+@pytest.fixture
+def stub_server():
+    server = _StubServer(("127.0.0.1", 0), _StubHandler)
+    server.hits = {}
+    server.connections = set()
+    server.lock = threading.Lock()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server, f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def _endpoint(path: str) -> APIEndpoint:
+    return APIEndpoint(path=path, method=HTTPMethod.GET, route=path)
+
+
+class TestLatencyHistogram:
+    def test_percentiles_within_precision(self):
+        histogram = LatencyHistogram(significant_figures=2)
+        for value in range(1, 100_001):
+            histogram.record(value)
+
+        assert histogram.total_count == 100_000
+        assert histogram.max_value == 100_000
+        assert histogram.value_at_percentile(50) == pytest.approx(50_000, rel=0.01)
+        assert histogram.value_at_percentile(90) == pytest.approx(90_000, rel=0.01)
+        assert histogram.value_at_percentile(99) == pytest.approx(99_000, rel=0.01)
+
+    def test_merge(self):
+        a = LatencyHistogram()
+        b = LatencyHistogram()
+        a.record(10)
+        b.record(5000)
+        a.merge(b)
+        assert a.total_count == 2
+        assert a.min_value == 10
+        assert a.max_value == 5000
+
+    def test_empty(self):
+        assert LatencyHistogram().value_at_percentile(99) == 0
+
+
+class TestMeasureEndpoints:
+    def test_warmup_requests_are_discarded(self, stub_server):
+        server, base_url = stub_server
+        adapter = APIAdapter()
+        profile = LoadProfile(requests_per_endpoint=5, warmup_requests=2, concurrency=4)
+
+        results = adapter.measure_endpoints([_endpoint("/fast")], base_url, profile=profile)
+
+        result = results["GET /fast"]
+        assert server.hits["/fast"] == 7
+        assert result.total_requests == 5
+        assert result.successful_requests == 5
+        assert 0 < result.p50_ms <= result.p90_ms <= result.p99_ms <= result.max_ms
+        assert result.throughput_rps > 0
+
+    def test_endpoints_measured_concurrently(self, stub_server):
+        _, base_url = stub_server
+        adapter = APIAdapter()
+        endpoints = [_endpoint(f"/slow/200/{i}") for i in range(40)]
+        profile = LoadProfile(requests_per_endpoint=1, warmup_requests=0, concurrency=40)
+
+        start = time.perf_counter()
+        results = adapter.measure_endpoints(endpoints, base_url, profile=profile)
+        elapsed = time.perf_counter() - start
+
+        # Sequential would take 40 * 0.2s = 8s
+        assert len(results) == 40
+        assert elapsed < 2.0
+        assert all(r.p50_ms >= 200 for r in results.values())
+
+    def test_connections_are_reused(self, stub_server):
+        server, base_url = stub_server
+        adapter = APIAdapter()
+        profile = LoadProfile(requests_per_endpoint=50, warmup_requests=0, concurrency=2)
+
+        adapter.measure_endpoints([_endpoint("/fast")], base_url, profile=profile)
+
+        assert len(server.connections) <= 2
+
+    def test_track_performance_reports_percentiles(self, stub_server):
+        _, base_url = stub_server
+        adapter = APIAdapter()
+        measurements = [adapter.measure_endpoint(_endpoint("/fast"), base_url) for _ in range(10)]
+
+        stats = adapter.track_performance(measurements)["GET /fast"]
+        assert stats.total_requests == 10
+        assert 0 < stats.p50_response_time_ms <= stats.p99_response_time_ms
@@ -0,0 +1,213 @@
+"""
+Tests for deduplicated online backups of features.db.
+
+Verifies that:
+- Snapshots taken while another connection keeps committing restore to a
+  consistent database (no torn transactions, WAL contents included)
+- Successive snapshots only store chunks that changed
+- Cleanup garbage-collects chunks no remaining snapshot references
+- Legacy full-copy backups are still listed and restorable
+
+The benchmark reports time per backup and total bytes stored for 100
+successive backups of a ~20 MB database with a few rows changed in between.
+"""
+import json
+import os
+import shutil
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from api import database_backup
+
+
+@pytest.fixture
+def project(tmp_path):
+    project_dir = tmp_path / "proj"
+    project_dir.mkdir()
+    conn = _connect(project_dir)
+    conn.execute(
+        "CREATE TABLE features (id INTEGER PRIMARY KEY, priority INTEGER, category TEXT, "
+        "name TEXT, description TEXT, steps TEXT, passes BOOLEAN DEFAULT 0)"
+    )
+    conn.close()
+    return project_dir
+
+
+def _connect(project_dir):
+    conn = sqlite3.connect(str(project_dir / "features.db"), timeout=30, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    return conn
+
+
+def _insert_pairs(conn, start, count, description="d"):
+    """Insert features two at a time; a consistent copy always has whole pairs."""
+    for i in range(start, start + count):
+        conn.execute("BEGIN IMMEDIATE")
+        for half in range(2):
+            conn.execute(
+                "INSERT INTO features (priority, category, name, description, steps) VALUES (?, ?, ?, ?, '[]')",
+                (i, f"pair-{i}", f"f{i}-{half}", description),
+            )
+        conn.execute("COMMIT")
+
+
+def _check_consistent(db_path):
+    conn = sqlite3.connect(str(db_path))
+    try:
+        assert conn.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
+        torn = conn.execute(
+            "SELECT COUNT(*) FROM (SELECT category FROM features GROUP BY category HAVING COUNT(*) != 2)"
+        ).fetchone()[0]
+        assert torn == 0
+        return conn.execute("SELECT COUNT(*) FROM features").fetchone()[0]
+    finally:
+        conn.close()
+
+
+class TestOnlineBackup:
+    def test_restore_consistent_under_concurrent_writes(self, project, tmp_path):
+        writer = _connect(project)
+        _insert_pairs(writer, 0, 200)
+
+        stop = threading.Event()
+
+        def write_forever():
+            conn = _connect(project)
+            i = 1000
+            while not stop.is_set():
+                _insert_pairs(conn, i, 1, description="x" * 500)
+                i += 1
+            conn.close()
+
+        thread = threading.Thread(target=write_forever)
+        thread.start()
+        try:
+            snapshots = []
+            for _ in range(5):
+                snapshots.append(database_backup.backup_features_db(project, pages_per_step=4, step_sleep=0.001))
+                time.sleep(0.02)
+        finally:
+            stop.set()
+            thread.join()
+        writer.close()
+
+        assert all(snapshots)
+        counts = []
+        for snapshot in snapshots:
+            restored = tmp_path / f"restore-{snapshot.stem}"
+            restored.mkdir()
+            assert database_backup.restore_from_backup(restored, snapshot)
+            count = _check_consistent(restored / "features.db")
+            assert count % 2 == 0 and count >= 400
+            counts.append(count)
+
+        # The writer made progress while the backups ran
+        assert counts[-1] > counts[0]
+
+    def test_restore_over_live_database(self, project):
+        conn = _connect(project)
+        _insert_pairs(conn, 0, 10)
+        snapshot = database_backup.backup_features_db(project)
+        _insert_pairs(conn, 10, 5)
+
+        assert database_backup.restore_from_backup(project, snapshot.name)
+        assert conn.execute("SELECT COUNT(*) FROM features").fetchone()[0] == 20
+        conn.close()
+        assert _check_consistent(project / "features.db") == 20
+
+        # The state replaced by the restore was kept as an emergency snapshot
+        emergency = [b for b in database_backup.list_backups(project) if b["reason"] == "emergency"]
+        assert emergency[0]["feature_count"] == 30
+
+    def test_unchanged_pages_are_stored_once(self, project):
+        conn = _connect(project)
+        _insert_pairs(conn, 0, 2000, description="y" * 300)
+
+        first = database_backup.backup_features_db(project)
+        second = database_backup.backup_features_db(project)
+        conn.execute("UPDATE features SET passes = 1 WHERE id = 1")
+        third = database_backup.backup_features_db(project)
+        conn.close()
+
+        stored = {b["filename"]: b for b in database_backup.list_backups(project)}
+        assert stored[first.name]["stored_bytes"] > 0
+        assert stored[second.name]["stored_bytes"] == 0
+        assert 0 < stored[third.name]["stored_bytes"] < stored[first.name]["stored_bytes"] / 10
+
+    def test_cleanup_collects_unreferenced_chunks(self, project, monkeypatch):
+        monkeypatch.setattr(database_backup, "GC_GRACE_SECONDS", -1)
+        conn = _connect(project)
+        snapshots = []
+        for i in range(4):
+            _insert_pairs(conn, i * 500, 500, description=f"{i}" * 200)
+            snapshots.append(database_backup.backup_features_db(project))
+        conn.close()
+
+        objects_dir = database_backup.get_backup_dir(project) / database_backup.OBJECTS_DIR_NAME
+        before = len(list(objects_dir.glob("*/*")))
+        removed = database_backup.cleanup_old_backups(project, keep=1)
+        assert removed == snapshots[:3][::-1]
+        assert len(list(objects_dir.glob("*/*"))) < before
+
+        # The remaining snapshot still restores in full
+        target = project.parent / "restored"
+        target.mkdir()
+        assert database_backup.restore_from_backup(target, snapshots[-1])
+        assert _check_consistent(target / "features.db") == 4000
+
+    def test_legacy_full_copy_backup_still_restores(self, project):
+        conn = _connect(project)
+        _insert_pairs(conn, 0, 3)
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        legacy = database_backup.get_backup_dir(project) / "features_6_20250101-000000_manual.db"
+        shutil.copy2(project / "features.db", legacy)
+        _insert_pairs(conn, 3, 3)
+        conn.close()
+
+        listed = [b["filename"] for b in database_backup.list_backups(project)]
+        assert legacy.name in listed
+        assert database_backup.restore_from_backup(project, legacy.name)
+        assert _check_consistent(project / "features.db") == 6
+
+
+def test_successive_backup_benchmark(project):
+    conn = _connect(project)
+    conn.execute("BEGIN")
+    conn.executemany(
+        "INSERT INTO features (priority, category, name, description, steps) VALUES (?, ?, ?, ?, '[]')",
+        ((i, f"pair-{i // 2}", f"f{i}", os.urandom(200).hex()) for i in range(40000)),
+    )
+    conn.execute("COMMIT")
+
+    timings = []
+    stored_bytes = 0
+    for i in range(100):
+        conn.execute("UPDATE features SET passes = 1 WHERE id = ?", (i * 97 + 1,))
+        _insert_pairs(conn, 100000 + i, 1)
+        start = time.perf_counter()
+        manifest_path = database_backup.backup_features_db(project, reason="bench")
+        timings.append(time.perf_counter() - start)
+        manifest = json.loads(manifest_path.read_text())
+        stored_bytes += manifest["stored_bytes"]
+    conn.close()
+
+    db_mb = manifest["backup_size"] / (1024**2)
+    stored_mb = stored_bytes / (1024**2)
+    summary = database_backup.backup_project_summary(project)
+    print(
+        f"\ndb {db_mb:.1f} MB | 100 backups: mean {sum(timings) * 10:.1f} ms, "
+        f"max {max(timings) * 1000:.1f} ms | written {stored_mb:.1f} MB "
+        f"(full copies: {db_mb * 100:.0f} MB) | on disk after retention "
+        f"{summary['total_backup_size_mb']} MB"
+    )
+
+    assert summary["backup_count"] == database_backup.MAX_BACKUPS
+    assert stored_mb * 20 < db_mb * 100
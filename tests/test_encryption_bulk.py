@@ -0,0 +1,126 @@
+"""
+Tests for cached key derivation and bulk record encryption.
+
+Verifies that derived keys are reused across managers, that bulk-encrypted
+records round-trip with their original types (including plaintext that looks
+like a placeholder or an encrypted value), and that values written in the
+older double-base64 format still decrypt.
+
+The microbenchmark compares per-field and bulk encryption of 10,000 test
+result records.
+"""
+import base64
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from custom.uat_gateway.utils import encryption
+from custom.uat_gateway.utils.encryption import BULK_FIELD, EncryptionManager
+
+PASSWORD = "0123456789abcdef0123456789abcdef"  # 32 chars: derived via PBKDF2
+
+
+def _record(i):
+    return {
+        "test_id": f"t{i}",
+        "status": "passed",
+        "duration_ms": 1200 + i,
+        "auth_token": f"tok-{i}",
+        "context": {
+            "session_id": f"s{i}",
+            "user": {"password": "hunter2", "retries": 3},
+            "cookies": [{"name": "sid", "cookie_value": f"c{i}"}],
+        },
+        "steps": [{"action": "click", "api_key": "k"}, {"action": "type"}],
+    }
+
+
+class TestKeyDerivation:
+    def test_derived_key_is_cached(self):
+        encryption._derive_key_cached.cache_clear()
+
+        start = time.perf_counter()
+        first = EncryptionManager(PASSWORD)
+        cold = time.perf_counter() - start
+
+        start = time.perf_counter()
+        second = EncryptionManager(PASSWORD)
+        warm = time.perf_counter() - start
+
+        assert encryption._derive_key_cached.cache_info().hits == 1
+        assert second.decrypt_data(first.encrypt_data("x")) == "x"
+        assert warm * 10 < cold
+
+
+class TestBulkRecords:
+    def test_round_trip_preserves_types(self):
+        manager = EncryptionManager(PASSWORD)
+        record = _record(1)
+
+        encrypted = manager.encrypt_record(record)
+        assert BULK_FIELD in encrypted
+        assert "hunter2" not in str(encrypted) and "tok-1" not in str(encrypted)
+        assert encrypted["status"] == "passed"
+
+        assert manager.decrypt_record(encrypted) == record
+
+    def test_records_without_sensitive_fields_are_unchanged(self):
+        manager = EncryptionManager(PASSWORD)
+        record = {"test_id": "t", "steps": [{"action": "click"}]}
+        assert manager.encrypt_record(record) == record
+
+    def test_prefixed_plaintext_is_not_decrypted(self):
+        manager = EncryptionManager(PASSWORD)
+        token = manager.encrypt_data("not-mine")
+        record = {
+            "error": "ENCRYPTED_FIELD:0",
+            "api_key": "k",
+            "steps": [{"output": "ENCRYPTED:abc"}, {"output": token}],
+        }
+        encrypted = manager.encrypt_record(record)
+        assert manager.decrypt_record(encrypted) == record
+        assert encrypted["steps"][0]["output"] == "ENCRYPTED:abc"
+
+        # No sensitive fields, but the record must not be read as per-field encrypted
+        plain = {"log": [token, "ENCRYPTED_FIELD:1"]}
+        encrypted = manager.encrypt_record(plain)
+        assert BULK_FIELD in encrypted
+        assert manager.decrypt_record(encrypted) == plain
+
+    def test_per_field_and_legacy_values_still_decrypt(self):
+        manager = EncryptionManager(PASSWORD)
+        per_field = manager.encrypt_dict({"password": "p", "name": "n"})
+        assert manager.decrypt_record(per_field) == {"password": "p", "name": "n"}
+
+        legacy_token = base64.b64encode(manager.cipher.encrypt(b"old-secret")).decode()
+        assert manager.decrypt_data(f"ENCRYPTED:{legacy_token}") == "old-secret"
+
+
+def test_ten_thousand_records_benchmark():
+    manager = EncryptionManager(PASSWORD)
+    records = [_record(i) for i in range(10_000)]
+
+    start = time.perf_counter()
+    per_field = [manager.encrypt_dict(r, recursive=True) for r in records]
+    per_field_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    bulk = manager.encrypt_records(records)
+    bulk_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    restored = manager.decrypt_records(bulk)
+    bulk_decrypt_s = time.perf_counter() - start
+
+    per_field_bytes = sum(len(str(r)) for r in per_field)
+    bulk_bytes = sum(len(str(r)) for r in bulk)
+    print(
+        f"\n10k records: per-field encrypt {per_field_s * 1000:.0f} ms ({per_field_bytes / 1e6:.1f} MB) | "
+        f"bulk encrypt {bulk_s * 1000:.0f} ms ({bulk_bytes / 1e6:.1f} MB), decrypt {bulk_decrypt_s * 1000:.0f} ms"
+    )
+
+    assert restored == records
+    assert bulk_s < per_field_s
@@ -0,0 +1,158 @@
+"""
+Tests for the revision-keyed graph cache in the feature MCP server.
+
+Verifies that:
+- Cached ready/blocked/graph answers match an uncached recomputation
+- The server's own writes and writes from other connections invalidate it
+- Commits that don't touch the features table don't force a rebuild
+
+The benchmark reports per-call latency on a 5,000 feature project, cold
+(full rebuild) and warm (cache hit).
+"""
+import json
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from sqlalchemy import text
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from api.database import Feature, create_database, dispose_engine
+from api.dependency_resolver import compute_scheduling_scores
+from mcp_server import feature_mcp
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    engine, session_maker = create_database(tmp_path)
+    monkeypatch.setattr(feature_mcp, "_engine", engine)
+    monkeypatch.setattr(feature_mcp, "_session_maker", session_maker)
+    monkeypatch.setattr(feature_mcp, "_graph_cache", feature_mcp._GraphCache())
+    yield engine, session_maker
+    feature_mcp._graph_cache.close()
+    dispose_engine(tmp_path)
+
+
+def _seed(session_maker, count):
+    session = session_maker()
+    for i in range(count):
+        session.add(Feature(
+            priority=i + 1,
+            category="core",
+            name=f"Feature {i + 1}",
+            description="d" * 200,
+            steps=["step"],
+            passes=i % 5 == 0,
+            dependencies=[i, i - 1] if i > 1 else None,
+        ))
+    session.commit()
+    session.close()
+
+
+def _reference_ready(session_maker):
+    """Ready list computed the way the tools did before caching."""
+    session = session_maker()
+    try:
+        all_features = [f.to_dict() for f in session.query(Feature).all()]
+    finally:
+        session.close()
+    passing_ids = {f["id"] for f in all_features if f["passes"]}
+    ready = [
+        f for f in all_features
+        if not f["passes"] and not f["in_progress"]
+        and all(d in passing_ids for d in f["dependencies"])
+    ]
+    scores = compute_scheduling_scores(all_features)
+    ready.sort(key=lambda f: (-scores.get(f["id"], 0), f["priority"], f["id"]))
+    return ready
+
+
+class TestGraphCache:
+    def test_matches_uncached_results(self, server):
+        _, session_maker = server
+        _seed(session_maker, 200)
+
+        ready = json.loads(feature_mcp.feature_get_ready(limit=50))
+        expected = _reference_ready(session_maker)
+        assert ready["features"] == expected[:50]
+        assert ready["total_ready"] == len(expected)
+
+        overview = json.loads(feature_mcp.feature_get_overview(ready_limit=50, blocked_limit=100))
+        assert overview["ready"] == ready
+        assert overview["blocked"] == json.loads(feature_mcp.feature_get_blocked(limit=100))
+        assert overview["stats"] == json.loads(feature_mcp.feature_get_stats())
+
+        graph = json.loads(feature_mcp.feature_get_graph())
+        assert len(graph["nodes"]) == 200
+        assert {n["status"] for n in graph["nodes"]} <= {"done", "blocked", "in_progress", "pending"}
+
+    def test_own_writes_invalidate(self, server):
+        _, session_maker = server
+        _seed(session_maker, 10)
+
+        first = json.loads(feature_mcp.feature_get_ready())
+        claimed = first["features"][0]["id"]
+        feature_mcp.feature_mark_in_progress(claimed)
+
+        after = json.loads(feature_mcp.feature_get_ready())
+        assert claimed not in [f["id"] for f in after["features"]]
+        assert after["total_ready"] == first["total_ready"] - 1
+
+    def test_external_writes_invalidate(self, server):
+        engine, session_maker = server
+        _seed(session_maker, 10)
+        before = json.loads(feature_mcp.feature_get_stats())
+        assert json.loads(feature_mcp.feature_get_overview())["stats"] == before
+
+        # Another process (e.g. the orchestrator) marks a feature passing
+        with engine.connect() as conn:
+            conn.execute(text("UPDATE features SET passes = 1 WHERE passes = 0 AND id = 2"))
+            conn.commit()
+
+        stats = json.loads(feature_mcp.feature_get_overview())["stats"]
+        assert stats["passing"] == before["passing"] + 1
+
+    def test_unrelated_commits_keep_snapshot(self, server):
+        engine, session_maker = server
+        _seed(session_maker, 10)
+        snapshot = feature_mcp._graph_cache.get()
+
+        with engine.connect() as conn:
+            conn.execute(text("CREATE TABLE scratch (x INTEGER)"))
+            conn.commit()
+
+        assert feature_mcp._graph_cache.get() is snapshot
+
+
+def test_per_call_latency_benchmark(server):
+    _, session_maker = server
+    _seed(session_maker, 5000)
+    calls = {
+        "ready": lambda: feature_mcp.feature_get_ready(limit=10),
+        "blocked": lambda: feature_mcp.feature_get_blocked(limit=20),
+        "graph": feature_mcp.feature_get_graph,
+        "overview": feature_mcp.feature_get_overview,
+    }
+
+    def timed(call, repeat):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            call()
+        return (time.perf_counter() - start) * 1000 / repeat
+
+    results = {}
+    for name, call in calls.items():
+        feature_mcp._graph_cache.invalidate()
+        cold_ms = timed(call, 1)
+        warm_ms = timed(call, 20)
+        results[name] = (cold_ms, warm_ms)
+
+    print("\n" + " | ".join(
+        f"{name}: cold {cold:.1f} ms, warm {warm:.2f} ms" for name, (cold, warm) in results.items()
+    ))
+
+    cold_ready, warm_ready = results["ready"]
+    assert warm_ready * 10 < cold_ready
@@ -0,0 +1,128 @@
+"""
+Tests for journaled journey persistence.
+
+Verifies that mutations append to the journal instead of rewriting the
+snapshot, that restart replays the journal (including after a torn write or
+a crash mid-compaction), and that backups are bounded.
+
+The benchmark measures update throughput and startup replay time with
+10,000 journeys.
+"""
+import json
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from custom.uat_gateway.api_server.journey_persistence import JourneyPersistence
+
+
+def _journey(i, **extra):
+    return {"id": f"j{i}", "name": f"Journey {i}", "steps": [{"action": "click", "target": f"#b{i}"}] * 5, **extra}
+
+
+def _reopen(store, **kwargs):
+    if store._journal is not None:
+        store._journal.close()
+        store._journal = None
+    return JourneyPersistence(str(store.storage_file), **kwargs)
+
+
+class TestJournal:
+    def test_mutations_append_without_rewriting_snapshot(self, tmp_path):
+        store = JourneyPersistence(str(tmp_path / "journeys.json"))
+        snapshot_mtime = store.storage_file.stat().st_mtime_ns
+
+        store.create_journey("a", _journey(1))
+        store.update_journey("a", _journey(1, status="running"))
+        store.create_journey("b", _journey(2))
+        store.delete_journey("b")
+
+        assert store.storage_file.stat().st_mtime_ns == snapshot_mtime
+        lines = store.journal_file.read_text().splitlines()
+        assert [json.loads(line)["op"] for line in lines] == ["put", "put", "put", "delete"]
+
+        reloaded = _reopen(store)
+        assert reloaded.get_all_journeys() == {"a": _journey(1, status="running")}
+
+    def test_torn_tail_is_discarded(self, tmp_path):
+        store = JourneyPersistence(str(tmp_path / "journeys.json"))
+        store.create_journey("a", _journey(1))
+        store.create_journey("b", _journey(2))
+
+        # Simulate a crash halfway through writing a third record
+        with open(store.journal_file, "a") as f:
+            f.write('{"seq": 3, "op": "put", "id": "c", "da')
+
+        reloaded = _reopen(store)
+        assert sorted(reloaded.get_all_journeys()) == ["a", "b"]
+
+        reloaded.create_journey("c", _journey(3))
+        again = _reopen(reloaded)
+        assert sorted(again.get_all_journeys()) == ["a", "b", "c"]
+
+    def test_compaction_and_bounded_backups(self, tmp_path):
+        store = JourneyPersistence(str(tmp_path / "journeys.json"), compact_threshold=10, max_backups=3)
+
+        for i in range(100):
+            store.create_journey(f"j{i}", _journey(i))
+
+        snapshot = json.loads(store.storage_file.read_text())
+        assert snapshot["sequence"] == 100
+        assert snapshot["journey_count"] == 100
+        assert store.journal_file.read_text() == ""
+        assert len(list(tmp_path.glob("journeys.json.bak.*"))) == 3
+
+        assert _reopen(store).get_journey_count() == 100
+
+    def test_records_covered_by_snapshot_are_skipped(self, tmp_path):
+        store = JourneyPersistence(str(tmp_path / "journeys.json"))
+        store.create_journey("a", _journey(1))
+        journal = store.journal_file.read_text()
+        store.delete_journey("a")
+        store._compact()
+
+        # Crash after the snapshot rename but before the journal was truncated
+        store.journal_file.write_text(journal)
+
+        assert _reopen(store).get_all_journeys() == {}
+
+
+def test_journal_benchmark(tmp_path):
+    count = 10_000
+    store = JourneyPersistence(str(tmp_path / "journeys.json"), compact_threshold=count * 10)
+
+    start = time.perf_counter()
+    for i in range(count):
+        store.create_journey(f"j{i}", _journey(i))
+    create_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(count):
+        store.update_journey(f"j{i}", _journey(i, status="passed"))
+    update_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    reloaded = _reopen(store, compact_threshold=count * 10)
+    replay_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    reloaded._compact()
+    compact_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    from_snapshot = _reopen(reloaded)
+    snapshot_load_s = time.perf_counter() - start
+
+    print(
+        f"\n{count} journeys: create {count / create_s:,.0f}/s, update {count / update_s:,.0f}/s | "
+        f"replay {2 * count} records {replay_s * 1000:.0f} ms | compact {compact_s * 1000:.0f} ms | "
+        f"snapshot load {snapshot_load_s * 1000:.0f} ms"
+    )
+
+    assert reloaded.get_journey_count() == count
+    assert from_snapshot.get_journey(f"j{count - 1}")["status"] == "passed"
+    # Each mutation costs one appended record, not a rewrite of every journey
+    assert count / update_s > 5_000
@@ -0,0 +1,118 @@
+"""
+Tests for lazy, paginated log viewer rendering.
+
+Verifies that:
+- Highlighting is applied in one pass and never nests spans inside URLs
+- Entries are formatted only when displayed, and only once
+- Level filters, stats and pages agree with the full entry list
+
+The benchmark builds a 200,000 line console log and reports ingest time,
+page-one render time and the cost of a full render.
+"""
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from custom.uat_gateway.test_executor.test_executor import ConsoleMessage
+from custom.uat_gateway.ui.kanban import log_viewer
+from custom.uat_gateway.ui.kanban.log_viewer import LogViewer, format_log_text
+
+LEVELS = ("log", "info", "warning", "error", "debug")
+
+
+def _logs(count):
+    return [
+        ConsoleMessage(
+            level=LEVELS[i % len(LEVELS)],
+            text=f"request {i} to https://api.example.com/v1/items/{i}?debug=true took {i % 900}ms, cached=false",
+            timestamp=1_700_000_000 + i / 10,
+            url="https://app.example.com/static/js/main.js" if i % 4 == 0 else None,
+            line=i % 300 or None,
+        )
+        for i in range(count)
+    ]
+
+
+class TestHighlighting:
+    def test_single_pass_highlighting(self):
+        formatted = format_log_text("TypeError: got 42 from https://x.io/a/7?ok=true, expected null", True)
+        assert formatted == (
+            '<span class="log-keyword">TypeError:</span> got <span class="log-number">42</span> from '
+            '<span class="log-url">https://x.io/a/7?ok=true,</span> expected <span class="log-boolean">null</span>'
+        )
+
+    def test_keywords_only_for_error_and_warning(self):
+        assert "log-keyword" not in format_log_text("Error: boom", False)
+        assert format_log_text("<b>&</b>", False) == "&lt;b&gt;&amp;&lt;/b&gt;"
+
+
+class TestLazyViewer:
+    def test_entries_are_built_on_demand_and_cached(self, monkeypatch):
+        built = []
+        original = log_viewer.LogEntry.__post_init__
+
+        def counting(self):
+            built.append(self.text)
+            original(self)
+
+        monkeypatch.setattr(log_viewer.LogEntry, "__post_init__", counting)
+
+        viewer = LogViewer(_logs(1000), page_size=50)
+        assert built == []
+        assert viewer.get_stats() == {level: 200 for level in ("error", "warning", "info", "log", "debug")}
+
+        first = viewer.to_html(page=1)
+        assert len(built) == 50
+        assert viewer.to_html(page=1) == first
+        assert len(built) == 50
+        assert '1 / 20' in first
+
+    def test_filters_and_pages_match_full_list(self):
+        viewer = LogViewer(_logs(230), page_size=20)
+        errors = viewer.get_error_logs()
+        assert [e.text for e in errors] == [e.text for e in viewer.entries if e.level == "error"]
+
+        pages = [viewer.get_page(p, level_filter="error") for p in range(1, viewer.get_page_count(level_filter="error") + 1)]
+        assert [e for page in pages for e in page] == errors
+        assert viewer.get_page(99) == []
+        assert "No console logs available" in viewer.to_html(level_filter="trace")
+
+        viewer.add_logs([ConsoleMessage(level="error", text="late failure", timestamp=1_700_001_000.0)])
+        assert viewer.get_stats()["error"] == len(errors) + 1
+        assert viewer.get_error_logs()[-1].text == "late failure"
+        assert viewer.to_markdown(level_filter="error").endswith("late failure\n```\n")
+
+
+def test_large_log_page_one_benchmark():
+    logs = _logs(200_000)
+
+    start = time.perf_counter()
+    viewer = LogViewer(logs)
+    ingest_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    page_one = viewer.to_html(page=1)
+    page_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    viewer.to_html(page=1)
+    stats = viewer.get_stats()
+    errors_page = viewer.to_html(level_filter="error", page=1)
+    warm_ms = (time.perf_counter() - start) * 1000
+
+    small = LogViewer(logs[:20_000])
+    start = time.perf_counter()
+    small.to_html()
+    full_20k_ms = (time.perf_counter() - start) * 1000
+
+    print(
+        f"\n200k lines: ingest {ingest_ms:.0f} ms | page one {page_ms:.1f} ms | "
+        f"warm page + stats + error page {warm_ms:.1f} ms | full render of 20k lines {full_20k_ms:.0f} ms"
+    )
+
+    assert page_one.count('class="log-entry ') == 100
+    assert stats["error"] == 40_000 and "log-error" in errors_page
+    assert page_ms < 50
@@ -0,0 +1,221 @@
+"""
+Concurrency tests for the per-host circuit breaker in network_handler.
+
+Drives a decorated client from many threads against a local flaky stub
+server and verifies closed -> open -> half-open -> closed transitions, the
+half-open probe budget (including probes that are cancelled), and bounded
+failure histories. Also reports the per-call overhead of the breaker
+bookkeeping.
+"""
+import asyncio
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+import requests
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from custom.uat_gateway.utils.network_handler import (
+    CircuitBreakerState,
+    CircuitState,
+    NetworkFailureHandler,
+    RetryConfig,
+    handle_network_failures,
+)
+
+
+class _FlakyHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.hits += 1
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        try:
+            time.sleep(server.delay)
+            code = 500 if server.failing else 200
+            self.send_response(code)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"ok")
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+class _FlakyServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _FlakyHandler)
+        self.lock = threading.Lock()
+        self.failing = True
+        self.delay = 0.0
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.hits = 0
+            self.in_flight = 0
+            self.max_in_flight = 0
+
+
+@pytest.fixture
+def flaky():
+    server = _FlakyServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _client(server, handler):
+    url = f"http://127.0.0.1:{server.server_address[1]}/"
+
+    @handle_network_failures(handler=handler, extract_host=lambda _: "stub")
+    def fetch():
+        response = requests.get(url, timeout=5)
+        response.raise_for_status()
+        return {"success": True}
+
+    return fetch
+
+
+def _hammer(fetch, calls, workers=32):
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(lambda _: fetch(), range(calls)))
+
+
+def test_state_transitions_under_concurrency(flaky):
+    handler = NetworkFailureHandler(
+        retry_config=RetryConfig(max_retries=0),
+        breaker_template=CircuitBreakerState(failure_threshold=5, timeout_seconds=0.3, half_open_max_calls=3),
+    )
+    fetch = _client(flaky, handler)
+
+    # Closed -> open: once open, calls are rejected without reaching the server
+    flaky.delay = 0.01
+    results = _hammer(fetch, 300)
+    breaker = handler.circuit_breakers["stub"]
+    assert breaker.state == CircuitState.OPEN
+    assert flaky.hits < 300
+    assert sum(r.get("retry_after", 0) >= 1 for r in results) == 300 - flaky.hits
+
+    # Half-open: a failing probe reopens immediately
+    time.sleep(0.35)
+    flaky.reset()
+    _hammer(fetch, 50)
+    assert breaker.state == CircuitState.OPEN
+    assert flaky.max_in_flight <= 3
+
+    # Half-open with a healthy server: at most 3 concurrent probes, then closed
+    time.sleep(0.35)
+    flaky.failing = False
+    flaky.delay = 0.05
+    flaky.reset()
+    results = _hammer(fetch, 64)
+    assert flaky.max_in_flight <= 3
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.probes_in_flight == 0
+
+    # Closed again: full concurrency reaches the server
+    flaky.reset()
+    results = _hammer(fetch, 64)
+    assert all(r == {"success": True} for r in results)
+    assert flaky.max_in_flight > 3
+
+    status = handler.get_health_status()
+    assert status.total_requests == status.successful_requests + status.failed_requests
+
+
+def test_cancelled_probes_release_their_slots():
+    handler = NetworkFailureHandler(
+        retry_config=RetryConfig(max_retries=0),
+        breaker_template=CircuitBreakerState(failure_threshold=1, timeout_seconds=0.05, half_open_max_calls=3),
+    )
+    hang = True
+
+    @handle_network_failures(handler=handler, extract_host=lambda _: "stub")
+    async def fetch():
+        if hang:
+            await asyncio.sleep(60)
+        return {"success": True}
+
+    async def scenario():
+        nonlocal hang
+        handler.record_failure("stub", handler.classify_error(ConnectionRefusedError("refused")))
+        await asyncio.sleep(0.06)
+
+        # Three half-open probes, cancelled mid-request (timeout, disconnect)
+        probes = [asyncio.create_task(fetch()) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        breaker = handler.circuit_breakers["stub"]
+        assert breaker.state == CircuitState.HALF_OPEN and breaker.probes_in_flight == 3
+        for probe in probes:
+            probe.cancel()
+        await asyncio.gather(*probes, return_exceptions=True)
+        assert breaker.probes_in_flight == 0
+
+        hang = False
+        return [await fetch() for _ in range(3)], breaker
+
+    results, breaker = asyncio.run(scenario())
+    assert results == [{"success": True}] * 3
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_success_without_probe_keeps_probe_slots():
+    handler = NetworkFailureHandler(
+        breaker_template=CircuitBreakerState(failure_threshold=1, timeout_seconds=0, half_open_max_calls=3),
+    )
+    handler.record_failure("h", handler.classify_error(ConnectionRefusedError("refused")))
+    assert handler.check_circuit_breaker("h") == (False, "Circuit breaker half-open")
+
+    # A call admitted before the breaker opened finishes while it is half-open
+    handler.record_success("h")
+    assert handler.circuit_breakers["h"].probes_in_flight == 1
+    handler.record_success("h", probe=True)
+    assert handler.circuit_breakers["h"].probes_in_flight == 0
+
+
+def test_histories_are_bounded():
+    handler = NetworkFailureHandler()
+    failure = handler.classify_error(ConnectionRefusedError("refused"))
+    for _ in range(1000):
+        handler.record_failure("h", failure)
+
+    assert len(handler.failure_history) == 100
+    assert len(handler.health_status.recent_failures) == 50
+    assert handler.health_status.failed_requests == 1000
+
+
+def test_breaker_overhead_per_call():
+    handler = NetworkFailureHandler()
+    calls_per_thread = 20_000
+    threads = 8
+
+    def work(i):
+        host = f"host{i % 4}"
+        for _ in range(calls_per_thread):
+            handler.check_circuit_breaker(host)
+            handler.record_success(host)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(work, range(threads)))
+    per_call_us = (time.perf_counter() - start) / (calls_per_thread * threads) * 1e6
+
+    print(f"\nbreaker check + record_success: {per_call_us:.2f} us per call across {threads} threads")
+    assert per_call_us < 50
+    assert all(cb.state == CircuitState.CLOSED for cb in handler.circuit_breakers.values())
@@ -0,0 +1,227 @@
+"""
+Tests for the prompt template cache.
+
+Verifies that spawning a batch of agents reads each template once and builds
+the YOLO variant once, that edited, added and removed project overrides are
+picked up through the (mtime, size) check, that cached prompts match what
+the uncached path produced, and that agents forked by a pool server inherit
+the templates it warmed.
+
+The benchmark spawns YOLO coding agents with Popen (each process reads and
+strips its template) and through the agent pool, and reports how long each
+agent takes to render its prompt.
+"""
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import agent_pool
+import prompts
+
+ROOT = Path(__file__).parent.parent.resolve()
+
+CODING_TEMPLATE = """# Coding agent
+
+### STEP 4: IMPLEMENT
+1. Write the code
+2. Test manually using browser automation (see Step 5)
+
+### STEP 5: VERIFY WITH BROWSER AUTOMATION
+Open the app with Playwright and take screenshots.
+""" + "Click through every flow and check the console.\n" * 200 + """
+### STEP 5.5: MARK PASSING
+**ONLY MARK A FEATURE AS PASSING AFTER VERIFICATION WITH SCREENSHOTS.**
+
+## BROWSER AUTOMATION
+
+Use the browser tools for all verification.
+---
+## GIT
+Commit your work.
+"""
+
+TESTING_TEMPLATE = "# Testing agent\nTest features: {{TESTING_FEATURE_IDS}}\n"
+
+
+@pytest.fixture
+def templates(tmp_path, monkeypatch):
+    templates_dir = tmp_path / "templates"
+    templates_dir.mkdir()
+    (templates_dir / "coding_prompt.template.md").write_text(CODING_TEMPLATE)
+    (templates_dir / "testing_prompt.template.md").write_text(TESTING_TEMPLATE)
+    monkeypatch.setattr(prompts, "TEMPLATES_DIR", templates_dir)
+    prompts.clear_prompt_cache()
+    yield templates_dir
+    prompts.clear_prompt_cache()
+
+
+@pytest.fixture
+def project(tmp_path):
+    project_dir = tmp_path / "project"
+    project_dir.mkdir()
+    return project_dir
+
+
+@pytest.fixture
+def counters(monkeypatch):
+    counts = {"reads": 0, "strips": 0}
+    real_read_text = Path.read_text
+    real_strip = prompts._strip_browser_testing_sections
+
+    def read_text(self, *args, **kwargs):
+        counts["reads"] += 1
+        return real_read_text(self, *args, **kwargs)
+
+    def strip(prompt):
+        counts["strips"] += 1
+        return real_strip(prompt)
+
+    monkeypatch.setattr(Path, "read_text", read_text)
+    monkeypatch.setattr(prompts, "_strip_browser_testing_sections", strip)
+    return counts
+
+
+def _write(path: Path, text: str) -> None:
+    """Write a file and move its mtime on, whatever the timestamp resolution."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+def test_yolo_variant_matches_uncached_strip(templates, project):
+    yolo = prompts.get_coding_prompt(project, yolo_mode=True)
+    assert yolo == prompts._strip_browser_testing_sections(CODING_TEMPLATE)
+    assert "VERIFY FEATURE (YOLO MODE)" in yolo
+    assert "Playwright" not in yolo and "## GIT" in yolo
+    assert prompts.get_coding_prompt(project) == CODING_TEMPLATE
+
+
+def test_agent_batch_reads_and_strips_once(templates, project, counters):
+    for feature_id in range(50):
+        prompts.get_single_feature_prompt(feature_id, project, yolo_mode=True)
+        prompts.get_batch_feature_prompt([feature_id, feature_id + 1], project, yolo_mode=True)
+        prompts.get_batch_feature_prompt([feature_id], project)
+        prompts.get_testing_prompt(project, testing_feature_ids=[feature_id])
+
+    # One read per template (coding, testing) and one strip for the YOLO variant
+    assert counters == {"reads": 2, "strips": 1}
+
+    batch = prompts.get_batch_feature_prompt([7, 9], project, yolo_mode=True)
+    assert batch.startswith("## ASSIGNED FEATURES (BATCH): #7, #9")
+    assert batch.endswith(prompts._strip_browser_testing_sections(CODING_TEMPLATE))
+    assert prompts.get_testing_prompt(project, testing_feature_ids=[3, 4]).endswith("Test features: 3, 4\n")
+
+
+def test_overrides_are_picked_up(templates, project, counters):
+    assert prompts.load_prompt("coding_prompt", project) == CODING_TEMPLATE
+
+    # A project override appears
+    override = prompts.get_project_prompts_dir(project) / "coding_prompt.md"
+    _write(override, "# Project coding prompt\n")
+    assert prompts.load_prompt("coding_prompt", project) == "# Project coding prompt\n"
+
+    # Edited: re-read once, then cached again
+    _write(override, "# Edited coding prompt\n")
+    reads = counters["reads"]
+    assert prompts.load_prompt("coding_prompt", project) == "# Edited coding prompt\n"
+    assert prompts.load_prompt("coding_prompt", project) == "# Edited coding prompt\n"
+    assert counters["reads"] == reads + 1
+
+    # Removed: back to the base template, without reading it again
+    override.unlink()
+    reads = counters["reads"]
+    assert prompts.load_prompt("coding_prompt", project) == CODING_TEMPLATE
+    assert counters["reads"] == reads
+
+
+def test_missing_prompt(templates, project):
+    with pytest.raises(FileNotFoundError):
+        prompts.load_prompt("no_such_prompt", project)
+
+
+def test_warm_cache_is_not_read_again(templates, project, counters):
+    prompts.warm_prompt_cache(project, yolo_mode=True)
+    assert counters == {"reads": 2, "strips": 1}
+
+    prompts.get_single_feature_prompt(1, project, yolo_mode=True)
+    prompts.get_testing_prompt(project, testing_feature_ids=[1])
+    assert counters == {"reads": 2, "strips": 1}
+
+
+# Stand-in for an agent process: renders its prompt the way agent.py does and
+# reports how many template reads and YOLO strips that took
+SPAWNED_AGENT = f"""
+import sys, time
+from pathlib import Path
+sys.path.insert(0, {str(ROOT)!r})
+import prompts
+
+counts = {{"reads": 0, "strips": 0}}
+real_read_text, real_strip = Path.read_text, prompts._strip_browser_testing_sections
+
+def read_text(self, *args, **kwargs):
+    counts["reads"] += 1
+    return real_read_text(self, *args, **kwargs)
+
+def strip(prompt):
+    counts["strips"] += 1
+    return real_strip(prompt)
+
+Path.read_text = read_text
+prompts._strip_browser_testing_sections = strip
+
+start = time.perf_counter()
+prompt = prompts.get_single_feature_prompt(7, Path(sys.argv[-1]), yolo_mode=True)
+elapsed_ms = (time.perf_counter() - start) * 1000
+print(counts["reads"], counts["strips"], elapsed_ms, "VERIFY FEATURE (YOLO MODE)" in prompt, flush=True)
+"""
+
+
+@pytest.mark.skipif(not agent_pool.FORK_AVAILABLE, reason="needs fork and Unix sockets")
+def test_spawn_benchmark(tmp_path, project):
+    spawns = 10
+    _write(prompts.get_project_prompts_dir(project) / "coding_prompt.md", CODING_TEMPLATE)
+    stub = tmp_path / "stub_agent.py"
+    stub.write_text(SPAWNED_AGENT)
+    cmd = [sys.executable, "-u", str(stub), "--agent-type", "coding", "--project-dir", str(project)]
+
+    def run(start_agent):
+        results = []
+        for _ in range(spawns):
+            proc = start_agent()
+            output = proc.stdout.read().split()
+            assert proc.wait(timeout=30) == 0, output
+            proc.stdout.close()
+            reads, strips, elapsed_ms, stripped = output[-4:]
+            assert stripped == "True"
+            results.append((int(reads), int(strips), float(elapsed_ms)))
+        return results
+
+    popen = run(lambda: subprocess.Popen(
+        cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+    ))
+    pool = agent_pool.AgentPool(stub, preload=("prompts",), project_dir=project, yolo_mode=True)
+    try:
+        pooled = run(lambda: pool.spawn(cmd, cwd=str(tmp_path), env=dict(os.environ)))
+    finally:
+        pool.close()
+
+    popen_ms = statistics.median(ms for _, _, ms in popen)
+    pooled_ms = statistics.median(ms for _, _, ms in pooled)
+    print(
+        f"\n{spawns} spawned YOLO agents, median prompt render: "
+        f"Popen {popen_ms:.2f} ms (read + strip in every agent), "
+        f"pool {pooled_ms:.2f} ms (cache warmed by the server)"
+    )
+    # Every fresh process reads and strips; forked agents inherit the server's cache
+    assert all(reads >= 1 and strips == 1 for reads, strips, _ in popen)
+    assert all(reads == 0 and strips == 0 for reads, strips, _ in pooled)
+    assert pooled_ms < popen_ms
@@ -0,0 +1,148 @@
+"""
+Tests for the GCRA rate limiter middleware.
+
+Verifies that the limiter admits exactly the configured number of requests
+per window, reports accurate Retry-After and reset values, and keeps the
+client table bounded.
+
+The benchmark drives 100,000 distinct clients through the limiter and
+reports per-request overhead and table size.
+"""
+import asyncio
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from custom.uat_gateway.api_server import rate_limiter as rate_limiter_module
+from custom.uat_gateway.api_server.rate_limiter import RateLimiterMiddleware, RateLimitError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return 1_700_000_000.0 + self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limiter_module, "time", fake)
+    return fake
+
+
+def _request(client="c1"):
+    return SimpleNamespace(headers={"X-Client-ID": client}, query_params={}, client=None)
+
+
+def _hit(limiter, client="c1"):
+    return asyncio.run(limiter.check_rate_limit(_request(client)))
+
+
+class TestGCRA:
+    def test_admits_exactly_the_limit(self, clock):
+        limiter = RateLimiterMiddleware(requests_per_minute=60, requests_per_hour=1000)
+
+        remaining = [_hit(limiter)[1].remaining for _ in range(60)]
+        assert remaining[0] == 59 and remaining[-1] == 0
+
+        with pytest.raises(RateLimitError) as exc:
+            _hit(limiter)
+        info = exc.value.rate_limit_info
+        assert info.window == "minute"
+        assert info.retry_after == pytest.approx(1.0)
+        assert limiter.get_rate_limit_headers(info)["Retry-After"] == "1"
+
+        # One emission interval later exactly one more request fits
+        clock.now += 1.0
+        _hit(limiter)
+        with pytest.raises(RateLimitError):
+            _hit(limiter)
+
+    def test_reset_time_is_when_allowance_refills(self, clock):
+        limiter = RateLimiterMiddleware(requests_per_minute=60, requests_per_hour=1000)
+        for _ in range(30):
+            _, info = _hit(limiter)
+
+        # 30 of 60 used: the minute allowance is full again in 30 seconds
+        assert info.window == "minute"
+        assert (info.reset_time.timestamp() - clock.time()) == pytest.approx(30.0)
+
+        clock.now += 30.0
+        assert _hit(limiter)[1].remaining == 59
+
+    def test_hourly_denial_does_not_charge_minute_window(self, clock):
+        limiter = RateLimiterMiddleware(requests_per_minute=60, requests_per_hour=5)
+        for _ in range(5):
+            _hit(limiter)
+        minute_tat = limiter.client_buckets["client:c1"].minute_tat
+
+        with pytest.raises(RateLimitError) as exc:
+            _hit(limiter)
+        assert exc.value.rate_limit_info.window == "hour"
+        assert exc.value.rate_limit_info.retry_after == pytest.approx(720.0)
+        assert limiter.client_buckets["client:c1"].minute_tat == minute_tat
+
+    def test_client_table_is_bounded(self, clock):
+        limiter = RateLimiterMiddleware(max_clients=100)
+        for i in range(1000):
+            _hit(limiter, f"c{i}")
+        assert len(limiter.client_buckets) == 100
+        assert "client:c999" in limiter.client_buckets
+
+        # Once their allowance has refilled, idle clients are dropped first
+        clock.now += 3600
+        _hit(limiter, "fresh")
+        assert list(limiter.client_buckets) == ["client:fresh"]
+
+
+def test_hundred_thousand_clients_benchmark():
+    clients = 100_000
+    chunk = 10_000
+    limiter = RateLimiterMiddleware(max_clients=20_000)
+    requests = [_request(f"c{i}") for i in range(clients)]
+    loop = asyncio.new_event_loop()
+
+    async def drive(target, batch):
+        start = time.perf_counter()
+        for request in batch:
+            await target.check_rate_limit(request)
+        return (time.perf_counter() - start) / len(batch) * 1e6
+
+    per_request_us = [loop.run_until_complete(drive(limiter, requests[i:i + chunk])) for i in range(0, clients, chunk)]
+
+    # Memory growth while another 20k new clients churn through a full table
+    churn = [_request(f"n{i}") for i in range(20_000)]
+    tracemalloc.start()
+    loop.run_until_complete(drive(limiter, churn))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # A single hot client: cost must not depend on the configured limit
+    hot_us = {}
+    for limit in (100, 100_000):
+        hot = RateLimiterMiddleware(requests_per_minute=limit, requests_per_hour=limit * 60)
+        hot_us[limit] = loop.run_until_complete(drive(hot, [_request("hot")] * min(limit, 10_000)))
+    loop.close()
+
+    print(
+        f"\n{clients} clients: per-request {per_request_us[0]:.1f} us (first 10k) -> "
+        f"{per_request_us[-1]:.1f} us (last 10k) | table {len(limiter.client_buckets)} clients, "
+        f"peak traced during churn {peak / 1e6:.1f} MB | hot client limit 100: {hot_us[100]:.1f} us, "
+        f"limit 100k: {hot_us[100_000]:.1f} us"
+    )
+
+    assert len(limiter.client_buckets) == 20_000
+    assert per_request_us[-1] < per_request_us[0] * 3
+    assert hot_us[100_000] < hot_us[100] * 3
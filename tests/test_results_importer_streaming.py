@@ -0,0 +1,174 @@
+"""
+Tests for the streaming results importer.
+
+Verifies that:
+- The iterative parser yields exactly what json.load sees, across chunk boundaries
+- Legacy JSON and NDJSON exports import to the same results
+- Progress and results callbacks fire per chunk, and retain_results=False keeps nothing
+- Results are indexed by journey as they are imported
+
+The benchmark imports a large legacy export and reports peak traced memory
+and records per second, against json.load plus materialization.
+"""
+import io
+import json
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from custom.uat_gateway.test_executor import test_executor
+from custom.uat_gateway.ui.kanban.results_exporter import ResultsExporter, ResultsModal
+from custom.uat_gateway.ui.kanban.results_importer import (
+    ImportResult,
+    ResultsImporter,
+    iter_json_document,
+)
+
+
+def _modal(count, logs_per_result=2):
+    modal = ResultsModal(execution_metadata={"run": "nightly", "unicode": "héllo ✓"})
+    for i in range(count):
+        modal.add_test_result(test_executor.TestResult(
+            test_name=f"test_{i}",
+            passed=i % 7 != 0,
+            duration_ms=100 + i,
+            error_message=None if i % 7 else f"Expected 200 got {500 + i % 3}",
+            journey_id=f"journey-{i % 10}",
+            artifacts=[test_executor.TestArtifact("screenshot", f"/tmp/shot_{i}.png", datetime(2026, 1, 1, 12, 0, i % 60), f"test_{i}")],
+        ))
+        for n in range(logs_per_result):
+            modal.console_logs.append(test_executor.ConsoleMessage("log", f"log {i}.{n} " + "x" * 200, 1_700_000_000.0 + i))
+    return modal
+
+
+def _fields(results):
+    return [(r.test_name, r.passed, r.duration_ms, r.error_message, r.journey_id, len(r.artifacts)) for r in results]
+
+
+class TestIterativeParser:
+    def test_matches_json_load_across_chunk_boundaries(self):
+        document = {
+            "export_metadata": {"exported_at": "2026-01-01", "export_version": "1.0"},
+            "empty": [],
+            "test_results": [{"n": 123456789, "f": -1.5e-3, "s": "a\"b\\\\c ✓", "nested": [[1], {"k": None}]}] * 5,
+            "flag": True,
+            "console_logs": [12345, 678, "tail"],
+        }
+        raw = json.dumps(document, ensure_ascii=False, indent=1).encode("utf-8")
+
+        for read_size in (1, 3, 7, 64, 1 << 20):
+            rebuilt = {}
+            for key, value, is_item, _ in iter_json_document(io.BytesIO(raw), read_size=read_size):
+                if is_item:
+                    rebuilt.setdefault(key, []).append(value)
+                else:
+                    rebuilt[key] = value
+            assert rebuilt == document, read_size
+
+    def test_malformed_document_reports_error(self, tmp_path):
+        path = tmp_path / "broken.json"
+        path.write_text('{"test_results": [{"test_name": "a"}, {"test_name": ')
+
+        result = ResultsImporter().import_from_file(str(path))
+        assert not result.success
+        assert result.errors[0].startswith("Invalid JSON format")
+
+
+class TestStreamingImport:
+    def test_json_and_ndjson_round_trip(self, tmp_path):
+        modal = _modal(250)
+        exporter = ResultsExporter(str(tmp_path))
+        json_path = exporter.export_results(modal, "export.json")
+        ndjson_path = exporter.export_results(modal, "export.ndjson", format="ndjson")
+
+        with open(json_path) as f:
+            reference = ResultsImporter()._import_test_results(json.load(f)["test_results"], ImportResult(True))
+
+        for path in (json_path, ndjson_path):
+            importer = ResultsImporter(chunk_size=64)
+            result = importer.import_from_file(path)
+            assert result.success, result.errors
+            assert result.imported_test_results == 250
+            assert result.imported_console_logs == 500
+            assert _fields(importer.get_imported_results()) == _fields(reference)
+            assert [r.test_name for r in importer.get_results_for_journey("journey-3")] == [
+                f"test_{i}" for i in range(3, 250, 10)
+            ]
+
+    def test_callbacks_and_bounded_retention(self, tmp_path):
+        path = ResultsExporter(str(tmp_path)).export_results(_modal(300), "export.ndjson", format="ndjson")
+
+        progress, chunks = [], []
+        importer = ResultsImporter(retain_results=False, chunk_size=100)
+        result = importer.import_from_file(path, progress_callback=progress.append, results_callback=chunks.append)
+
+        assert result.success
+        assert [len(c) for c in chunks] == [100, 100, 100]
+        assert importer.get_imported_results() == []
+        fractions = [p.fraction for p in progress]
+        assert fractions == sorted(fractions) and fractions[-1] == 1.0
+        assert progress[-1].records == 900
+
+    def test_empty_export_round_trip(self, tmp_path):
+        modal = ResultsModal(execution_metadata={"run": "empty"})
+        exporter = ResultsExporter(str(tmp_path))
+
+        for path in (
+            exporter.export_results(modal, "empty.json"),
+            exporter.export_results(modal, "empty.ndjson", format="ndjson"),
+        ):
+            importer = ResultsImporter()
+            result = importer.import_from_file(path)
+            assert result.success, (path, result.errors)
+            assert result.imported_test_results == 0 and result.imported_console_logs == 0
+            assert importer.get_imported_results() == []
+
+    def test_missing_sections_and_metadata_warnings(self, tmp_path):
+        empty = tmp_path / "empty.json"
+        empty.write_text('{"export_metadata": {"exported_at": "now"}}')
+        result = ResultsImporter().import_from_file(str(empty))
+        assert not result.success
+        assert "No valid data sections" in result.errors[0]
+        assert result.warnings == ["Missing metadata field: export_version"]
+
+
+def test_large_export_memory_benchmark(tmp_path):
+    count = 20_000
+    path = ResultsExporter(str(tmp_path)).export_results(_modal(count, logs_per_result=3), "big.json")
+    size_mb = Path(path).stat().st_size / 1e6
+
+    def load_whole():
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        importer = ResultsImporter()
+        importer._import_test_results(data["test_results"], ImportResult(True))
+        return importer
+
+    def stream():
+        importer = ResultsImporter(retain_results=False)
+        importer.import_from_file(path, results_callback=lambda chunk: None)
+        return importer
+
+    measurements = {}
+    for name, run in (("json.load", load_whole), ("streaming", stream)):
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        tracemalloc.start()
+        run()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        measurements[name] = (elapsed, peak)
+
+    records = count * 4
+    print(f"\n{size_mb:.0f} MB export, {records} records: " + " | ".join(
+        f"{name}: {records / elapsed:,.0f} records/s, peak {peak / 1e6:.1f} MB"
+        for name, (elapsed, peak) in measurements.items()
+    ))
+
+    assert measurements["streaming"][1] * 5 < measurements["json.load"][1]
@@ -0,0 +1,165 @@
+"""
+Tests for the background NDJSON security audit trail.
+
+Verifies that:
+- Each event becomes exactly one NDJSON line, written off the calling thread
+- Queries by user, event type and time range match a full scan
+- Size-based rotation keeps the index usable across rotated files
+- A torn final line left by a crash is discarded on restart
+
+The benchmark runs a login storm and compares per-call latency of the old
+synchronous path (JSON DEBUG line through a file handler) with queueing.
+"""
+import json
+import logging
+import statistics
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from custom.uat_gateway.utils.security_audit_logger import (
+    AUDIT_LOG_NAME,
+    SecurityAuditLogger,
+    SecurityEventType,
+)
+
+
+def _read_lines(path: Path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+class TestAuditTrail:
+    def test_one_line_per_event(self, tmp_path):
+        audit = SecurityAuditLogger(component="test.audit", log_dir=tmp_path)
+        audit.log_login_success("u1", "alice", ip_address="10.0.0.1")
+        audit.log_login_failure("bob", reason="bad password")
+        audit.close()
+
+        lines = _read_lines(tmp_path / AUDIT_LOG_NAME)
+        assert [e["event_type"] for e in lines] == ["login_success", "login_failure"]
+        assert lines[1]["details"] == {"reason": "bad password"}
+
+    def test_query_matches_full_scan(self, tmp_path):
+        audit = SecurityAuditLogger(component="test.audit", log_dir=tmp_path, index_block_size=16)
+        for i in range(500):
+            if i % 3 == 0:
+                audit.log_login_failure(f"user{i % 7}", ip_address="10.0.0.2")
+            else:
+                audit.log_token_validated(f"id{i % 5}", f"user{i % 7}")
+
+        everything = audit.query_events()
+        assert len(everything) == 500
+
+        failures = audit.query_events(user="user3", event_type=SecurityEventType.LOGIN_FAILURE)
+        assert failures == [
+            e for e in everything if e["username"] == "user3" and e["event_type"] == "login_failure"
+        ]
+        assert audit.query_events(user="id2") == [e for e in everything if e["user_id"] == "id2"]
+
+        middle = everything[200]["timestamp"]
+        assert audit.query_events(start=middle) == [e for e in everything if e["timestamp"] >= middle]
+        assert audit.query_events(user="user1", limit=3) == [
+            e for e in everything if e["username"] == "user1"
+        ][-3:]
+
+        future = datetime.utcnow() + timedelta(days=1)
+        assert audit.query_events(start=future) == []
+        audit.close()
+
+    def test_rotation_keeps_queries_working(self, tmp_path):
+        audit = SecurityAuditLogger(
+            component="test.audit", log_dir=tmp_path, max_bytes=20_000, backup_count=3, index_block_size=8
+        )
+        for i in range(400):
+            audit.log_login_failure(f"user{i}")
+        audit.flush()
+
+        assert audit.writer.rotations > 0
+        assert sorted(p.name for p in tmp_path.glob(f"{AUDIT_LOG_NAME}.[0-9]")) == [
+            f"{AUDIT_LOG_NAME}.{n}" for n in (1, 2, 3)
+        ]
+        assert all(p.stat().st_size <= 20_000 for p in tmp_path.glob(f"{AUDIT_LOG_NAME}*"))
+
+        kept = audit.query_events()
+        assert kept[-1]["username"] == "user399"
+        assert audit.query_events(user="user399") == [kept[-1]]
+        assert audit.query_events(user="user0") == []
+        audit.close()
+
+    def test_torn_tail_is_discarded_on_restart(self, tmp_path):
+        audit = SecurityAuditLogger(component="test.audit", log_dir=tmp_path)
+        for i in range(10):
+            audit.log_login_failure(f"user{i}")
+        audit.flush()
+        # Simulate a crash: no index entry for the open block, half a line on disk
+        with open(tmp_path / AUDIT_LOG_NAME, "ab") as f:
+            f.write(b'{"timestamp": "2026-')
+        audit.writer._closed = True
+
+        restarted = SecurityAuditLogger(component="test.audit", log_dir=tmp_path)
+        restarted.log_login_failure("after")
+        events = restarted.query_events()
+        assert [e["username"] for e in events] == [f"user{i}" for i in range(10)] + ["after"]
+        restarted.close()
+
+
+def test_login_storm_latency_benchmark(tmp_path):
+    threads, per_thread = 8, 2000
+
+    def storm(log_one):
+        latencies = []
+        lock = threading.Lock()
+
+        def worker(n):
+            local = []
+            for i in range(per_thread):
+                start = time.perf_counter()
+                log_one(f"user{n}-{i}")
+                local.append(time.perf_counter() - start)
+            with lock:
+                latencies.extend(local)
+
+        workers = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+        latencies.sort()
+        return statistics.mean(latencies) * 1e6, latencies[int(len(latencies) * 0.99)] * 1e6
+
+    # Previous behaviour: human line plus a JSON DEBUG line, both written synchronously
+    sync_logger = logging.getLogger("test.audit.sync")
+    sync_logger.propagate = False
+    sync_logger.setLevel(logging.DEBUG)
+    handler = logging.FileHandler(tmp_path / "sync.log")
+    sync_logger.addHandler(handler)
+
+    def sync_log(username):
+        event = audit_for_events.log_login_failure(username, reason="bad password")
+        sync_logger.warning(event.to_log_message())
+        sync_logger.debug(f"SECURITY_EVENT: {event.to_json()}")
+
+    audit_for_events = SecurityAuditLogger(component="test.audit.events", log_dir=tmp_path / "discard")
+    audit_for_events.writer.submit = lambda event: None
+    sync_mean, sync_p99 = storm(sync_log)
+    sync_logger.removeHandler(handler)
+    handler.close()
+
+    audit = SecurityAuditLogger(component="test.audit.storm", log_dir=tmp_path / "queued")
+    audit.logger.disabled = True
+    queued_mean, queued_p99 = storm(lambda username: audit.log_login_failure(username, reason="bad password"))
+    audit.flush(timeout=30)
+
+    print(
+        f"\n{threads * per_thread} login failures: sync mean {sync_mean:.1f} us p99 {sync_p99:.1f} us | "
+        f"queued mean {queued_mean:.1f} us p99 {queued_p99:.1f} us"
+    )
+
+    assert audit.writer.events_written == threads * per_thread
+    assert queued_mean < sync_mean
+    audit.close()
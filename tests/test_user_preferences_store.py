@@ -0,0 +1,141 @@
+"""
+Tests for the SQLite-backed user preference store.
+
+Verifies that preferences round-trip through the database, that users are
+loaded lazily, that bursts of changes collapse into one transaction, that
+writes after close() are rejected, and that legacy per-user JSON files are
+imported once.
+
+The benchmark seeds 50,000 users and reports time to first request and
+write transaction counts.
+"""
+import json
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from custom.uat_gateway.api_server.user_preferences import UserPreferencesManager
+
+
+class TestPreferenceStore:
+    def test_round_trip_and_lazy_load(self, tmp_path):
+        manager = UserPreferencesManager(tmp_path, flush_delay=0)
+        manager.set_preference("alice", "theme", "dark")
+        manager.set_preferences("alice", {"timezone": "UTC", "layout": {"cols": 3}})
+        manager.set_preference("bob", "theme", "light")
+        manager.delete_preference("alice", "timezone")
+        manager.close()
+
+        reopened = UserPreferencesManager(tmp_path)
+        assert reopened._cache == {}
+        assert reopened.get_all_preferences("alice") == {"theme": "dark", "layout": {"cols": 3}}
+        assert list(reopened._cache) == ["alice"]
+        assert sorted(reopened.get_all_users()) == ["alice", "bob"]
+        reopened.close()
+
+    def test_burst_collapses_into_one_transaction(self, tmp_path):
+        manager = UserPreferencesManager(tmp_path, flush_delay=0.1)
+
+        for i in range(200):
+            manager.set_preference("alice", f"panel_{i % 20}", i)
+
+        assert manager.transactions == 0
+        time.sleep(0.3)
+        assert manager.transactions == 1
+        manager.close()
+
+        reopened = UserPreferencesManager(tmp_path)
+        assert reopened.get_preference("alice", "panel_19") == 199
+        reopened.close()
+
+    def test_reset_and_delete_user(self, tmp_path):
+        manager = UserPreferencesManager(tmp_path, flush_delay=0)
+        manager.set_preferences("alice", {"a": 1, "b": 2})
+        manager.set_preference("bob", "a", 1)
+
+        manager.reset_user_preferences("alice")
+        manager.set_preference("alice", "c", 3)
+        assert manager.delete_user_preferences("bob") is True
+        assert manager.delete_user_preferences("nobody") is False
+        manager.close()
+
+        reopened = UserPreferencesManager(tmp_path)
+        assert reopened.get_all_preferences("alice") == {"c": 3}
+        assert reopened.get_all_users() == ["alice"]
+        reopened.close()
+
+    def test_writes_after_close_are_rejected(self, tmp_path):
+        manager = UserPreferencesManager(tmp_path, flush_delay=0.05)
+        manager.set_preference("alice", "theme", "dark")
+        manager.close()
+
+        with pytest.raises(RuntimeError, match="closed"):
+            manager.set_preference("alice", "theme", "light")
+        with pytest.raises(RuntimeError, match="closed"):
+            manager.set_preferences("alice", {"theme": "light"})
+        with pytest.raises(RuntimeError, match="closed"):
+            manager.reset_user_preferences("alice")
+        assert manager.get_preference("alice", "theme") == "dark"
+        # A flush timer that fires after close has nothing to write to
+        manager.flush()
+        time.sleep(0.1)
+
+        reopened = UserPreferencesManager(tmp_path)
+        assert reopened.get_preference("alice", "theme") == "dark"
+        reopened.close()
+
+    def test_legacy_json_files_are_imported(self, tmp_path):
+        (tmp_path / "user_0123456789abcdef.json").write_text(json.dumps({
+            "user_id": "carol",
+            "preferences": {"theme": {"key": "theme", "value": "dark",
+                                      "created_at": "2025-01-01T00:00:00", "updated_at": "2025-01-01T00:00:00"}},
+            "created_at": "2025-01-01T00:00:00",
+            "updated_at": "2025-01-01T00:00:00",
+        }))
+
+        manager = UserPreferencesManager(tmp_path)
+        assert manager.get_preference("carol", "theme") == "dark"
+        manager.close()
+
+
+def test_fifty_thousand_users_benchmark(tmp_path):
+    users = 50_000
+    with sqlite3.connect(tmp_path / "user_preferences.db") as conn:
+        UserPreferencesManager(tmp_path).close()
+        now = "2026-01-01T00:00:00"
+        conn.executemany("INSERT INTO users VALUES (?, ?, ?)", ((f"u{i}", now, now) for i in range(users)))
+        conn.executemany(
+            "INSERT INTO preferences VALUES (?, ?, ?, ?, ?)",
+            ((f"u{i}", key, json.dumps(f"{key}-{i}"), now, now)
+             for i in range(users) for key in ("theme", "timezone", "layout"))
+        )
+    conn.close()
+
+    start = time.perf_counter()
+    manager = UserPreferencesManager(tmp_path, flush_delay=0.05)
+    value = manager.get_preference("u49999", "timezone")
+    first_request_ms = (time.perf_counter() - start) * 1000
+
+    # A UI burst: 100 users each changing 5 settings
+    start = time.perf_counter()
+    for i in range(100):
+        manager.set_preferences(f"u{i}", {f"k{n}": n for n in range(5)})
+    burst_ms = (time.perf_counter() - start) * 1000
+    time.sleep(0.2)
+    transactions = manager.transactions
+    manager.close()
+
+    print(
+        f"\n{users} users: time to first request {first_request_ms:.1f} ms | "
+        f"500 changes in {burst_ms:.1f} ms -> {transactions} write transaction(s)"
+    )
+
+    assert value == "timezone-49999"
+    assert first_request_ms < 500
+    assert transactions == 1
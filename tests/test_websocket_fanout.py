@@ -0,0 +1,218 @@
+"""
+Tests for per-client fan-out in the realtime WebSocket servers.
+
+Verifies that:
+- A client's queue coalesces progress updates in place and drops the oldest
+  message when full
+- Broadcasts reach real WebSocket clients through their outboxes
+- EventManager events raised from another thread are delivered
+
+The benchmark broadcasts to 500 simulated clients, 25 of which read slowly,
+and reports delivery latency for the fast clients, compared with awaiting
+each client's send in turn.
+"""
+import asyncio
+import json
+import socket
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import websockets
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from custom.uat_gateway.ui.events import EventManager
+from custom.uat_gateway.ui.fanout import ClientOutbox
+from custom.uat_gateway.ui.realtime.websocket_server import WebSocketClient, WebSocketServer
+
+
+class FakeSocket:
+    """Records delivery times; slow sockets take `delay` seconds per send"""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.received = []
+
+    async def send(self, message: str):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.received.append((time.perf_counter(), message))
+
+
+class TestClientOutbox:
+    def test_coalesce_and_drop_oldest(self):
+        async def scenario():
+            gate = asyncio.Event()
+            delivered = []
+
+            async def send(message):
+                await gate.wait()
+                delivered.append(message)
+
+            outbox = ClientOutbox(send, max_size=3)
+            outbox.put("first")
+            await asyncio.sleep(0)  # sender picks up "first" and blocks on the gate
+            for pct in (10, 20, 30):
+                outbox.put(f"progress {pct}", coalesce_key="progress")
+            outbox.put("a")
+            outbox.put("b")
+            outbox.put("c")  # full: drops the oldest queued message
+
+            assert outbox.queued() == 3
+            gate.set()
+            await outbox.join()
+            return outbox, delivered
+
+        outbox, delivered = asyncio.run(scenario())
+        assert delivered == ["first", "a", "b", "c"]
+        assert outbox.coalesced == 2 and outbox.dropped == 1
+
+    def test_coalesced_message_keeps_its_position(self):
+        async def scenario():
+            delivered = []
+
+            async def send(message):
+                delivered.append(message)
+
+            outbox = ClientOutbox(send)
+            outbox.put("progress 10", coalesce_key="progress")
+            outbox.put("complete a")
+            outbox.put("progress 20", coalesce_key="progress")
+            await outbox.join()
+            return delivered
+
+        assert asyncio.run(scenario()) == ["progress 20", "complete a"]
+
+    def test_send_failure_closes_outbox(self):
+        async def scenario():
+            errors = []
+
+            async def send(message):
+                raise ConnectionError("gone")
+
+            outbox = ClientOutbox(send, on_error=errors.append)
+            outbox.put("x")
+            await outbox.join()
+            outbox.put("ignored")
+            return outbox, errors
+
+        outbox, errors = asyncio.run(scenario())
+        assert outbox.closed and outbox.queued() == 0
+        assert [str(e) for e in errors] == ["gone"]
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("localhost", 0))
+        return s.getsockname()[1]
+
+
+class TestWebSocketDelivery:
+    def test_broadcast_reaches_authenticated_clients(self):
+        async def scenario():
+            server = WebSocketServer(port=_free_port(), auth_token="secret-token-123")
+            await server.start()
+            url = f"ws://localhost:{server.port}"
+            try:
+                async with websockets.connect(url) as reader, websockets.connect(url) as idle:
+                    for ws in (reader, idle):
+                        await ws.send(json.dumps({"token": "secret-token-123"}))
+                        assert json.loads(await ws.recv())["type"] == "authenticated"
+
+                    await server.send_progress_update("checkout", "happy path", 50.0)
+                    await server.send_scenario_complete("checkout", "happy path", True)
+
+                    first = json.loads(await asyncio.wait_for(reader.recv(), 5))
+                    second = json.loads(await asyncio.wait_for(reader.recv(), 5))
+                    assert [first["type"], second["type"]] == ["progress", "scenario_complete"]
+                    assert {c["sent"] for c in server.get_clients()} == {2}
+            finally:
+                await server.stop()
+
+        asyncio.run(scenario())
+
+    def test_event_manager_delivers_events_from_other_threads(self):
+        async def scenario():
+            manager = EventManager(port=_free_port())
+            await manager.start()
+            try:
+                async with websockets.connect(f"ws://localhost:{manager.port}") as ws:
+                    while manager.get_client_count() == 0:
+                        await asyncio.sleep(0.01)
+
+                    await asyncio.to_thread(manager.broadcast_progress, "test_execution", 0.5)
+                    manager.broadcast_error("login_test", "Assertion failed")
+
+                    events = [json.loads(await asyncio.wait_for(ws.recv(), 5)) for _ in range(2)]
+                    assert [e["event_type"] for e in events] == ["progress", "error"]
+            finally:
+                await manager.stop()
+
+        asyncio.run(scenario())
+
+
+def test_fanout_latency_benchmark():
+    fast_count, slow_count, slow_delay = 475, 25, 0.02
+
+    def make_server():
+        server = WebSocketServer(message_queue_size=20)
+        sockets = [FakeSocket(slow_delay if i % 20 == 0 else 0.0) for i in range(fast_count + slow_count)]
+        for ws in sockets:
+            client = WebSocketClient(ws, "token", datetime.now(), queue_size=server.message_queue_size)
+            server.clients[client.client_id] = client
+        return server, [ws for ws in sockets if not ws.delay], [ws for ws in sockets if ws.delay]
+
+    def fast_latencies(fast, sent_at):
+        latencies = []
+        for ws in fast:
+            for received_at, message in ws.received:
+                latencies.append(received_at - sent_at[json.loads(message)["data"]["seq"]])
+        latencies.sort()
+        return latencies
+
+    async def sequential(broadcasts):
+        # Previous behaviour: await every client's send in turn
+        server, fast, _ = make_server()
+        sent_at = {}
+        for seq in range(broadcasts):
+            message = json.dumps({"type": "progress", "data": {"seq": seq}})
+            sent_at[seq] = time.perf_counter()
+            for client in server.clients.values():
+                await client.websocket.send(message)
+        return fast_latencies(fast, sent_at)
+
+    async def fanout(broadcasts):
+        server, fast, slow = make_server()
+        sent_at = {}
+        start = time.perf_counter()
+        for seq in range(broadcasts):
+            sent_at[seq] = time.perf_counter()
+            await server.broadcast("progress", {"seq": seq}, coalesce_key=("progress", "journey", "scenario"))
+            await asyncio.sleep(0.005)
+        await asyncio.gather(*(c.outbox.join() for c in server.clients.values()))
+        elapsed = time.perf_counter() - start
+        return fast_latencies(fast, sent_at), slow, elapsed
+
+    old = asyncio.run(sequential(5))
+    new, slow, elapsed = asyncio.run(fanout(100))
+
+    def summary(latencies):
+        return (statistics.median(latencies) * 1000, latencies[int(len(latencies) * 0.99)] * 1000)
+
+    old_p50, old_p99 = summary(old)
+    new_p50, new_p99 = summary(new)
+    slow_received = statistics.mean(len(ws.received) for ws in slow)
+    print(
+        f"\n500 clients ({slow_count} slow): sequential fast-client p50 {old_p50:.1f} ms p99 {old_p99:.1f} ms | "
+        f"fan-out p50 {new_p50:.2f} ms p99 {new_p99:.2f} ms | "
+        f"slow clients got {slow_received:.0f}/100 (coalesced) in {elapsed:.2f} s"
+    )
+
+    assert len(new) == fast_count * 100
+    assert new_p50 * 20 < old_p50
+    assert new_p99 < old_p50
+    assert slow_received < 100
@@ -561,6 +561,8 @@ export interface AssistantConversationDetail {
   title: string | null
   created_at: string | null
   updated_at: string | null
+  message_count: number
+  has_more: boolean  // More messages exist beyond this page
   messages: AssistantMessage[]
 }
 